@@ -0,0 +1,125 @@
+"""
+restore_backup.py — List and restore Time Aligned session data backups.
+
+Usage:
+    python restore_backup.py                       # list backups
+    python restore_backup.py 20261016_101500_000000
+    python restore_backup.py --at "2026-10-16 10:15"
+
+Backups are made before destructive changes such as deleting a session (see
+src/backup_store.py). Restoring first backs up the current data, so a restore
+can itself be undone. Close Time Aligned before restoring.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime
+
+from src.atomic_writer import write_json_atomic
+from src.backup_store import BackupStore
+from src.constants import (
+    DEFAULT_BACKUP_FOLDER,
+    DEFAULT_DATA_FILE,
+    DEFAULT_SETTINGS_FILE,
+    STORAGE_BACKEND_SQLITE,
+)
+from src.session_journal import SessionJournal
+from src.sqlite_store import SqliteSessionStore, sqlite_path_for
+
+
+def uses_sqlite(settings_file):
+    """Whether the settings select the SQLite storage backend"""
+    try:
+        with open(settings_file, "r") as f:
+            settings = json.load(f)
+    except (OSError, ValueError):
+        return False
+    storage_settings = settings.get("storage_settings", {})
+    return storage_settings.get("backend") == STORAGE_BACKEND_SQLITE
+
+
+def load_current(data_file, sqlite):
+    """Current session data, including journaled transitions"""
+    if sqlite:
+        return SqliteSessionStore(sqlite_path_for(data_file)).load_all()
+    try:
+        with open(data_file, "r") as f:
+            all_data = json.load(f)
+    except (OSError, ValueError):
+        all_data = {}
+    SessionJournal(data_file).replay(all_data)
+    return all_data
+
+
+def restore(store, backup_id, data_file, sqlite):
+    """Replace the session data with a backup, backing up the current data first.
+
+    Returns:
+        int: Number of sessions restored
+    """
+    all_data = store.restore(backup_id)
+    store.create(load_current(data_file, sqlite), f"before restore {backup_id}")
+    if sqlite:
+        SqliteSessionStore(sqlite_path_for(data_file)).save_all(all_data)
+    else:
+        write_json_atomic(data_file, all_data)
+        SessionJournal(data_file).clear()
+    return len(all_data)
+
+
+def list_backups(store):
+    """Print the kept backups, oldest first"""
+    backups = store.list()
+    if not backups:
+        print(f"No backups in {store.backup_dir}")
+        return
+    for backup in backups:
+        created = datetime.fromtimestamp(backup["created"])
+        print(
+            f"{backup['id']}  {created:%Y-%m-%d %H:%M:%S}  "
+            f"{backup['sessions']:>5} sessions  {backup['reason']}"
+        )
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Restore Time Aligned backups.")
+    parser.add_argument("backup_id", nargs="?", help="Backup to restore")
+    parser.add_argument(
+        "--at",
+        help='Restore the newest backup made at or before "YYYY-MM-DD HH:MM"',
+    )
+    parser.add_argument("--data-file", default=DEFAULT_DATA_FILE)
+    parser.add_argument("--settings-file", default=DEFAULT_SETTINGS_FILE)
+    parser.add_argument("--backup-dir", default=DEFAULT_BACKUP_FOLDER)
+    args = parser.parse_args(argv)
+
+    store = BackupStore(args.backup_dir)
+    backup_id = args.backup_id
+    if args.at:
+        try:
+            moment = datetime.strptime(args.at, "%Y-%m-%d %H:%M")
+        except ValueError:
+            print(f'ERROR: --at must look like "2026-10-16 10:15", got {args.at!r}')
+            return 1
+        backup_id = store.backup_at(moment)
+        if backup_id is None:
+            print(f"ERROR: No backup was made at or before {args.at}.")
+            return 1
+    if backup_id is None:
+        list_backups(store)
+        return 0
+
+    sqlite = uses_sqlite(args.settings_file)
+    try:
+        count = restore(store, backup_id, args.data_file, sqlite)
+    except (OSError, ValueError) as error:
+        print(f"ERROR: Could not restore backup {backup_id}: {error}")
+        return 1
+    target = sqlite_path_for(args.data_file) if sqlite else args.data_file
+    print(f"Restored {count} sessions from backup {backup_id} to {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
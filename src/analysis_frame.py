@@ -1,12 +1,21 @@
 import math
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
-import json
-import csv
-from datetime import datetime, timedelta
+import itertools
+from datetime import date, datetime, timedelta
 
 from src.ui_helpers import ScrollableFrame, get_frame_background
+from src.analysis_query import AnalysisQuery
+from src.analysis_worker import AnalysisWorker
+from src.csv_export import ANALYSIS_CSV_FIELDS, export_csv_with_progress
+from src.daily_rollup import DailyRollup
+from src.date_index import DateIndex, first_day
+from src.name_table import NameTable
+from src.period_model import PeriodModel
+from src.timeline_cache import TimelineCache, TimelineResultSet
 from src.constants import (
+    ANALYSIS_DEBOUNCE_MS,
+    ANALYSIS_POLL_MS,
     COLOR_ACTIVE_LIGHT_GREEN,
     COLOR_BREAK_LIGHT_ORANGE,
     COLOR_GRAY_BACKGROUND,
@@ -20,10 +29,33 @@ from src.constants import (
     FONT_MICRO,
     FONT_NORMAL_ITALIC,
     FONT_TIMER_SMALL,
+    MOUSEWHEEL_DELTA_DIVISOR,
     PIE_CHART_FONT,
     PIE_CHART_MARGIN,
     PIE_CHART_SIZE,
     PIE_TEXT_MIN_PERCENT,
+    TIMELINE_COMMENT_MAX_LINES,
+    TIMELINE_VISIBLE_ROWS,
+    TIMELINE_WHEEL_ROWS,
+)
+
+# Timeline columns in display order: (width in characters, use a wrapping Text
+# widget, expand to fill the row). Headers in update_timeline_header() match.
+TIMELINE_COLUMNS = (
+    (10, False, False),  # Date
+    (9, False, False),  # Start
+    (8, False, False),  # Duration
+    (12, False, False),  # Sphere
+    (5, False, False),  # Sphere Active
+    (5, False, False),  # Project Active
+    (7, False, False),  # Type
+    (15, False, False),  # Primary Action
+    (21, True, False),  # Primary Comment
+    (15, False, False),  # Secondary Action
+    (21, True, False),  # Secondary Comment
+    (21, True, False),  # Active Comments
+    (21, True, False),  # Break Comments
+    (21, True, True),  # Session Notes
 )
 
 
@@ -220,11 +252,21 @@ class AnalysisFrame(ttk.Frame):
         # Status filter (active, all, archived) - controls both sphere and project dropdowns
         self.status_filter = tk.StringVar(master=root, value="active")
 
-        # Load More pagination state
-        self.periods_per_page = 50  # Load 50 periods at a time
-        self.timeline_data_all = []  # Full dataset
-        self.periods_loaded = 0  # How many periods currently displayed
-        self.load_more_button = None  # Reference to Load More button
+        # Virtualized timeline: a fixed pool of row widgets is re-filled with
+        # whichever periods are scrolled into view
+        self.timeline_data_all = []  # Full sorted dataset
+        self.timeline_result_set = None  # Unsorted rows + cached orderings
+        self.timeline_cache = TimelineCache()  # Recent result sets (LRU)
+        self.timeline_first_row = 0  # Index of the first period in view
+        self.timeline_rows = []  # Pooled row frames (see _create_timeline_row)
+        self.timeline_scrollbar = None
+        # Bind tag shared by all pooled cells - one mousewheel binding in total
+        self.timeline_wheel_tag = f"TimelineRows{id(self)}"
+
+        # Background refreshes after filter changes (see schedule_refresh)
+        self.analysis_worker = None  # Started on first use
+        self._refresh_after_id = None  # Pending debounced refresh
+        self._poll_after_id = None  # Pending check for a background result
 
         self.create_widgets()
 
@@ -248,8 +290,7 @@ class AnalysisFrame(ttk.Frame):
         self.tracker.settings["analysis_settings"]["card_ranges"] = self.card_ranges
 
         try:
-            with open(self.tracker.settings_file, "w") as f:
-                json.dump(self.tracker.settings, f, indent=2)
+            self.tracker.save_settings()
         except Exception as error:
             messagebox.showerror("Error", f"Failed to save settings: {error}")
 
@@ -439,10 +480,18 @@ class AnalysisFrame(ttk.Frame):
             pady=(0, 5),
         )
 
-        # Create canvas and scrollbar for timeline
-        # a simple frame for timeline - no separate scrollbar
+        # Pooled rows plus a scrollbar over the full dataset (shown when the
+        # periods don't all fit)
         self.timeline_frame = ttk.Frame(timeline_container)
-        self.timeline_frame.pack(fill="both", expand=True)
+        self.timeline_frame.grid(row=0, column=0, sticky=(tk.N, tk.S, tk.W, tk.E))
+        self.timeline_scrollbar = ttk.Scrollbar(
+            timeline_container, orient="vertical", command=self.on_timeline_scrollbar
+        )
+        timeline_container.columnconfigure(0, weight=1)
+        timeline_container.rowconfigure(0, weight=1)
+        self.bind_class(
+            self.timeline_wheel_tag, "<MouseWheel>", self.on_timeline_mousewheel
+        )
 
         # Configure grid weights for content_frame
         content_frame.columnconfigure(0, weight=1)
@@ -458,6 +507,14 @@ class AnalysisFrame(ttk.Frame):
 
     def destroy(self):
         """Clean up when AnalysisFrame is destroyed."""
+        self.cancel_background_refresh()
+        if self.analysis_worker is not None:
+            self.analysis_worker.stop(timeout=1)
+            self.analysis_worker = None
+        try:
+            self.unbind_class(self.timeline_wheel_tag, "<MouseWheel>")
+        except tk.TclError:
+            pass
         super().destroy()
 
     def create_card(self, parent, index):
@@ -564,9 +621,9 @@ class AnalysisFrame(ttk.Frame):
         self.save_card_ranges()
         self.update_card(card_index)
 
-        # If this is the selected card, update timeline
+        # If this is the selected card, update timeline (in the background)
         if card_index == self.selected_card:
-            self.update_timeline()
+            self.schedule_refresh()
 
     def open_custom_date_dialog(self):
         """
@@ -664,7 +721,7 @@ class AnalysisFrame(ttk.Frame):
         if event and event.widget == self.sphere_filter:
             self.update_project_filter()
 
-        self.refresh_all()
+        self.schedule_refresh()
 
     def get_filtered_spheres(self):
         """
@@ -719,8 +776,8 @@ class AnalysisFrame(ttk.Frame):
         if current_project not in current_values:
             self.project_var.set("All Projects")
 
-        # Refresh the data display
-        self.refresh_all()
+        # Refresh the data display (in the background)
+        self.schedule_refresh()
 
     def refresh_all(self):
         """Refresh all cards and timeline display after filter or data changes.
@@ -729,25 +786,351 @@ class AnalysisFrame(ttk.Frame):
         Updates all three summary cards (Active, Break, Idle) and the complete
         timeline period list.
 
-        Called from filter change events:
-        - on_sphere_filter_changed() - Sphere filter dropdown
-        - on_project_filter_changed() - Project filter dropdown
-        - on_range_changed() - Date range filter
-        - on_status_changed() - Active/All/Archived toggle
+        Runs synchronously on the Tk thread. Called on first display and by
+        callers that need the display current right away; filter changes
+        (sphere/project dropdowns, Active/All/Archived toggle, card range) go
+        through schedule_refresh() instead.
 
         Side effects:
             - Updates all 3 card displays with recalculated totals
             - Refreshes timeline with filtered periods
-            - Resets pagination to first page
+            - Scrolls the timeline back to the first period
             - Updates scrollable area
 
         Note:
-            Always updates cards before timeline to ensure summary
-            stats are available for display.
+            Card totals come from the tracker's daily rollup when it keeps one;
+            otherwise a single query pass answers all three card totals
+            together with the timeline rows (see AnalysisQuery). Timeline rows
+            already in the timeline cache are not queried again.
         """
+        self.cancel_background_refresh()
+        request = self.prepare_refresh()
+        totals, timeline = self.compute_refresh(request)
+        self.apply_refresh(request, totals, timeline)
+
+    def schedule_refresh(self):
+        """Refresh cards and timeline in the background after a short debounce.
+
+        Each call restarts the debounce and cancels a query still running for
+        an earlier filter state, so rapid filter clicks only query once. The
+        query runs on the analysis worker thread; its result is picked up on
+        the Tk thread by _poll_background_refresh().
+        """
+        self.cancel_background_refresh()
+        self._refresh_after_id = self.root.after(
+            ANALYSIS_DEBOUNCE_MS, self._start_background_refresh
+        )
+
+    def cancel_background_refresh(self):
+        """Drop a pending debounced refresh and any query in flight"""
+        for attr in ("_refresh_after_id", "_poll_after_id"):
+            after_id = getattr(self, attr)
+            if after_id is not None:
+                try:
+                    self.root.after_cancel(after_id)
+                except tk.TclError:
+                    pass
+                setattr(self, attr, None)
+        if self.analysis_worker is not None:
+            self.analysis_worker.cancel()
+
+    def _start_background_refresh(self):
+        """Snapshot the filters on the Tk thread and query on the worker"""
+        self._refresh_after_id = None
+        request = self.prepare_refresh()
+        if request["data"] is None:
+            # Everything came from the daily rollup and the timeline cache
+            self.apply_refresh(request, request["totals"], None)
+            return
+
+        if request["period_model"] is not None:
+            # The Tk thread keeps renaming/pruning the shared model
+            request["period_model"] = request["period_model"].snapshot()
+        if self.analysis_worker is None:
+            self.analysis_worker = AnalysisWorker()
+        generation = self.analysis_worker.submit(
+            lambda cancelled: self.compute_refresh(request, cancelled)
+        )
+        self._poll_after_id = self.root.after(
+            ANALYSIS_POLL_MS, self._poll_background_refresh, generation, request
+        )
+
+    def _poll_background_refresh(self, generation, request):
+        """Apply the worker's result once it is ready (runs on the Tk thread)"""
+        self._poll_after_id = None
+        worker = self.analysis_worker
+        if worker is None or worker.is_cancelled(generation):
+            return
+        result = worker.poll()
+        if result is None:
+            self._poll_after_id = self.root.after(
+                ANALYSIS_POLL_MS, self._poll_background_refresh, generation, request
+            )
+            return
+
+        _, value, error = result
+        if error is not None:
+            # Raising here would only reach Tk's callback error handler and
+            # leave the view silently showing the old filter state
+            messagebox.showerror("Error", f"Failed to refresh analysis: {error}")
+            return
+        totals, timeline = value
+        self.apply_refresh(request, totals, timeline)
+
+    def prepare_refresh(self):
+        """Collect everything a refresh needs while on the Tk thread.
+
+        Card totals are taken from the daily rollup and timeline rows from the
+        timeline cache where possible. Filters and active flags are copied so
+        the query can run on another thread.
+
+        Returns:
+            dict: Refresh request for compute_refresh()/apply_refresh(). Its
+            "data" is the session data read view, or None if no query is needed.
+        """
+        date_ranges = [self.get_date_range(name) for name in self.card_ranges]
+        cache_key = self.timeline_cache_key(date_ranges[self.selected_card])
+        result_set = self.timeline_cache.get(cache_key) if cache_key else None
+
+        rollup = self.get_daily_rollup()
+        totals = None
+        if rollup is not None:
+            totals = [
+                self.rollup_totals(rollup, date_range) for date_range in date_ranges
+            ]
+
+        settings = self.tracker.settings
+        request = {
+            "date_ranges": date_ranges,
+            "selected_card": self.selected_card,
+            "filters": (
+                self.sphere_var.get(),
+                self.project_var.get(),
+                self.status_filter.get(),
+            ),
+            "settings": {
+                section: {
+                    name: dict(config)
+                    for name, config in settings.get(section, {}).items()
+                }
+                for section in ("spheres", "projects")
+            },
+            "cache_key": cache_key,
+            "result_set": result_set,
+            "totals": totals,
+            "data": None,
+            "period_model": None,
+            "date_index": None,
+        }
+        if totals is None or result_set is None:
+            queried = (
+                date_ranges if totals is None else [date_ranges[self.selected_card]]
+            )
+            (
+                request["data"],
+                request["period_model"],
+                request["date_index"],
+            ) = self.query_inputs(queried)
+        return request
+
+    @staticmethod
+    def compute_refresh(request, cancelled=None):
+        """Run the query part of a refresh. Touches no widgets (thread-safe).
+
+        Args:
+            request: Dict from prepare_refresh()
+            cancelled: Optional callable; the query stops with QueryCancelled
+                once it returns True
+
+        Returns:
+            tuple: (card totals, timeline rows or None if cached)
+        """
+        totals = request["totals"]
+        if request["data"] is None:
+            return totals, None
+
+        query = AnalysisQuery(
+            request["data"], request["period_model"], request["date_index"]
+        )
+        date_ranges = request["date_ranges"]
+        selected = request["selected_card"]
+        need_timeline = request["result_set"] is None
+        if totals is None:
+            result = query.run(
+                date_ranges,
+                *request["filters"],
+                request["settings"],
+                timeline_index=selected if need_timeline else None,
+                cancelled=cancelled,
+            )
+            return result.totals, result.timeline if need_timeline else None
+
+        result = query.run(
+            [date_ranges[selected]],
+            *request["filters"],
+            request["settings"],
+            timeline_index=0,
+            cancelled=cancelled,
+        )
+        return totals, result.timeline
+
+    def apply_refresh(self, request, totals, timeline):
+        """Show a computed refresh: update the cards and the timeline.
+
+        Args:
+            request: Dict from prepare_refresh()
+            totals: (active_seconds, break_seconds) per card
+            timeline: Timeline rows, or None if the request had them cached
+        """
+        result_set = request["result_set"]
+        if result_set is None:
+            result_set = TimelineResultSet(timeline)
+            if request["cache_key"]:
+                self.timeline_cache.put(request["cache_key"], result_set)
+
         for i in range(3):
-            self.update_card(i)
-        self.update_timeline()
+            self.update_card(i, totals=totals[i])
+        if request["selected_card"] == self.selected_card:
+            self.update_timeline(result_set=result_set)
+        else:
+            # Another card was selected while the query ran
+            self.update_timeline()
+
+    def timeline_cache_key(self, date_range):
+        """Key for the timeline cache, or None if the rows can't be cached.
+
+        Covers the date range, filters, sphere/project active flags, the name
+        table (renames) and the tracker's session data version, so any change
+        to the data or settings is a cache miss.
+        """
+        data_version = getattr(self.tracker, "data_version", None)
+        # Mock trackers in tests have no real data version
+        if not isinstance(data_version, int):
+            return None
+        settings = self.tracker.settings
+        active_flags = tuple(
+            tuple(
+                sorted(
+                    (name, bool(config.get("active", True)))
+                    for name, config in settings.get(section, {}).items()
+                )
+            )
+            for section in ("spheres", "projects")
+        )
+        return (
+            tuple(date_range),
+            self.sphere_var.get(),
+            self.project_var.get(),
+            self.status_filter.get(),
+            active_flags,
+            NameTable(settings).key,
+            data_version,
+        )
+
+    def get_timeline_result_set(self, range_name):
+        """Timeline rows for a card range from the cache, querying on a miss"""
+        date_range = self.get_date_range(range_name)
+        cache_key = self.timeline_cache_key(date_range)
+        result_set = self.timeline_cache.get(cache_key) if cache_key else None
+        if result_set is None:
+            result = self.run_query([date_range], timeline_index=0)
+            result_set = TimelineResultSet(result.timeline)
+            if cache_key:
+                self.timeline_cache.put(cache_key, result_set)
+        return result_set
+
+    def get_daily_rollup(self):
+        """Return the tracker's up-to-date DailyRollup, or None if it has none"""
+        get_rollup = getattr(self.tracker, "get_daily_rollup", None)
+        if not callable(get_rollup):
+            return None
+        rollup = get_rollup()
+        # Mock trackers in tests return Mock objects here
+        return rollup if isinstance(rollup, DailyRollup) else None
+
+    def rollup_totals(self, rollup, date_range):
+        """Card totals for one date range from the daily rollup"""
+        return rollup.totals(
+            date_range,
+            self.sphere_var.get(),
+            self.project_var.get(),
+            self.status_filter.get(),
+            self.tracker.settings,
+        )
+
+    def get_period_model(self):
+        """Return the tracker's shared PeriodModel, or None if it has none"""
+        get_model = getattr(self.tracker, "get_period_model", None)
+        if not callable(get_model):
+            return None
+        model = get_model()
+        # Mock trackers in tests return Mock objects here
+        return model if isinstance(model, PeriodModel) else None
+
+    def get_date_index(self):
+        """Return the tracker's DateIndex of the session data, or None"""
+        get_index = getattr(self.tracker, "get_date_index", None)
+        if not callable(get_index):
+            return None
+        index = get_index()
+        # Mock trackers in tests return Mock objects here
+        return index if isinstance(index, DateIndex) else None
+
+    def uses_sqlite_storage(self):
+        """Whether the tracker stores sessions in SQLite (False for Mock trackers)"""
+        uses_sqlite = getattr(self.tracker, "uses_sqlite_storage", None)
+        return callable(uses_sqlite) and uses_sqlite() is True
+
+    def query_inputs(self, date_ranges):
+        """Session data, PeriodModel and DateIndex for a query over date_ranges.
+
+        With the SQLite backend only the sessions dated within the ranges are
+        read (see TimeTracker.load_sessions_between). Those are fresh dicts the
+        shared PeriodModel has never seen, so they are normalized with a model
+        of their own that resolves the same names.
+
+        Returns:
+            tuple: (session data, PeriodModel or None, DateIndex or None)
+        """
+        if not self.uses_sqlite_storage():
+            return (
+                self.tracker.load_data(read_only=True),
+                self.get_period_model(),
+                self.get_date_index(),
+            )
+        first = min(first_day(start) for start, _ in date_ranges)
+        stop = max(first_day(end) for _, end in date_ranges)
+        last = (date.fromisoformat(stop) - timedelta(days=1)).isoformat()
+        model = self.get_period_model()
+        return (
+            self.tracker.load_sessions_between(first, last),
+            PeriodModel(model.names if model is not None else None),
+            None,
+        )
+
+    def create_query(self, date_ranges):
+        """Load the session data for date_ranges once and wrap it in an
+        AnalysisQuery"""
+        return AnalysisQuery(*self.query_inputs(date_ranges))
+
+    def run_query(self, date_ranges, timeline_index=None):
+        """Run one query pass with the current sphere/project/status filters.
+
+        Args:
+            date_ranges: List of (start_datetime, end_datetime) tuples
+            timeline_index: Index of the range to build timeline rows for
+
+        Returns:
+            AnalysisResult with totals per range and timeline rows
+        """
+        return self.create_query(date_ranges).run(
+            date_ranges,
+            self.sphere_var.get(),
+            self.project_var.get(),
+            self.status_filter.get(),
+            self.tracker.settings,
+            timeline_index=timeline_index,
+        )
 
     def get_date_range(self, range_name):
         """Convert date range string to start/end datetime objects for filtering.
@@ -857,178 +1240,16 @@ class AnalysisFrame(ttk.Frame):
         Note:
             - Idle periods with end timestamps are counted as break time
             - Applies current sphere_filter and project_filter selections
-            - For multi-project periods, checks if any project matches the filter
+            - For multi-project periods, counts the filtered project's allocated
+              duration
+            - Break/idle time only counts for sessions with a matching active period
+            - Answered from the tracker's daily rollup (O(days)) when available
         """
-        start_date, end_date = self.get_date_range(range_name)
-        all_data = self.tracker.load_data()
-
-        total_active = 0
-        total_break = 0
-
-        sphere_filter = self.sphere_var.get()
-        project_filter = self.project_var.get()
-        status_filter = self.status_filter.get()  # active / all / archived radio button
-
-        for _, session_data in all_data.items():
-            # Check if session is in date range
-            session_date = datetime.strptime(
-                session_data.get("date", "2000-01-01"), "%Y-%m-%d"
-            )
-            if not (start_date <= session_date < end_date):
-                continue
-
-            # Check sphere filter
-            session_sphere = session_data.get("sphere", "")
-            if sphere_filter != "All Spheres" and session_sphere != sphere_filter:
-                continue
-
-            # Get sphere active status — used by status_filter checks below
-            sphere_active = (
-                self.tracker.settings.get("spheres", {})
-                .get(session_sphere, {})
-                .get("active", True)
-            )
-
-            # Determine whether any active period in this session matches the project filter.
-            # Break/idle totals are session-contextual: only counted when the session has at
-            # least one active period matching the current project filter.
-            # If the session has NO active periods, break/idle are counted regardless.
-            active_periods = session_data.get("active", [])
-            if project_filter == "All Projects" or not active_periods:
-                session_has_matching_project = True
-            else:
-                session_has_matching_project = any(
-                    period.get("project") == project_filter
-                    or any(
-                        p.get("name") == project_filter
-                        for p in period.get("projects", [])
-                    )
-                    for period in active_periods
-                )
-
-            # Calculate active time
-            for period in session_data.get("active", []):
-                if project_filter == "All Projects":
-                    # Determine primary project for status filtering
-                    primary_project = period.get("project", "")
-                    if not primary_project:
-                        for project_item in period.get("projects", []):
-                            if project_item.get("project_primary", True):
-                                primary_project = project_item.get("name", "")
-                                break
-                    project_active = (
-                        self.tracker.settings.get("projects", {})
-                        .get(primary_project, {})
-                        .get("active", True)
-                    )
-                    if status_filter == "active" and not (
-                        sphere_active and project_active
-                    ):
-                        continue  # skip inactive combinations
-                    elif status_filter == "archived" and (
-                        sphere_active and project_active
-                    ):
-                        continue  # skip fully active combinations
-                    total_active += period.get("duration", 0)
-                    continue
-
-                period_projects = period.get("projects", [])
-                if period_projects:
-                    # Multi-project period: "projects" array holds each project's
-                    # allocated duration — always use it for all projects.
-                    for project_dict in period_projects:
-                        if project_dict.get("name") == project_filter:
-                            project_active = (
-                                self.tracker.settings.get("projects", {})
-                                .get(project_filter, {})
-                                .get("active", True)
-                            )
-                            if status_filter == "active" and not (
-                                sphere_active and project_active
-                            ):
-                                break  # skip — inactive combination
-                            if status_filter == "archived" and (
-                                sphere_active and project_active
-                            ):
-                                break  # skip — fully active combination
-                            total_active += project_dict.get("duration", 0)
-                            break
-                else:
-                    if period.get("project", "") == project_filter:
-                        # Single-project period: no allocation split, full duration.
-                        project_active = (
-                            self.tracker.settings.get("projects", {})
-                            .get(project_filter, {})
-                            .get("active", True)
-                        )
-                        if status_filter == "active" and not (
-                            sphere_active and project_active
-                        ):
-                            continue  # skip — inactive combination
-                        elif status_filter == "archived" and (
-                            sphere_active and project_active
-                        ):
-                            continue  # skip — fully active combination
-                        total_active += period.get("duration", 0)
-
-            # Calculate break time (only for sessions with at least one matching active period)
-            # Break actions have no project-level active status, but when a specific project
-            # is selected we use that project's active flag alongside sphere_active to decide
-            # whether this session counts as active or archived for break filtering.
-            if session_has_matching_project:
-                if project_filter != "All Projects":
-                    break_project_active = (
-                        self.tracker.settings.get("projects", {})
-                        .get(project_filter, {})
-                        .get("active", True)
-                    )
-                    session_considered_active = sphere_active and break_project_active
-                else:
-                    # For "All Projects", a session is "active" only if it has at
-                    # least one active period where sphere AND project are both active.
-                    # If every active period belongs to an inactive project the session
-                    # is "archived" and its breaks must not count in the active filter.
-                    # Exception: sessions with NO active periods (pure break/idle sessions)
-                    # are treated as active when their sphere is active — there is no
-                    # project to be inactive.
-                    active_periods_list = session_data.get("active", [])
-                    if not active_periods_list:
-                        session_considered_active = sphere_active
-                    else:
-                        session_considered_active = False
-                        for active_period in active_periods_list:
-                            primary_project = active_period.get("project", "")
-                            if not primary_project:
-                                for project_item in active_period.get("projects", []):
-                                    if project_item.get("project_primary", True):
-                                        primary_project = project_item.get("name", "")
-                                        break
-                            proj_active = (
-                                self.tracker.settings.get("projects", {})
-                                .get(primary_project, {})
-                                .get("active", True)
-                            )
-                            if sphere_active and proj_active:
-                                session_considered_active = True
-                                break
-
-                for period in session_data.get("breaks", []):
-                    if status_filter == "active" and not session_considered_active:
-                        continue  # skip breaks in inactive sessions
-                    elif status_filter == "archived" and session_considered_active:
-                        continue  # skip breaks in fully active sessions
-                    total_break += period.get("duration", 0)
-
-                # Calculate idle time (only for sessions with at least one matching active period)
-                for period in session_data.get("idle_periods", []):
-                    if period.get("end_timestamp"):
-                        if status_filter == "active" and not session_considered_active:
-                            continue
-                        elif status_filter == "archived" and session_considered_active:
-                            continue
-                        total_break += period.get("duration", 0)
-
-        return total_active, total_break
+        date_range = self.get_date_range(range_name)
+        rollup = self.get_daily_rollup()
+        if rollup is not None:
+            return self.rollup_totals(rollup, date_range)
+        return self.run_query([date_range]).totals[0]
 
     def format_duration(self, seconds):
         """Format duration in seconds to human-readable string with intelligent rounding.
@@ -1094,12 +1315,20 @@ class AnalysisFrame(ttk.Frame):
         except:
             return time_str
 
-    def update_card(self, card_index):
-        """Update a single card's data"""
+    def update_card(self, card_index, totals=None):
+        """Update a single card's data.
+
+        Args:
+            card_index: Index of the card (0-2)
+            totals: Precomputed (active_seconds, break_seconds), or None to
+                calculate them for the card's range
+        """
         card = self.cards[card_index]
         range_name = self.card_ranges[card_index]
 
-        active_time, break_time = self.calculate_totals(range_name)
+        if totals is None:
+            totals = self.calculate_totals(range_name)
+        active_time, break_time = totals
 
         card.active_label.config(text=f"Active: {self.format_duration(active_time)}")
         card.break_label.config(text=f"Break: {self.format_duration(break_time)}")
@@ -1121,361 +1350,69 @@ class AnalysisFrame(ttk.Frame):
         - session_active_comments: Session-level active comments
         - session_break_idle_comments: Session-level break/idle comments
         - session_notes: Session-level notes
+
+        Rows are sorted by date and start time.
         """
-        start_date, end_date = self.get_date_range(range_name)
-        all_data = self.tracker.load_data()
-
-        sphere_filter = self.sphere_var.get()
-        project_filter = self.project_var.get()
-        status_filter = (
-            self.status_filter.get()
-        )  # Get the radio button filter (active/all/archived)
-
-        # Collect all periods
-        timeline_data = []
-
-        for _, session_data in all_data.items():
-            # Check if session is in date range
-            session_date = datetime.strptime(
-                session_data.get("date", "2000-01-01"), "%Y-%m-%d"
-            )
-            if not (start_date <= session_date < end_date):
-                continue
+        return list(self.get_timeline_result_set(range_name).rows)
 
-            # Check sphere filter
-            session_sphere = session_data.get("sphere", "")
-            if sphere_filter != "All Spheres" and session_sphere != sphere_filter:
-                continue
+    def _create_timeline_row(self):
+        """Create one pooled timeline row with a widget per column.
 
-            # Get sphere active status for this session (used by all period types)
-            sphere_name = session_data.get("sphere", "")
-            sphere_active = (
-                self.tracker.settings.get("spheres", {})
-                .get(sphere_name, {})
-                .get("active", True)
-            )
+        Rows are created once and re-filled by _fill_timeline_row() while
+        scrolling, so the widget count stays constant however many periods the
+        timeline holds.
 
-            # Get session-level comments
-            session_comments_dict = session_data.get("session_comments", {})
-            session_active_comments = session_comments_dict.get("active_notes", "")
-            break_notes = session_comments_dict.get("break_notes", "")
-            idle_notes = session_comments_dict.get("idle_notes", "")
-            session_notes = session_comments_dict.get("session_notes", "")
-
-            # Determine whether any active period in this session matches the project filter.
-            # Break/idle periods are session-contextual: they are only shown when the session
-            # contains at least one active period that matches the current project filter.
-            # If the session has NO active periods, break/idle are shown regardless (no project
-            # to filter by — e.g. a session that consists only of breaks or idle time).
-            active_periods = session_data.get("active", [])
-            if project_filter == "All Projects" or not active_periods:
-                session_has_matching_project = True
-            else:
-                session_has_matching_project = any(
-                    period.get("project") == project_filter
-                    or any(
-                        p.get("name") == project_filter
-                        for p in period.get("projects", [])
-                    )
-                    for period in active_periods
-                )
+        Returns:
+            tk.Frame: Row frame with its column widgets in row_frame.cells
+        """
+        row_frame = tk.Frame(self.timeline_frame)
+        row_frame.grid(
+            row=len(self.timeline_rows), column=0, sticky=(tk.W, tk.E), pady=1
+        )
+        row_frame.cells = []
 
-            # Determine if the session is "considered active" for break/idle filtering.
-            # A session is active only if it has at least one active period where both
-            # sphere AND project are active. Used to gate break/idle rows in the timeline.
-            if project_filter != "All Projects":
-                break_proj_active = (
-                    self.tracker.settings.get("projects", {})
-                    .get(project_filter, {})
-                    .get("active", True)
+        for column_index, (width, use_text_widget, expand) in enumerate(
+            TIMELINE_COLUMNS
+        ):
+            row_frame.columnconfigure(column_index, weight=1 if expand else 0)
+            if use_text_widget:
+                # Text widget for word wrapping; height is set from the
+                # wrapped line count after filling (see _render_timeline_window)
+                cell = tk.Text(
+                    row_frame,
+                    width=width,
+                    height=1,
+                    wrap=tk.WORD,
+                    font=FONT_EXTRA_SMALL,
+                    relief=tk.FLAT,
+                    cursor="arrow",  # Read-only, so no text cursor
                 )
-                session_considered_active = sphere_active and break_proj_active
             else:
-                # Sessions with NO active periods (pure break/idle) are treated as
-                # active when their sphere is active — no project to be inactive.
-                if not active_periods:
-                    session_considered_active = sphere_active
-                else:
-                    session_considered_active = False
-                    for period in active_periods:
-                        primary_project = period.get("project", "")
-                        if not primary_project:
-                            for project_item in period.get("projects", []):
-                                if project_item.get("project_primary", True):
-                                    primary_project = project_item.get("name", "")
-                                    break
-                        proj_active = (
-                            self.tracker.settings.get("projects", {})
-                            .get(primary_project, {})
-                            .get("active", True)
-                        )
-                        if sphere_active and proj_active:
-                            session_considered_active = True
-                            break
-
-            # Add active periods
-            for period in session_data.get("active", []):
-                # Determine primary and secondary projects
-                primary_project = ""
-                primary_comment = ""
-                secondary_project = ""
-                secondary_comment = ""
-
-                if period.get("project"):
-                    # Single project case
-                    primary_project = period.get("project", "")
-                    primary_comment = period.get("comment", "")
-                else:
-                    # Multiple projects case
-                    for project_item in period.get("projects", []):
-                        if project_item.get("project_primary", True):
-                            primary_project = project_item.get("name", "")
-                            primary_comment = project_item.get("comment", "")
-                        else:
-                            secondary_project = project_item.get("name", "")
-                            secondary_comment = project_item.get("comment", "")
-
-                # Check project filter
-                if project_filter != "All Projects":
-                    if (
-                        primary_project != project_filter
-                        and secondary_project != project_filter
-                    ):
-                        continue
-
-                # Get project active status
-                project_active = (
-                    self.tracker.settings.get("projects", {})
-                    .get(primary_project, {})
-                    .get("active", True)
-                )
-
-                # Apply status filter (Active/All/Archived radio button)
-                # Active: Show only if BOTH sphere AND project are active
-                # All: Show everything (no filtering)
-                # Archived: Show if EITHER sphere OR project is inactive (but not both active)
-                if status_filter == "active":
-                    if not (sphere_active and project_active):
-                        continue  # Skip inactive combinations
-                elif status_filter == "archived":
-                    if sphere_active and project_active:
-                        continue  # Skip fully active combinations
-                # For "all", don't skip anything
-
-                timeline_data.append(
-                    {
-                        "date": session_data.get("date"),
-                        "period_start": period.get("start", ""),
-                        "duration": period.get("duration", 0),
-                        "sphere": sphere_name,
-                        "sphere_active": sphere_active,
-                        "project": primary_project,
-                        "project_active": project_active,
-                        "type": "Active",
-                        "primary_project": primary_project,
-                        "primary_comment": primary_comment,
-                        "secondary_project": secondary_project,
-                        "secondary_comment": secondary_comment,
-                        "session_active_comments": session_active_comments,
-                        "session_break_idle_comments": "",  # Don't show break/idle comments on active periods
-                        "session_notes": session_notes,
-                    }
-                )
-
-            # Add break periods
-            for period in session_data.get("breaks", []):
-                # Skip break periods if no active period in this session matches the project filter
-                if not session_has_matching_project:
-                    continue
-
-                # Determine primary and secondary actions
-                primary_action = ""
-                primary_comment = ""
-                secondary_action = ""
-                secondary_comment = ""
-
-                if period.get("action"):
-                    # Single action case
-                    primary_action = period.get("action", "")
-                    primary_comment = period.get("comment", "")
-                else:
-                    # Multiple actions case
-                    for action_item in period.get("actions", []):
-                        if action_item.get("break_primary", True):
-                            primary_action = action_item.get("name", "")
-                            primary_comment = action_item.get("comment", "")
-                        else:
-                            secondary_action = action_item.get("name", "")
-                            secondary_comment = action_item.get("comment", "")
-
-                # Apply status filter for break periods using session_considered_active.
-                # A session is "active" only if sphere AND at least one project are active.
-                if status_filter == "active" and not session_considered_active:
-                    continue  # Skip breaks in archived/inactive sessions
-                elif status_filter == "archived" and session_considered_active:
-                    continue  # Skip breaks in fully active sessions
-                # For "all", don't skip anything
-
-                timeline_data.append(
-                    {
-                        "date": session_data.get("date"),
-                        "period_start": period.get("start", ""),
-                        "duration": period.get("duration", 0),
-                        "sphere": sphere_name,
-                        "sphere_active": sphere_active,
-                        "project": primary_action,
-                        "project_active": True,  # Break actions don't have active status
-                        "type": "Break",
-                        "primary_project": primary_action,
-                        "primary_comment": primary_comment,
-                        "secondary_project": secondary_action,
-                        "secondary_comment": secondary_comment,
-                        "session_active_comments": "",  # Don't show active comments on break periods
-                        "session_break_idle_comments": break_notes,  # Show break notes on break periods
-                        "session_notes": session_notes,
-                    }
+                cell = tk.Label(
+                    row_frame,
+                    width=width,
+                    anchor="w",
+                    padx=3,
+                    font=FONT_EXTRA_SMALL,
+                    justify="left",
                 )
+            cell.grid(
+                row=0, column=column_index, sticky=(tk.W, tk.E) if expand else tk.W
+            )
+            # Mousewheel over any cell scrolls the timeline (one class binding)
+            cell.bindtags((self.timeline_wheel_tag,) + cell.bindtags())
+            row_frame.cells.append(cell)
 
-            # Add idle periods
-            for period in session_data.get("idle_periods", []):
-                # Skip idle periods if no active period in this session matches the project filter
-                if not session_has_matching_project:
-                    continue
-
-                if period.get("end_timestamp"):
-                    # Determine primary and secondary actions
-                    primary_action = ""
-                    primary_comment = ""
-                    secondary_action = ""
-                    secondary_comment = ""
-
-                    if period.get("action"):
-                        # Single action case
-                        primary_action = period.get("action", "")
-                        primary_comment = period.get("comment", "")
-                    else:
-                        # Multiple actions case
-                        for action_item in period.get("actions", []):
-                            if action_item.get("idle_primary", True):
-                                primary_action = action_item.get("name", "")
-                                primary_comment = action_item.get("comment", "")
-                            else:
-                                secondary_action = action_item.get("name", "")
-                                secondary_comment = action_item.get("comment", "")
-
-                    # Apply status filter for idle periods using session_considered_active.
-                    if status_filter == "active" and not session_considered_active:
-                        continue  # Skip idle in archived/inactive sessions
-                    elif status_filter == "archived" and session_considered_active:
-                        continue  # Skip idle in fully active sessions
-                    # For "all", don't skip anything
-
-                    timeline_data.append(
-                        {
-                            "date": session_data.get("date"),
-                            "period_start": period.get("start", ""),
-                            "duration": period.get("duration", 0),
-                            "sphere": sphere_name,
-                            "sphere_active": sphere_active,
-                            "project": primary_action,
-                            "project_active": True,  # Idle actions don't have active status
-                            "type": "Idle",
-                            "primary_project": primary_action,
-                            "primary_comment": primary_comment,
-                            "secondary_project": secondary_action,
-                            "secondary_comment": secondary_comment,
-                            "session_active_comments": "",  # Don't show active comments on idle periods
-                            "session_break_idle_comments": idle_notes,  # Show idle notes on idle periods
-                            "session_notes": session_notes,
-                        }
-                    )
-
-        # Sort by date and start time
-        timeline_data.sort(key=lambda x: (x["date"], x["period_start"]))
-
-        return timeline_data
-
-    def load_more_periods(self):
-        """Load the next batch of timeline periods using pagination.
-
-        Implements incremental loading to prevent UI lag with large datasets.
-        Loads 50 periods at a time from timeline_data_all (set by update_timeline).
-
-        Batch calculation:
-        - start_idx = periods_loaded (tracks how many shown so far)
-        - end_idx = min(start_idx + 50, total_periods)
-        - Renders periods[start_idx:end_idx]
-
-        After rendering batch:
-        - If more periods exist: Shows "Load X More (Y of Z shown)" button
-        - If all loaded and >50 total: Shows "All X periods loaded" message
-        - If ≤50 total: No message (all fit on first page)
-
-        Side effects:
-            - Destroys existing load_more_button if present
-            - Calls _render_timeline_period() for each period in batch
-            - Increments self.periods_loaded by batch size
-            - Creates new load_more_button if more periods remain
-            - Adds "all loaded" message if this was the final batch
-
-        Called by:
-            - update_timeline() for first page load
-            - Load More button click for subsequent pages
-
-        Note:
-            Uses self.periods_per_page = 50 as batch size. This balance was
-            chosen to minimize initial load time while showing meaningful data.
-        """
-        # Remove Load More button if it exists
-        if self.load_more_button:
-            self.load_more_button.destroy()
-            self.load_more_button = None
-
-        # Calculate range for this batch
-        start_idx = self.periods_loaded
-        end_idx = min(start_idx + self.periods_per_page, len(self.timeline_data_all))
-
-        # Get periods for this batch
-        periods_to_render = self.timeline_data_all[start_idx:end_idx]
-
-        # Render this batch of periods
-        for period_index, period in enumerate(periods_to_render, start=start_idx):
-            self._render_timeline_period(period, period_index)
-
-        # Update loaded count
-        self.periods_loaded = end_idx
-
-        # Add Load More button if there are more periods to load
-        if self.periods_loaded < len(self.timeline_data_all):
-            remaining = len(self.timeline_data_all) - self.periods_loaded
-            next_batch = min(self.periods_per_page, remaining)
-
-            button_frame = ttk.Frame(self.timeline_frame)
-            button_frame.grid(row=self.periods_loaded, column=0, pady=10)
+        row_frame.bindtags((self.timeline_wheel_tag,) + row_frame.bindtags())
+        self.timeline_rows.append(row_frame)
+        return row_frame
 
-            button_text = f"Load {next_batch} More ({self.periods_loaded} of {len(self.timeline_data_all)} shown)"
-            self.load_more_button = ttk.Button(
-                button_frame, text=button_text, command=self.load_more_periods
-            )
-            self.load_more_button.pack()
-        else:
-            # All periods loaded
-            if len(self.timeline_data_all) > self.periods_per_page:
-                # Only show "all loaded" message if we had multiple pages
-                label_frame = ttk.Frame(self.timeline_frame)
-                label_frame.grid(row=self.periods_loaded, column=0, pady=10)
-                ttk.Label(
-                    label_frame,
-                    text=f"All {len(self.timeline_data_all)} periods loaded",
-                    font=FONT_NORMAL_ITALIC,
-                ).pack()
-
-    def _render_timeline_period(self, period, row_index):
-        """Render a single period row in the timeline
+    def _fill_timeline_row(self, row_frame, period):
+        """Show a period in a pooled row
 
         Args:
+            row_frame: Row created by _create_timeline_row()
             period: Period dict with timeline data
-            row_index: Row index for grid placement
         """
         # Color code based on type
         if period["type"] == "Active":
@@ -1483,118 +1420,132 @@ class AnalysisFrame(ttk.Frame):
         else:  # Break or Idle
             bg_color = COLOR_BREAK_LIGHT_ORANGE
 
-        row_frame = tk.Frame(self.timeline_frame, bg=bg_color)
-        row_frame.grid(row=row_index, column=0, sticky=(tk.W, tk.E), pady=1)
-
-        # NOTE: Removed individual mousewheel binding on row_frame
-        # ScrollableFrame's bind_all handler will handle scrolling automatically
-        # Adding bindings here was causing the handler to stop working after
-        # multiple update_timeline() calls
+        values = (
+            period["date"],
+            self.format_time_12hr(period["period_start"]),
+            self.format_duration(period["duration"]),
+            period.get("sphere", ""),
+            "✓" if period.get("sphere_active", True) else "",
+            "✓" if period.get("project_active", True) else "",
+            period["type"],
+            period["primary_project"],
+            period["primary_comment"],
+            period["secondary_project"],
+            period["secondary_comment"],
+            period["session_active_comments"],
+            period["session_break_idle_comments"],
+            period["session_notes"],
+        )
 
-        # Configure row_frame columns for grid layout
-        for column_index in range(14):  # 14 columns total
-            if column_index == 13:  # Session Notes (last column) expands
-                row_frame.columnconfigure(column_index, weight=1)
+        row_frame.config(bg=bg_color)
+        for cell, value in zip(row_frame.cells, values):
+            if isinstance(cell, tk.Text):
+                cell.config(state=tk.NORMAL, bg=bg_color)
+                cell.delete("1.0", tk.END)
+                cell.insert("1.0", value)
+                cell.config(state=tk.DISABLED)
             else:
-                row_frame.columnconfigure(column_index, weight=0)
+                cell.config(text=value, bg=bg_color)
 
-        # Create label helper function
-        col_idx = 0  # Track current column index
+    def _render_timeline_window(self):
+        """Fill the row pool with the periods from timeline_first_row onwards.
 
-        def add_column(text, width, wraplength=0, expand=False, use_text_widget=False):
-            """Add a column to the timeline row using Label or Text widget
-
-            Args:
-                text: Text to display
-                width: Width in characters
-                wraplength: Pixel width for text wrapping (0 = no wrap) - only for Label
-                expand: Whether to expand to fill remaining space
-                use_text_widget: Use Text widget instead of Label (for better wrapping)
-            """
-            nonlocal col_idx
+        Grows or shrinks the pool to min(TIMELINE_VISIBLE_ROWS, periods), then
+        sizes the comment cells to their wrapped line count after a single
+        layout pass for the whole window.
+        """
+        total = len(self.timeline_data_all)
+        pool_size = min(TIMELINE_VISIBLE_ROWS, total)
+        while len(self.timeline_rows) > pool_size:
+            self.timeline_rows.pop().destroy()
+        while len(self.timeline_rows) < pool_size:
+            self._create_timeline_row()
+
+        self.timeline_first_row = max(
+            0, min(self.timeline_first_row, total - pool_size)
+        )
+        visible = self.timeline_data_all[
+            self.timeline_first_row : self.timeline_first_row + pool_size
+        ]
+        for row_frame, period in zip(self.timeline_rows, visible):
+            self._fill_timeline_row(row_frame, period)
+
+        if self.timeline_rows:
+            # One layout pass so the Text widgets know their wrap width
+            self.timeline_frame.update_idletasks()
+            for row_frame in self.timeline_rows:
+                for cell in row_frame.cells:
+                    if isinstance(cell, tk.Text):
+                        display_lines = cell.count("1.0", "end", "displaylines")
+                        if isinstance(display_lines, tuple):
+                            display_lines = display_lines[0]
+                        lines = display_lines or 1
+                        cell.config(
+                            height=min(TIMELINE_COMMENT_MAX_LINES, max(1, lines))
+                        )
 
-            if use_text_widget:
-                # Use Text widget for better text wrapping with TRUE dynamic height
-                txt = tk.Text(
-                    row_frame,
-                    width=width,
-                    height=1,  # Temporary height - will be updated after measuring wrapped content
-                    wrap=tk.WORD,
-                    bg=bg_color,
-                    font=FONT_EXTRA_SMALL,
-                    relief=tk.FLAT,
-                    state=tk.NORMAL,
-                    cursor="arrow",  # Use arrow cursor instead of text cursor for read-only widget
+        if self.timeline_scrollbar is not None:
+            if total > pool_size:
+                self.timeline_scrollbar.grid(row=0, column=1, sticky=(tk.N, tk.S))
+                self.timeline_scrollbar.set(
+                    self.timeline_first_row / total,
+                    (self.timeline_first_row + pool_size) / total,
                 )
-                txt.insert("1.0", text)
-
-                # Grid the widget FIRST so it knows its actual width for wrapping
-                if expand:
-                    txt.grid(row=0, column=col_idx, sticky=(tk.W, tk.E))
-                else:
-                    txt.grid(row=0, column=col_idx, sticky=tk.W)
-
-                # Update to force wrap calculation
-                txt.update_idletasks()
-
-                # TRUE dynamic height: Use count("displaylines") to get ACTUAL wrapped line count
-                # (not an estimation formula - this is exact!)
-                display_lines_tuple = txt.count("1.0", "end", "displaylines")
-                actual_lines = display_lines_tuple[0] if display_lines_tuple else 1
+            else:
+                self.timeline_scrollbar.grid_remove()
 
-                # Set height to exact wrapped line count (cap at 15 for extremely long text)
-                txt.config(height=min(15, max(1, actual_lines)))
+    def scroll_timeline_to(self, first_row):
+        """Scroll the timeline so first_row is the top visible period.
 
-                txt.config(state=tk.DISABLED)  # Make read-only
+        Args:
+            first_row: Index into timeline_data_all (clamped to the valid range)
 
-                # NOTE: ScrollableFrame's bind_all handles mousewheel - no widget-specific binding needed
-                col_idx += 1
-            else:
-                lbl = tk.Label(
-                    row_frame,
-                    text=text,
-                    width=width,
-                    anchor="w",
-                    padx=3,
-                    bg=bg_color,
-                    font=FONT_EXTRA_SMALL,
-                    wraplength=wraplength,
-                    justify="left",
-                )
-                if expand:
-                    lbl.grid(row=0, column=col_idx, sticky=(tk.W, tk.E))
-                else:
-                    lbl.grid(row=0, column=col_idx, sticky=tk.W)
-                # NOTE: Removed mousewheel binding - ScrollableFrame handles it
-                col_idx += 1
+        Returns:
+            bool: True if the visible window moved
+        """
+        max_first = max(0, len(self.timeline_data_all) - len(self.timeline_rows))
+        first_row = max(0, min(int(first_row), max_first))
+        if first_row == self.timeline_first_row:
+            return False
+        self.timeline_first_row = first_row
+        self._render_timeline_window()
+        return True
+
+    def on_timeline_scrollbar(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, units/pages)"""
+        total = len(self.timeline_data_all)
+        if not total:
+            return
+        if args[0] == "moveto":
+            self.scroll_timeline_to(round(float(args[1]) * total))
+        elif args[0] == "scroll":
+            step = len(self.timeline_rows) if args[2] == "pages" else 1
+            self.scroll_timeline_to(self.timeline_first_row + int(args[1]) * step)
+
+    def on_timeline_mousewheel(self, event):
+        """Scroll the timeline rows; at either end let the page scroll instead"""
+        if not event.delta:
+            return None
+        notches = int(-1 * (event.delta / MOUSEWHEEL_DELTA_DIVISOR))
+        if notches == 0:
+            # Touchpads send deltas smaller than one notch
+            notches = -1 if event.delta > 0 else 1
+        if self.scroll_timeline_to(
+            self.timeline_first_row + notches * TIMELINE_WHEEL_ROWS
+        ):
+            return "break"
+        return None
 
-        # Render all columns with proper widths using grid layout
-        add_column(period["date"], 10)
-        add_column(self.format_time_12hr(period["period_start"]), 9)
-        add_column(self.format_duration(period["duration"]), 8)
-        add_column(period.get("sphere", ""), 12)
-        add_column("✓" if period.get("sphere_active", True) else "", 5)
-        add_column("✓" if period.get("project_active", True) else "", 5)
-        add_column(period["type"], 7)
-        add_column(period["primary_project"], 15)
-        add_column(period["primary_comment"], 21, use_text_widget=True)
-        add_column(period["secondary_project"], 15)
-        add_column(period["secondary_comment"], 21, use_text_widget=True)
-        add_column(period["session_active_comments"], 21, use_text_widget=True)
-        add_column(period["session_break_idle_comments"], 21, use_text_widget=True)
-        add_column(period["session_notes"], 21, use_text_widget=True, expand=True)
-
-    def update_timeline(self):
-        """Refresh the entire timeline display with pagination and sorting.
+    def update_timeline(self, periods=None, result_set=None):
+        """Refresh the entire timeline display with sorting.
 
         Main orchestrator for timeline updates. This method:
-        1. Clears existing timeline widgets (preserves frame for ScrollableFrame)
-        2. Gets all timeline data for selected date range using get_timeline_data()
-        3. Sorts periods by current sort column and direction
-        4. Resets pagination to first page (50 periods)
-        5. Loads first batch via load_more_periods()
-        6. Updates frozen timeline header
-        7. Forces canvas scrollregion recalculation and resets scroll position
+        1. Gets all timeline data for selected date range using get_timeline_data()
+        2. Sorts periods by current sort column and direction
+        3. Scrolls the virtualized timeline back to the first period and
+           re-fills the row pool via _render_timeline_window()
+        4. Updates frozen timeline header
+        5. Forces canvas scrollregion recalculation and resets scroll position
 
         Called by:
         - Filter changes (sphere, project, status, date range)
@@ -1603,60 +1554,49 @@ class AnalysisFrame(ttk.Frame):
         - Initial timeline creation
 
         Side effects:
-            - Destroys all child widgets in timeline_frame
             - Stores full sorted dataset in self.timeline_data_all
-            - Resets self.periods_loaded to 0
-            - Calls load_more_periods() to render first 50 rows
+            - Resets self.timeline_first_row to 0
+            - Re-fills at most TIMELINE_VISIBLE_ROWS pooled rows (no widgets
+              are created for the remaining periods)
             - Updates timeline header with sort indicators
             - Reconfigures canvas scrollregion based on content
             - Resets scroll position to top (yview_moveto(0))
 
-        CRITICAL: This method clears children, not the frame itself, to avoid
-        breaking ScrollableFrame's canvas reference. After clearing, forces
+        Args:
+            periods: Timeline rows already computed, or None to take them from
+                the timeline cache / query them for the selected card's range
+            result_set: TimelineResultSet to show (takes precedence over periods)
+
+        CRITICAL: Rows live inside timeline_frame, which is never destroyed, to
+        avoid breaking ScrollableFrame's canvas reference. Afterwards forces
         geometry updates and scrollregion recalculation for proper rendering.
         """
         if not hasattr(self, "timeline_frame") or self.timeline_frame is None:
             return
 
-        # CRITICAL FIX: Clear children instead of destroying the frame itself
-        # Destroying the frame was breaking the ScrollableFrame's canvas
-        for widget in self.timeline_frame.winfo_children():
-            widget.destroy()
-
         # Configure timeline_frame column to expand
         self.timeline_frame.columnconfigure(0, weight=1)
 
-        # Get ALL data using new get_timeline_data method
-        range_name = self.card_ranges[self.selected_card]
-        periods = self.get_timeline_data(range_name)
+        # Get ALL rows - cached result sets skip the query entirely
+        if result_set is None:
+            if periods is None:
+                range_name = self.card_ranges[self.selected_card]
+                result_set = self.get_timeline_result_set(range_name)
+            else:
+                result_set = TimelineResultSet(periods)
+        self.timeline_result_set = result_set
 
         # Sort by date and start time (or by selected column)
         if not hasattr(self, "timeline_sort_column"):
             self.timeline_sort_column = "date"
             self.timeline_sort_reverse = True
 
-        # Sort by current column
-        sort_key_map = {
-            "date": lambda x: (x["date"], x["period_start"]),
-            "type": lambda x: x["type"],
-            "primary_project": lambda x: x["primary_project"],
-            "secondary_project": lambda x: x["secondary_project"],
-            "start": lambda x: x["period_start"],
-            "duration": lambda x: x["duration"],
-        }
-        periods.sort(
-            key=sort_key_map.get(self.timeline_sort_column, sort_key_map["date"]),
-            reverse=self.timeline_sort_reverse,
+        # Orderings are computed once per column/direction and reused
+        self.timeline_data_all = result_set.sorted(
+            self.timeline_sort_column, self.timeline_sort_reverse
         )
-
-        # Store full sorted dataset
-        self.timeline_data_all = periods
-
-        # Reset pagination - show only first 50 periods
-        self.periods_loaded = 0
-
-        # Load first page (50 periods)
-        self.load_more_periods()
+        self.timeline_first_row = 0
+        self._render_timeline_window()
 
         # Update frozen header
         self.update_timeline_header()
@@ -1678,13 +1618,17 @@ class AnalysisFrame(ttk.Frame):
             self.scrollable_container.canvas.yview_moveto(0)
 
     def sort_timeline(self, column):
-        """Sort timeline by column"""
+        """Sort timeline by column.
+
+        Reorders the rows already shown - the session data is not re-read or
+        re-filtered.
+        """
         if self.timeline_sort_column == column:
             self.timeline_sort_reverse = not self.timeline_sort_reverse
         else:
             self.timeline_sort_column = column
             self.timeline_sort_reverse = False
-        self.update_timeline()
+        self.update_timeline(result_set=self.timeline_result_set)
 
     def update_timeline_header(self):
         """Update the frozen timeline header with current sort indicators"""
@@ -1841,285 +1785,24 @@ class AnalysisFrame(ttk.Frame):
     def export_to_csv(self):
         """Export timeline data to CSV.
 
-        Note: This method is intentionally longer than typical (280 lines)
-        due to sequential processing of three period types (active, break, idle)
-        with similar but not identical logic. The linear structure maintains
-        clarity for the export workflow.
+        Rows come from the shared AnalysisQuery (see iter_export_rows() for the
+        export-specific filter rules) and are streamed to the file with a
+        progress dialog that can cancel the export.
         """
         # Get data for selected card's range
         range_name = self.card_ranges[self.selected_card]
-        start_date, end_date = self.get_date_range(range_name)
-        all_data = self.tracker.load_data()
-
-        sphere_filter = self.sphere_var.get()
-        project_filter = self.project_var.get()
-        status_filter = (
-            self.status_filter.get()
-        )  # Get the radio button filter (active/all/archived)
-
-        # Collect all periods
-        periods = []
-
-        for _, session_data in all_data.items():
-            session_date = datetime.strptime(
-                session_data.get("date", "2000-01-01"), "%Y-%m-%d"
-            )
-            if not (start_date <= session_date < end_date):
-                continue
-
-            session_sphere = session_data.get("sphere", "")
-            if sphere_filter != "All Spheres" and session_sphere != sphere_filter:
-                continue
-
-            # Get sphere active status for filtering
-            sphere_active = (
-                self.tracker.settings.get("spheres", {})
-                .get(session_sphere, {})
-                .get("active", True)
-            )
-
-            for period in session_data.get("active", []):
-                # Get project name - handle both single project and projects array
-                project_name = period.get("project", "")
-                if not project_name and period.get("projects"):
-                    # If using projects array, get the primary project name
-                    for project_dict in period.get("projects", []):
-                        if project_dict.get("project_primary", True):
-                            project_name = project_dict.get("name", "")
-                            break
-
-                if project_filter != "All Projects" and project_name != project_filter:
-                    continue
-
-                # Get project active status
-                project_active = (
-                    self.tracker.settings.get("projects", {})
-                    .get(project_name, {})
-                    .get("active", True)
-                )
-
-                # Apply status filter (Active/All/Archived radio button)
-                # Active: Show only if BOTH sphere AND project are active
-                # All: Show everything (no filtering)
-                # Archived: Show if EITHER sphere OR project is inactive (but not both active)
-                if status_filter == "active":
-                    if not (sphere_active and project_active):
-                        continue  # Skip inactive combinations
-                elif status_filter == "archived":
-                    if sphere_active and project_active:
-                        continue  # Skip fully active combinations
-                # For "all", don't skip anything
-
-                # Get primary and secondary project data
-                primary_project = ""
-                primary_comment = ""
-                primary_percentage = 100
-                primary_period_duration = period.get("duration", 0)
-                secondary_project = ""
-                secondary_comment = ""
-                secondary_percentage = ""
-                secondary_period_duration = ""
-
-                if period.get("project"):
-                    # Single project case
-                    primary_project = period.get("project", "")
-                    primary_comment = period.get("comment", "")
-                else:
-                    # Multiple projects case
-                    for project_item in period.get("projects", []):
-                        if project_item.get("project_primary", True):
-                            primary_project = project_item.get("name", "")
-                            primary_comment = project_item.get("comment", "")
-                            primary_percentage = project_item.get("percentage", 100)
-                            primary_period_duration = project_item.get("duration", 0)
-                        else:
-                            secondary_project = project_item.get("name", "")
-                            secondary_comment = project_item.get("comment", "")
-                            secondary_percentage = project_item.get("percentage", 0)
-                            secondary_period_duration = project_item.get("duration", 0)
-
-                # Get session-level comments
-                session_comments_dict = session_data.get("session_comments", {})
-                session_active_comments = session_comments_dict.get("active_notes", "")
-                session_notes = session_comments_dict.get("session_notes", "")
-
-                periods.append(
-                    {
-                        "Date": session_data.get("date"),
-                        "Start": period.get("start", ""),
-                        "Duration": self.format_duration(period.get("duration", 0)),
-                        "Sphere": session_sphere,
-                        "Sphere Active": "Yes" if sphere_active else "No",
-                        "Project Active": "Yes" if project_active else "No",
-                        "Type": "Active",
-                        "Primary Action": primary_project,
-                        "Primary Percentage": primary_percentage,
-                        "Primary Duration": self.format_duration(
-                            primary_period_duration
-                        ),
-                        "Primary Comment": primary_comment,
-                        "Secondary Action": secondary_project,
-                        "Secondary Percentage": secondary_percentage,
-                        "Secondary Duration": (
-                            self.format_duration(secondary_period_duration)
-                            if secondary_period_duration != ""
-                            else ""
-                        ),
-                        "Secondary Comment": secondary_comment,
-                        "Active Comments": session_active_comments,
-                        "Break Comments": "",
-                        "Session Notes": session_notes,
-                    }
-                )
-
-            for period in session_data.get("breaks", []):
-                # Apply status filter for break periods
-                # Since break actions don't have active status, filter based on sphere only
-                if status_filter == "active":
-                    if not sphere_active:
-                        continue  # Skip if sphere is inactive
-                elif status_filter == "archived":
-                    if sphere_active:
-                        continue  # Archived filter only shows inactive spheres for breaks
-                # For "all", don't skip anything
-
-                # Get primary and secondary action data
-                primary_action = ""
-                primary_comment = ""
-                primary_percentage = 100
-                primary_period_duration = period.get("duration", 0)
-                secondary_action = ""
-                secondary_comment = ""
-                secondary_percentage = ""
-                secondary_period_duration = ""
-
-                if period.get("action"):
-                    # Single action case
-                    primary_action = period.get("action", "")
-                    primary_comment = period.get("comment", "")
-                else:
-                    # Multiple actions case
-                    for action_item in period.get("actions", []):
-                        if action_item.get("break_primary", True):
-                            primary_action = action_item.get("name", "")
-                            primary_comment = action_item.get("comment", "")
-                            primary_percentage = action_item.get("percentage", 100)
-                            primary_period_duration = action_item.get("duration", 0)
-                        else:
-                            secondary_action = action_item.get("name", "")
-                            secondary_comment = action_item.get("comment", "")
-                            secondary_percentage = action_item.get("percentage", 0)
-                            secondary_period_duration = action_item.get("duration", 0)
-
-                # Get session-level comments
-                session_comments_dict = session_data.get("session_comments", {})
-                break_notes = session_comments_dict.get("break_notes", "")
-                session_notes = session_comments_dict.get("session_notes", "")
-
-                periods.append(
-                    {
-                        "Date": session_data.get("date"),
-                        "Start": period.get("start", ""),
-                        "Duration": self.format_duration(period.get("duration", 0)),
-                        "Sphere": session_sphere,
-                        "Sphere Active": "Yes" if sphere_active else "No",
-                        "Project Active": "N/A",
-                        "Type": "Break",
-                        "Primary Action": primary_action,
-                        "Primary Percentage": primary_percentage,
-                        "Primary Duration": self.format_duration(
-                            primary_period_duration
-                        ),
-                        "Primary Comment": primary_comment,
-                        "Secondary Action": secondary_action,
-                        "Secondary Percentage": secondary_percentage,
-                        "Secondary Duration": (
-                            self.format_duration(secondary_period_duration)
-                            if secondary_period_duration != ""
-                            else ""
-                        ),
-                        "Secondary Comment": secondary_comment,
-                        "Active Comments": "",
-                        "Break Comments": break_notes,
-                        "Session Notes": session_notes,
-                    }
-                )
-
-            # Export idle periods
-            for period in session_data.get("idle_periods", []):
-                # Apply status filter for idle periods
-                # Since idle actions don't have active status, filter based on sphere only
-                if status_filter == "active":
-                    if not sphere_active:
-                        continue  # Skip if sphere is inactive
-                elif status_filter == "archived":
-                    if sphere_active:
-                        continue  # Archived filter only shows inactive spheres for idles
-                # For "all", don't skip anything
-
-                # Get primary and secondary action data
-                primary_action = ""
-                primary_comment = ""
-                primary_percentage = 100
-                primary_period_duration = period.get("duration", 0)
-                secondary_action = ""
-                secondary_comment = ""
-                secondary_percentage = ""
-                secondary_period_duration = ""
-
-                if period.get("action"):
-                    # Single action case
-                    primary_action = period.get("action", "")
-                    primary_comment = period.get("comment", "")
-                else:
-                    # Multiple actions case
-                    for action_item in period.get("actions", []):
-                        if action_item.get("idle_primary", True):
-                            primary_action = action_item.get("name", "")
-                            primary_comment = action_item.get("comment", "")
-                            primary_percentage = action_item.get("percentage", 100)
-                            primary_period_duration = action_item.get("duration", 0)
-                        else:
-                            secondary_action = action_item.get("name", "")
-                            secondary_comment = action_item.get("comment", "")
-                            secondary_percentage = action_item.get("percentage", 0)
-                            secondary_period_duration = action_item.get("duration", 0)
-
-                # Get session-level comments
-                session_comments_dict = session_data.get("session_comments", {})
-                idle_notes = session_comments_dict.get("idle_notes", "")
-                session_notes = session_comments_dict.get("session_notes", "")
-
-                periods.append(
-                    {
-                        "Date": session_data.get("date"),
-                        "Start": period.get("start", ""),
-                        "Duration": self.format_duration(period.get("duration", 0)),
-                        "Sphere": session_sphere,
-                        "Sphere Active": "Yes" if sphere_active else "No",
-                        "Project Active": "N/A",
-                        "Type": "Idle",
-                        "Primary Action": primary_action,
-                        "Primary Percentage": primary_percentage,
-                        "Primary Duration": self.format_duration(
-                            primary_period_duration
-                        ),
-                        "Primary Comment": primary_comment,
-                        "Secondary Action": secondary_action,
-                        "Secondary Percentage": secondary_percentage,
-                        "Secondary Duration": (
-                            self.format_duration(secondary_period_duration)
-                            if secondary_period_duration != ""
-                            else ""
-                        ),
-                        "Secondary Comment": secondary_comment,
-                        "Active Comments": "",
-                        "Break Comments": idle_notes,
-                        "Session Notes": session_notes,
-                    }
-                )
+        date_range = self.get_date_range(range_name)
+        rows = self.create_query([date_range]).iter_export_rows(
+            date_range,
+            self.sphere_var.get(),
+            self.project_var.get(),
+            self.status_filter.get(),
+            self.tracker.settings,
+            self.format_duration,
+        )
 
-        if not periods:
+        first_row = next(rows, None)
+        if first_row is None:
             messagebox.showinfo("No Data", "No data to export for selected filters")
             return
 
@@ -2134,37 +1817,16 @@ class AnalysisFrame(ttk.Frame):
             return
 
         try:
-            with open(filename, "w", newline="", encoding="utf-8") as csvfile:
-                # CSV headers match timeline headers in order
-                fieldnames = [
-                    "Date",
-                    "Start",
-                    "Duration",
-                    "Sphere",
-                    "Sphere Active",
-                    "Project Active",
-                    "Type",
-                    "Primary Action",
-                    "Primary Percentage",
-                    "Primary Duration",
-                    "Primary Comment",
-                    "Secondary Action",
-                    "Secondary Percentage",
-                    "Secondary Duration",
-                    "Secondary Comment",
-                    "Active Comments",
-                    "Break Comments",
-                    "Session Notes",
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-                writer.writeheader()
-                for period in periods:
-                    writer.writerow(period)
-
-            messagebox.showinfo(
-                "Success", f"Exported {len(periods)} entries to {filename}"
+            count = export_csv_with_progress(
+                self.root,
+                filename,
+                ANALYSIS_CSV_FIELDS,
+                itertools.chain([first_row], rows),
             )
+            if count is None:
+                return  # Cancelled - no file written
+
+            messagebox.showinfo("Success", f"Exported {count} entries to {filename}")
 
         except Exception as error:
             messagebox.showerror("Error", f"Failed to export CSV: {error}")
@@ -0,0 +1,474 @@
+"""
+Analysis Query Module for Time Tracker
+Single-pass query engine behind the analysis cards, timeline and CSV export.
+Periods are read in their canonical form (see src.period_model), normalized
+once per session change when the tracker's PeriodModel is passed in. One pass
+over the sessions then answers the totals for any number of date ranges
+together with the timeline rows, which are slotted TimelineRow views of their
+session and period rather than per-row dicts.
+"""
+
+from src.period_model import PERIOD_SOURCES, normalize_period, normalize_session
+
+ALL_SPHERES = "All Spheres"
+ALL_PROJECTS = "All Projects"
+
+
+def _status_allows(status_filter, is_active):
+    """Apply the Active/All/Archived radio button to an active flag"""
+    if status_filter == "active":
+        return is_active
+    if status_filter == "archived":
+        return not is_active
+    return True
+
+
+# Timeline row field -> value, read through the row's session and period
+TIMELINE_ROW_FIELDS = {
+    "date": lambda row: row.session.date,
+    "period_start": lambda row: row.period.start,
+    "duration": lambda row: row.period.duration,
+    "sphere": lambda row: row.session.sphere,
+    "sphere_active": lambda row: row.sphere_active,
+    "project": lambda row: row.period.primary,
+    "project_active": lambda row: row.project_active,
+    "type": lambda row: row.period.type,
+    "primary_project": lambda row: row.period.primary,
+    "primary_comment": lambda row: row.period.primary_comment,
+    "secondary_project": lambda row: row.period.secondary,
+    "secondary_comment": lambda row: row.period.secondary_comment,
+    "session_active_comments": lambda row: row.session_active_comments,
+    "session_break_idle_comments": lambda row: row.session_break_idle_comments,
+    "session_notes": lambda row: row.session.session_notes,
+}
+
+
+class TimelineRow:
+    """One analysis timeline row.
+
+    Refers to its Session and Period instead of copying their fields, so a
+    row costs a few slots rather than a 15-key dict. Fields are read like a
+    dict - row["date"], row.get("sphere") - with the keys of
+    TIMELINE_ROW_FIELDS.
+    """
+
+    __slots__ = (
+        "session",
+        "period",
+        "sphere_active",
+        "project_active",
+        "session_active_comments",
+        "session_break_idle_comments",
+    )
+
+    def __init__(
+        self, session, period, sphere_active, project_active, active_notes, notes
+    ):
+        self.session = session
+        self.period = period
+        self.sphere_active = sphere_active
+        self.project_active = project_active
+        self.session_active_comments = active_notes
+        self.session_break_idle_comments = notes
+
+    def __getitem__(self, key):
+        return TIMELINE_ROW_FIELDS[key](self)
+
+    def get(self, key, default=None):
+        getter = TIMELINE_ROW_FIELDS.get(key)
+        return default if getter is None else getter(self)
+
+    def __contains__(self, key):
+        return key in TIMELINE_ROW_FIELDS
+
+    def keys(self):
+        return TIMELINE_ROW_FIELDS.keys()
+
+    def to_dict(self):
+        """Return the row as a plain dict"""
+        return {key: getter(self) for key, getter in TIMELINE_ROW_FIELDS.items()}
+
+    def __eq__(self, other):
+        if isinstance(other, TimelineRow):
+            other = other.to_dict()
+        if not isinstance(other, dict):
+            return NotImplemented
+        return self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"TimelineRow({self.to_dict()!r})"
+
+
+class QueryCancelled(Exception):
+    """Raised by AnalysisQuery.run() when its cancelled() callback returns True"""
+
+
+class AnalysisResult:
+    """Answer of one AnalysisQuery.run() pass"""
+
+    def __init__(self, range_count):
+        # (active_seconds, break_seconds) per requested date range
+        self.totals = [(0, 0)] * range_count
+        # Timeline rows sorted by (date, period_start)
+        self.timeline = []
+
+
+class AnalysisQuery:
+    """Query engine over one loaded copy of the session data.
+
+    Sessions are normalized lazily the first time a query touches them and
+    reused by every later query on the same instance (or, with a PeriodModel,
+    by every query until the session changes). Settings (active flags)
+    are looked up per query, so the same instance stays valid when spheres or
+    projects are archived.
+    """
+
+    def __init__(self, all_data, period_model=None, date_index=None):
+        """
+        Args:
+            all_data: Session data (read-only view is fine - never modified)
+            period_model: Shared PeriodModel to take normalized sessions from;
+                without one, sessions are normalized per query instance
+            date_index: DateIndex of all_data; with one, only the sessions in
+                the queried date ranges are read
+        """
+        self.all_data = all_data
+        self.period_model = period_model
+        self.date_index = date_index
+        self._prepared = {}
+
+    def _prepare(self, session_name, session_data, keep=True):
+        if self.period_model is not None:
+            prepared = self.period_model.session(session_name, session_data)
+        else:
+            prepared = self._prepared.get(session_name)
+            if prepared is None:
+                prepared = normalize_session(session_data)
+                if keep:
+                    self._prepared[session_name] = prepared
+        if prepared.date_value is None:
+            raise ValueError(
+                f"Malformed date {session_data.get('date')!r} in session "
+                f"{session_name!r}"
+            )
+        return prepared
+
+    def _sessions(self, sphere_filter, date_ranges, keep=True):
+        """Yield prepared sessions matching the sphere filter.
+
+        Args:
+            sphere_filter: Sphere name or ALL_SPHERES
+            date_ranges: Ranges the caller reads; with a date index, sessions
+                outside all of them are skipped without being prepared
+            keep: Keep newly normalized sessions for later queries. Streaming
+                exports pass False so memory use stays flat.
+        """
+        if self.date_index is None:
+            sessions = self.all_data.items()
+        else:
+            sessions = (
+                (session_name, self.all_data[session_name])
+                for session_name in self.date_index.sessions_in(date_ranges)
+                if session_name in self.all_data
+            )
+        for session_name, session_data in sessions:
+            prepared = self._prepare(session_name, session_data, keep)
+            if sphere_filter != ALL_SPHERES and prepared.sphere != sphere_filter:
+                continue
+            yield prepared
+
+    def run(
+        self,
+        date_ranges,
+        sphere_filter,
+        project_filter,
+        status_filter,
+        settings,
+        timeline_index=None,
+        cancelled=None,
+    ):
+        """Compute card totals and timeline rows in one pass.
+
+        Break/idle time is session-contextual: it only counts when the session
+        has an active period matching the project filter (or no active periods
+        at all), and a session is "considered active" for the status filter if
+        at least one of its active periods has an active sphere and project.
+
+        Args:
+            date_ranges: List of (start_datetime, end_datetime), end exclusive
+            sphere_filter: Sphere name or ALL_SPHERES
+            project_filter: Project name or ALL_PROJECTS
+            status_filter: "active", "all" or "archived"
+            settings: Settings dict (spheres/projects active flags)
+            timeline_index: Index into date_ranges to build timeline rows for,
+                or None for totals only
+            cancelled: Optional callable checked before each session; the
+                query stops as soon as it returns True
+
+        Returns:
+            AnalysisResult
+
+        Raises:
+            QueryCancelled: If cancelled() returned True
+        """
+        result = AnalysisResult(len(date_ranges))
+        totals = [[0, 0] for _ in date_ranges]
+        sphere_settings = settings.get("spheres", {})
+        project_settings = settings.get("projects", {})
+
+        def project_active(name):
+            return project_settings.get(name, {}).get("active", True)
+
+        for session in self._sessions(sphere_filter, date_ranges):
+            if cancelled is not None and cancelled():
+                raise QueryCancelled()
+            session_date = session.date_value
+            matching = [
+                totals[i]
+                for i, (start, end) in enumerate(date_ranges)
+                if start <= session_date < end
+            ]
+            in_timeline = timeline_index is not None and (
+                date_ranges[timeline_index][0]
+                <= session_date
+                < date_ranges[timeline_index][1]
+            )
+            if not matching:
+                continue
+
+            sphere_name = session.sphere
+            sphere_active = sphere_settings.get(sphere_name, {}).get("active", True)
+            active_periods = session.active
+
+            if project_filter == ALL_PROJECTS or not active_periods:
+                session_has_matching_project = True
+            else:
+                session_has_matching_project = any(
+                    project_filter in period.names for period in active_periods
+                )
+
+            if project_filter != ALL_PROJECTS:
+                session_considered_active = sphere_active and project_active(
+                    project_filter
+                )
+            elif not active_periods:
+                # Pure break/idle session - no project to be inactive
+                session_considered_active = sphere_active
+            else:
+                session_considered_active = any(
+                    sphere_active and project_active(period.status_name)
+                    for period in active_periods
+                )
+
+            # Active periods
+            for period in active_periods:
+                if project_filter == ALL_PROJECTS:
+                    if _status_allows(
+                        status_filter,
+                        sphere_active and project_active(period.status_name),
+                    ):
+                        for range_totals in matching:
+                            range_totals[0] += period.duration
+                elif period.allocations:
+                    # Multi-project period: count the filtered project's share
+                    for allocation in period.allocations:
+                        if allocation.name == project_filter:
+                            if _status_allows(
+                                status_filter,
+                                sphere_active and project_active(project_filter),
+                            ):
+                                for range_totals in matching:
+                                    range_totals[0] += allocation.duration
+                            break
+                elif period.single_name == project_filter:
+                    if _status_allows(
+                        status_filter,
+                        sphere_active and project_active(project_filter),
+                    ):
+                        for range_totals in matching:
+                            range_totals[0] += period.duration
+
+                if not in_timeline:
+                    continue
+                if project_filter != ALL_PROJECTS and project_filter not in (
+                    period.primary,
+                    period.secondary,
+                ):
+                    continue
+                primary_active = project_active(period.primary)
+                if not _status_allows(status_filter, sphere_active and primary_active):
+                    continue
+                result.timeline.append(
+                    TimelineRow(
+                        session,
+                        period,
+                        sphere_active,
+                        primary_active,
+                        session.active_notes,
+                        "",
+                    )
+                )
+
+            if not session_has_matching_project:
+                continue
+            if not _status_allows(status_filter, session_considered_active):
+                continue
+
+            # Break and finished idle periods
+            for list_name, notes_key in (
+                ("breaks", "break_notes"),
+                ("idle_periods", "idle_notes"),
+            ):
+                for period in getattr(session, list_name):
+                    if list_name == "idle_periods" and not period.ended:
+                        continue
+                    for range_totals in matching:
+                        range_totals[1] += period.duration
+                    if in_timeline:
+                        result.timeline.append(
+                            TimelineRow(
+                                session,
+                                period,
+                                sphere_active,
+                                True,  # Break/idle actions have no active status
+                                "",
+                                getattr(session, notes_key),
+                            )
+                        )
+
+        result.totals = [tuple(range_totals) for range_totals in totals]
+        result.timeline.sort(key=lambda x: (x.session.date, x.period.start))
+        return result
+
+    def export_rows(
+        self,
+        date_range,
+        sphere_filter,
+        project_filter,
+        status_filter,
+        settings,
+        format_duration,
+    ):
+        """Build CSV export rows for one date range as a list.
+
+        See iter_export_rows(), which streams the same rows.
+        """
+        return list(
+            self.iter_export_rows(
+                date_range,
+                sphere_filter,
+                project_filter,
+                status_filter,
+                settings,
+                format_duration,
+            )
+        )
+
+    def iter_export_rows(
+        self,
+        date_range,
+        sphere_filter,
+        project_filter,
+        status_filter,
+        settings,
+        format_duration,
+    ):
+        """Yield CSV export rows for one date range.
+
+        Export keeps its own filter rules: the project filter matches the
+        primary project only, break/idle rows are filtered on sphere status
+        alone, and open idle periods are included.
+
+        Args:
+            date_range: (start_datetime, end_datetime), end exclusive
+            sphere_filter: Sphere name or ALL_SPHERES
+            project_filter: Project name or ALL_PROJECTS
+            status_filter: "active", "all" or "archived"
+            settings: Settings dict (spheres/projects active flags)
+            format_duration: Callable formatting seconds for the CSV
+
+        Yields:
+            dict: Row keyed by the CSV column names, in session order
+        """
+        start_date, end_date = date_range
+        sphere_settings = settings.get("spheres", {})
+        project_settings = settings.get("projects", {})
+
+        for session in self._sessions(sphere_filter, [date_range], keep=False):
+            if not (start_date <= session.date_value < end_date):
+                continue
+
+            sphere_active = sphere_settings.get(session.sphere, {}).get("active", True)
+
+            for period in session.active:
+                project_name = period.status_name
+                if project_filter != ALL_PROJECTS and project_name != project_filter:
+                    continue
+                project_active = project_settings.get(project_name, {}).get(
+                    "active", True
+                )
+                if not _status_allows(status_filter, sphere_active and project_active):
+                    continue
+                yield self._export_row(
+                    session,
+                    period,
+                    sphere_active,
+                    "Yes" if project_active else "No",
+                    session.active_notes,
+                    "",
+                    format_duration,
+                )
+
+            for list_name, notes_key in (
+                ("breaks", "break_notes"),
+                ("idle_periods", "idle_notes"),
+            ):
+                for period in getattr(session, list_name):
+                    if not _status_allows(status_filter, sphere_active):
+                        continue
+                    yield self._export_row(
+                        session,
+                        period,
+                        sphere_active,
+                        "N/A",
+                        "",
+                        getattr(session, notes_key),
+                        format_duration,
+                    )
+
+    def _export_row(
+        self,
+        session,
+        period,
+        sphere_active,
+        project_active,
+        active_notes,
+        break_notes,
+        format_duration,
+    ):
+        return {
+            "Date": session.date,
+            "Start": period.start,
+            "Duration": format_duration(period.duration),
+            "Sphere": session.sphere,
+            "Sphere Active": "Yes" if sphere_active else "No",
+            "Project Active": project_active,
+            "Type": period.type,
+            "Primary Action": period.primary,
+            "Primary Percentage": period.primary_percentage,
+            "Primary Duration": format_duration(period.primary_duration),
+            "Primary Comment": period.primary_comment,
+            "Secondary Action": period.secondary,
+            "Secondary Percentage": period.secondary_percentage,
+            "Secondary Duration": (
+                format_duration(period.secondary_duration)
+                if period.secondary_duration != ""
+                else ""
+            ),
+            "Secondary Comment": period.secondary_comment,
+            "Active Comments": active_notes,
+            "Break Comments": break_notes,
+            "Session Notes": session.session_notes,
+        }
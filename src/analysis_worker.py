@@ -0,0 +1,128 @@
+"""
+Analysis Worker Module for Time Tracker
+Background thread for analysis queries. Each submitted query starts a new
+generation: older queued queries are dropped and a running one sees that it was
+superseded and stops early, so only the newest result is ever delivered. The
+Tk thread collects results with poll() (scheduled via root.after), because Tk
+widgets must only be touched from the thread that created them.
+"""
+
+import threading
+
+from src.analysis_query import QueryCancelled
+
+
+class AnalysisWorker:
+    """Runs the latest submitted analysis job on one background thread.
+
+    Jobs are callables taking an is_cancelled() callback. A job should check it
+    regularly (AnalysisQuery.run() does so per session) and may raise
+    QueryCancelled to stop.
+    """
+
+    def __init__(self, name="AnalysisWorker"):
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._pending = None  # (generation, job) waiting to run
+        self._running = None  # generation currently running
+        self._result = None  # (generation, value, error) not yet polled
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def generation(self):
+        """Generation of the newest submitted (or cancelled) job"""
+        return self._generation
+
+    def submit(self, job):
+        """Queue a job, superseding any queued, running or unpolled one.
+
+        Args:
+            job: Callable(is_cancelled) returning the result
+
+        Returns:
+            int: The job's generation
+        """
+        with self._condition:
+            self._generation += 1
+            self._pending = (self._generation, job)
+            self._result = None
+            self._condition.notify_all()
+            return self._generation
+
+    def cancel(self):
+        """Supersede every queued, running or unpolled job"""
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+            self._result = None
+            self._condition.notify_all()
+
+    def is_cancelled(self, generation):
+        """True if a newer job was submitted (or cancel() called) since generation"""
+        return generation != self._generation
+
+    def busy(self):
+        """True while the newest job is queued or running"""
+        with self._condition:
+            return self._pending is not None or self._running == self._generation
+
+    def poll(self):
+        """Take the newest job's result if it has finished.
+
+        Returns:
+            tuple: (generation, value, error) - error is the exception the job
+            raised, or None - or None if no current result is ready
+        """
+        with self._condition:
+            result = self._result
+            self._result = None
+            return result
+
+    def wait(self, timeout=None):
+        """Block until the newest job has finished (or was cancelled).
+
+        Returns:
+            bool: True if no job is queued or running, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._pending is None and self._running is None,
+                timeout=timeout,
+            )
+
+    def stop(self, timeout=None):
+        """Cancel outstanding work and stop the worker thread"""
+        with self._condition:
+            self._stopping = True
+        self.cancel()
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._pending is not None or self._stopping
+                )
+                if self._stopping:
+                    return
+                generation, job = self._pending
+                self._pending = None
+                self._running = generation
+
+            value = None
+            error = None
+            try:
+                value = job(lambda: self.is_cancelled(generation))
+            except QueryCancelled:
+                pass
+            except Exception as exc:
+                error = exc
+
+            with self._condition:
+                self._running = None
+                if not self.is_cancelled(generation):
+                    self._result = (generation, value, error)
+                self._condition.notify_all()
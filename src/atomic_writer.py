@@ -0,0 +1,142 @@
+"""
+Atomic Writer Module for Time Tracker
+Shared writer for data.json and settings.json. Every write goes to a temporary
+file that is forced to disk and then renamed over the live file, so a crash
+mid-write leaves the previous version intact instead of a truncated file.
+Settings edits come in bursts (typing a name, toggling checkboxes), so
+AtomicJsonWriter.write() coalesces writes to the same file within
+JSON_WRITE_COALESCE_SECONDS into one and performs it on the persistence
+worker; flush() is the barrier used at shutdown.
+"""
+
+import json
+import os
+import threading
+
+from src.constants import JSON_WRITE_COALESCE_SECONDS
+
+
+def write_text_atomic(path, text):
+    """Replace a file's contents without ever leaving it half-written.
+
+    Args:
+        path: File to replace
+        text: New contents
+
+    Raises:
+        OSError: If the file cannot be written (the old file is left as it was)
+    """
+    temp_file = f"{path}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, path)
+
+
+def write_json_atomic(path, data):
+    """Atomically write data as indented JSON (the data.json/settings.json format)"""
+    write_text_atomic(path, json.dumps(data, indent=2))
+
+
+class AtomicJsonWriter:
+    """Coalescing atomic JSON writer on top of a PersistenceWorker.
+
+    write() serializes the data immediately - later changes to the caller's
+    dict don't leak into the queued write - and schedules it after a short
+    delay. Writes to the same file before that delay expires replace the
+    queued snapshot, so a burst of edits costs one disk write.
+    """
+
+    def __init__(self, worker, delay=JSON_WRITE_COALESCE_SECONDS, on_error=None):
+        """
+        Args:
+            worker: PersistenceWorker that performs the writes
+            delay: Seconds to wait for more writes to the same file
+            on_error: Optional callable(path, error) run on the worker thread
+                when a queued write fails
+        """
+        self.worker = worker
+        self.delay = delay
+        self.on_error = on_error
+        self._lock = threading.Lock()
+        self._pending = {}  # path -> serialized snapshot not yet submitted
+        self._timers = {}  # path -> threading.Timer that submits it
+
+    def write(self, path, data):
+        """Queue data to be written to path; returns immediately.
+
+        Raises:
+            TypeError: If data is not JSON serializable
+        """
+        text = json.dumps(data, indent=2)
+        with self._lock:
+            self._pending[path] = text
+            if path in self._timers:
+                return
+            timer = threading.Timer(self.delay, self._submit, (path,))
+            timer.daemon = True
+            self._timers[path] = timer
+        timer.start()
+
+    def write_now(self, path, data):
+        """Write data to path before returning, superseding any queued write.
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        self._cancel(path)
+        # An older write of this file still on the worker must not land later
+        self.worker.flush()
+        write_json_atomic(path, data)
+
+    def pending_paths(self):
+        """Files with a queued write that hasn't been handed to the worker yet"""
+        with self._lock:
+            return list(self._pending)
+
+    def flush(self, timeout=None):
+        """Write every queued snapshot now and wait until it is on disk.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if all writes completed, False on timeout
+        """
+        with self._lock:
+            timers = list(self._timers.items())
+        for path, timer in timers:
+            timer.cancel()
+            self._submit(path)
+        return self.worker.flush(timeout)
+
+    def _cancel(self, path):
+        with self._lock:
+            self._pending.pop(path, None)
+            timer = self._timers.pop(path, None)
+        if timer is not None:
+            timer.cancel()
+
+    def _submit(self, path):
+        """Hand a file's queued snapshot to the worker (timer or flush).
+
+        Submitted under the lock, so a concurrent flush() that finds nothing
+        left to submit still waits for this write.
+        """
+        with self._lock:
+            self._timers.pop(path, None)
+            text = self._pending.pop(path, None)
+            if text is None:
+                return
+            self.worker.submit(
+                ("json", path),
+                text,
+                lambda texts: write_text_atomic(path, texts[-1]),
+                replace=True,
+                on_done=lambda error: self._on_written(path, error),
+            )
+
+    def _on_written(self, path, error):
+        if error is not None and self.on_error is not None:
+            self.on_error(path, error)
@@ -0,0 +1,274 @@
+"""
+Backup Store Module for Time Tracker
+Point-in-time backups of the session data that don't copy the whole history
+each time. Sessions are stored once per distinct content under objects/
+(named by their SHA-256), and each backup is a small manifest under
+snapshots/ mapping session names to those hashes. Backing up before deleting
+one session of a large history therefore writes the manifest and nothing
+else. Backups are rotated by count, age and total size, and restore()
+rebuilds the session data of any backup still kept (see restore_backup.py).
+"""
+
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+from src.atomic_writer import write_text_atomic
+from src.constants import (
+    BACKUP_FORMAT_VERSION,
+    BACKUP_MAX_AGE_DAYS,
+    BACKUP_MAX_COUNT,
+    BACKUP_MAX_SIZE_MB,
+    DEFAULT_BACKUP_FOLDER,
+    SECONDS_PER_HOUR,
+)
+
+SNAPSHOT_DIR = "snapshots"  # Backup manifests, one per backup
+OBJECT_DIR = "objects"  # Session contents, one file per distinct session
+
+
+def session_digest(session):
+    """Return (sha256 hex digest, canonical JSON text) of one session"""
+    text = json.dumps(session, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest(), text
+
+
+class BackupStore:
+    """Deduplicated backups of the session data in one folder"""
+
+    def __init__(self, backup_dir=DEFAULT_BACKUP_FOLDER):
+        self.backup_dir = backup_dir
+        self.snapshot_dir = os.path.join(backup_dir, SNAPSHOT_DIR)
+        self.object_dir = os.path.join(backup_dir, OBJECT_DIR)
+
+    def _object_path(self, digest):
+        return os.path.join(self.object_dir, digest[:2], f"{digest}.json")
+
+    def _snapshot_path(self, backup_id):
+        return os.path.join(self.snapshot_dir, f"{backup_id}.json")
+
+    def create(self, all_data, reason="", created=None):
+        """Back up the session data.
+
+        Only sessions whose content isn't stored yet are written; the backup
+        itself is a manifest of session name -> content hash. If nothing
+        changed since the newest backup, no new backup is made.
+
+        Args:
+            all_data: Session data (session name -> session)
+            reason: Short note shown when listing backups (e.g. "delete X")
+            created: time.time() of the backup (defaults to now)
+
+        Returns:
+            str: ID of the backup holding this data
+
+        Raises:
+            OSError: If the backup cannot be written
+        """
+        created = time.time() if created is None else created
+        sessions = {}
+        for session_name, session in all_data.items():
+            digest, text = session_digest(session)
+            sessions[session_name] = digest
+            path = self._object_path(digest)
+            if os.path.exists(path):
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Objects are only referenced once the manifest below is synced,
+            # and restore() verifies them, so they skip the per-file fsync
+            temp_file = f"{path}.tmp"
+            with open(temp_file, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_file, path)
+
+        backup_ids = self._backup_ids()
+        if backup_ids:
+            try:
+                if self._read_manifest(backup_ids[-1])["sessions"] == sessions:
+                    return backup_ids[-1]
+            except (OSError, ValueError):
+                pass
+
+        backup_id = datetime.fromtimestamp(created).strftime("%Y%m%d_%H%M%S_%f")
+        manifest = {
+            "format": BACKUP_FORMAT_VERSION,
+            "created": created,
+            "reason": reason,
+            "sessions": sessions,
+        }
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        write_text_atomic(
+            self._snapshot_path(backup_id),
+            json.dumps(manifest, separators=(",", ":")),
+        )
+        return backup_id
+
+    def list(self):
+        """Return the kept backups, oldest first.
+
+        Returns:
+            list: Dicts with "id", "created", "reason" and "sessions" (count);
+            unreadable manifests are skipped
+        """
+        backups = []
+        for backup_id in self._backup_ids():
+            try:
+                manifest = self._read_manifest(backup_id)
+            except (OSError, ValueError):
+                continue
+            backups.append(
+                {
+                    "id": backup_id,
+                    "created": manifest["created"],
+                    "reason": manifest.get("reason", ""),
+                    "sessions": len(manifest["sessions"]),
+                }
+            )
+        return backups
+
+    def _backup_ids(self):
+        """IDs of the backup manifests on disk, oldest first"""
+        try:
+            names = os.listdir(self.snapshot_dir)
+        except FileNotFoundError:
+            return []
+        # IDs are timestamps, so name order is creation order
+        return sorted(name[: -len(".json")] for name in names if name.endswith(".json"))
+
+    def backup_at(self, moment):
+        """Return the ID of the newest backup made at or before moment.
+
+        Args:
+            moment: datetime or time.time() value
+
+        Returns:
+            str or None: Backup ID, or None if every backup is newer
+        """
+        if isinstance(moment, datetime):
+            moment = moment.timestamp()
+        found = None
+        for backup in self.list():
+            if backup["created"] <= moment:
+                found = backup["id"]
+        return found
+
+    def restore(self, backup_id):
+        """Rebuild the session data as it was when a backup was made.
+
+        Args:
+            backup_id: ID from create() or list()
+
+        Returns:
+            dict: Session data, in the order it had when backed up
+
+        Raises:
+            FileNotFoundError: If the backup or one of its sessions is missing
+            ValueError: If a stored session doesn't match its hash
+        """
+        manifest = self._read_manifest(backup_id)
+        all_data = {}
+        for session_name, digest in manifest["sessions"].items():
+            with open(self._object_path(digest), "r", encoding="utf-8") as f:
+                text = f.read()
+            if hashlib.sha256(text.encode("utf-8")).hexdigest() != digest:
+                raise ValueError(f"Backup of session {session_name} is corrupt")
+            all_data[session_name] = json.loads(text)
+        return all_data
+
+    def _read_manifest(self, backup_id):
+        with open(self._snapshot_path(backup_id), "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if (
+            not isinstance(manifest, dict)
+            or not isinstance(manifest.get("sessions"), dict)
+            or not isinstance(manifest.get("created"), (int, float))
+        ):
+            raise ValueError(f"Backup {backup_id} is unreadable")
+        return manifest
+
+    def rotate(
+        self,
+        max_count=BACKUP_MAX_COUNT,
+        max_age_days=BACKUP_MAX_AGE_DAYS,
+        max_size_mb=BACKUP_MAX_SIZE_MB,
+        now=None,
+    ):
+        """Remove the oldest backups beyond the count, age and size limits.
+
+        The newest backup is always kept. Stored sessions no backup refers to
+        any more are removed afterwards.
+
+        Returns:
+            list: IDs of the removed backups
+        """
+        now = time.time() if now is None else now
+        backups = []  # (backup ID, manifest), oldest first
+        for backup_id in self._backup_ids():
+            try:
+                backups.append((backup_id, self._read_manifest(backup_id)))
+            except (OSError, ValueError):
+                continue
+
+        # Size of every stored session, and how many backups refer to it
+        references = {}
+        for _, manifest in backups:
+            for digest in set(manifest["sessions"].values()):
+                references[digest] = references.get(digest, 0) + 1
+        object_sizes = {}
+        for digest in references:
+            try:
+                object_sizes[digest] = os.path.getsize(self._object_path(digest))
+            except OSError:
+                object_sizes[digest] = 0
+        total_size = sum(object_sizes.values()) + sum(
+            os.path.getsize(self._snapshot_path(backup_id)) for backup_id, _ in backups
+        )
+
+        removed = []
+        max_size = max_size_mb * 1024 * 1024
+        while len(backups) > 1:
+            oldest_id, oldest = backups[0]
+            if not (
+                len(backups) > max_count
+                or now - oldest["created"] > max_age_days * 24 * SECONDS_PER_HOUR
+                or total_size > max_size
+            ):
+                break
+            backups.pop(0)
+            path = self._snapshot_path(oldest_id)
+            total_size -= os.path.getsize(path)
+            os.remove(path)
+            removed.append(oldest_id)
+            for digest in set(oldest["sessions"].values()):
+                references[digest] -= 1
+                if references[digest] == 0:
+                    total_size -= object_sizes[digest]
+
+        self._collect_garbage(
+            {digest for digest, count in references.items() if count > 0}
+        )
+        return removed
+
+    def _collect_garbage(self, referenced):
+        """Remove stored sessions (and leftover temp files) not in referenced"""
+        try:
+            buckets = os.listdir(self.object_dir)
+        except FileNotFoundError:
+            return
+        for bucket in buckets:
+            bucket_dir = os.path.join(self.object_dir, bucket)
+            if not os.path.isdir(bucket_dir):
+                continue
+            for name in os.listdir(bucket_dir):
+                if name.endswith(".json") and name[: -len(".json")] in referenced:
+                    continue
+                try:
+                    os.remove(os.path.join(bucket_dir, name))
+                except OSError:
+                    pass
+            try:
+                os.rmdir(bucket_dir)
+            except OSError:
+                pass  # Not empty
@@ -3,20 +3,20 @@ Completion Frame - Displayed when a session ends.
 Allows user to tag actions for active time, breaks, and idle periods.
 """
 
-import json
 import tkinter as tk
 from tkinter import ttk
 from datetime import datetime
 from tkinter import messagebox
 import os
 import subprocess
-import shutil
-import datetime as dt
 
+from src.date_index import DateIndex
+from src.name_table import NameTable, assign_name_ids, stamp_session_ids
+from src.period_model import PERIOD_SOURCES, PeriodModel, normalize_session
+from src.screenshot_manifest import load_period_screenshots
 from src.ui_helpers import get_frame_background
 
 from src.constants import (
-    DEFAULT_BACKUP_FOLDER,
     FONT_TITLE,
     FONT_HEADING,
     FONT_BODY,
@@ -48,7 +48,7 @@ class CompletionFrame(ttk.Frame):
 
         # If no session_name provided, get the most recent session
         if session_name is None:
-            all_data = self.tracker.load_data()
+            all_data = self.tracker.load_data(read_only=True)
             if all_data:
                 # Get most recent session (sessions are named with timestamps)
                 session_name = max(all_data.keys())
@@ -59,14 +59,14 @@ class CompletionFrame(ttk.Frame):
         self.session_name = session_name
 
         # Load session data from JSON
-        all_data = self.tracker.load_data()
+        all_data = self.tracker.load_data(read_only=True)
         if session_name and session_name in all_data:
             loaded_data = all_data[session_name]
             self.session_start_timestamp = loaded_data.get("start_timestamp", 0)
             self.session_end_timestamp = loaded_data.get("end_timestamp", 0)
             self.session_duration = loaded_data.get("total_duration", 0)
-            # Store session sphere from saved data
-            self.session_sphere = loaded_data.get("sphere", None)
+            # Store session sphere from saved data (its current name)
+            self.session_sphere = self._normalized_session(loaded_data).sphere or None
 
             # Build session_data dict for compatibility with existing code
             self.session_data = {
@@ -78,6 +78,8 @@ class CompletionFrame(ttk.Frame):
 
             # Load session comments if they exist
             self.session_comments = loaded_data.get("session_comments", {})
+            # Screenshot near-duplicate counts, if screenshots were taken
+            self.screenshot_dedupe = loaded_data.get("screenshot_dedupe")
         else:
             # Fallback for missing session
             self.session_start_timestamp = 0
@@ -91,6 +93,7 @@ class CompletionFrame(ttk.Frame):
                 "break_time": 0,
             }
             self.session_comments = {}
+            self.screenshot_dedupe = None
         self.text_boxes = []  # Store references to text boxes for each period
         # Store references to project/break action dropdowns for updating when sphere changes
         self.project_menus = []
@@ -285,18 +288,18 @@ class CompletionFrame(ttk.Frame):
 
         # Determine initial value - prioritize first project used in session over default
         initial_project = default_project
-        all_data = self.tracker.load_data()
+        all_data = self.tracker.load_data(read_only=True)
         if self.session_name in all_data:
-            session = all_data[self.session_name]
+            session = self._normalized_session(all_data[self.session_name])
             # Get first project used in this session
-            for period in session.get("active", []):
-                if period.get("project"):
-                    initial_project = period.get("project")
+            for period in session.active:
+                if period.single_name:
+                    initial_project = period.single_name
                     break
                 # Check projects array
-                for project_item in period.get("projects", []):
-                    if project_item.get("project_primary", True):
-                        initial_project = project_item.get("name", "")
+                for allocation in period.allocations:
+                    if allocation.primary:
+                        initial_project = allocation.name or ""
                         break
                 if initial_project != default_project:
                     break
@@ -352,12 +355,7 @@ class CompletionFrame(ttk.Frame):
 
         if selected_date:
             # Load all sessions for the selected date
-            all_data = self.tracker.load_data()
-            self.sessions_for_date = [
-                session_name
-                for session_name in all_data.keys()
-                if session_name.startswith(selected_date + "_")
-            ]
+            self.sessions_for_date = self._sessions_on(selected_date)
             # Sort chronologically: Session 1 = oldest, highest number = most recent
             self.sessions_for_date.sort()
 
@@ -409,14 +407,16 @@ class CompletionFrame(ttk.Frame):
             self.session_name = selected_session
 
             # Load session data from JSON
-            all_data = self.tracker.load_data()
+            all_data = self.tracker.load_data(read_only=True)
             if selected_session in all_data:
                 loaded_data = all_data[selected_session]
                 self.session_start_timestamp = loaded_data.get("start_timestamp", 0)
                 self.session_end_timestamp = loaded_data.get("end_timestamp", 0)
                 self.session_duration = loaded_data.get("total_duration", 0)
                 # Store session sphere from saved data (CRITICAL for correct sphere display)
-                self.session_sphere = loaded_data.get("sphere", None)
+                self.session_sphere = (
+                    self._normalized_session(loaded_data).sphere or None
+                )
 
                 # Load session comments if they exist (CRITICAL for populating comment fields)
                 self.session_comments = loaded_data.get("session_comments", {})
@@ -476,9 +476,9 @@ class CompletionFrame(ttk.Frame):
                 self.selected_sphere = new_sphere
 
                 # Save to file
+                assign_name_ids(self.tracker.settings)
                 try:
-                    with open(self.tracker.settings_file, "w") as f:
-                        json.dump(self.tracker.settings, f, indent=2)
+                    self.tracker.save_settings()
                 except Exception as error:
                     messagebox.showerror(
                         "Error", f"Failed to save sphere settings: {error}"
@@ -561,16 +561,7 @@ class CompletionFrame(ttk.Frame):
 
         grid_column = 0
         # Create dropdown for selecting date first
-        all_data = self.tracker.load_data()
-
-        # Extract unique dates from session names
-        dates_set = set()
-        for session_name in all_data.keys():
-            if "_" in session_name:
-                date_part = session_name.split("_")[0]
-                dates_set.add(date_part)
-
-        date_options = sorted(list(dates_set), reverse=True)  # Most recent first
+        date_options = self._session_dates()[::-1]  # Most recent first
         current_date = ""
         if self.session_name and "_" in self.session_name:
             current_date = self.session_name.split("_")[0]
@@ -590,11 +581,7 @@ class CompletionFrame(ttk.Frame):
         grid_column += 1
 
         # Create dropdown for selecting session within the date
-        self.sessions_for_date = [
-            session_name
-            for session_name in all_data.keys()
-            if session_name.startswith(current_date + "_")
-        ]
+        self.sessions_for_date = self._sessions_on(current_date)
 
         # Sort chronologically: Session 1 = oldest, highest number = most recent
         self.sessions_for_date.sort()
@@ -706,12 +693,28 @@ class CompletionFrame(ttk.Frame):
         grid_column += 1
         ttk.Label(
             time_frame, text=self.tracker.format_time(total_idle), font=FONT_BODY
-        ).grid(row=0, column=grid_column, sticky=tk.W)
+        ).grid(row=0, column=grid_column, sticky=tk.W, padx=(0, 20))
+        grid_column += 1
+
+        # Screenshots: how many captures were near-duplicates of the last one
+        if self.screenshot_dedupe:
+            ttk.Label(time_frame, text="Screenshots:", font=FONT_HEADING).grid(
+                row=0, column=grid_column, sticky=tk.W, padx=(0, 5)
+            )
+            grid_column += 1
+            ttk.Label(
+                time_frame,
+                text=(
+                    f"{self.screenshot_dedupe.get('captures', 0)} taken, "
+                    f"{self.screenshot_dedupe.get('ratio', 0):.0%} duplicates"
+                ),
+                font=FONT_BODY,
+            ).grid(row=0, column=grid_column, sticky=tk.W)
 
     def _calculate_total_idle(self):
         """Calculate total idle time from session data"""
         total_idle = 0
-        all_data = self.tracker.load_data()
+        all_data = self.tracker.load_data(read_only=True)
 
         if self.session_name in all_data:
             for idle_period in all_data[self.session_name]["idle_periods"]:
@@ -730,23 +733,20 @@ class CompletionFrame(ttk.Frame):
         default_project = self.tracker.get_default_project(self.selected_sphere)
 
         # Collect all projects used in this session (even if now inactive)
-        all_data = self.tracker.load_data()
+        all_data = self.tracker.load_data(read_only=True)
         if self.session_name in all_data:
-            session = all_data[self.session_name]
+            session = self._normalized_session(all_data[self.session_name])
             session_projects = set()
 
-            # Collect from active periods
-            for period in session.get("active", []):
+            # Collect from active periods (current names of renamed projects)
+            for period in session.active:
                 # Single project case
-                if period.get("project"):
-                    project_name = period.get("project", "")
-                    if project_name:
-                        session_projects.add(project_name)
+                if period.single_name:
+                    session_projects.add(period.single_name)
                 # Multiple projects case
-                for project_item in period.get("projects", []):
-                    project_name = project_item.get("name", "")
-                    if project_name:
-                        session_projects.add(project_name)
+                for allocation in period.allocations:
+                    if allocation.name:
+                        session_projects.add(allocation.name)
 
             # Add session projects to active_projects if they belong to this sphere and aren't already there
             for project_name in session_projects:
@@ -760,6 +760,50 @@ class CompletionFrame(ttk.Frame):
 
         return active_projects, default_project
 
+    def _date_index(self):
+        """Return the session data's DateIndex (see src.date_index).
+
+        Uses the tracker's index when there is one, which is kept current as
+        sessions change instead of being rebuilt from every session.
+        """
+        get_index = getattr(self.tracker, "get_date_index", None)
+        index = get_index() if callable(get_index) else None
+        if isinstance(index, DateIndex):
+            return index
+        return DateIndex(self.tracker.load_data(read_only=True))
+
+    def _session_dates(self):
+        """Return the dates that have sessions, oldest first.
+
+        Asks the tracker when it can answer without loading every session
+        (an indexed lookup with the SQLite backend).
+        """
+        get_dates = getattr(self.tracker, "session_dates", None)
+        dates = get_dates() if callable(get_dates) else None
+        if isinstance(dates, list):
+            return dates
+        return self._date_index().dates
+
+    def _sessions_on(self, day):
+        """Return the names of the sessions on an ISO day, in data order"""
+        get_sessions = getattr(self.tracker, "sessions_on", None)
+        names = get_sessions(day) if callable(get_sessions) else None
+        if isinstance(names, list):
+            return names
+        return self._date_index().sessions_on(day)
+
+    def _normalized_session(self, session_data):
+        """Return this session's data as a Session (see src.period_model).
+
+        Uses the tracker's shared PeriodModel when there is one, so a session
+        already normalized for analysis or export isn't normalized again.
+        """
+        get_model = getattr(self.tracker, "get_period_model", None)
+        model = get_model() if callable(get_model) else None
+        if isinstance(model, PeriodModel):
+            return model.session(self.session_name, session_data)
+        return normalize_session(session_data)
+
     def _create_timeline(self):
         """Create chronological timeline of all active/break/idle periods"""
         # Container for timeline section
@@ -780,133 +824,37 @@ class CompletionFrame(ttk.Frame):
 
         # Build master list of all periods
         self.all_periods = []
-        all_data = self.tracker.load_data()
+        all_data = self.tracker.load_data(read_only=True)
 
         if self.session_name in all_data:
-            session = all_data[self.session_name]
-
-            # Add active periods
-            for period in session.get("active", []):
-                # Determine primary and secondary projects
-                primary_project = ""
-                secondary_project = ""
-                comment = ""
-                secondary_comment = ""
-                secondary_percentage = 50  # Default percentage
-
-                if period.get("project"):
-                    # Single project case - key is "project"
-                    primary_project = period.get("project", "")
-                    comment = period.get("comment", "")
-                else:
-                    # Multiple projects case - key is "projects" (list)
-                    for project_item in period.get("projects", []):
-                        if project_item.get("project_primary", True):
-                            primary_project = project_item.get("name", "")
-                            comment = project_item.get("comment", "")
-                        else:
-                            secondary_project = project_item.get("name", "")
-                            secondary_comment = project_item.get("comment", "")
-                            secondary_percentage = project_item.get("percentage", 50)
-
-                self.all_periods.append(
-                    {
-                        "type": "Active",
-                        "start": period.get("start", ""),
-                        "start_timestamp": period.get("start_timestamp", 0),
-                        "end": period.get("end", ""),
-                        "end_timestamp": period.get("end_timestamp", 0),
-                        "duration": period.get("duration", 0),
-                        "project": primary_project,
-                        "comment": comment,
-                        "secondary_project": secondary_project,
-                        "secondary_comment": secondary_comment,
-                        "secondary_percentage": secondary_percentage,
-                        "screenshot_folder": period.get("screenshot_folder", ""),
-                    }
-                )
-
-            # Add breaks
-            for period in session.get("breaks", []):
-                # Determine primary and secondary actions
-                primary_action = ""
-                secondary_action = ""
-                comment = ""
-                secondary_comment = ""
-                secondary_percentage = 50  # Default percentage
-
-                if period.get("action"):
-                    # Single action case - key is "action"
-                    primary_action = period.get("action", "")
-                    comment = period.get("comment", "")
-                else:
-                    # Multiple actions case - key is "actions" (list)
-                    for action_item in period.get("actions", []):
-                        if action_item.get("break_primary", True):
-                            primary_action = action_item.get("name", "")
-                            comment = action_item.get("comment", "")
-                        else:
-                            secondary_action = action_item.get("name", "")
-                            secondary_comment = action_item.get("comment", "")
-                            secondary_percentage = action_item.get("percentage", 50)
-
-                self.all_periods.append(
-                    {
-                        "type": "Break",
-                        "start": period.get("start", ""),
-                        "start_timestamp": period.get("start_timestamp", 0),
-                        "end": period.get("end", ""),
-                        "end_timestamp": period.get("end_timestamp", 0),
-                        "duration": period.get("duration", 0),
-                        "action": primary_action,
-                        "comment": comment,
-                        "secondary_action": secondary_action,
-                        "secondary_comment": secondary_comment,
-                        "secondary_percentage": secondary_percentage,
-                        "screenshot_folder": period.get("screenshot_folder", ""),
-                    }
-                )
-
-            # Add idle periods
-            for period in session.get("idle_periods", []):
-                # Determine primary and secondary actions
-                primary_action = ""
-                secondary_action = ""
-                comment = ""
-                secondary_comment = ""
-                secondary_percentage = 50  # Default percentage
-
-                if period.get("action"):
-                    # Single action case - key is "action"
-                    primary_action = period.get("action", "")
-                    comment = period.get("comment", "")
-                else:
-                    # Multiple actions case - key is "actions" (list)
-                    for action_item in period.get("actions", []):
-                        if action_item.get("idle_primary", True):
-                            primary_action = action_item.get("name", "")
-                            comment = action_item.get("comment", "")
-                        else:
-                            secondary_action = action_item.get("name", "")
-                            secondary_comment = action_item.get("comment", "")
-                            secondary_percentage = action_item.get("percentage", 50)
-
-                self.all_periods.append(
-                    {
-                        "type": "Idle",
-                        "start": period.get("start", ""),
-                        "start_timestamp": period.get("start_timestamp", 0),
-                        "end": period.get("end", ""),
-                        "end_timestamp": period.get("end_timestamp", 0),
-                        "duration": period.get("duration", 0),
-                        "action": primary_action,
-                        "comment": comment,
-                        "secondary_action": secondary_action,
-                        "secondary_comment": secondary_comment,
-                        "secondary_percentage": secondary_percentage,
-                        "screenshot_folder": period.get("screenshot_folder", ""),
-                    }
-                )
+            session_data = all_data[self.session_name]
+            session = self._normalized_session(session_data)
+
+            for list_name, _, _, _, _ in PERIOD_SOURCES:
+                for period in getattr(session, list_name):
+                    # Active periods use project keys, breaks/idle use action keys
+                    name_key = "project" if list_name == "active" else "action"
+                    secondary_percentage = period.secondary_percentage
+                    if secondary_percentage == "":
+                        secondary_percentage = 50  # Default percentage
+                    self.all_periods.append(
+                        {
+                            "type": period.type,
+                            "start": period.start,
+                            "start_timestamp": period.start_timestamp,
+                            "end": period.end,
+                            "end_timestamp": period.end_timestamp,
+                            "duration": period.duration,
+                            name_key: period.primary,
+                            "comment": period.primary_comment,
+                            f"secondary_{name_key}": period.secondary,
+                            "secondary_comment": period.secondary_comment,
+                            "secondary_percentage": secondary_percentage,
+                            "screenshot_folder": period.screenshot_folder,
+                            "screenshot_manifest": period.screenshot_manifest,
+                            "screenshots": period.screenshots,
+                        }
+                    )
 
         # Sort by start timestamp
         self.all_periods.sort(key=lambda x: x["start_timestamp"])
@@ -915,6 +863,7 @@ class CompletionFrame(ttk.Frame):
         periods_frame = ttk.Frame(timeline_container)
         periods_frame.pack(fill="both", expand=True)
 
+        manifests = {}  # Screenshot manifests read so far, by path
         for period_idx, period in enumerate(self.all_periods):
             timeline_column = 0
 
@@ -1219,13 +1168,17 @@ class CompletionFrame(ttk.Frame):
             self.secondary_percentage_labels.append(label_secondary_percentage)
             timeline_column += 1
 
-            # Screenshot folder button
+            # Screenshot folder button with the period's screenshot count -
+            # the session manifest is only read here, once for all periods
             screenshot_folder = period.get("screenshot_folder", "")
             if screenshot_folder and os.path.exists(screenshot_folder):
+                screenshots = load_period_screenshots(
+                    period, os.path.dirname(self.tracker.data_file), manifests
+                )
                 screenshot_btn = ttk.Button(
                     periods_frame,
-                    text="📸",
-                    width=3,
+                    text=f"📸 {len(screenshots)}" if screenshots else "📸",
+                    width=6 if screenshots else 3,
                     command=lambda folder=screenshot_folder: self._open_screenshot_folder(
                         folder
                     ),
@@ -1396,9 +1349,9 @@ class CompletionFrame(ttk.Frame):
                 }
 
                 # Save to file
+                assign_name_ids(self.tracker.settings)
                 try:
-                    with open(self.tracker.settings_file, "w") as f:
-                        json.dump(self.tracker.settings, f, indent=2)
+                    self.tracker.save_settings()
                 except Exception as error:
                     messagebox.showerror(
                         "Error", f"Failed to save project settings: {error}"
@@ -1543,9 +1496,9 @@ class CompletionFrame(ttk.Frame):
                 }
 
                 # Save to file
+                assign_name_ids(self.tracker.settings)
                 try:
-                    with open(self.tracker.settings_file, "w") as f:
-                        json.dump(self.tracker.settings, f, indent=2)
+                    self.tracker.save_settings()
                 except Exception as error:
                     messagebox.showerror(
                         "Error", f"Failed to save break action settings: {error}"
@@ -2032,6 +1985,9 @@ class CompletionFrame(ttk.Frame):
             "session_notes": self.session_notes_text.get("1.0", tk.END).strip(),
         }
 
+        # Reference the chosen names by ID so later renames carry over
+        stamp_session_ids(session, NameTable(self.tracker.settings))
+
         # Single save operation - minimizes I/O and reduces corruption risk
         self.tracker.save_data(all_data)
 
@@ -2055,6 +2011,8 @@ class CompletionFrame(ttk.Frame):
         try:
             from src.google_sheets_integration import GoogleSheetsUploader
 
+            # The uploader reads the settings file
+            self.tracker.flush_writes()
             uploader = GoogleSheetsUploader(self.tracker.settings_file)
 
             if uploader.is_enabled():
@@ -2114,6 +2072,7 @@ class CompletionFrame(ttk.Frame):
             has_action = idle_period.get("action") or idle_period.get("actions")
             if not has_action:
                 idle_period["action"] = default_break_action
+        stamp_session_ids(session, NameTable(self.tracker.settings))
 
         # Save if any defaults were applied
         self.tracker.save_data(all_data)
@@ -2144,14 +2103,8 @@ class CompletionFrame(ttk.Frame):
 
             # Delete the session if it exists
             if self.session_name in all_data:
-                # Ensure backups directory exists
-                backup_dir = DEFAULT_BACKUP_FOLDER
-                os.makedirs(backup_dir, exist_ok=True)
-
-                backup_filename = f"{os.path.basename(self.tracker.data_file)}.backup_{dt.datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                backup_file = os.path.join(backup_dir, backup_filename)
                 try:
-                    shutil.copy2(self.tracker.data_file, backup_file)
+                    self.tracker.backup_data(f"delete {self.session_name}")
                 except Exception as e:
                     messagebox.showerror(
                         "Backup Failed",
@@ -2159,15 +2112,10 @@ class CompletionFrame(ttk.Frame):
                     )
                     return
 
-                del all_data[self.session_name]
-
-                # Write directly so an empty dict is saved correctly.
-                # save_data(merge=False) has a safety guard that skips writing
-                # when the dict is empty, which would leave the deleted session
-                # in data.json when it was the last one.
+                # The tracker writes an empty dict too, so deleting the last
+                # session works, and keeps its journal and caches in step
                 try:
-                    with open(self.tracker.data_file, "w") as f:
-                        json.dump(all_data, f, indent=2)
+                    self.tracker.delete_session(self.session_name)
                 except Exception as e:
                     messagebox.showerror(
                         "Save Error",
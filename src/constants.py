@@ -23,7 +23,8 @@ ONE_MINUTE_SECONDS = SECONDS_PER_MINUTE
 # Timer and Update Intervals
 # =============================================================================
 
-UPDATE_TIMER_INTERVAL_MS = 100  # milliseconds between UI updates
+TIMER_BOUNDARY_SLACK_MS = 5  # fire just after a whole second so displays tick over
+SESSION_CHECKPOINT_INTERVAL_MS = 15 * MILLISECONDS_PER_SECOND  # live session
 IDLE_CHECK_INTERVAL_SECONDS = 0.5  # seconds between idle checks
 
 # =============================================================================
@@ -98,6 +99,15 @@ TRAY_ICON_BG_COLOR = (
     0,
     0,
 )  # Transparent RGBA background — blends with OS taskbar
+TRAY_TOOLTIP_MIN_INTERVAL_SECONDS = 1.0  # tooltip text refreshed at most this often
+
+# Virtualized analysis timeline
+TIMELINE_VISIBLE_ROWS = 25  # pooled row widgets, re-filled while scrolling
+TIMELINE_WHEEL_ROWS = 3  # rows scrolled per mousewheel notch
+TIMELINE_COMMENT_MAX_LINES = 15  # tallest a wrapped comment cell grows
+TIMELINE_CACHE_SIZE = 8  # filtered timeline result sets kept for re-sorting/revisits
+ANALYSIS_DEBOUNCE_MS = 150  # quiet time after a filter change before querying
+ANALYSIS_POLL_MS = 25  # how often the Tk thread checks for a background result
 
 # Pie chart dimensions (analysis frame cards)
 PIE_CHART_SIZE = 160  # Canvas width and height in pixels
@@ -115,6 +125,48 @@ DEFAULT_SCREENSHOT_FOLDER = "screenshots"
 DEFAULT_BACKUP_FOLDER = "backups"
 DEFAULT_GOOGLE_CREDENTIALS_FILE = "credentials.json"
 
+# =============================================================================
+# Data Storage
+# =============================================================================
+
+JOURNAL_FILE_SUFFIX = ".journal"  # data.json -> data.json.journal
+JOURNAL_COMPACTION_THRESHOLD = 500  # journal records before folding into data.json
+CHECKPOINT_FILE_SUFFIX = ".checkpoint"  # data.json -> data.json.checkpoint
+PERSISTENCE_QUEUE_SIZE = 256  # queued writes before submitters block (back-pressure)
+PERSISTENCE_FLUSH_TIMEOUT_SECONDS = 10  # max wait for pending writes on shutdown
+JSON_WRITE_COALESCE_SECONDS = 0.5  # settings writes within this window -> one write
+STORAGE_BACKEND_JSON = "json"  # data.json snapshot + journal (default)
+STORAGE_BACKEND_SQLITE = "sqlite"  # indexed SQLite database next to data.json
+ROLLUP_FILE_SUFFIX = ".rollup"  # data.json -> data.json.rollup (daily analysis totals)
+ROLLUP_FORMAT_VERSION = 1  # bump when the rollup row layout changes
+CSV_EXPORT_CHUNK_ROWS = 500  # rows written between flushes/progress updates
+BACKUP_FORMAT_VERSION = 1  # bump when the backup manifest layout changes
+BACKUP_MAX_COUNT = 50  # backups kept in the backup folder (newest always kept)
+BACKUP_MAX_AGE_DAYS = 90  # older backups are removed
+BACKUP_MAX_SIZE_MB = 200  # oldest backups are removed beyond this total size
+
+# =============================================================================
+# Screenshot Capture
+# =============================================================================
+
+SCREENSHOT_WRITER_THREADS = 2  # threads encoding and saving captured screenshots
+SCREENSHOT_QUEUE_MAX_MB = 256  # raw pixels queued for saving before oldest drop
+SCREENSHOT_DEFAULT_FORMAT = "png"  # "png", "jpeg" or "webp"
+SCREENSHOT_DEFAULT_QUALITY = 80  # JPEG/WebP quality, 1-100
+SCREENSHOT_DEFAULT_THUMBNAIL_SIZE = 320  # thumbnail longest side in px (0 = none)
+SCREENSHOT_THUMBNAIL_QUALITY = 70  # thumbnails are always JPEG
+SCREENSHOT_THUMBNAIL_FOLDER = "thumbnails"  # inside each period folder
+SCREENSHOT_HASH_SIZE = 16  # perceptual hash is HASH_SIZE^2 bits (dHash)
+SCREENSHOT_DEDUPE_SIMILARITY = 97  # % of matching hash bits for a near-duplicate
+SCREENSHOT_INDEX_FILE = "index.json"  # size index in the screenshot folder
+SCREENSHOT_INDEX_FORMAT_VERSION = 1  # bump when the index layout changes
+SCREENSHOT_RETENTION_START_DELAY_SECONDS = 60  # first retention pass after startup
+SCREENSHOT_RETENTION_INTERVAL_SECONDS = 15 * SECONDS_PER_MINUTE  # between passes
+SCREENSHOT_RETENTION_BATCH = 20  # screenshots deleted before pausing
+SCREENSHOT_RETENTION_BATCH_PAUSE_SECONDS = 0.1  # pause between deletion batches
+SCREENSHOT_MANIFEST_FILE = "manifest.json"  # per-session screenshot metadata
+SCREENSHOT_MANIFEST_FORMAT_VERSION = 1  # bump when the manifest layout changes
+
 # =============================================================================
 # Resource Path Helper (PyInstaller compatibility)
 # =============================================================================
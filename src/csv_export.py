@@ -0,0 +1,185 @@
+"""
+CSV Export Module for Time Tracker
+Streaming CSV export shared by the analysis "Export to CSV" button and the
+settings "Save All Data to CSV" button. Rows are generated one at a time from
+the canonical period model (see src.period_model) and written straight to disk
+in chunks, so memory use doesn't grow with the size of the history. A progress
+dialog with a Cancel button is refreshed between chunks.
+"""
+
+import csv
+import os
+import tkinter as tk
+from operator import itemgetter
+from tkinter import ttk
+
+from src.period_model import SESSION_ROW_FIELDS, iter_session_rows
+from src.constants import CSV_EXPORT_CHUNK_ROWS, FONT_NORMAL
+
+# Analysis export columns - match the timeline headers in order
+ANALYSIS_CSV_FIELDS = [
+    "Date",
+    "Start",
+    "Duration",
+    "Sphere",
+    "Sphere Active",
+    "Project Active",
+    "Type",
+    "Primary Action",
+    "Primary Percentage",
+    "Primary Duration",
+    "Primary Comment",
+    "Secondary Action",
+    "Secondary Percentage",
+    "Secondary Duration",
+    "Secondary Comment",
+    "Active Comments",
+    "Break Comments",
+    "Session Notes",
+]
+
+# "Save All Data to CSV" columns - one row per period with raw session fields
+ALL_DATA_CSV_FIELDS = SESSION_ROW_FIELDS
+
+
+def iter_all_data_rows(all_data, period_model=None):
+    """Yield "Save All Data to CSV" rows for every session.
+
+    Each active, break and idle period becomes one row; sessions without any
+    periods get a single "session_summary" row (see iter_session_rows()).
+
+    Args:
+        all_data: Session data dict (session id -> session)
+        period_model: Optional PeriodModel to take normalized sessions from
+
+    Yields:
+        dict: Row keyed by ALL_DATA_CSV_FIELDS
+    """
+    for session_id, session_data in all_data.items():
+        session = None
+        if period_model is not None:
+            session = period_model.session(session_id, session_data)
+        yield from iter_session_rows(session_id, session_data, session)
+
+
+def write_csv(
+    file_path, fieldnames, rows, progress=None, chunk_rows=CSV_EXPORT_CHUNK_ROWS
+):
+    """Stream rows into a CSV file.
+
+    Rows are consumed lazily and the file is flushed every chunk_rows rows.
+    The data is written to a temporary file that replaces file_path only when
+    complete, so a failed or cancelled export never leaves a partial file.
+
+    Args:
+        file_path: Destination CSV path
+        fieldnames: Column names; every row must have these keys
+        rows: Iterable of row dicts (typically a generator)
+        progress: Optional callable(rows_written) called after each chunk;
+            returning False cancels the export
+        chunk_rows: Rows written between flushes/progress calls
+
+    Returns:
+        int: Number of rows written, or None if cancelled
+    """
+    temp_file = f"{file_path}.part"
+    get_values = itemgetter(*fieldnames)
+    written = 0
+    completed = False
+    try:
+        with open(temp_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            for row in rows:
+                writer.writerow(get_values(row))
+                written += 1
+                if written % chunk_rows == 0:
+                    f.flush()
+                    if progress is not None and progress(written) is False:
+                        break
+            else:
+                completed = True
+        if completed:
+            if progress is not None:
+                progress(written)
+            os.replace(temp_file, file_path)
+            return written
+    except BaseException:
+        _remove_quietly(temp_file)
+        raise
+
+    _remove_quietly(temp_file)
+    return None
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class ExportProgressDialog:
+    """Small window showing export progress with a Cancel button.
+
+    Use as the progress callback of write_csv(); each call updates the row
+    count and processes pending UI events so Cancel (and the rest of the
+    window) stays responsive while the export runs.
+    """
+
+    def __init__(self, parent, title="Exporting CSV"):
+        self.cancelled = False
+        self.window = tk.Toplevel(parent)
+        self.window.title(title)
+        self.window.resizable(False, False)
+        self.window.transient(parent)
+        self.window.protocol("WM_DELETE_WINDOW", self.cancel)
+
+        self.status_label = ttk.Label(
+            self.window, text="Preparing export...", font=FONT_NORMAL
+        )
+        self.status_label.pack(padx=20, pady=(15, 5))
+        self.progress_bar = ttk.Progressbar(
+            self.window, mode="indeterminate", length=250
+        )
+        self.progress_bar.pack(padx=20, pady=5)
+        ttk.Button(self.window, text="Cancel", command=self.cancel).pack(pady=(5, 15))
+        self.window.update()
+        try:
+            # Keep clicks in the main window from starting anything else
+            self.window.grab_set()
+        except tk.TclError:
+            pass
+
+    def cancel(self):
+        """Stop the export at the next chunk"""
+        self.cancelled = True
+
+    def __call__(self, rows_written):
+        self.status_label.config(text=f"{rows_written:,} rows written...")
+        self.progress_bar.step()
+        self.window.update()
+        return not self.cancelled
+
+    def close(self):
+        """Close the dialog"""
+        try:
+            self.window.destroy()
+        except tk.TclError:
+            pass
+
+
+def export_csv_with_progress(parent, file_path, fieldnames, rows):
+    """Stream rows to file_path while showing an ExportProgressDialog.
+
+    Returns:
+        int: Number of rows written, or None if the user cancelled
+
+    Raises:
+        OSError: If the file can't be written (nothing is left behind)
+    """
+    dialog = ExportProgressDialog(parent)
+    try:
+        return write_csv(file_path, fieldnames, rows, progress=dialog)
+    finally:
+        dialog.close()
@@ -0,0 +1,324 @@
+"""
+Daily Rollup Module for Time Tracker
+Pre-aggregated analysis totals per date x sphere x project x period type. The
+analysis cards answer their active/break totals from these day rows instead of
+rescanning every session, and the rollup is updated incrementally when
+sessions are saved, renamed or deleted. Active/archived flags are not baked in:
+they are resolved from the settings at query time, so archiving a project
+never requires a rebuild. The rollup is persisted next to data.json together
+with the signature of the files it was built from.
+"""
+
+import bisect
+import json
+import os
+from src.analysis_query import ALL_PROJECTS, ALL_SPHERES, _status_allows
+from src.date_index import first_day
+from src.period_model import normalize_session
+from src.constants import ROLLUP_FILE_SUFFIX, ROLLUP_FORMAT_VERSION
+
+# Row kinds. A row key is a tuple starting with its kind and sphere:
+# (ACTIVE_BY_STATUS, sphere, status_name) - active time by first primary project,
+#     used by "All Projects"
+# (ACTIVE_BY_PROJECT, sphere, project) - active time allocated to one project,
+#     used by a specific project filter
+# (BREAK_TIME, sphere, project_names, status_names, has_active) - break time and
+#     finished idle time, keyed by the session's active projects because break
+#     time only counts for sessions that match the project filter
+ACTIVE_BY_STATUS = "active_status"
+ACTIVE_BY_PROJECT = "active_project"
+BREAK_TIME = "break"
+
+
+def rollup_path_for(data_file):
+    """Return the rollup file path that belongs to a data file"""
+    return f"{data_file}{ROLLUP_FILE_SUFFIX}"
+
+
+def session_rollup_rows(session_data, session=None):
+    """Compute one session's contribution to the rollup.
+
+    Args:
+        session_data: Session dict from data.json
+        session: Its Session if already available
+
+    Returns:
+        tuple: (date, rows) where date is the normalized "YYYY-MM-DD" day and
+        rows is a list of (key, seconds) pairs
+
+    Raises:
+        ValueError: If the session date is malformed (as the analysis query does)
+    """
+    if session is None:
+        session = normalize_session(session_data)
+    if session.date_value is None:
+        raise ValueError(f"Malformed session date {session_data.get('date')!r}")
+    date = session.date_value.date().isoformat()
+    sphere = session.sphere
+
+    by_status = {}
+    by_project = {}
+    project_names = set()
+    status_names = set()
+    for period in session.active:
+        status_name = period.status_name
+        by_status[status_name] = by_status.get(status_name, 0) + period.duration
+        status_names.add(status_name)
+        project_names.update(name for name in period.names if name is not None)
+
+        if period.allocations:
+            # Only the first allocation of a name counts (matches the query)
+            seen = set()
+            for allocation in period.allocations:
+                name = allocation.name
+                if name is None or name in seen:
+                    continue
+                seen.add(name)
+                by_project[name] = by_project.get(name, 0) + allocation.duration
+        elif period.single_name is not None:
+            name = period.single_name
+            by_project[name] = by_project.get(name, 0) + period.duration
+
+    break_seconds = 0
+    for list_name in ("breaks", "idle_periods"):
+        for period in getattr(session, list_name):
+            if list_name == "idle_periods" and not period.ended:
+                continue
+            break_seconds += period.duration
+
+    rows = [
+        ((ACTIVE_BY_STATUS, sphere, name), secs) for name, secs in by_status.items()
+    ]
+    rows += [
+        ((ACTIVE_BY_PROJECT, sphere, name), secs) for name, secs in by_project.items()
+    ]
+    if break_seconds:
+        rows.append(
+            (
+                (
+                    BREAK_TIME,
+                    sphere,
+                    tuple(sorted(project_names, key=repr)),
+                    tuple(sorted(status_names, key=repr)),
+                    bool(session.active),
+                ),
+                break_seconds,
+            )
+        )
+    return date, rows
+
+
+def _key_from_json(key):
+    """Turn a row key read back from JSON into its tuple form"""
+    if key[0] == BREAK_TIME:
+        return (key[0], key[1], tuple(key[2]), tuple(key[3]), key[4])
+    return tuple(key)
+
+
+class DailyRollup:
+    """Per-day analysis totals with incremental per-session updates.
+
+    Each session's rows are kept so that a changed or deleted session can be
+    subtracted from its day: the day rows are re-summed from the sessions on
+    that day only.
+    """
+
+    def __init__(self, source=()):
+        self.source = tuple(source)  # Files the rollup was built from
+        self.sessions = {}  # session name -> (date, rows)
+        self.days = {}  # date -> {row key: seconds}
+        self.dates = []  # Sorted dates that have rows
+        self._day_sessions = {}  # date -> set of session names
+
+    def rebuild(self, all_data, period_model=None):
+        """Recompute the rollup from scratch"""
+        self.sessions = {}
+        self.days = {}
+        self.dates = []
+        self._day_sessions = {}
+        self.update_sessions(all_data, all_data.keys(), period_model)
+
+    def update_sessions(self, all_data, session_names, period_model=None):
+        """Re-read changed sessions; names missing from all_data are removed.
+
+        Args:
+            all_data: Current session data
+            session_names: Names of sessions that were added, changed or deleted
+            period_model: Optional PeriodModel to take normalized sessions from
+        """
+        touched_days = set()
+        for session_name in list(session_names):
+            previous = self.sessions.pop(session_name, None)
+            if previous is not None:
+                touched_days.add(previous[0])
+                self._day_sessions[previous[0]].discard(session_name)
+            if session_name in all_data:
+                session_data = all_data[session_name]
+                normalized = None
+                if period_model is not None:
+                    normalized = period_model.session(session_name, session_data)
+                date, rows = session_rollup_rows(session_data, normalized)
+                self.sessions[session_name] = (date, rows)
+                self._day_sessions.setdefault(date, set()).add(session_name)
+                touched_days.add(date)
+
+        for date in touched_days:
+            self._resum_day(date)
+
+    def _resum_day(self, date):
+        day_rows = {}
+        for session_name in self._day_sessions.get(date, ()):
+            for key, seconds in self.sessions[session_name][1]:
+                day_rows[key] = day_rows.get(key, 0) + seconds
+
+        had_rows = date in self.days
+        if day_rows:
+            self.days[date] = day_rows
+            if not had_rows:
+                bisect.insort(self.dates, date)
+        else:
+            if not self._day_sessions.get(date):
+                self._day_sessions.pop(date, None)
+            if had_rows:
+                del self.days[date]
+                self.dates.remove(date)
+
+    def totals(
+        self, date_range, sphere_filter, project_filter, status_filter, settings
+    ):
+        """Active and break totals for one date range.
+
+        Same rules as AnalysisQuery.run(): break/idle time counts only for
+        sessions with an active period matching the project filter (or no
+        active periods), and only if the session is considered active.
+
+        Args:
+            date_range: (start_datetime, end_datetime), end exclusive
+            sphere_filter: Sphere name or ALL_SPHERES
+            project_filter: Project name or ALL_PROJECTS
+            status_filter: "active", "all" or "archived"
+            settings: Settings dict (spheres/projects active flags)
+
+        Returns:
+            tuple: (active_seconds, break_seconds)
+        """
+        sphere_settings = settings.get("spheres", {})
+        project_settings = settings.get("projects", {})
+
+        def project_active(name):
+            return project_settings.get(name, {}).get("active", True)
+
+        start, end = date_range
+        first = bisect.bisect_left(self.dates, first_day(start))
+        stop = bisect.bisect_left(self.dates, first_day(end))
+
+        active_total = 0
+        break_total = 0
+        for date in self.dates[first:stop]:
+            for key, seconds in self.days[date].items():
+                kind, sphere = key[0], key[1]
+                if sphere_filter != ALL_SPHERES and sphere != sphere_filter:
+                    continue
+                sphere_active = sphere_settings.get(sphere, {}).get("active", True)
+
+                if kind == ACTIVE_BY_STATUS:
+                    if project_filter == ALL_PROJECTS and _status_allows(
+                        status_filter, sphere_active and project_active(key[2])
+                    ):
+                        active_total += seconds
+                elif kind == ACTIVE_BY_PROJECT:
+                    if key[2] == project_filter and _status_allows(
+                        status_filter, sphere_active and project_active(key[2])
+                    ):
+                        active_total += seconds
+                else:
+                    _, _, project_names, status_names, has_active = key
+                    if project_filter != ALL_PROJECTS:
+                        if has_active and project_filter not in project_names:
+                            continue
+                        considered_active = sphere_active and project_active(
+                            project_filter
+                        )
+                    elif not has_active:
+                        considered_active = sphere_active
+                    else:
+                        considered_active = any(
+                            sphere_active and project_active(name)
+                            for name in status_names
+                        )
+                    if _status_allows(status_filter, considered_active):
+                        break_total += seconds
+
+        return active_total, break_total
+
+    def snapshot(self):
+        """Copy of the saved state that save() can write from another thread
+        while this rollup keeps being updated.
+
+        Session rows are replaced on update, never changed in place, so a
+        shallow copy of the session map is enough. Only save() may be called on
+        the copy.
+        """
+        copy = DailyRollup(self.source)
+        copy.sessions = dict(self.sessions)
+        return copy
+
+    def save(self, rollup_file, signature):
+        """Persist the rollup (written atomically).
+
+        Args:
+            rollup_file: Path to write to
+            signature: File signatures of self.source the rollup reflects
+        """
+        payload = {
+            "format": ROLLUP_FORMAT_VERSION,
+            "source": list(self.source),
+            "signature": signature,
+            "sessions": {
+                name: [date, [[list(key), seconds] for key, seconds in rows]]
+                for name, (date, rows) in self.sessions.items()
+            },
+        }
+        temp_file = f"{rollup_file}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(temp_file, rollup_file)
+
+    @classmethod
+    def load(cls, rollup_file, source, signature):
+        """Load a persisted rollup if it still matches the data files.
+
+        Args:
+            rollup_file: Path written by save()
+            source: Files the session data is currently read from
+            signature: Their current file signatures (None never matches)
+
+        Returns:
+            DailyRollup, or None if the file is missing, unreadable, from an
+            older format or built from different/changed data
+        """
+        if signature is None:
+            return None
+        try:
+            with open(rollup_file, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            # Round-trip through JSON so tuples compare equal to stored lists
+            expected = json.loads(json.dumps([list(source), signature]))
+            if (
+                payload.get("format") != ROLLUP_FORMAT_VERSION
+                or [payload.get("source"), payload.get("signature")] != expected
+            ):
+                return None
+
+            rollup = cls(source)
+            for name, (date, rows) in payload["sessions"].items():
+                rollup.sessions[name] = (
+                    date,
+                    [(_key_from_json(key), seconds) for key, seconds in rows],
+                )
+                rollup._day_sessions.setdefault(date, set()).add(name)
+            for date in list(rollup._day_sessions):
+                rollup._resum_day(date)
+            return rollup
+        except Exception:
+            return None
@@ -0,0 +1,146 @@
+"""
+Date Index Module for Time Tracker
+Session names grouped by calendar day, with the days kept sorted so a date
+range is found with two bisects instead of parsing every session's date. The
+session store keeps one index per read view and updates it for each session a
+transition changes (see SessionStore.date_index), so analysis queries and the
+completion frame's date/session pickers only touch the sessions they show.
+"""
+
+import bisect
+from datetime import datetime, timedelta
+
+
+def session_day(session_data):
+    """Return a session's date as an ISO "YYYY-MM-DD" string, or None if malformed"""
+    try:
+        return (
+            datetime.strptime(session_data.get("date"), "%Y-%m-%d").date().isoformat()
+        )
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def first_day(moment):
+    """First calendar day whose midnight is at or after moment"""
+    day = moment.date()
+    if datetime.combine(day, datetime.min.time()) < moment:
+        day += timedelta(days=1)
+    return day.isoformat()
+
+
+class DateIndex:
+    """Session names by day, sorted for range lookups.
+
+    Lookups return names in session data order (the order sessions were added),
+    so callers see sessions in the same order as when iterating the data.
+    Sessions whose date can't be parsed are kept in `undated` and included in
+    every range lookup - readers that parse dates still report them.
+
+    An index is never modified once built; updated() returns a new one, so an
+    index handed to a worker thread stays consistent with its data view.
+    """
+
+    def __init__(self, all_data=None):
+        """
+        Args:
+            all_data: Session data dict (session name -> session) to index
+        """
+        self.dates = []  # Sorted ISO days that have sessions
+        self.sessions = {}  # ISO day -> session names, in data order
+        self.undated = []  # Names of sessions with a malformed date
+        self._days = {}  # Session name -> ISO day (None if malformed)
+        self._positions = {}  # Session name -> position in data order
+        self._next_position = 0
+        if all_data:
+            for session_name, session_data in all_data.items():
+                day = (
+                    session_day(session_data)
+                    if isinstance(session_data, dict)
+                    else None
+                )
+                self._positions[session_name] = self._next_position
+                self._next_position += 1
+                self._days[session_name] = day
+                if day is None:
+                    self.undated.append(session_name)
+                else:
+                    self.sessions.setdefault(day, []).append(session_name)
+            self.dates = sorted(self.sessions)
+
+    def __len__(self):
+        return len(self._days)
+
+    def updated(self, session_name, session_data):
+        """Return a copy of the index with one session added, changed or removed.
+
+        Args:
+            session_name: Session name
+            session_data: Its new session dict, or None if it was deleted
+        """
+        index = DateIndex()
+        index.dates = self.dates
+        index.sessions = dict(self.sessions)
+        index.undated = self.undated
+        index._days = dict(self._days)
+        index._positions = dict(self._positions)
+        index._next_position = self._next_position
+
+        old_day = index._days.pop(session_name, None)
+        if session_name in index._positions:
+            if old_day is None:
+                index.undated = [n for n in index.undated if n != session_name]
+            else:
+                names = [n for n in index.sessions[old_day] if n != session_name]
+                if names:
+                    index.sessions[old_day] = names
+                else:
+                    del index.sessions[old_day]
+                    index.dates = [d for d in index.dates if d != old_day]
+
+        if session_data is None:
+            index._positions.pop(session_name, None)
+            return index
+
+        if session_name not in index._positions:
+            # New sessions are added at the end of the data, like dict keys
+            index._positions[session_name] = index._next_position
+            index._next_position += 1
+        day = session_day(session_data) if isinstance(session_data, dict) else None
+        index._days[session_name] = day
+        if day is None:
+            index.undated = index._in_order(index.undated + [session_name])
+        elif day in index.sessions:
+            index.sessions[day] = index._in_order(index.sessions[day] + [session_name])
+        else:
+            index.sessions[day] = [session_name]
+            index.dates = list(index.dates)
+            bisect.insort(index.dates, day)
+        return index
+
+    def _in_order(self, names):
+        return sorted(names, key=self._positions.__getitem__)
+
+    def sessions_on(self, day):
+        """Return the names of the sessions on an ISO day ("YYYY-MM-DD")"""
+        return list(self.sessions.get(day, ()))
+
+    def sessions_in(self, date_ranges):
+        """Return the names of the sessions in any of the date ranges.
+
+        Args:
+            date_ranges: List of (start_datetime, end_datetime), end exclusive,
+                matched against each session's date at midnight
+
+        Returns:
+            list: Session names in data order, malformed-date sessions included
+        """
+        days = set()
+        for start, end in date_ranges:
+            first = bisect.bisect_left(self.dates, first_day(start))
+            stop = bisect.bisect_left(self.dates, first_day(end))
+            days.update(self.dates[first:stop])
+        if len(days) == len(self.dates):
+            return list(self._positions)  # Every session - already in order
+        names = [name for day in days for name in self.sessions[day]]
+        return self._in_order(names + self.undated)
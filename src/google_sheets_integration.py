@@ -18,12 +18,34 @@ from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 from src.constants import DEFAULT_SETTINGS_FILE
+from src.name_table import NameTable
+from src.period_model import SESSION_ROW_FIELDS, iter_session_rows, normalize_session
 
 # Scopes for Google Sheets API
 # Use read-only scope for viewing, full scope for editing
 SCOPES_FULL = ["https://www.googleapis.com/auth/spreadsheets"]
 SCOPES_READONLY = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
 
+# Session row fields uploaded in minutes instead of seconds
+SHEET_MINUTE_FIELDS = {
+    "session_total_duration",
+    "session_active_duration",
+    "session_break_duration",
+    "primary_duration",
+    "secondary_duration",
+}
+# Free-text session row fields escaped against formula injection
+SHEET_ESCAPED_FIELDS = {
+    "primary_action",
+    "primary_comment",
+    "secondary_action",
+    "secondary_comment",
+    "active_notes",
+    "break_notes",
+    "idle_notes",
+    "session_notes",
+}
+
 
 def escape_for_sheets(text):
     """
@@ -495,6 +517,19 @@ class GoogleSheetsUploader:
             )
             return False
 
+    @staticmethod
+    def _sheet_row(row):
+        """Convert an iter_session_rows() row to the sheet's column values"""
+        values = []
+        for field in SESSION_ROW_FIELDS:
+            value = row[field]
+            if field in SHEET_MINUTE_FIELDS and value != "":
+                value = round(value / 60, 2)
+            elif field in SHEET_ESCAPED_FIELDS:
+                value = escape_for_sheets(value)
+            values.append(value)
+        return values
+
     def upload_session(self, session_data, session_id):
         """
         Upload a session to Google Sheets with detailed format matching CSV export
@@ -522,278 +557,14 @@ class GoogleSheetsUploader:
             return False
 
         try:
-            # Extract session-level data
-            date = session_data.get("date", "")
-            sphere = session_data.get("sphere", "")
-            start_time = session_data.get("start_time", "")
-            end_time = session_data.get("end_time", "")
-
-            # Convert durations from seconds to minutes
-            total_duration = round(session_data.get("total_duration", 0) / 60, 2)
-            active_duration = round(session_data.get("active_duration", 0) / 60, 2)
-            break_duration = round(session_data.get("break_duration", 0) / 60, 2)
-
-            # Get session comments
-            session_comments = session_data.get("session_comments", {})
-            active_notes = escape_for_sheets(session_comments.get("active_notes", ""))
-            break_notes = escape_for_sheets(session_comments.get("break_notes", ""))
-            idle_notes = escape_for_sheets(session_comments.get("idle_notes", ""))
-            session_notes = escape_for_sheets(session_comments.get("session_notes", ""))
-
-            # Process active periods, breaks, and idle periods
-            active_periods = session_data.get("active", [])
-            breaks = session_data.get("breaks", [])
-            idle_periods = session_data.get("idle_periods", [])
-
-            # Prepare all rows to upload
-            rows = []
-
-            # Process active periods
-            if active_periods:
-                for active in active_periods:
-                    # Extract primary and secondary project information
-                    primary_project = ""
-                    primary_comment = ""
-                    primary_percentage = 100
-                    primary_period_duration = active.get("duration", 0)
-                    secondary_project = ""
-                    secondary_comment = ""
-                    secondary_percentage = ""
-                    secondary_period_duration = ""
-
-                    if active.get("project"):
-                        # Single project case
-                        primary_project = escape_for_sheets(active.get("project", ""))
-                        primary_comment = escape_for_sheets(active.get("comment", ""))
-                    else:
-                        # Multiple projects case
-                        for project_item in active.get("projects", []):
-                            if project_item.get("project_primary", True):
-                                primary_project = escape_for_sheets(
-                                    project_item.get("name", "")
-                                )
-                                primary_comment = escape_for_sheets(
-                                    project_item.get("comment", "")
-                                )
-                                primary_percentage = project_item.get("percentage", 100)
-                                primary_period_duration = project_item.get(
-                                    "duration", 0
-                                )
-                            else:
-                                secondary_project = escape_for_sheets(
-                                    project_item.get("name", "")
-                                )
-                                secondary_comment = escape_for_sheets(
-                                    project_item.get("comment", "")
-                                )
-                                secondary_percentage = project_item.get(
-                                    "percentage", ""
-                                )
-                                secondary_period_duration = project_item.get(
-                                    "duration", 0
-                                )
-
-                    row = [
-                        session_id,
-                        date,
-                        sphere,
-                        start_time,
-                        end_time,
-                        total_duration,
-                        active_duration,
-                        break_duration,
-                        "active",
-                        primary_project,
-                        primary_percentage,
-                        round(primary_period_duration / 60, 2),
-                        primary_comment,
-                        secondary_project,
-                        secondary_percentage,
-                        (
-                            round(secondary_period_duration / 60, 2)
-                            if secondary_period_duration != ""
-                            else ""
-                        ),
-                        secondary_comment,
-                        active.get("start", ""),
-                        active.get("end", ""),
-                        active_notes,
-                        break_notes,
-                        idle_notes,
-                        session_notes,
-                    ]
-                    rows.append(row)
-
-            # Process breaks
-            if breaks:
-                for brk in breaks:
-                    # Extract primary and secondary action information
-                    primary_action = ""
-                    primary_comment = ""
-                    primary_percentage = 100
-                    primary_period_duration = brk.get("duration", 0)
-                    secondary_action = ""
-                    secondary_comment = ""
-                    secondary_percentage = ""
-                    secondary_period_duration = ""
-
-                    if brk.get("action"):
-                        # Single action case
-                        primary_action = escape_for_sheets(brk.get("action", ""))
-                        primary_comment = escape_for_sheets(brk.get("comment", ""))
-                    else:
-                        # Multiple actions case
-                        for action_item in brk.get("actions", []):
-                            if action_item.get("break_primary", True):
-                                primary_action = escape_for_sheets(
-                                    action_item.get("name", "")
-                                )
-                                primary_comment = escape_for_sheets(
-                                    action_item.get("comment", "")
-                                )
-                                primary_percentage = action_item.get("percentage", 100)
-                                primary_period_duration = action_item.get("duration", 0)
-                            else:
-                                secondary_action = escape_for_sheets(
-                                    action_item.get("name", "")
-                                )
-                                secondary_comment = escape_for_sheets(
-                                    action_item.get("comment", "")
-                                )
-                                secondary_percentage = action_item.get("percentage", "")
-                                secondary_period_duration = action_item.get(
-                                    "duration", 0
-                                )
-
-                    row = [
-                        session_id,
-                        date,
-                        sphere,
-                        start_time,
-                        end_time,
-                        total_duration,
-                        active_duration,
-                        break_duration,
-                        "break",
-                        primary_action,
-                        primary_percentage,
-                        round(primary_period_duration / 60, 2),
-                        primary_comment,
-                        secondary_action,
-                        secondary_percentage,
-                        (
-                            round(secondary_period_duration / 60, 2)
-                            if secondary_period_duration != ""
-                            else ""
-                        ),
-                        secondary_comment,
-                        brk.get("start", ""),
-                        "",  # activity_end
-                        active_notes,
-                        break_notes,
-                        idle_notes,
-                        session_notes,
-                    ]
-                    rows.append(row)
-
-            # Process idle periods
-            if idle_periods:
-                for idle in idle_periods:
-                    # Extract primary and secondary action information
-                    primary_action = ""
-                    primary_comment = ""
-                    primary_percentage = 100
-                    primary_period_duration = idle.get("duration", 0)
-                    secondary_action = ""
-                    secondary_comment = ""
-                    secondary_percentage = ""
-                    secondary_period_duration = ""
-
-                    if idle.get("action"):
-                        # Single action case
-                        primary_action = escape_for_sheets(idle.get("action", ""))
-                        primary_comment = escape_for_sheets(idle.get("comment", ""))
-                    else:
-                        # Multiple actions case
-                        for action_item in idle.get("actions", []):
-                            if action_item.get("idle_primary", True):
-                                primary_action = escape_for_sheets(
-                                    action_item.get("name", "")
-                                )
-                                primary_comment = escape_for_sheets(
-                                    action_item.get("comment", "")
-                                )
-                                primary_percentage = action_item.get("percentage", 100)
-                                primary_period_duration = action_item.get("duration", 0)
-                            else:
-                                secondary_action = escape_for_sheets(
-                                    action_item.get("name", "")
-                                )
-                                secondary_comment = escape_for_sheets(
-                                    action_item.get("comment", "")
-                                )
-                                secondary_percentage = action_item.get("percentage", "")
-                                secondary_period_duration = action_item.get("duration", 0)
-
-                    row = [
-                        session_id,
-                        date,
-                        sphere,
-                        start_time,
-                        end_time,
-                        total_duration,
-                        active_duration,
-                        break_duration,
-                        "idle",
-                        primary_action,
-                        primary_percentage,
-                        round(primary_period_duration / 60, 2),
-                        primary_comment,
-                        secondary_action,
-                        secondary_percentage,
-                        (
-                            round(secondary_period_duration / 60, 2)
-                            if secondary_period_duration != ""
-                            else ""
-                        ),
-                        secondary_comment,
-                        idle.get("start", ""),
-                        idle.get("end", ""),
-                        active_notes,
-                        break_notes,
-                        idle_notes,
-                        session_notes,
-                    ]
-                    rows.append(row)
-
-            # If no active periods, breaks, or idle, create summary row
-            if not active_periods and not breaks and not idle_periods:
-                row = [
-                    session_id,
-                    date,
-                    sphere,
-                    start_time,
-                    end_time,
-                    total_duration,
-                    active_duration,
-                    break_duration,
-                    "session_summary",
-                    "",  # primary_action
-                    "",  # primary_percentage
-                    "",  # primary_duration
-                    "",  # primary_comment
-                    "",  # secondary_action
-                    "",  # secondary_percentage
-                    "",  # secondary_duration
-                    "",  # secondary_comment
-                    "",  # activity_start
-                    "",  # activity_end
-                    active_notes,
-                    break_notes,
-                    idle_notes,
-                    session_notes,
-                ]
-                rows.append(row)
+            # One row per period from the canonical period model, with names
+            # resolved to the current settings names, durations converted
+            # from seconds to minutes and text escaped for Sheets
+            session = normalize_session(session_data, NameTable(self.settings))
+            rows = [
+                self._sheet_row(row)
+                for row in iter_session_rows(session_id, session_data, session)
+            ]
 
             # Append all rows to sheet
             if rows:
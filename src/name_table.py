@@ -0,0 +1,190 @@
+"""
+Name Table Module for Time Tracker
+Stable IDs for spheres, projects and break actions. Every settings entry gets an
+"id" that saved sessions reference next to the name they were written with
+(session "sphere_id", period "project_id"/"action_id", allocation "id"). The
+NameTable built from settings maps those IDs back to the current names, so
+renaming is a settings-only change: old sessions keep their stored name and
+show the new one because their ID still points at the renamed entry. Sessions
+or entries without an ID fall back to the stored name.
+"""
+
+import uuid
+
+from src.period_model import (
+    ALLOCATION_ID_KEY,
+    PERIOD_NAME_KINDS,
+    PERIOD_SOURCES,
+    SPHERE_ID_KEY,
+    single_id_key,
+)
+
+# Settings sections whose entries get IDs
+NAME_KINDS = ("spheres", "projects", "break_actions")
+
+# Settings flag: existing sessions have been given IDs (see migrate_name_ids)
+NAME_IDS_MIGRATED_KEY = "name_ids_migrated"
+
+
+def new_name_id():
+    """Return a fresh ID - random, so a deleted entry's ID is never reused"""
+    return uuid.uuid4().hex[:12]
+
+
+def assign_name_ids(settings):
+    """Give every sphere, project and break action without an ID a new one.
+
+    Args:
+        settings: Settings dict (modified in place)
+
+    Returns:
+        bool: True if any ID was added
+    """
+    changed = False
+    for kind in NAME_KINDS:
+        for entry in settings.get(kind, {}).values():
+            if isinstance(entry, dict) and not entry.get("id"):
+                entry["id"] = new_name_id()
+                changed = True
+    return changed
+
+
+def rename_entry(settings, kind, old_name, new_name):
+    """Rename a sphere, project or break action in settings.
+
+    The entry keeps its ID, so saved sessions that reference it show the new
+    name without being rewritten. Projects of a renamed sphere are re-pointed
+    at the new sphere name.
+
+    Args:
+        settings: Settings dict (modified in place)
+        kind: "spheres", "projects" or "break_actions"
+        old_name: Current name
+        new_name: New name (must not already exist)
+
+    Raises:
+        KeyError: If old_name doesn't exist
+        ValueError: If new_name already exists
+    """
+    entries = settings.get(kind, {})
+    if new_name in entries:
+        raise ValueError(f"{new_name!r} already exists")
+    entry = entries.pop(old_name)
+    if isinstance(entry, dict) and not entry.get("id"):
+        entry["id"] = new_name_id()
+    entries[new_name] = entry
+
+    if kind == "spheres":
+        for project_data in settings.get("projects", {}).values():
+            if project_data.get("sphere") == old_name:
+                project_data["sphere"] = new_name
+
+
+class NameTable:
+    """Current names of the spheres, projects and break actions by ID"""
+
+    def __init__(self, settings):
+        self._names = {}  # (kind, id) -> current name
+        self._ids = {}  # (kind, name) -> id
+        for kind in NAME_KINDS:
+            for name, entry in settings.get(kind, {}).items():
+                entry_id = entry.get("id") if isinstance(entry, dict) else None
+                if entry_id:
+                    self._names[(kind, entry_id)] = name
+                    self._ids[(kind, name)] = entry_id
+        # Hashable snapshot - equal tables resolve every reference the same way
+        self.key = tuple(sorted(self._names.items()))
+
+    def name(self, kind, name_id, stored_name):
+        """Return the current name for a reference.
+
+        Args:
+            kind: "spheres", "projects" or "break_actions"
+            name_id: Stored ID, or None
+            stored_name: Name stored with the reference
+
+        Returns:
+            The entry's current name, or stored_name if the ID is missing or
+            its entry no longer exists
+        """
+        if name_id is None:
+            return stored_name
+        return self._names.get((kind, name_id), stored_name)
+
+    def id_for(self, kind, name):
+        """Return the ID of the entry currently called name, or None"""
+        return self._ids.get((kind, name))
+
+    def __eq__(self, other):
+        if not isinstance(other, NameTable):
+            return NotImplemented
+        return self.key == other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+
+def stamp_session_ids(session_data, table, overwrite=True):
+    """Store the IDs of the names a session references.
+
+    Call after writing names into a session. A name that isn't a current
+    settings entry keeps whatever ID it had, so a session written with a name
+    that was renamed since still points at the renamed entry.
+
+    Args:
+        session_data: Session dict (modified in place)
+        table: NameTable for the current settings
+        overwrite: Replace IDs that are already stored. False only fills in
+            missing IDs (used by the migration).
+
+    Returns:
+        bool: True if any ID was added or changed
+    """
+    changed = False
+
+    def stamp_name(target, name_key, id_key, kind):
+        nonlocal changed
+        name = target.get(name_key)
+        if not name:
+            # No name (e.g. switched to the list format) - drop a stale ID
+            if overwrite and target.pop(id_key, None) is not None:
+                changed = True
+            return
+        if not overwrite and target.get(id_key):
+            return
+        name_id = table.id_for(kind, name)
+        if name_id is not None and target.get(id_key) != name_id:
+            target[id_key] = name_id
+            changed = True
+
+    stamp_name(session_data, "sphere", SPHERE_ID_KEY, "spheres")
+    for list_name, period_type, single_key, list_key, _ in PERIOD_SOURCES:
+        kind = PERIOD_NAME_KINDS[period_type]
+        for period in session_data.get(list_name, []):
+            stamp_name(period, single_key, single_id_key(single_key), kind)
+            for item in period.get(list_key, []):
+                stamp_name(item, "name", ALLOCATION_ID_KEY, kind)
+    return changed
+
+
+def migrate_name_ids(settings, all_data):
+    """Give settings entries IDs and store them in existing sessions.
+
+    Only missing session IDs are filled in; names that don't match a settings
+    entry (deleted spheres/projects/actions) are left without one.
+
+    Args:
+        settings: Settings dict (modified in place)
+        all_data: Session data (modified in place)
+
+    Returns:
+        list: Names of the sessions that were changed
+    """
+    assign_name_ids(settings)
+    table = NameTable(settings)
+    return [
+        session_name
+        for session_name, session_data in all_data.items()
+        if isinstance(session_data, dict)
+        and stamp_session_ids(session_data, table, overwrite=False)
+    ]
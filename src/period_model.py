@@ -0,0 +1,600 @@
+"""
+Period Model Module for Time Tracker
+Canonical, normalized form of session periods. Stored periods come in two
+formats - a legacy single "project"/"action" name with "comment", or a
+"projects"/"actions" list with primary/secondary allocations flagged by
+project_primary/break_primary/idle_primary. Every consumer (analysis cards and
+timeline, CSV exports, Google Sheets upload, completion timeline) reads the
+canonical record built here instead of re-detecting the format per row.
+
+Sessions, periods and allocations are __slots__ classes (Session, Period,
+Allocation) rather than dicts: with years of history the cached records for
+every period are the bulk of the analysis memory. Each keeps the stored fields
+plus a note of which keys were missing, so to_dict() gives back exactly the
+stored JSON - apart from names resolved through a NameTable (src.name_table),
+which come back as the current names.
+
+PeriodModel caches the normalized sessions for the tracker's session data, so
+each session is normalized once per change rather than once per query.
+"""
+
+from datetime import datetime
+from types import MappingProxyType
+
+# Period list in session data -> (timeline type, single-name key, list key,
+# primary flag inside the list)
+PERIOD_SOURCES = (
+    ("active", "Active", "project", "projects", "project_primary"),
+    ("breaks", "Break", "action", "actions", "break_primary"),
+    ("idle_periods", "Idle", "action", "actions", "idle_primary"),
+)
+
+# Timeline type -> (single-name key, list key, primary flag)
+PERIOD_KEYS = {source[1]: source[2:] for source in PERIOD_SOURCES}
+
+# Timeline type -> settings section its names refer to (see src.name_table)
+PERIOD_NAME_KINDS = {
+    "Active": "projects",
+    "Break": "break_actions",
+    "Idle": "break_actions",
+}
+
+# Stable IDs stored next to names (see src.name_table)
+SPHERE_ID_KEY = "sphere_id"  # On the session
+ALLOCATION_ID_KEY = "id"  # On "projects"/"actions" list entries
+
+
+def single_id_key(single_key):
+    """ID key stored next to a single "project"/"action" name"""
+    return f"{single_key}_id"
+
+
+# Flat per-period rows (see iter_session_rows) - the "Save All Data to CSV"
+# columns, also uploaded to Google Sheets
+SESSION_ROW_FIELDS = [
+    "session_id",
+    "date",
+    "sphere",
+    "session_start_time",
+    "session_end_time",
+    "session_total_duration",
+    "session_active_duration",
+    "session_break_duration",
+    "type",
+    "primary_action",
+    "primary_percentage",
+    "primary_duration",
+    "primary_comment",
+    "secondary_action",
+    "secondary_percentage",
+    "secondary_duration",
+    "secondary_comment",
+    "activity_start",
+    "activity_end",
+    "active_notes",
+    "break_notes",
+    "idle_notes",
+    "session_notes",
+]
+
+
+# Raw period keys kept in Period slots; any others are kept in Period.extra
+_PERIOD_KEYS = (
+    "start",
+    "end",
+    "start_timestamp",
+    "end_timestamp",
+    "duration",
+    "comment",
+    "screenshot_folder",
+    "screenshots",
+    "screenshot_manifest",
+)
+
+# Raw session keys kept in Session slots; any others are kept in Session.extra
+_SESSION_KEYS = (
+    "date",
+    "sphere",
+    "sphere_id",
+    "start_time",
+    "end_time",
+    "start_timestamp",
+    "total_duration",
+    "active_duration",
+    "break_duration",
+    "session_comments",
+)
+
+_NO_COMMENTS = MappingProxyType({})
+
+# Shared "absent keys" tuples - most records miss the same few keys
+_absent_tuples = {}
+
+
+def _absent(data, keys):
+    """Return the keys missing from data as a shared tuple"""
+    absent = tuple(key for key in keys if key not in data)
+    return _absent_tuples.setdefault(absent, absent)
+
+
+def _extra(data, keys):
+    """Return the items of data not in keys, or None if there are none"""
+    if len(data) <= len(keys) and all(key in keys for key in data):
+        return None
+    return {key: value for key, value in data.items() if key not in keys}
+
+
+def _resolve(names, kind, name_id, stored_name):
+    """Return the current name of a stored reference (stored_name if no names)"""
+    if names is None or not stored_name:
+        return stored_name
+    return names.name(kind, name_id, stored_name)
+
+
+def _to_dict(record, keys, values):
+    """Rebuild a raw dict from (key, value) pairs, skipping absent keys"""
+    data = {key: value for key, value in zip(keys, values) if key not in record.absent}
+    if record.extra:
+        data.update(record.extra)
+    return data
+
+
+class Allocation:
+    """One entry of a period's "projects"/"actions" allocation list.
+
+    Attributes hold the stored values; keys the entry didn't have are listed in
+    absent (their attributes hold a placeholder) so to_dict() gives back
+    exactly the stored entry - with a renamed project/action's current name.
+    """
+
+    __slots__ = (
+        "name",
+        "id",
+        "duration",
+        "percentage",
+        "comment",
+        "primary",
+        "extra",
+        "absent",
+    )
+
+    KEYS = ("name", ALLOCATION_ID_KEY, "duration", "percentage", "comment")
+
+    def __init__(self, item, primary_flag, kind=None, names=None):
+        """
+        Args:
+            item: Allocation dict from the period
+            primary_flag: Key marking the primary allocation
+                (project_primary/break_primary/idle_primary)
+            kind: Settings section the name refers to
+            names: Optional NameTable to resolve the name through its ID
+        """
+        keys = self.KEYS + (primary_flag,)
+        self.id = item.get(ALLOCATION_ID_KEY)
+        self.name = _resolve(names, kind, self.id, item.get("name"))
+        self.duration = item.get("duration", 0)
+        self.percentage = item.get("percentage")
+        self.comment = item.get("comment", "")
+        self.primary = item.get(primary_flag, True)
+        self.extra = _extra(item, keys)
+        self.absent = _absent(item, keys)
+
+    def to_dict(self, primary_flag):
+        """Return the stored allocation dict"""
+        return _to_dict(
+            self,
+            self.KEYS + (primary_flag,),
+            (
+                self.name,
+                self.id,
+                self.duration,
+                self.percentage,
+                self.comment,
+                self.primary,
+            ),
+        )
+
+
+class Period:
+    """One active, break or idle period in canonical form.
+
+    Both stored formats - a single "project"/"action" name with "comment", or a
+    "projects"/"actions" list of Allocations - are read once here; the primary_*
+    and secondary_* attributes give the resolved allocation either way.
+
+    Attributes:
+        type: "Active", "Break" or "Idle"
+        start, end: Display times ("" if not stored)
+        start_timestamp, end_timestamp: Epoch seconds (0 if not stored)
+        duration: Seconds
+        single_name: Legacy single project/action name ("" if the list is used)
+        single_id: Its stable ID, or None
+        comment: Legacy single-name comment
+        allocations: Tuple of Allocations from the list format
+        primary, primary_comment, primary_percentage, primary_duration:
+            The primary allocation (the single name at 100% if not a list)
+        secondary, secondary_comment, secondary_percentage,
+            secondary_duration: The secondary allocation ("" if none)
+        status_name: First primary name, used for active/archived status
+    """
+
+    __slots__ = (
+        "type",
+        "start",
+        "end",
+        "start_timestamp",
+        "end_timestamp",
+        "duration",
+        "single_name",
+        "single_id",
+        "comment",
+        "screenshot_folder",
+        "screenshots",
+        "screenshot_manifest",
+        "allocations",
+        "primary",
+        "primary_comment",
+        "primary_percentage",
+        "primary_duration",
+        "secondary",
+        "secondary_comment",
+        "secondary_percentage",
+        "secondary_duration",
+        "status_name",
+        "extra",
+        "absent",
+    )
+
+    def __init__(
+        self, period, period_type, single_key, list_key, primary_flag, names=None
+    ):
+        """
+        Args:
+            period: Period dict from session data
+            period_type: "Active", "Break" or "Idle"
+            single_key: "project" or "action"
+            list_key: "projects" or "actions"
+            primary_flag: Key marking the primary allocation in list_key
+            names: Optional NameTable - project/action names are resolved
+                through their IDs to the current names
+        """
+        kind = PERIOD_NAME_KINDS[period_type]
+        keys = _PERIOD_KEYS + (single_key, single_id_key(single_key), list_key)
+        duration = period.get("duration", 0)
+        allocation_list = period.get(list_key, ())
+
+        self.type = period_type
+        self.start = period.get("start", "")
+        self.end = period.get("end", "")
+        self.start_timestamp = period.get("start_timestamp", 0)
+        self.end_timestamp = period.get("end_timestamp", 0)
+        self.duration = duration
+        self.single_id = period.get(single_id_key(single_key))
+        self.single_name = _resolve(
+            names, kind, self.single_id, period.get(single_key, "")
+        )
+        self.comment = period.get("comment", "")
+        self.screenshot_folder = period.get("screenshot_folder", "")
+        self.screenshots = period.get("screenshots")
+        self.screenshot_manifest = period.get("screenshot_manifest", "")
+        self.allocations = tuple(
+            Allocation(item, primary_flag, kind, names) for item in allocation_list
+        )
+        self.extra = _extra(period, keys)
+        self.absent = _absent(period, keys)
+
+        self.primary = ""
+        self.primary_comment = ""
+        self.primary_percentage = 100
+        self.primary_duration = duration
+        self.secondary = ""
+        self.secondary_comment = ""
+        self.secondary_percentage = ""
+        self.secondary_duration = ""
+        self.status_name = self.single_name
+
+        if self.single_name:
+            self.primary = self.single_name
+            self.primary_comment = self.comment
+        else:
+            for item, allocation in zip(allocation_list, self.allocations):
+                name = allocation.name if "name" in item else ""
+                if allocation.primary:
+                    self.primary = name
+                    self.primary_comment = allocation.comment
+                    self.primary_percentage = item.get("percentage", 100)
+                    self.primary_duration = allocation.duration
+                else:
+                    self.secondary = name
+                    self.secondary_comment = allocation.comment
+                    self.secondary_percentage = item.get("percentage", 0)
+                    self.secondary_duration = allocation.duration
+
+        if not self.status_name:
+            for item, allocation in zip(allocation_list, self.allocations):
+                if allocation.primary:
+                    self.status_name = allocation.name if "name" in item else ""
+                    break
+
+    @property
+    def names(self):
+        """Every name the period is allocated to (None for a missing name)"""
+        single_key = PERIOD_KEYS[self.type][0]
+        single = None if single_key in self.absent else self.single_name
+        return (single,) + tuple(item.name for item in self.allocations)
+
+    @property
+    def ended(self):
+        """False for idle periods that are still open"""
+        return bool(self.end_timestamp)
+
+    def to_dict(self):
+        """Return the stored period dict this Period was built from"""
+        single_key, list_key, primary_flag = PERIOD_KEYS[self.type]
+        return _to_dict(
+            self,
+            _PERIOD_KEYS + (single_key, single_id_key(single_key), list_key),
+            (
+                self.start,
+                self.end,
+                self.start_timestamp,
+                self.end_timestamp,
+                self.duration,
+                self.comment,
+                self.screenshot_folder,
+                self.screenshots,
+                self.screenshot_manifest,
+                self.single_name,
+                self.single_id,
+                [item.to_dict(primary_flag) for item in self.allocations],
+            ),
+        )
+
+
+def normalize_period(
+    period, period_type, single_key, list_key, primary_flag, names=None
+):
+    """Read one active/break/idle period dict into a Period"""
+    return Period(period, period_type, single_key, list_key, primary_flag, names)
+
+
+class Session:
+    """One session in canonical form.
+
+    Attributes:
+        date: "YYYY-MM-DD" as stored
+        date_value: date as a datetime, or None if it is malformed
+        sphere: Sphere name
+        sphere_id: Its stable ID, or None
+        start_time, end_time: Display times
+        start_timestamp: Epoch seconds
+        total_duration, active_duration, break_duration: Seconds
+        session_comments: Stored notes dict (see the *_notes properties)
+        active, breaks, idle_periods: Tuples of Periods
+    """
+
+    __slots__ = (
+        "date",
+        "date_value",
+        "sphere",
+        "sphere_id",
+        "start_time",
+        "end_time",
+        "start_timestamp",
+        "total_duration",
+        "active_duration",
+        "break_duration",
+        "session_comments",
+        "active",
+        "breaks",
+        "idle_periods",
+        "extra",
+        "absent",
+    )
+
+    def __init__(self, session_data, names=None):
+        """
+        Args:
+            session_data: Session dict from data.json
+            names: Optional NameTable - sphere, project and action names are
+                resolved through their IDs to the current names
+        """
+        keys = _SESSION_KEYS + tuple(source[0] for source in PERIOD_SOURCES)
+        self.date = session_data.get("date")
+        try:
+            self.date_value = datetime.strptime(
+                session_data.get("date", "2000-01-01"), "%Y-%m-%d"
+            )
+        except (TypeError, ValueError):
+            self.date_value = None
+        self.sphere_id = session_data.get(SPHERE_ID_KEY)
+        self.sphere = _resolve(
+            names, "spheres", self.sphere_id, session_data.get("sphere", "")
+        )
+        self.start_time = session_data.get("start_time", "")
+        self.end_time = session_data.get("end_time", "")
+        self.start_timestamp = session_data.get("start_timestamp", 0)
+        self.total_duration = session_data.get("total_duration", 0)
+        self.active_duration = session_data.get("active_duration", 0)
+        self.break_duration = session_data.get("break_duration", 0)
+        self.session_comments = session_data.get("session_comments", _NO_COMMENTS)
+        for list_name, period_type, single_key, list_key, flag in PERIOD_SOURCES:
+            setattr(
+                self,
+                list_name,
+                tuple(
+                    Period(period, period_type, single_key, list_key, flag, names)
+                    for period in session_data.get(list_name, ())
+                ),
+            )
+        self.extra = _extra(session_data, keys)
+        self.absent = _absent(session_data, keys)
+
+    @property
+    def active_notes(self):
+        return self.session_comments.get("active_notes", "")
+
+    @property
+    def break_notes(self):
+        return self.session_comments.get("break_notes", "")
+
+    @property
+    def idle_notes(self):
+        return self.session_comments.get("idle_notes", "")
+
+    @property
+    def session_notes(self):
+        return self.session_comments.get("session_notes", "")
+
+    def to_dict(self):
+        """Return the stored session dict this Session was built from"""
+        return _to_dict(
+            self,
+            _SESSION_KEYS + tuple(source[0] for source in PERIOD_SOURCES),
+            (
+                self.date,
+                self.sphere,
+                self.sphere_id,
+                self.start_time,
+                self.end_time,
+                self.start_timestamp,
+                self.total_duration,
+                self.active_duration,
+                self.break_duration,
+                self.session_comments,
+                [period.to_dict() for period in self.active],
+                [period.to_dict() for period in self.breaks],
+                [period.to_dict() for period in self.idle_periods],
+            ),
+        )
+
+
+def normalize_session(session_data, names=None):
+    """Read a session dict into a Session (names: optional NameTable)"""
+    return Session(session_data, names)
+
+
+def iter_session_rows(session_id, session_data, session=None):
+    """Yield one flat row per period of a session (SESSION_ROW_FIELDS keys).
+
+    Each active, break and idle period becomes one row; a session without any
+    periods gets a single "session_summary" row. Durations are in seconds.
+
+    Args:
+        session_id: Session name
+        session_data: Session dict from data.json
+        session: Its Session if already available
+    """
+    if session is None:
+        session = normalize_session(session_data)
+    session_fields = {
+        "session_id": session_id,
+        "date": session_data.get("date", ""),
+        "sphere": session.sphere,
+        "session_start_time": session_data.get("start_time", ""),
+        "session_end_time": session_data.get("end_time", ""),
+        "session_total_duration": session_data.get("total_duration", 0),
+        "session_active_duration": session_data.get("active_duration", 0),
+        "session_break_duration": session_data.get("break_duration", 0),
+    }
+    notes_fields = {
+        "active_notes": session.active_notes,
+        "break_notes": session.break_notes,
+        "idle_notes": session.idle_notes,
+        "session_notes": session.session_notes,
+    }
+
+    has_periods = False
+    for list_name, period_type, _, _, _ in PERIOD_SOURCES:
+        for period in getattr(session, list_name):
+            has_periods = True
+            yield {
+                **session_fields,
+                "type": period_type.lower(),
+                "primary_action": period.primary,
+                "primary_percentage": period.primary_percentage,
+                "primary_duration": period.primary_duration,
+                "primary_comment": period.primary_comment,
+                "secondary_action": period.secondary,
+                "secondary_percentage": period.secondary_percentage,
+                "secondary_duration": period.secondary_duration,
+                "secondary_comment": period.secondary_comment,
+                "activity_start": period.start,
+                # Breaks have no recorded end time
+                "activity_end": "" if list_name == "breaks" else period.end,
+                **notes_fields,
+            }
+
+    if not has_periods:
+        yield {
+            **session_fields,
+            "type": "session_summary",
+            "primary_action": "",
+            "primary_percentage": "",
+            "primary_duration": "",
+            "primary_comment": "",
+            "secondary_action": "",
+            "secondary_percentage": "",
+            "secondary_duration": "",
+            "secondary_comment": "",
+            "activity_start": "",
+            "activity_end": "",
+            **notes_fields,
+        }
+
+
+class PeriodModel:
+    """Normalized sessions, cached per session.
+
+    A cached entry is reused while the session dict it was built from is still
+    the one in the session data. The session store replaces (never modifies)
+    the dict of a session that changes, so an identity check is enough to know
+    which sessions need normalizing again.
+
+    With a NameTable (see src.name_table) sphere, project and action names
+    are resolved to their current names; set_names() drops the cache when the
+    names change (a rename only touches settings, not the session dicts).
+    """
+
+    def __init__(self, names=None):
+        self._sessions = {}  # session name -> (session dict, normalized)
+        self.names = names
+
+    def set_names(self, names):
+        """Resolve names through a new NameTable, renormalizing if it changed"""
+        if names != self.names:
+            self.names = names
+            self._sessions.clear()
+
+    def session(self, session_name, session_data):
+        """Return the normalized session, normalizing it if it changed"""
+        entry = self._sessions.get(session_name)
+        if entry is not None and entry[0] is session_data:
+            return entry[1]
+        normalized = normalize_session(session_data, self.names)
+        self._sessions[session_name] = (session_data, normalized)
+        return normalized
+
+    def snapshot(self):
+        """Copy for a query on another thread.
+
+        The copy resolves names with the same NameTable (never modified once
+        built) and starts from this cache, but fills and clears its own, so
+        set_names()/prune() on the original can't change it mid-query.
+        """
+        copy = PeriodModel(self.names)
+        copy._sessions = dict(self._sessions)
+        return copy
+
+    def prune(self, all_data):
+        """Forget sessions that are no longer in the session data"""
+        for session_name in list(self._sessions):
+            if session_name not in all_data:
+                self._sessions.pop(session_name, None)
+
+    def clear(self):
+        """Forget every normalized session"""
+        self._sessions.clear()
+
+    def __len__(self):
+        return len(self._sessions)
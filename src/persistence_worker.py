@@ -0,0 +1,181 @@
+"""
+Persistence Worker Module for Time Tracker
+Single background writer thread for session data. Callers (the Tk thread)
+submit small write jobs to a bounded queue and return immediately; the worker
+coalesces queued jobs and performs the disk I/O, so neither the UI thread nor
+the pynput input hook threads ever block on a slow disk.
+"""
+
+import queue
+import threading
+
+from src.constants import PERSISTENCE_QUEUE_SIZE
+
+
+class _Job:
+    """One queued write"""
+
+    __slots__ = ("key", "payload", "write_batch", "replace", "on_done")
+
+    def __init__(self, key, payload, write_batch, replace, on_done):
+        self.key = key
+        self.payload = payload
+        self.write_batch = write_batch
+        self.replace = replace
+        self.on_done = on_done
+
+
+# Marks an empty queue while draining (None is the stop sentinel)
+_NO_JOB = object()
+
+
+class PersistenceWorker:
+    """Background writer with a bounded queue, write coalescing and flush barrier.
+
+    Jobs with the same key that are queued back to back are written together:
+    append jobs (e.g. journal records) are passed to write_batch as one list so
+    they share a single open/fsync, and replace jobs (e.g. full snapshots) keep
+    only the newest payload. Jobs with different keys are never reordered.
+    """
+
+    def __init__(self, max_queue_size=PERSISTENCE_QUEUE_SIZE, name="PersistenceWorker"):
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._condition = threading.Condition()
+        self._submitted = 0
+        self._completed = 0
+        # Set by the worker thread once it no longer waits for jobs; from then
+        # on submit() writes on the caller's thread
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, key, payload, write_batch, replace=False, on_done=None):
+        """Queue a write and return immediately.
+
+        Blocks only if the queue is full (back-pressure instead of unbounded
+        memory growth).
+
+        Args:
+            key: Jobs with equal keys may be coalesced (e.g. ("journal", path))
+            payload: Data handed to write_batch
+            write_batch: Callable taking a list of payloads and writing them
+            replace: If True, a newer queued payload with the same key
+                supersedes this one instead of being appended after it
+            on_done: Optional callable(error) run on the worker thread after the
+                write; error is None on success
+        """
+        job = _Job(key, payload, write_batch, replace, on_done)
+        with self._condition:
+            self._submitted += 1
+            stopped = self._stopped
+        if stopped:
+            self._process([job])
+            return
+        self._queue.put(job)
+        with self._condition:
+            stopped = self._stopped
+        if stopped:
+            # The worker stopped while the job was being queued - it may have
+            # drained the queue for the last time already
+            self._drain()
+
+    def flush(self, timeout=None):
+        """Wait until every job submitted so far has been written.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if all writes completed, False on timeout
+        """
+        if threading.current_thread() is self._thread:
+            return True
+        with self._condition:
+            target = self._submitted
+            return self._condition.wait_for(
+                lambda: self._completed >= target, timeout=timeout
+            )
+
+    def pending_count(self):
+        """Number of submitted jobs not yet written"""
+        with self._condition:
+            return self._submitted - self._completed
+
+    def stop(self, timeout=None):
+        """Flush outstanding writes and stop the worker thread"""
+        self.flush(timeout)
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass
+        if threading.current_thread() is not self._thread:
+            self._thread.join(timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            job = self._queue.get()
+            batch = []
+            # Take whatever else is already queued so it can be coalesced; jobs
+            # queued after the stop sentinel are still written
+            while job is not _NO_JOB:
+                if job is None:
+                    stopping = True
+                else:
+                    batch.append(job)
+                try:
+                    job = self._queue.get_nowait()
+                except queue.Empty:
+                    job = _NO_JOB
+            if stopping:
+                with self._condition:
+                    self._stopped = True
+            if batch:
+                self._process(batch)
+        self._drain()
+
+    def _drain(self):
+        """Write every job left in the queue (after the worker stopped)"""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if job is not None:
+                self._process([job])
+
+    def _process(self, batch):
+        """Write a drained batch, merging consecutive jobs with the same key"""
+        runs = []
+        for job in batch:
+            if (
+                runs
+                and runs[-1][0].key == job.key
+                and runs[-1][0].replace == job.replace
+            ):
+                runs[-1].append(job)
+            else:
+                runs.append([job])
+
+        for run in runs:
+            first = run[0]
+            if first.replace:
+                payloads = [run[-1].payload]
+            else:
+                payloads = [job.payload for job in run]
+
+            error = None
+            try:
+                first.write_batch(payloads)
+            except Exception as exc:
+                error = exc
+
+            for job in run:
+                if job.on_done is not None:
+                    try:
+                        job.on_done(error)
+                    except Exception:
+                        pass
+            with self._condition:
+                self._completed += len(run)
+                self._condition.notify_all()
@@ -1,6 +1,8 @@
 """
 Screenshot Capture Module for Time Tracker
 Captures screenshots when window focus changes and organizes them by date/session/period.
+The monitor thread only grabs the screen; the timestamp overlay, encoding and
+saving happen on a ScreenshotWriter worker pool (src/screenshot_writer.py).
 """
 
 import os
@@ -13,14 +15,30 @@ import win32process
 import psutil
 
 from src.constants import DEFAULT_SCREENSHOT_FOLDER
+from src.screenshot_dedupe import ScreenshotDeduper, perceptual_hash
+from src.screenshot_encoding import (
+    ScreenshotEncoding,
+    fit_within,
+    thumbnail_path_for,
+)
+from src.screenshot_manifest import remove_screenshots, write_period_screenshots
+from src.screenshot_writer import ScreenshotWriter
 
 
 class ScreenshotCapture:
     """Handles screenshot capture on window focus changes"""
 
-    def __init__(self, settings, data_file_path):
+    def __init__(self, settings, data_file_path, index=None):
+        """
+        Args:
+            settings: Full settings dictionary
+            data_file_path: Path of data.json (relative_path is relative to it)
+            index: Optional ScreenshotIndex told about every saved screenshot,
+                for the retention limits (src/screenshot_retention.py)
+        """
         self.settings = settings
         self.data_file_path = data_file_path
+        self.index = index
 
         # Screenshot settings
         self.enabled = self.settings.get("screenshot_settings", {}).get(
@@ -35,6 +53,10 @@ class ScreenshotCapture:
         self.screenshot_base_path = self.settings.get("screenshot_settings", {}).get(
             "screenshot_path", DEFAULT_SCREENSHOT_FOLDER
         )
+        # Format, quality, maximum size and thumbnails of saved screenshots
+        self.encoding = ScreenshotEncoding(self.settings.get("screenshot_settings"))
+        # Skips saving captures that look like the last one of the period
+        self.deduper = ScreenshotDeduper(self.settings.get("screenshot_settings"))
 
         # State tracking
         self.monitoring = False
@@ -51,6 +73,13 @@ class ScreenshotCapture:
         self.current_period_screenshots = (
             []
         )  # List of screenshot info for current period
+        # Guards the period lists - the monitor thread appends, writer threads
+        # remove captures that were dropped or failed to save
+        self.screenshots_lock = threading.Lock()
+
+        # Encodes and saves grabbed screenshots off the monitor thread
+        self.writer = ScreenshotWriter()
+        self.failed_captures = 0  # Captures dropped or not saved
 
     def start_monitoring(self):
         """Start monitoring window focus changes"""
@@ -75,7 +104,9 @@ class ScreenshotCapture:
         self.current_session_key = session_key
         self.current_period_type = period_type
         self.current_period_index = period_index
-        self.current_period_screenshots = []  # Reset screenshot list for new period
+        with self.screenshots_lock:
+            self.current_period_screenshots = []  # Reset list for new period
+            self.deduper.reset()
 
         # Create folder structure: screenshots/YYYY-MM-DD/session_<timestamp>/period_<type>_<index>/
         if session_key:
@@ -136,7 +167,12 @@ class ScreenshotCapture:
         return False
 
     def capture_screenshot(self):
-        """Capture a screenshot and save it to the current period folder"""
+        """Grab a screenshot and queue it for saving to the current period folder.
+
+        Returns as soon as the screen is grabbed. The returned info is part of
+        get_current_period_screenshots() right away; the file appears once a
+        writer thread has saved it.
+        """
         if not self.current_screenshot_folder:
             return None
 
@@ -149,55 +185,22 @@ class ScreenshotCapture:
 
             # Capture screenshot
             screenshot = ImageGrab.grab()
-
-            # Add timestamp overlay to bottom left
-            draw = ImageDraw.Draw(screenshot)
-            timestamp_display = datetime.now().strftime("%m/%d/%Y %I:%M:%S %p")
-
-            # Try to use a nice font, fallback to default if not available
-            try:
-                font = ImageFont.truetype("arial.ttf", 16)
-            except:
-                font = ImageFont.load_default()
-
-            # Calculate text size for background rectangle
-            bbox = draw.textbbox((0, 0), timestamp_display, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-
-            # Get image height for bottom left positioning
-            _, img_height = screenshot.size
-
-            # Draw semi-transparent background rectangle at bottom left
-            padding = 8
-            y_position = img_height - text_height - padding * 2
-            draw.rectangle(
-                [(0, y_position), (text_width + padding * 2, img_height)],
-                fill=(0, 0, 0, 100),
-            )
-
-            # Draw timestamp text in white at bottom left
-            draw.text(
-                (padding, y_position + padding),
-                timestamp_display,
-                fill=(255, 255, 255),
-                font=font,
-            )
+            captured_at = datetime.now()
 
             # Generate filename with timestamp and window info
-            timestamp_str = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp_str = captured_at.strftime("%Y%m%d_%H%M%S")
             # Sanitize window title for filename
             safe_title = "".join(
                 c if c.isalnum() or c in (" ", "-", "_") else "_" for c in window_title
             )
             safe_title = safe_title[:50]  # Limit length
 
-            filename = f"{timestamp_str}_{process_name}_{safe_title}.png"
+            encoding = self.encoding
+            filename = (
+                f"{timestamp_str}_{process_name}_{safe_title}{encoding.extension}"
+            )
             filepath = os.path.join(self.current_screenshot_folder, filename)
 
-            # Save screenshot
-            screenshot.save(filepath, "PNG", optimize=True)
-
             # Update state
             self.last_capture_time = time.time()
             self.last_window_title = window_title
@@ -213,14 +216,184 @@ class ScreenshotCapture:
                 "process_name": process_name,
             }
 
+            # A near-duplicate of the period's last saved capture is skipped,
+            # or listed with the earlier file instead of saving a new one
+            fingerprint = None
+            if self.deduper.enabled:
+                fingerprint = perceptual_hash(screenshot)
+                with self.screenshots_lock:
+                    earlier = self.deduper.check(self.current_session_key, fingerprint)
+                    if earlier is not None:
+                        if self.deduper.mode == "skip":
+                            return None
+                        screenshot_info["filepath"] = earlier["filepath"]
+                        screenshot_info["relative_path"] = earlier["relative_path"]
+                        screenshot_info["duplicate_of"] = earlier["timestamp"]
+                        self.current_period_screenshots.append(screenshot_info)
+                        if self.index is not None:
+                            self.index.add_reference(earlier["filepath"])
+                        return screenshot_info
+
             # Add to current period's screenshot list
-            self.current_period_screenshots.append(screenshot_info)
+            with self.screenshots_lock:
+                period_screenshots = self.current_period_screenshots
+                period_screenshots.append(screenshot_info)
+                if fingerprint is not None:
+                    self.deduper.remember(fingerprint, screenshot_info)
+
+            self.writer.submit(
+                screenshot,
+                lambda image: self._save_screenshot(
+                    image, filepath, captured_at, encoding
+                ),
+                on_done=lambda error: self._on_screenshot_saved(
+                    period_screenshots, screenshot_info, error
+                ),
+            )
 
             return screenshot_info
 
         except Exception as error:
             return None
 
+    def _save_screenshot(self, screenshot, filepath, captured_at, encoding):
+        """Scale down, draw the timestamp overlay and save the file and its
+        thumbnail (writer thread)"""
+        # Scale down first so the overlay text keeps its size
+        screenshot = fit_within(screenshot, encoding.max_dimension)
+
+        # Add timestamp overlay to bottom left
+        draw = ImageDraw.Draw(screenshot)
+        timestamp_display = captured_at.strftime("%m/%d/%Y %I:%M:%S %p")
+
+        # Try to use a nice font, fallback to default if not available
+        try:
+            font = ImageFont.truetype("arial.ttf", 16)
+        except:
+            font = ImageFont.load_default()
+
+        # Calculate text size for background rectangle
+        bbox = draw.textbbox((0, 0), timestamp_display, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+
+        # Get image height for bottom left positioning
+        _, img_height = screenshot.size
+
+        # Draw semi-transparent background rectangle at bottom left
+        padding = 8
+        y_position = img_height - text_height - padding * 2
+        draw.rectangle(
+            [(0, y_position), (text_width + padding * 2, img_height)],
+            fill=(0, 0, 0, 100),
+        )
+
+        # Draw timestamp text in white at bottom left
+        draw.text(
+            (padding, y_position + padding),
+            timestamp_display,
+            fill=(255, 255, 255),
+            font=font,
+        )
+
+        # Save screenshot; temp files keep half-written images out of view
+        _save_via_temp_file(filepath, lambda target: encoding.save(screenshot, target))
+
+        # A missing thumbnail is not worth losing the screenshot over
+        thumbnail_file = thumbnail_path_for(filepath)
+        try:
+            if encoding.thumbnail_size:
+                os.makedirs(os.path.dirname(thumbnail_file), exist_ok=True)
+                _save_via_temp_file(
+                    thumbnail_file,
+                    lambda target: encoding.save_thumbnail(screenshot, target),
+                )
+        except Exception:
+            pass
+
+        if self.index is not None:
+            size = os.path.getsize(filepath)
+            if os.path.exists(thumbnail_file):
+                size += os.path.getsize(thumbnail_file)
+            self.index.add(filepath, size, captured_at.timestamp())
+
+    def _on_screenshot_saved(self, period_screenshots, screenshot_info, error):
+        """Writer callback: forget a capture that was dropped or not saved,
+        along with near-duplicates listed with its file.
+
+        If its period was already written to the session manifest (see
+        write_period_manifest), the entries are removed there too.
+        """
+        if error is None:
+            return
+        filepath = screenshot_info["filepath"]
+        with self.screenshots_lock:
+            self.failed_captures += 1
+            period_screenshots[:] = [
+                info for info in period_screenshots if info["filepath"] != filepath
+            ]
+            self.deduper.forget(screenshot_info)
+            try:
+                remove_screenshots([filepath], os.path.dirname(self.data_file_path))
+            except OSError:
+                pass  # The entry points at a missing file, as a deleted one would
+
+    def write_period_manifest(self, start_timestamp):
+        """Store the current period's screenshot list in the session manifest
+        (see src.screenshot_manifest).
+
+        Captures still queued for saving are included; one that is dropped or
+        fails to save later is removed from the manifest again. Both happen
+        under screenshots_lock, so a failure can't slip in between copying
+        the list and writing it.
+
+        Args:
+            start_timestamp: The period's start_timestamp
+
+        Returns:
+            str or None: Path of the manifest, or None if the period has no
+            screenshots
+
+        Raises:
+            OSError: If the manifest could not be written
+        """
+        with self.screenshots_lock:
+            if (
+                not self.current_period_screenshots
+                or not self.current_screenshot_folder
+            ):
+                return None
+            return write_period_screenshots(
+                self.current_screenshot_folder,
+                start_timestamp,
+                list(self.current_period_screenshots),
+            )
+
+    def dedupe_stats(self, session_key):
+        """How many of a session's captures were near-duplicates.
+
+        Returns:
+            dict or None: {"captures", "duplicates", "ratio"}, or None if no
+            screenshot was compared in the session (or dedupe is off)
+        """
+        with self.screenshots_lock:
+            return self.deduper.stats(session_key)
+
+    def pending_count(self):
+        """Number of grabbed screenshots not saved yet"""
+        return self.writer.pending_count()
+
+    def flush(self, timeout=None):
+        """Wait until every grabbed screenshot has been saved (or dropped).
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if nothing is left to save, False on timeout
+        """
+        return self.writer.flush(timeout)
+
     def _monitor_loop(self):
         """Main monitoring loop that checks for window focus changes"""
         while self.monitoring:
@@ -262,8 +435,9 @@ class ScreenshotCapture:
         """Get defensive copy of screenshots captured for current period.
 
         Returns list of screenshot file paths captured since the current period
-        started. Returns a copy to prevent external code from modifying the
-        internal list.
+        started, including captures still queued for saving. Captures dropped
+        from a full queue or that failed to save are removed from the list.
+        Returns a copy to prevent external code from modifying the internal list.
 
         Called from:
         - Screenshot display in completion frame
@@ -278,9 +452,10 @@ class ScreenshotCapture:
             Returns defensive copy via .copy() to prevent external mutation.
             List is reset to empty when new_period() is called.
         """
-        return (
-            self.current_period_screenshots.copy()
-        )  # Return a copy to avoid external modification
+        with self.screenshots_lock:
+            return (
+                self.current_period_screenshots.copy()
+            )  # Return a copy to avoid external modification
 
     def update_settings(self, new_settings):
         """Update screenshot capture settings from new settings dictionary.
@@ -297,6 +472,12 @@ class ScreenshotCapture:
         - capture_on_focus_change: True - Capture when switching windows
         - min_seconds_between_captures: 10 - Rate limiting
         - screenshot_path: "screenshots" - Base folder path
+        - image_format: "png" - "png", "jpeg" or "webp"
+        - image_quality: 80 - JPEG/WebP quality
+        - max_dimension: 0 - Longest side in pixels (0 = full resolution)
+        - thumbnail_size: 320 - Thumbnail longest side (0 = no thumbnails)
+        - dedupe_mode: "reference" - "reference", "skip" or "off"
+        - dedupe_similarity: 97 - % of matching hash bits for a near-duplicate
 
         Args:
             new_settings: Full settings dictionary from settings.json
@@ -322,9 +503,23 @@ class ScreenshotCapture:
         self.screenshot_base_path = self.settings.get("screenshot_settings", {}).get(
             "screenshot_path", "screenshots"
         )
+        self.encoding = ScreenshotEncoding(self.settings.get("screenshot_settings"))
+        self.deduper.configure(self.settings.get("screenshot_settings"))
 
         # Restart monitoring if needed
         if self.enabled and not self.monitoring:
             self.start_monitoring()
         elif not self.enabled and self.monitoring:
             self.stop_monitoring()
+
+
+def _save_via_temp_file(filepath, save):
+    """Call save(temp path), then move the finished file into place"""
+    temp_file = f"{filepath}.tmp"
+    try:
+        save(temp_file)
+        os.replace(temp_file, filepath)
+    except Exception:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
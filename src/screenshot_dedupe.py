@@ -0,0 +1,135 @@
+"""
+Screenshot Dedupe Module for Time Tracker
+Fingerprints screenshots with a difference hash (dHash) so near-identical
+captures - the same document on screen for an hour of timer captures - can be
+recognised without comparing pixels. The hash is computed on a small grayscale
+copy, which takes a few milliseconds even for a 4K capture.
+"""
+
+from PIL import Image
+
+from src.constants import SCREENSHOT_DEDUPE_SIMILARITY, SCREENSHOT_HASH_SIZE
+
+DEDUPE_MODES = ("reference", "skip", "off")
+
+
+def perceptual_hash(image, hash_size=SCREENSHOT_HASH_SIZE):
+    """Difference hash of an image.
+
+    The image is shrunk to (hash_size + 1) x hash_size grayscale pixels and
+    each bit records whether a pixel is brighter than its right neighbour, so
+    small changes (a clock, the cursor) keep the hash but a different layout
+    doesn't.
+
+    Returns:
+        int: hash_size * hash_size bit fingerprint
+    """
+    width, height = image.size
+    # Integer reduce first - much cheaper than resampling the full frame
+    factor = max(1, min(width, height) // (hash_size * 4))
+    small = image.reduce(factor) if factor > 1 else image
+    pixels = list(
+        small.convert("L")
+        .resize((hash_size + 1, hash_size), Image.Resampling.BOX)
+        .tobytes()
+    )
+    fingerprint = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for column in range(hash_size):
+            fingerprint = (fingerprint << 1) | (
+                pixels[offset + column] > pixels[offset + column + 1]
+            )
+    return fingerprint
+
+
+def similarity(first, second, hash_size=SCREENSHOT_HASH_SIZE):
+    """Share of matching bits between two hashes, 0-100"""
+    differing = bin(first ^ second).count("1")
+    return 100 * (1 - differing / (hash_size * hash_size))
+
+
+class ScreenshotDeduper:
+    """Compares each capture with the last one saved in the current period.
+
+    Attributes:
+        mode: "reference" - a near-duplicate is listed with the earlier file
+                instead of saving a new one
+              "skip" - a near-duplicate is not listed or saved at all
+              "off" - every capture is saved
+        min_similarity: Percent of matching hash bits from which a capture
+            counts as a near-duplicate
+    """
+
+    def __init__(self, screenshot_settings=None):
+        self.last_hash = None  # Hash of the last saved capture of this period
+        self.last_info = None  # Its screenshot info
+        self.session_counts = {}  # session key -> [captures, duplicates]
+        self.configure(screenshot_settings)
+
+    def configure(self, screenshot_settings):
+        """Read the dedupe_mode and dedupe_similarity settings"""
+        screenshot_settings = screenshot_settings or {}
+        mode = screenshot_settings.get("dedupe_mode", DEDUPE_MODES[0])
+        self.mode = mode if mode in DEDUPE_MODES else DEDUPE_MODES[0]
+        try:
+            min_similarity = float(
+                screenshot_settings.get(
+                    "dedupe_similarity", SCREENSHOT_DEDUPE_SIMILARITY
+                )
+            )
+        except (TypeError, ValueError):
+            min_similarity = SCREENSHOT_DEDUPE_SIMILARITY
+        self.min_similarity = min(100.0, max(0.0, min_similarity))
+
+    @property
+    def enabled(self):
+        return self.mode != "off"
+
+    def reset(self):
+        """Forget the last capture (a new period started)"""
+        self.last_hash = None
+        self.last_info = None
+
+    def check(self, session_key, fingerprint):
+        """Count a capture and return the saved capture it duplicates.
+
+        Returns:
+            dict or None: Screenshot info of the earlier capture, or None if
+            this one is different enough to be saved
+        """
+        counts = self.session_counts.setdefault(session_key, [0, 0])
+        counts[0] += 1
+        if (
+            self.last_hash is not None
+            and similarity(self.last_hash, fingerprint) >= self.min_similarity
+        ):
+            counts[1] += 1
+            return self.last_info
+        return None
+
+    def remember(self, fingerprint, screenshot_info):
+        """Record a capture that is being saved as the one to compare with"""
+        self.last_hash = fingerprint
+        self.last_info = screenshot_info
+
+    def forget(self, screenshot_info):
+        """Stop comparing with a capture that could not be saved"""
+        if self.last_info is screenshot_info:
+            self.reset()
+
+    def stats(self, session_key):
+        """Dedupe counts of a session.
+
+        Returns:
+            dict or None: {"captures", "duplicates", "ratio"}, or None if
+            nothing was captured in the session
+        """
+        captures, duplicates = self.session_counts.get(session_key, (0, 0))
+        if not captures:
+            return None
+        return {
+            "captures": captures,
+            "duplicates": duplicates,
+            "ratio": round(duplicates / captures, 3),
+        }
@@ -0,0 +1,147 @@
+"""
+Screenshot Encoding Module for Time Tracker
+Turns the screenshot_settings image options (format, quality, maximum size,
+thumbnails) into how a captured screenshot is saved. Kept free of the Windows
+capture APIs so encoding can be tested and benchmarked anywhere
+(see tests/benchmark_screenshot_encoding.py).
+"""
+
+import os
+
+from PIL import Image, features
+
+from src.constants import (
+    SCREENSHOT_DEFAULT_FORMAT,
+    SCREENSHOT_DEFAULT_QUALITY,
+    SCREENSHOT_DEFAULT_THUMBNAIL_SIZE,
+    SCREENSHOT_THUMBNAIL_FOLDER,
+    SCREENSHOT_THUMBNAIL_QUALITY,
+)
+
+# Setting value -> (PIL format, file extension)
+IMAGE_FORMATS = {
+    "png": ("PNG", ".png"),
+    "jpeg": ("JPEG", ".jpg"),
+    "webp": ("WEBP", ".webp"),
+}
+
+
+def available_formats():
+    """Image formats this Pillow build can write, in IMAGE_FORMATS order"""
+    return [name for name in IMAGE_FORMATS if name != "webp" or features.check("webp")]
+
+
+class ScreenshotEncoding:
+    """How screenshots are saved, read from the screenshot settings.
+
+    Attributes:
+        image_format: "png", "jpeg" or "webp" (falls back to PNG if the setting
+            is unknown or this Pillow build can't write it)
+        quality: 1-100, used by JPEG and WebP
+        max_dimension: Longest side in pixels; larger captures are scaled
+            down to fit (0 = keep full resolution)
+        thumbnail_size: Longest side of the thumbnail saved next to each
+            capture (0 = no thumbnails)
+    """
+
+    def __init__(self, screenshot_settings=None):
+        screenshot_settings = screenshot_settings or {}
+        image_format = str(
+            screenshot_settings.get("image_format", SCREENSHOT_DEFAULT_FORMAT)
+        ).lower()
+        if image_format == "jpg":
+            image_format = "jpeg"
+        if image_format not in available_formats():
+            image_format = SCREENSHOT_DEFAULT_FORMAT
+        self.image_format = image_format
+        self.quality = _int_setting(
+            screenshot_settings.get("image_quality"), SCREENSHOT_DEFAULT_QUALITY, 1, 100
+        )
+        self.max_dimension = _int_setting(
+            screenshot_settings.get("max_dimension"), 0, 0
+        )
+        self.thumbnail_size = _int_setting(
+            screenshot_settings.get("thumbnail_size"),
+            SCREENSHOT_DEFAULT_THUMBNAIL_SIZE,
+            0,
+        )
+
+    @property
+    def extension(self):
+        """File extension of saved screenshots, e.g. ".webp" """
+        return IMAGE_FORMATS[self.image_format][1]
+
+    def save(self, image, target):
+        """Scale down if needed and encode the screenshot.
+
+        Args:
+            image: PIL image as captured
+            target: File path or binary file object
+
+        Returns:
+            PIL image that was saved (scaled down if max_dimension applies),
+            for making the thumbnail from
+        """
+        image = fit_within(image, self.max_dimension)
+        _encode(image, target, self.image_format, self.quality)
+        return image
+
+    def save_thumbnail(self, image, target):
+        """Save a small JPEG copy of a screenshot, if thumbnails are enabled.
+
+        Returns:
+            bool: True if a thumbnail was saved
+        """
+        if not self.thumbnail_size:
+            return False
+        thumbnail = fit_within(image, self.thumbnail_size)
+        _encode(thumbnail, target, "jpeg", SCREENSHOT_THUMBNAIL_QUALITY)
+        return True
+
+
+def thumbnail_path_for(filepath):
+    """Thumbnail file of a screenshot: <period folder>/thumbnails/<name>.jpg"""
+    folder, filename = os.path.split(filepath)
+    name = os.path.splitext(filename)[0]
+    return os.path.join(folder, SCREENSHOT_THUMBNAIL_FOLDER, f"{name}.jpg")
+
+
+def fit_within(image, max_dimension):
+    """Return image scaled down so its longest side is at most max_dimension.
+
+    Returns the image itself if it already fits or max_dimension is 0.
+    """
+    width, height = image.size
+    longest = max(width, height)
+    if not max_dimension or longest <= max_dimension:
+        return image
+    scale = max_dimension / longest
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    # Box (area average) keeps text readable when shrinking and is about 4x
+    # faster than LANCZOS on a 4K frame
+    return image.resize(size, Image.Resampling.BOX)
+
+
+def _encode(image, target, image_format, quality):
+    pil_format = IMAGE_FORMATS[image_format][0]
+    if image_format == "png":
+        image.save(target, pil_format, optimize=True)
+        return
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    if image_format == "jpeg":
+        image.save(target, pil_format, quality=quality, optimize=True)
+    else:
+        # method 2 of 0-6: about 5% larger files than the default (4) in half
+        # the time (see tests/benchmark_screenshot_encoding.py)
+        image.save(target, pil_format, quality=quality, method=2)
+
+
+def _int_setting(value, default, low, high=None):
+    """Setting value as an int within [low, high]; missing or invalid -> default"""
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        return default
+    value = max(low, value)
+    return value if high is None else min(high, value)
@@ -0,0 +1,229 @@
+"""
+Screenshot Manifest Module for Time Tracker
+Screenshot metadata (file, capture time, window title and process of every
+capture) is kept in a manifest.json in each session's screenshot folder rather
+than in data.json, so heavy screenshot use doesn't grow the file every load
+has to parse. A period only stores the manifest's path ("screenshot_manifest",
+relative to data.json) and finds its list there by its start timestamp; the
+list is read when a view needs it.
+
+Sessions saved with inline "screenshots" lists are moved over once by
+migrate_screenshot_manifests().
+"""
+
+import json
+import os
+import threading
+
+from src.atomic_writer import write_json_atomic
+from src.constants import SCREENSHOT_MANIFEST_FILE, SCREENSHOT_MANIFEST_FORMAT_VERSION
+from src.period_model import PERIOD_SOURCES
+
+# Settings flag: inline screenshot lists have been moved to manifests
+SCREENSHOT_MANIFESTS_MIGRATED_KEY = "screenshot_manifests_migrated"
+
+# Manifests are written on the Tk thread and edited by screenshot retention
+_manifest_lock = threading.Lock()
+
+
+def manifest_path_for(period_folder):
+    """Manifest of the session a period's screenshot folder belongs to"""
+    session_folder = os.path.dirname(os.path.normpath(period_folder))
+    return os.path.join(session_folder, SCREENSHOT_MANIFEST_FILE)
+
+
+def screenshot_file(screenshot_info, data_dir):
+    """Path of a screenshot's file (relative_path is relative to data_dir)"""
+    if screenshot_info.get("relative_path"):
+        return os.path.join(data_dir, screenshot_info["relative_path"])
+    return screenshot_info.get("filepath", "")
+
+
+def read_manifest(manifest_file):
+    """Read the period records of a manifest.
+
+    Returns:
+        list: {"folder", "start_timestamp", "screenshots"} records, or an
+        empty list if the manifest is missing or unreadable
+    """
+    try:
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            periods = json.load(f)["periods"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+    return periods if isinstance(periods, list) else []
+
+
+def write_period_screenshots(period_folder, start_timestamp, screenshots):
+    """Store a period's screenshot list in its session manifest.
+
+    Saving a period again (same start timestamp) replaces its list.
+
+    Args:
+        period_folder: The period's screenshot folder
+        start_timestamp: The period's start_timestamp
+        screenshots: Screenshot info dicts of the period
+
+    Returns:
+        str: Path of the manifest
+
+    Raises:
+        OSError: If the manifest could not be written
+    """
+    manifest_file = manifest_path_for(period_folder)
+    record = {
+        "folder": os.path.basename(os.path.normpath(period_folder)),
+        "start_timestamp": start_timestamp,
+        "screenshots": screenshots,
+    }
+    with _manifest_lock:
+        periods = [
+            period
+            for period in read_manifest(manifest_file)
+            if period.get("start_timestamp") != start_timestamp
+        ]
+        periods.append(record)
+        os.makedirs(os.path.dirname(manifest_file) or os.curdir, exist_ok=True)
+        _write_manifest(manifest_file, periods)
+    return manifest_file
+
+
+def load_period_screenshots(period, data_dir, cache=None):
+    """Screenshot list of a saved period.
+
+    Args:
+        period: Period dict with "screenshot_manifest" and "start_timestamp"
+            (or an inline "screenshots" list from before manifests)
+        data_dir: Folder of data.json
+        cache: Optional dict of manifests already read, by path - pass the
+            same dict when loading several periods of a session
+
+    Returns:
+        list: Screenshot info dicts ([] if none)
+    """
+    if period.get("screenshots"):
+        return period["screenshots"]
+    if not period.get("screenshot_manifest"):
+        return []
+    manifest_file = os.path.join(data_dir, period["screenshot_manifest"])
+    if cache is None:
+        periods = read_manifest(manifest_file)
+    elif manifest_file in cache:
+        periods = cache[manifest_file]
+    else:
+        periods = cache[manifest_file] = read_manifest(manifest_file)
+    for record in periods:
+        if record.get("start_timestamp") == period.get("start_timestamp"):
+            return record.get("screenshots") or []
+    return []
+
+
+def remove_screenshots(paths, data_dir):
+    """Drop deleted screenshot files from their session manifests.
+
+    Every entry using a deleted file goes, near-duplicates included. A
+    manifest left without screenshots is removed with its emptied folders.
+
+    Args:
+        paths: Paths of the deleted screenshot files
+        data_dir: Folder of data.json
+
+    Returns:
+        int: Number of entries removed
+    """
+    deleted = {_normalized(path) for path in paths}
+    removed = 0
+    with _manifest_lock:
+        for manifest_file in {manifest_path_for(os.path.dirname(p)) for p in paths}:
+            periods = read_manifest(manifest_file)
+            count = 0
+            for record in periods:
+                screenshots = record.get("screenshots") or []
+                record["screenshots"] = [
+                    info
+                    for info in screenshots
+                    if _normalized(screenshot_file(info, data_dir)) not in deleted
+                ]
+                count += len(screenshots) - len(record["screenshots"])
+            if not count:
+                continue
+            removed += count
+            if any(record["screenshots"] for record in periods):
+                _write_manifest(manifest_file, periods)
+            else:
+                _remove_manifest(manifest_file)
+    return removed
+
+
+def migrate_screenshot_manifests(all_data, data_dir):
+    """Move inline period "screenshots" lists into session manifests.
+
+    Periods whose screenshot folder can't be told, or whose manifest can't be
+    written, keep their inline list.
+
+    Args:
+        all_data: Session data (modified in place)
+        data_dir: Folder of data.json
+
+    Returns:
+        list: Names of the sessions that were changed
+    """
+    changed = []
+    for session_name, session_data in all_data.items():
+        if not isinstance(session_data, dict):
+            continue
+        moved = False
+        for list_name, _, _, _, _ in PERIOD_SOURCES:
+            for period in session_data.get(list_name) or []:
+                if _move_to_manifest(period, data_dir):
+                    moved = True
+        if moved:
+            changed.append(session_name)
+    return changed
+
+
+def _move_to_manifest(period, data_dir):
+    """Move one period's inline list to its manifest; False if left inline"""
+    screenshots = period.get("screenshots")
+    if not screenshots or not isinstance(screenshots, list):
+        return False
+    if period.get("screenshot_folder"):
+        period_folder = os.path.join(data_dir, period["screenshot_folder"])
+    elif isinstance(screenshots[0], dict) and screenshot_file(screenshots[0], data_dir):
+        period_folder = os.path.dirname(screenshot_file(screenshots[0], data_dir))
+    else:
+        return False
+    try:
+        manifest_file = write_period_screenshots(
+            period_folder, period.get("start_timestamp", 0), screenshots
+        )
+    except OSError:
+        return False
+    period["screenshot_manifest"] = os.path.relpath(manifest_file, data_dir)
+    del period["screenshots"]
+    return True
+
+
+def _write_manifest(manifest_file, periods):
+    write_json_atomic(
+        manifest_file,
+        {"format": SCREENSHOT_MANIFEST_FORMAT_VERSION, "periods": periods},
+    )
+
+
+def _remove_manifest(manifest_file):
+    """Delete a manifest and the session and date folders it leaves empty"""
+    try:
+        os.remove(manifest_file)
+    except OSError:
+        return
+    session_folder = os.path.dirname(manifest_file)
+    for folder in (session_folder, os.path.dirname(session_folder)):
+        try:
+            os.rmdir(folder)
+        except OSError:
+            return  # Not empty
+
+
+def _normalized(path):
+    return os.path.normcase(os.path.abspath(path))
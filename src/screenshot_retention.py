@@ -0,0 +1,412 @@
+"""
+Screenshot Retention Module for Time Tracker
+Keeps the screenshots/ tree within the retention settings: a maximum total
+size, a maximum age and a number of captures kept per period.
+
+ScreenshotIndex records the size, capture time and reference count of every
+saved screenshot, so quota checks are done in memory instead of walking the
+tree. It is saved as index.json in the screenshot folder; on the next start
+only date folders from the day it was saved onwards are scanned for files it
+doesn't know yet.
+
+ScreenshotRetention runs the checks on a low-priority background thread that
+deletes in small batches, and reports evicted files so the tracker can drop
+them from the periods' screenshot lists.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from src.atomic_writer import write_text_atomic
+from src.constants import (
+    SCREENSHOT_INDEX_FILE,
+    SCREENSHOT_INDEX_FORMAT_VERSION,
+    SCREENSHOT_MANIFEST_FILE,
+    SCREENSHOT_RETENTION_BATCH,
+    SCREENSHOT_RETENTION_BATCH_PAUSE_SECONDS,
+    SCREENSHOT_RETENTION_INTERVAL_SECONDS,
+    SCREENSHOT_RETENTION_START_DELAY_SECONDS,
+    SCREENSHOT_THUMBNAIL_FOLDER,
+    SECONDS_PER_HOUR,
+)
+from src.screenshot_encoding import thumbnail_path_for
+
+# Index entry fields: [size in bytes (with thumbnail), capture time, references]
+SIZE, CREATED, REFERENCES = 0, 1, 2
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+class ScreenshotIndex:
+    """Running index of the saved screenshots below one folder.
+
+    Keys are paths relative to the folder with "/" separators, e.g.
+    "2026-02-16/session_143022/period_active_0/20260216_143100_x.png".
+    Loaded on first use; safe to use from several threads.
+    """
+
+    def __init__(self, base_path):
+        self.base_path = base_path
+        self.index_file = os.path.join(base_path, SCREENSHOT_INDEX_FILE)
+        self._files = None  # key -> [size, created, references], once loaded
+        self._total_bytes = 0
+        self._dirty = False
+        # References to screenshots still being saved, counted once added
+        self._pending_references = {}
+        self._lock = threading.RLock()
+
+    def key_for(self, path):
+        """Index key of a screenshot path, or None if it isn't below the folder"""
+        relative = os.path.relpath(
+            os.path.abspath(path), os.path.abspath(self.base_path)
+        )
+        if relative == os.curdir or relative.startswith(os.pardir):
+            return None
+        return relative.replace(os.sep, "/")
+
+    def path_for(self, key):
+        """Screenshot path of an index key"""
+        return os.path.join(self.base_path, *key.split("/"))
+
+    def add(self, path, size, created):
+        """Record a saved screenshot (size including its thumbnail)"""
+        key = self.key_for(path)
+        if key is None:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._files.get(key)
+            references = entry[REFERENCES] if entry else 1
+            references += self._pending_references.pop(key, 0)
+            self._set(key, [size, created, references])
+
+    def add_reference(self, path):
+        """Count another period entry (a near-duplicate) listing a screenshot"""
+        key = self.key_for(path)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._files.get(key)
+            if entry is not None:
+                entry[REFERENCES] += 1
+                self._dirty = True
+            elif key is not None:
+                self._pending_references[key] = self._pending_references.get(key, 0) + 1
+
+    def remove(self, key):
+        """Forget a screenshot"""
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._files.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry[SIZE]
+                self._dirty = True
+
+    def total_bytes(self):
+        """Size of all indexed screenshots and thumbnails"""
+        with self._lock:
+            self._ensure_loaded()
+            return self._total_bytes
+
+    def entries(self):
+        """Copy of the index as a list of (key, size, created, references)"""
+        with self._lock:
+            self._ensure_loaded()
+            return [(key, *entry) for key, entry in self._files.items()]
+
+    def save(self):
+        """Write the index to index.json if it changed"""
+        with self._lock:
+            if self._files is None or not self._dirty:
+                return
+            text = json.dumps(
+                {
+                    "format": SCREENSHOT_INDEX_FORMAT_VERSION,
+                    "saved_at": time.time(),
+                    "files": self._files,
+                },
+                separators=(",", ":"),
+            )
+            os.makedirs(self.base_path, exist_ok=True)
+            write_text_atomic(self.index_file, text)
+            self._dirty = False
+
+    def _set(self, key, entry):
+        old = self._files.get(key)
+        if old is not None:
+            self._total_bytes -= old[SIZE]
+        self._files[key] = entry
+        self._total_bytes += entry[SIZE]
+        self._dirty = True
+
+    def _ensure_loaded(self):
+        """Read index.json and scan for newer files, once (lock held)"""
+        if self._files is not None:
+            return
+        self._files = {}
+        saved_at = None
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format") == SCREENSHOT_INDEX_FORMAT_VERSION:
+                for key, entry in data["files"].items():
+                    self._set(key, [entry[SIZE], entry[CREATED], entry[REFERENCES]])
+                saved_at = float(data["saved_at"])
+                self._dirty = False
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, IndexError):
+            self._files = {}
+            self._total_bytes = 0
+        # Screenshots saved after the index (e.g. before a crash) can only be in
+        # date folders from that day on; without an index, scan everything
+        since = None
+        if saved_at is not None:
+            since = datetime.fromtimestamp(saved_at).strftime("%Y-%m-%d")
+        self._scan(since)
+
+    def _scan(self, since):
+        """Add screenshots missing from the index (lock held)"""
+        try:
+            date_folders = os.listdir(self.base_path)
+        except OSError:
+            return
+        for date_folder in date_folders:
+            date_dir = os.path.join(self.base_path, date_folder)
+            if (since is not None and date_folder < since) or not os.path.isdir(
+                date_dir
+            ):
+                continue
+            for root, dirs, names in os.walk(date_dir):
+                dirs[:] = [name for name in dirs if name != SCREENSHOT_THUMBNAIL_FOLDER]
+                for name in names:
+                    path = os.path.join(root, name)
+                    key = self.key_for(path)
+                    if (
+                        name.endswith(".tmp")
+                        or name == SCREENSHOT_MANIFEST_FILE
+                        or key in self._files
+                    ):
+                        continue
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    size = stat.st_size + _file_size(thumbnail_path_for(path))
+                    self._set(key, [size, stat.st_mtime, 1])
+
+
+class ScreenshotRetention:
+    """Evicts screenshots beyond the retention settings.
+
+    Settings (screenshot_settings, 0 = no limit):
+    - max_total_size_mb: Oldest days are thinned out first, and within a day
+      the screenshots fewest period entries refer to
+    - max_age_days: Screenshots captured longer ago are removed
+    - keep_per_period: Only this many screenshots are kept per period - the
+      most referenced, then the newest
+
+    Screenshots in the folder returned by protected_folder() (the running
+    session) are never removed.
+    """
+
+    def __init__(self, index, settings=None, on_evicted=None, protected_folder=None):
+        """
+        Args:
+            index: ScreenshotIndex of the screenshot folder
+            settings: Full settings dictionary
+            on_evicted: Optional callable(list of removed screenshot paths),
+                run on the retention thread
+            protected_folder: Optional callable returning a folder to leave
+                alone, or None
+        """
+        self.index = index
+        self.on_evicted = on_evicted
+        self.protected_folder = protected_folder
+        self.configure(settings)
+        self._thread = None
+        self._wake = threading.Event()
+        self._stopping = False
+
+    def configure(self, settings):
+        """Read the retention limits from the settings"""
+        screenshot_settings = (settings or {}).get("screenshot_settings", {})
+        self.max_total_size_mb = _limit(screenshot_settings.get("max_total_size_mb"))
+        self.max_age_days = _limit(screenshot_settings.get("max_age_days"))
+        self.keep_per_period = _limit(screenshot_settings.get("keep_per_period"))
+
+    @property
+    def enabled(self):
+        """Whether any retention limit is set"""
+        return bool(self.max_total_size_mb or self.max_age_days or self.keep_per_period)
+
+    def select_evictions(self, now=None, protected=None):
+        """Index keys of the screenshots beyond the limits, oldest first.
+
+        Args:
+            now: time.time() to measure ages against (defaults to now)
+            protected: Folder whose screenshots are kept regardless
+        """
+        now = time.time() if now is None else now
+        entries = self.index.entries()
+        protected_key = self.index.key_for(protected) if protected else None
+        if protected_key:
+            entries = [
+                entry
+                for entry in entries
+                if not entry[0].startswith(protected_key + "/")
+            ]
+
+        evicted = set()
+        if self.max_age_days:
+            cutoff = now - self.max_age_days * 24 * SECONDS_PER_HOUR
+            evicted.update(key for key, _, created, _ in entries if created < cutoff)
+
+        if self.keep_per_period:
+            periods = {}
+            for entry in entries:
+                periods.setdefault(entry[0].rsplit("/", 1)[0], []).append(entry)
+            for period_entries in periods.values():
+                if len(period_entries) <= self.keep_per_period:
+                    continue
+                period_entries.sort(key=lambda entry: (-entry[3], -entry[2]))
+                evicted.update(
+                    entry[0] for entry in period_entries[self.keep_per_period :]
+                )
+
+        if self.max_total_size_mb:
+            sizes = {entry[0]: entry[1] for entry in entries}
+            total = self.index.total_bytes() - sum(sizes[key] for key in evicted)
+            max_bytes = self.max_total_size_mb * 1024 * 1024
+            # Oldest date folder first; within a day the least referenced
+            remaining = sorted(
+                (entry for entry in entries if entry[0] not in evicted),
+                key=lambda entry: (entry[0].split("/", 1)[0], entry[3], entry[2]),
+            )
+            for key, size, _, _ in remaining:
+                if total <= max_bytes:
+                    break
+                evicted.add(key)
+                total -= size
+
+        created = {entry[0]: entry[2] for entry in entries}
+        return sorted(evicted, key=lambda key: created[key])
+
+    def run_once(self, now=None):
+        """Evict what is beyond the limits now.
+
+        Returns:
+            list: Paths of the removed screenshots
+        """
+        protected = self.protected_folder() if self.protected_folder else None
+        keys = self.select_evictions(now, protected)
+        evicted = []
+        for start in range(0, len(keys), SCREENSHOT_RETENTION_BATCH):
+            if start:
+                # Leave the disk to screenshot saving and the UI in between
+                time.sleep(SCREENSHOT_RETENTION_BATCH_PAUSE_SECONDS)
+            for key in keys[start : start + SCREENSHOT_RETENTION_BATCH]:
+                path = self._delete(key)
+                if path is not None:
+                    evicted.append(path)
+            if self._stopping:
+                break
+        self.index.save()
+        if evicted and self.on_evicted is not None:
+            self.on_evicted(evicted)
+        return evicted
+
+    def _delete(self, key):
+        """Remove a screenshot and its thumbnail; None if it is in use"""
+        path = self.index.path_for(key)
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError:
+            return None  # Open elsewhere (e.g. an image viewer) - try next time
+        try:
+            os.remove(thumbnail_path_for(path))
+        except OSError:
+            pass
+        self.index.remove(key)
+        _remove_empty_folders(os.path.dirname(path), self.index.base_path)
+        return path
+
+    def start(self):
+        """Start the background thread (does nothing if it is running)"""
+        if self._thread is not None and self._thread.is_alive():
+            self._wake.set()  # Settings changed - check again now
+            return
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="ScreenshotRetention", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the background thread and save the index"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.index.save()
+
+    def _run(self):
+        _lower_thread_priority()
+        delay = SCREENSHOT_RETENTION_START_DELAY_SECONDS
+        while True:
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stopping:
+                return
+            if self.enabled:
+                try:
+                    self.run_once()
+                except Exception:
+                    pass  # Retry on the next pass
+            delay = SCREENSHOT_RETENTION_INTERVAL_SECONDS
+
+
+def _limit(value):
+    """Retention setting as a non-negative int; missing or invalid -> 0 (off)"""
+    try:
+        return max(0, int(value))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _remove_empty_folders(folder, base_path):
+    """Remove folder and its parents up to base_path while they are empty"""
+    base_path = os.path.abspath(base_path)
+    folder = os.path.abspath(folder)
+    while folder != base_path and folder.startswith(base_path):
+        try:
+            os.rmdir(os.path.join(folder, SCREENSHOT_THUMBNAIL_FOLDER))
+        except OSError:
+            pass
+        try:
+            os.rmdir(folder)
+        except OSError:
+            return  # Not empty
+        folder = os.path.dirname(folder)
+
+
+def _lower_thread_priority():
+    """Run the calling thread at low priority where the OS allows it"""
+    if sys.platform != "win32":
+        return
+    try:
+        import ctypes
+
+        THREAD_PRIORITY_LOWEST = -2
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_LOWEST)
+    except Exception:
+        pass
@@ -0,0 +1,164 @@
+"""
+Screenshot Writer Module for Time Tracker
+Encodes and saves captured screenshots on a small pool of worker threads, so
+the screenshot monitor thread only grabs the screen and goes straight back to
+watching for focus changes. Queued captures are bounded by the memory their
+raw pixels take; when a new capture doesn't fit, the oldest queued captures
+are dropped (newer screenshots are worth more than a complete backlog).
+"""
+
+import collections
+import threading
+
+from src.constants import SCREENSHOT_QUEUE_MAX_MB, SCREENSHOT_WRITER_THREADS
+
+
+class ScreenshotDropped(Exception):
+    """Passed to on_done for a capture dropped from a full queue"""
+
+
+def image_size_bytes(image):
+    """Approximate memory held by an image's pixels"""
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+class _Job:
+    """One queued capture"""
+
+    __slots__ = ("image", "write", "on_done", "size")
+
+    def __init__(self, image, write, on_done, size):
+        self.image = image
+        self.write = write
+        self.on_done = on_done
+        self.size = size
+
+
+class ScreenshotWriter:
+    """Worker pool with a memory-bounded, drop-oldest queue of captures.
+
+    Worker threads are started with the first submitted capture, so nothing
+    runs while screenshots are disabled.
+    """
+
+    def __init__(
+        self,
+        workers=SCREENSHOT_WRITER_THREADS,
+        max_queued_bytes=SCREENSHOT_QUEUE_MAX_MB * 1024 * 1024,
+    ):
+        self.workers = workers
+        self.max_queued_bytes = max_queued_bytes
+        self.dropped = 0  # Captures dropped from a full queue so far
+        self._jobs = collections.deque()
+        self._queued_bytes = 0
+        self._in_progress = 0
+        self._condition = threading.Condition()
+        self._threads = []
+        self._stopping = False
+
+    def submit(self, image, write, on_done=None):
+        """Queue a capture and return immediately.
+
+        If the queue would exceed max_queued_bytes, the oldest queued captures
+        are dropped first. A capture larger than the whole limit is still
+        queued on its own.
+
+        Args:
+            image: PIL image as grabbed
+            write: Callable(image) that encodes and saves it (worker thread)
+            on_done: Optional callable(error) run on the worker thread; error is
+                None on success, ScreenshotDropped if the capture was dropped
+                (run on the thread whose submit dropped it), or the exception
+                write raised
+        """
+        job = _Job(image, write, on_done, image_size_bytes(image))
+        if self._stopping:
+            self._write(job)  # After stop() - write on the caller's thread
+            return
+        dropped = []
+        with self._condition:
+            while self._jobs and self._queued_bytes + job.size > self.max_queued_bytes:
+                oldest = self._jobs.popleft()
+                self._queued_bytes -= oldest.size
+                self.dropped += 1
+                dropped.append(oldest)
+            self._jobs.append(job)
+            self._queued_bytes += job.size
+            self._start_workers()
+            self._condition.notify()
+        for oldest in dropped:
+            self._finish(oldest, ScreenshotDropped())
+
+    def pending_count(self):
+        """Number of captures queued or being written"""
+        with self._condition:
+            return len(self._jobs) + self._in_progress
+
+    def flush(self, timeout=None):
+        """Wait until every capture submitted so far has been written or dropped.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if the queue is empty, False on timeout
+        """
+        if threading.current_thread() in self._threads:
+            return True
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._jobs and not self._in_progress, timeout=timeout
+            )
+
+    def stop(self, timeout=None):
+        """Write what is queued, then stop the worker threads"""
+        self.flush(timeout)
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def _start_workers(self):
+        """Start the worker threads if they aren't running (lock held)"""
+        if self._threads or self._stopping:
+            return
+        for number in range(self.workers):
+            thread = threading.Thread(
+                target=self._run, name=f"ScreenshotWriter-{number}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._jobs or self._stopping)
+                if not self._jobs:
+                    return
+                job = self._jobs.popleft()
+                self._queued_bytes -= job.size
+                self._in_progress += 1
+            self._write(job)
+            with self._condition:
+                self._in_progress -= 1
+                self._condition.notify_all()
+
+    def _write(self, job):
+        error = None
+        try:
+            job.write(job.image)
+        except Exception as write_error:
+            error = write_error
+        job.image = None  # Release the pixels before waiting again
+        self._finish(job, error)
+
+    def _finish(self, job, error):
+        if job.on_done is None:
+            return
+        try:
+            job.on_done(error)
+        except Exception:
+            pass  # A failing callback must not stop the worker
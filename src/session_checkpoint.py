@@ -0,0 +1,115 @@
+"""
+Session Checkpoint Module for Time Tracker
+Crash checkpoint for the running session. The session's end time and
+durations are rewritten every SESSION_CHECKPOINT_INTERVAL_MS into a small
+sidecar file next to the data file (data.json.checkpoint) - a few hundred
+bytes, replaced atomically - instead of being journaled into the session
+data. end_session() writes the final values and removes the checkpoint; if the
+app crashed instead, the checkpoint is folded into the session data on the
+next start.
+"""
+
+import json
+import os
+
+from src.atomic_writer import write_text_atomic
+from src.constants import CHECKPOINT_FILE_SUFFIX
+
+# Session fields the checkpoint carries
+CHECKPOINT_FIELDS = (
+    "end_time",
+    "end_timestamp",
+    "total_duration",
+    "active_duration",
+    "break_duration",
+)
+
+
+def checkpoint_path_for(data_file):
+    """Return the checkpoint file path that belongs to a data file"""
+    return f"{data_file}{CHECKPOINT_FILE_SUFFIX}"
+
+
+class SessionCheckpoint:
+    """Checkpoint file stored next to the data file (data.json.checkpoint)"""
+
+    def __init__(self, data_file):
+        self.data_file = data_file
+        self.checkpoint_file = checkpoint_path_for(data_file)
+
+    def write(self, session_name, fields):
+        """Replace the checkpoint with a session's current progress.
+
+        The file is written to a temporary name, forced to disk and renamed
+        over the old checkpoint, so a crash leaves either the old or the new
+        checkpoint - never a torn one.
+
+        Args:
+            session_name: Running session's key in data.json
+            fields: Values for CHECKPOINT_FIELDS
+
+        Raises:
+            OSError: If the checkpoint cannot be written
+        """
+        write_text_atomic(
+            self.checkpoint_file,
+            json.dumps({"session": session_name, "fields": fields}),
+        )
+
+    def write_latest(self, checkpoints):
+        """Write the newest of several (session_name, fields) checkpoints.
+
+        Used by the persistence worker, which coalesces queued checkpoints.
+        """
+        if checkpoints:
+            self.write(*checkpoints[-1])
+
+    def read(self):
+        """Return the checkpoint as (session_name, fields), or None if absent"""
+        try:
+            with open(self.checkpoint_file, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(checkpoint, dict) or not isinstance(
+            checkpoint.get("fields"), dict
+        ):
+            return None
+        fields = {
+            key: value
+            for key, value in checkpoint["fields"].items()
+            if key in CHECKPOINT_FIELDS
+        }
+        return checkpoint.get("session"), fields
+
+    def pending_update(self, all_data):
+        """Return the checkpointed fields if they are newer than the saved session.
+
+        A checkpoint left behind by a normal end_session() (e.g. removing it
+        failed) is older than the session's final end time and is ignored.
+
+        Args:
+            all_data: Loaded session data
+
+        Returns:
+            tuple: (session_name, fields), or None if there is nothing to recover
+        """
+        checkpoint = self.read()
+        if checkpoint is None:
+            return None
+        session_name, fields = checkpoint
+        session = all_data.get(session_name) if isinstance(all_data, dict) else None
+        if not isinstance(session, dict):
+            return None
+        saved_end = session.get("end_timestamp") or 0
+        if (fields.get("end_timestamp") or 0) <= saved_end:
+            return None
+        return session_name, fields
+
+    def clear(self):
+        """Remove the checkpoint once the session data holds its values"""
+        for path in (self.checkpoint_file, f"{self.checkpoint_file}.tmp"):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,180 @@
+"""
+Session Journal Module for Time Tracker
+Append-only write-ahead log for session state transitions. Each transition
+(session start, break, idle, resume, minute backup) appends one small JSON
+record instead of rewriting the whole data.json file. The journal is folded
+back into data.json (compacted) periodically and when a session ends.
+"""
+
+import os
+import json
+
+from src.constants import JOURNAL_FILE_SUFFIX
+
+
+def journal_path_for(data_file):
+    """Return the journal file path that belongs to a data file"""
+    return f"{data_file}{JOURNAL_FILE_SUFFIX}"
+
+
+def make_session_update(session_name, fields):
+    """Record that merges top-level fields into a session (creating it if needed)"""
+    return {"op": "update_session", "session": session_name, "fields": fields}
+
+
+def make_period_append(session_name, list_name, index, period):
+    """Record that appends a period to one of a session's period lists.
+
+    Args:
+        session_name: Session key in data.json
+        list_name: "active", "breaks" or "idle_periods"
+        index: Position the period occupies once appended. Makes replay
+            idempotent - if the snapshot already holds the period (crash between
+            compaction and journal removal) it is overwritten, not duplicated.
+        period: Period dictionary
+    """
+    return {
+        "op": "append_period",
+        "session": session_name,
+        "list": list_name,
+        "index": index,
+        "period": period,
+    }
+
+
+def make_period_update(session_name, list_name, index, fields):
+    """Record that merges fields into an existing period (e.g. closing an idle period)"""
+    return {
+        "op": "update_period",
+        "session": session_name,
+        "list": list_name,
+        "index": index,
+        "fields": fields,
+    }
+
+
+def apply_journal_record(all_data, record):
+    """Apply a single journal record to loaded session data in place.
+
+    Unknown operations are ignored so older builds can still read a journal
+    written by a newer one.
+
+    Args:
+        all_data: Dictionary mapping session names to session data
+        record: Journal record created by one of the make_* helpers
+    """
+    op = record.get("op")
+    session_name = record.get("session")
+    if session_name is None:
+        return
+
+    if op == "update_session":
+        session = all_data.setdefault(session_name, {})
+        session.update(record.get("fields", {}))
+
+    elif op == "append_period":
+        session = all_data.setdefault(session_name, {})
+        periods = session.setdefault(record["list"], [])
+        index = record.get("index", len(periods))
+        if index < len(periods):
+            periods[index] = record["period"]
+        else:
+            periods.append(record["period"])
+
+    elif op == "update_period":
+        periods = all_data.get(session_name, {}).get(record["list"], [])
+        index = record.get("index", -1)
+        if -len(periods) <= index < len(periods):
+            periods[index].update(record.get("fields", {}))
+
+
+class SessionJournal:
+    """Append-only journal stored next to the data file (data.json.journal)"""
+
+    def __init__(self, data_file):
+        self.data_file = data_file
+        self.journal_file = journal_path_for(data_file)
+        self._record_count = None  # Counted lazily from disk
+
+    def append(self, record):
+        """Append one record and force it to disk.
+
+        Raises:
+            OSError: If the journal cannot be written (caller reports the error)
+        """
+        self.append_many([record])
+
+    def append_many(self, records):
+        """Append several records with a single write and fsync.
+
+        Used by the persistence worker to flush coalesced transitions.
+
+        Raises:
+            OSError: If the journal cannot be written (caller reports the error)
+        """
+        if not records:
+            return
+        count = self.record_count()
+        lines = "".join(
+            json.dumps(record, separators=(",", ":")) + "\n" for record in records
+        )
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self._record_count = count + len(records)
+
+    def read_records(self):
+        """Return all complete records in the journal.
+
+        A torn final line (crash mid-append) is skipped rather than treated as
+        corruption, since everything before it is still valid.
+        """
+        if not os.path.exists(self.journal_file):
+            return []
+
+        records = []
+        try:
+            with open(self.journal_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    if isinstance(record, dict):
+                        records.append(record)
+        except OSError:
+            return []
+        return records
+
+    def replay(self, all_data):
+        """Apply every journal record on top of a loaded data.json snapshot.
+
+        Args:
+            all_data: Snapshot loaded from data.json (modified in place)
+
+        Returns:
+            dict: The same dictionary with journal records applied
+        """
+        records = self.read_records()
+        self._record_count = len(records)
+        for record in records:
+            apply_journal_record(all_data, record)
+        return all_data
+
+    def record_count(self):
+        """Number of records currently in the journal"""
+        if self._record_count is None:
+            self._record_count = len(self.read_records())
+        return self._record_count
+
+    def clear(self):
+        """Remove the journal after its records were compacted into data.json"""
+        try:
+            os.remove(self.journal_file)
+        except FileNotFoundError:
+            pass
+        self._record_count = 0
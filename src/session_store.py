@@ -0,0 +1,217 @@
+"""
+Session Store Module for Time Tracker
+Process-wide cache of parsed session data owned by TimeTracker. The data file
+is parsed once and handed out as a shared read view; it is only re-read when
+the watched files change on disk (modification time, size or inode). Every
+mutation bumps a monotonically increasing data version that frames and caches
+can use to tell whether their derived data is stale. A date index of the read
+view (see src.date_index) is built on first use and updated per transition.
+"""
+
+import os
+import pickle
+import threading
+
+from src.date_index import DateIndex
+from src.session_journal import apply_journal_record
+
+
+def file_signature(path):
+    """Return (mtime_ns, size, inode) for a file, or None if it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def copy_session_data(data):
+    """Return an independent deep copy of session data.
+
+    Session data is plain JSON types, so a pickle round trip is an exact copy
+    and roughly twice as fast as copy.deepcopy().
+    """
+    return pickle.loads(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+
+
+class SessionStore:
+    """Cached, version-stamped view of all session data.
+
+    The store is keyed on a "source": the tuple of files whose contents make up
+    the data (data.json + data.json.journal, or the SQLite database). If the
+    source changes (e.g. tests reassign data_file) or any of its files change
+    on disk, the next read reloads.
+    """
+
+    def __init__(self):
+        self.version = 0  # Bumped on every mutation or detected disk change
+        self._lock = threading.RLock()
+        self._data = None
+        self._source = None
+        self._signature = None
+        self._pending_writes = 0  # Applied in memory, not yet written to disk
+        self._date_index = None  # (read view, its DateIndex)
+
+    def _source_signature(self, source):
+        return tuple(file_signature(path) for path in source)
+
+    def get(self, source, loader):
+        """Return the shared read view, loading it if missing or stale.
+
+        Args:
+            source: Tuple of file paths the data is read from
+            loader: Callable returning freshly parsed data from disk
+
+        Returns:
+            The cached data. Callers must not modify it - use
+            copy_session_data() for a private, mutable copy. Later updates
+            replace the view instead of changing it, so it can be read from
+            another thread.
+        """
+        with self._lock:
+            if self._has_pending_writes(source):
+                # Our own writes are in flight - the cached view is authoritative
+                return self._data
+            signature = self._source_signature(source)
+            if (
+                self._data is None
+                or self._source != source
+                or self._signature != signature
+            ):
+                if self._data is not None:
+                    self.version += 1
+                # Signature is taken before loading, so a write that races the
+                # load is picked up on the next read
+                self._data = loader()
+                self._source = source
+                self._signature = signature
+            return self._data
+
+    def date_index(self, source, loader):
+        """Return the DateIndex of the shared read view (see get()).
+
+        Built on first use after a load and then kept current by apply(), so
+        a transition costs one session's update rather than a rebuild.
+        """
+        with self._lock:
+            data = self.get(source, loader)
+            if self._date_index is None or self._date_index[0] is not data:
+                all_data = data if isinstance(data, dict) else None
+                self._date_index = (data, DateIndex(all_data))
+            return self._date_index[1]
+
+    def check(self, source):
+        """Drop cached data if its files changed on disk.
+
+        Args:
+            source: Tuple of file paths the data is read from
+
+        Returns:
+            int: Current data version
+        """
+        with self._lock:
+            if self._has_pending_writes(source):
+                return self.version
+            if self._data is not None and (
+                self._source != source
+                or self._signature != self._source_signature(source)
+            ):
+                self._data = None
+                self.version += 1
+            return self.version
+
+    def apply(self, record, source):
+        """Apply a journal record that is being written to disk.
+
+        Keeps the cached view current without re-reading the file. Until
+        write_finished() is called for it, the cached view is treated as
+        authoritative even though the files on disk lag behind.
+
+        Args:
+            record: Session journal record (see src.session_journal)
+            source: Tuple of file paths the record is written to
+        """
+        with self._lock:
+            if (
+                self._data is not None
+                and self._source == source
+                and isinstance(self._data, dict)
+            ):
+                # Copy-on-write: views handed out earlier (e.g. to an analysis
+                # query running on a worker thread) are never modified
+                data = dict(self._data)
+                session_name = record.get("session")
+                if session_name in data:
+                    data[session_name] = copy_session_data(data[session_name])
+                # Copy so later in-place updates never alias the queued record
+                apply_journal_record(data, copy_session_data(record))
+                if self._date_index is not None and self._date_index[0] is self._data:
+                    index = self._date_index[1].updated(
+                        session_name, data.get(session_name)
+                    )
+                    self._date_index = (data, index)
+                self._data = data
+                self._pending_writes += 1
+            else:
+                self._data = None
+            self.version += 1
+
+    def write_started(self, source):
+        """Mark a write of the cached view that isn't a single record (e.g. a
+        journal compaction) as in flight; pair with write_finished()"""
+        with self._lock:
+            if self._data is not None and self._source == source:
+                self._pending_writes += 1
+
+    def write_finished(self, source):
+        """Mark one applied record as written to disk.
+
+        Once no writes are pending the current file signature is adopted, so
+        our own writes don't trigger a reload.
+        """
+        with self._lock:
+            if self._source != source or self._pending_writes == 0:
+                return
+            self._pending_writes -= 1
+            if self._pending_writes == 0 and self._data is not None:
+                self._signature = self._source_signature(source)
+
+    def has_pending_writes(self, source):
+        """Whether records applied to the cached view of source are still
+        being written, so the files on disk lag behind it"""
+        with self._lock:
+            return self._has_pending_writes(source)
+
+    def _has_pending_writes(self, source):
+        return (
+            self._pending_writes > 0
+            and self._data is not None
+            and self._source == source
+        )
+
+    def data_signature(self, source, version=None):
+        """Signature of the files the cached data was read from.
+
+        Args:
+            source: Tuple of file paths the data is read from
+            version: If given, the data version the caller's view was built
+                from; no signature is returned once the data moved on
+
+        Returns:
+            tuple: File signatures, or None if no data is cached for source, it
+            is no longer at version, or some of its writes are still pending
+            (the files lag behind)
+        """
+        with self._lock:
+            if self._data is None or self._source != source or self._pending_writes > 0:
+                return None
+            if version is not None and self.version != version:
+                return None
+            return self._signature
+
+    def invalidate(self):
+        """Forget the cached data after a full write (next read reloads)"""
+        with self._lock:
+            self._data = None
+            self._pending_writes = 0
+            self.version += 1
@@ -10,13 +10,26 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
 import json
 import os
-import csv
 import subprocess
 import platform
 import re
 
 from src.ui_helpers import ScrollableFrame, sanitize_name, get_frame_background
+from src.csv_export import (
+    ALL_DATA_CSV_FIELDS,
+    export_csv_with_progress,
+    iter_all_data_rows,
+)
 from src.google_sheets_integration import GoogleSheetsUploader
+from src.name_table import NameTable, assign_name_ids, rename_entry
+from src.period_model import PeriodModel
+from src.screenshot_dedupe import DEDUPE_MODES, ScreenshotDeduper
+from src.screenshot_encoding import ScreenshotEncoding, available_formats
+from src.sqlite_store import (
+    migrate_json_to_sqlite,
+    export_sqlite_to_json,
+    sqlite_path_for,
+)
 from src.constants import (
     COLOR_LINK_BLUE,
     COLOR_GRAY_TEXT,
@@ -33,6 +46,8 @@ from src.constants import (
     FONT_SMALL_ITALIC,
     FONT_EXTRA_SMALL,
     FONT_MONOSPACE,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_SQLITE,
 )
 
 
@@ -117,9 +132,10 @@ class SettingsFrame(ttk.Frame):
 
     def save_settings(self):
         """Save settings to file"""
+        # New spheres/projects/break actions get their stable IDs
+        assign_name_ids(self.tracker.settings)
         try:
-            with open(self.tracker.settings_file, "w") as f:
-                json.dump(self.tracker.settings, f, indent=2)
+            self.tracker.save_settings()
         except Exception as error:
             messagebox.showerror("Error", f"Failed to save settings: {error}")
 
@@ -194,6 +210,11 @@ class SettingsFrame(ttk.Frame):
 
         self._add_settings_separator(content_frame)
 
+        # Data storage backend section
+        self.create_storage_section(content_frame)
+
+        self._add_settings_separator(content_frame)
+
         # CSV Export section
         self.create_csv_export_section(content_frame)
 
@@ -496,7 +517,11 @@ class SettingsFrame(ttk.Frame):
         self.load_selected_sphere()
 
     def edit_sphere_name(self, old_name):
-        """Edit sphere name and update all references including saved sessions"""
+        """Edit sphere name and update the projects that reference it.
+
+        Saved sessions reference the sphere by ID (see src.name_table), so
+        they show the new name without being rewritten.
+        """
         new_name = simpledialog.askstring(
             "Edit Sphere Name", "Enter new name:", initialvalue=old_name
         )
@@ -515,30 +540,14 @@ class SettingsFrame(ttk.Frame):
 
         confirm = messagebox.askyesno(
             "Rename Sphere",
-            f"Renaming '{old_name}' to '{new_name}' will update the sphere name "
-            f"in all saved sessions.\n\nDo you want to continue?",
+            f"Renaming '{old_name}' to '{new_name}' will also show the new name "
+            f"for all saved sessions.\n\nDo you want to continue?",
         )
         if not confirm:
             return
 
-        # Rename sphere in settings
-        sphere_data = self.tracker.settings["spheres"].pop(old_name)
-        self.tracker.settings["spheres"][new_name] = sphere_data
-
-        # Update projects that reference this sphere
-        for _, project_data in self.tracker.settings.get("projects", {}).items():
-            if project_data.get("sphere") == old_name:
-                project_data["sphere"] = new_name
-
-        # Update saved sessions that reference this sphere
-        all_sessions = self.tracker.load_data()
-        sessions_updated = False
-        for session_data in all_sessions.values():
-            if session_data.get("sphere") == old_name:
-                session_data["sphere"] = new_name
-                sessions_updated = True
-        if sessions_updated:
-            self.tracker.save_data(all_sessions, merge=False)
+        # Settings-only rename - the sphere keeps its ID
+        rename_entry(self.tracker.settings, "spheres", old_name, new_name)
 
         self.save_settings()
         self.refresh_sphere_dropdown()
@@ -554,34 +563,18 @@ class SettingsFrame(ttk.Frame):
         self.save_settings()
         self.refresh_sphere_dropdown()
 
-    def _rename_project_in_sessions(self, old_name, new_name):
-        """Update project name references in all saved sessions.
+    def _rename_project(self, old_name, new_name):
+        """Rename a project in settings.
 
-        Handles two formats that may appear in active periods:
-        - Legacy format: active_period["project"] = "Project A"  (string)
-        - Multi-project format: active_period["projects"] = [{"name": "Project A", ...}]
-
-        Writes back to disk only when at least one entry was changed.
+        The project keeps its ID, which saved sessions reference in both the
+        legacy "project" and the "projects" list format (see src.name_table),
+        so they show the new name without being rewritten.
 
         Args:
-            old_name: The project name to search for in sessions.
-            new_name: The replacement project name.
+            old_name: Current project name
+            new_name: New project name (must not already exist)
         """
-        all_sessions = self.tracker.load_data()
-        sessions_updated = False
-        for session_data in all_sessions.values():
-            for active_period in session_data.get("active", []):
-                # Legacy single-project string field
-                if active_period.get("project") == old_name:
-                    active_period["project"] = new_name
-                    sessions_updated = True
-                # Multi-project array format
-                for project_entry in active_period.get("projects", []):
-                    if project_entry.get("name") == old_name:
-                        project_entry["name"] = new_name
-                        sessions_updated = True
-        if sessions_updated:
-            self.tracker.save_data(all_sessions, merge=False)
+        rename_entry(self.tracker.settings, "projects", old_name, new_name)
 
     def delete_sphere(self, sphere_name):
         """Delete a sphere and its associated projects"""
@@ -844,12 +837,12 @@ class SettingsFrame(ttk.Frame):
 
                 is_name_change = new_name != project_name
 
-                # Warn user that saved sessions will be updated before any mutation
+                # Confirm before any mutation - saved sessions show the new name
                 if is_name_change:
                     confirmed = messagebox.askyesno(
                         "Rename Project",
-                        f"Renaming '{project_name}' to '{new_name}' will update "
-                        f"the project name in all saved sessions.\n\nDo you want to continue?",
+                        f"Renaming '{project_name}' to '{new_name}' will also show "
+                        f"the new name for all saved sessions.\n\nDo you want to continue?",
                     )
                     if not confirmed:
                         return
@@ -862,11 +855,9 @@ class SettingsFrame(ttk.Frame):
                 project_data["note"] = note_var.get()
                 project_data["goal"] = goal_var.get()
 
-                # If name changed, rename project key and update saved sessions
+                # If name changed, rename project key (sessions follow its ID)
                 if is_name_change:
-                    self.tracker.settings["projects"].pop(project_name)
-                    self.tracker.settings["projects"][new_name] = project_data
-                    self._rename_project_in_sessions(project_name, new_name)
+                    self._rename_project(project_name, new_name)
 
                 self.save_settings()
 
@@ -1465,16 +1456,125 @@ class SettingsFrame(ttk.Frame):
         )
         screenshot_row += 1
 
+        # Image format and size - settings that are missing or invalid show
+        # the values screenshots are actually saved with
+        encoding = ScreenshotEncoding(screenshot_settings)
+        ttk.Label(screenshot_frame, text="Image format:").grid(
+            row=screenshot_row, column=0, columnspan=2, sticky=tk.W, pady=5
+        )
+        image_format_var = tk.StringVar(master=self.root, value=encoding.image_format)
+        ttk.Combobox(
+            screenshot_frame,
+            textvariable=image_format_var,
+            values=available_formats(),
+            state="readonly",
+            width=6,
+        ).grid(row=screenshot_row, column=1, pady=5, columnspan=2, padx=5, sticky=tk.W)
+        screenshot_row += 1
+
+        image_quality_var = tk.IntVar(master=self.root, value=encoding.quality)
+        max_dimension_var = tk.IntVar(master=self.root, value=encoding.max_dimension)
+        thumbnail_size_var = tk.IntVar(master=self.root, value=encoding.thumbnail_size)
+        for label, variable, to, increment in (
+            ("Quality (JPEG/WebP, 1-100):", image_quality_var, 100, 5),
+            ("Max image size in px (0 = full):", max_dimension_var, 7680, 160),
+            ("Thumbnail size in px (0 = none):", thumbnail_size_var, 1024, 32),
+        ):
+            ttk.Label(screenshot_frame, text=label).grid(
+                row=screenshot_row, column=0, columnspan=2, sticky=tk.W, pady=5
+            )
+            ttk.Spinbox(
+                screenshot_frame,
+                from_=0,
+                to=to,
+                increment=increment,
+                textvariable=variable,
+                width=5,
+            ).grid(
+                row=screenshot_row, column=1, pady=5, columnspan=2, padx=5, sticky=tk.W
+            )
+            screenshot_row += 1
+
+        # Near-duplicate screenshots
+        deduper = ScreenshotDeduper(screenshot_settings)
+        ttk.Label(screenshot_frame, text="Near-duplicate screenshots:").grid(
+            row=screenshot_row, column=0, columnspan=2, sticky=tk.W, pady=5
+        )
+        dedupe_mode_var = tk.StringVar(master=self.root, value=deduper.mode)
+        ttk.Combobox(
+            screenshot_frame,
+            textvariable=dedupe_mode_var,
+            values=DEDUPE_MODES,
+            state="readonly",
+            width=9,
+        ).grid(row=screenshot_row, column=1, pady=5, columnspan=2, padx=5, sticky=tk.W)
+        screenshot_row += 1
+
+        ttk.Label(screenshot_frame, text="Near-duplicate similarity (%):").grid(
+            row=screenshot_row, column=0, columnspan=2, sticky=tk.W, pady=5
+        )
+        dedupe_similarity_var = tk.IntVar(
+            master=self.root, value=round(deduper.min_similarity)
+        )
+        ttk.Spinbox(
+            screenshot_frame,
+            from_=50,
+            to=100,
+            textvariable=dedupe_similarity_var,
+            width=5,
+        ).grid(row=screenshot_row, column=1, pady=5, columnspan=2, padx=5, sticky=tk.W)
+        screenshot_row += 1
+
+        # Retention - older screenshots are deleted in the background
+        max_total_size_var = tk.IntVar(
+            master=self.root, value=screenshot_settings.get("max_total_size_mb", 0)
+        )
+        max_age_var = tk.IntVar(
+            master=self.root, value=screenshot_settings.get("max_age_days", 0)
+        )
+        keep_per_period_var = tk.IntVar(
+            master=self.root, value=screenshot_settings.get("keep_per_period", 0)
+        )
+        for label, variable, to, increment in (
+            ("Max total size in MB (0 = no limit):", max_total_size_var, 1000000, 500),
+            ("Delete after days (0 = never):", max_age_var, 3650, 7),
+            ("Keep per period (0 = all):", keep_per_period_var, 1000, 1),
+        ):
+            ttk.Label(screenshot_frame, text=label).grid(
+                row=screenshot_row, column=0, columnspan=2, sticky=tk.W, pady=5
+            )
+            ttk.Spinbox(
+                screenshot_frame,
+                from_=0,
+                to=to,
+                increment=increment,
+                textvariable=variable,
+                width=7,
+            ).grid(
+                row=screenshot_row, column=1, pady=5, columnspan=2, padx=5, sticky=tk.W
+            )
+            screenshot_row += 1
+
         # Define nested save function with closure over widget variables
         def save_screenshot_settings():
             """Save screenshot settings - uses closure to access parent scope variables."""
             self.tracker.settings["screenshot_settings"] = {
+                **screenshot_settings,
                 "enabled": screenshot_enabled_var.get(),
                 "capture_on_focus_change": capture_on_focus_var.get(),
                 "min_seconds_between_captures": min_seconds_var.get(),
                 "screenshot_path": screenshot_settings.get(
                     "screenshot_path", DEFAULT_SCREENSHOT_FOLDER
                 ),
+                "image_format": image_format_var.get(),
+                "image_quality": image_quality_var.get(),
+                "max_dimension": max_dimension_var.get(),
+                "thumbnail_size": thumbnail_size_var.get(),
+                "dedupe_mode": dedupe_mode_var.get(),
+                "dedupe_similarity": dedupe_similarity_var.get(),
+                "max_total_size_mb": max_total_size_var.get(),
+                "max_age_days": max_age_var.get(),
+                "keep_per_period": keep_per_period_var.get(),
             }
             self.save_settings()
             messagebox.showinfo("Success", "Screenshot settings saved")
@@ -1679,6 +1779,8 @@ class SettingsFrame(ttk.Frame):
             old_settings = self.tracker.settings.get("google_sheets", {})
             self.tracker.settings["google_sheets"] = temp_settings
             self.save_settings()
+            # The uploader reads the settings file
+            self.tracker.flush_writes()
 
             # Test connection
             try:
@@ -1791,6 +1893,163 @@ class SettingsFrame(ttk.Frame):
         if hasattr(self, "update_scrollregion"):
             self.update_scrollregion()
 
+    def create_storage_section(self, parent):
+        """Create data storage section (data.json or SQLite backend).
+
+        Switching to SQLite migrates data.json into the database if it doesn't
+        exist yet; switching back exports the database to data.json so no
+        sessions are lost either way.
+        """
+        storage_frame = ttk.LabelFrame(parent, padding=10, text="Data Storage")
+        storage_frame.grid(
+            row=self.row,
+            column=0,
+            columnspan=3,
+            padx=5,
+            pady=5,
+            sticky=(tk.W, tk.E),
+        )
+        self.row += 1
+
+        ttk.Label(
+            storage_frame,
+            text="SQLite keeps sessions in an indexed database, which keeps large "
+            "histories fast to filter. data.json is a single human-readable file.",
+            font=FONT_NORMAL,
+            wraplength=500,
+        ).grid(row=0, column=0, columnspan=2, pady=(0, 10), sticky=tk.W)
+
+        storage_settings = self.tracker.settings.get("storage_settings", {})
+        self.storage_backend_var = tk.StringVar(
+            master=self.root,
+            value=storage_settings.get("backend", STORAGE_BACKEND_JSON),
+        )
+        ttk.Radiobutton(
+            storage_frame,
+            text="data.json",
+            variable=self.storage_backend_var,
+            value=STORAGE_BACKEND_JSON,
+            command=self.change_storage_backend,
+        ).grid(row=1, column=0, sticky=tk.W, padx=10)
+        ttk.Radiobutton(
+            storage_frame,
+            text="SQLite database",
+            variable=self.storage_backend_var,
+            value=STORAGE_BACKEND_SQLITE,
+            command=self.change_storage_backend,
+        ).grid(row=1, column=1, sticky=tk.W, padx=10)
+
+        ttk.Button(
+            storage_frame,
+            text="Migrate data.json to SQLite",
+            command=self.migrate_data_to_sqlite,
+        ).grid(row=2, column=0, pady=5, sticky=tk.W, padx=10)
+        ttk.Button(
+            storage_frame,
+            text="Export SQLite to data.json",
+            command=self.export_sqlite_to_data_file,
+        ).grid(row=2, column=1, pady=5, sticky=tk.W, padx=10)
+
+    def change_storage_backend(self):
+        """Switch the storage backend, moving existing sessions across"""
+        new_backend = self.storage_backend_var.get()
+        storage_settings = self.tracker.settings.setdefault("storage_settings", {})
+        old_backend = storage_settings.get("backend", STORAGE_BACKEND_JSON)
+        if new_backend == old_backend:
+            return
+
+        if self.tracker.session_active:
+            messagebox.showerror(
+                "Error", "End the current session before changing data storage."
+            )
+            self.storage_backend_var.set(old_backend)
+            return
+
+        data_file = self.tracker.data_file
+        db_file = sqlite_path_for(data_file)
+        # Queued session writes must land before the sessions are copied
+        self.tracker.flush_writes()
+        try:
+            if new_backend == STORAGE_BACKEND_SQLITE:
+                # data.json is left behind as the JSON backend's copy - it
+                # mustn't keep a journal that would be replayed over it later
+                self.tracker.fold_journal()
+                count = migrate_json_to_sqlite(data_file, db_file)
+                message = f"Migrated {count} sessions to {db_file}"
+            else:
+                if os.path.exists(db_file):
+                    count = export_sqlite_to_json(db_file, data_file)
+                    message = f"Exported {count} sessions to {data_file}"
+                else:
+                    message = f"Using {data_file}"
+        except Exception as error:
+            messagebox.showerror("Error", f"Failed to change data storage: {error}")
+            self.storage_backend_var.set(old_backend)
+            return
+        finally:
+            self.tracker.session_store.invalidate()
+
+        storage_settings["backend"] = new_backend
+        self.save_settings()
+        messagebox.showinfo("Success", message)
+
+    def migrate_data_to_sqlite(self):
+        """Fold the journal into data.json and copy it into the SQLite database.
+
+        The database's sessions are replaced, so this is refused while SQLite is
+        the active backend - data.json is then an older copy.
+        """
+        data_file = self.tracker.data_file
+        db_file = sqlite_path_for(data_file)
+        storage_settings = self.tracker.settings.get("storage_settings", {})
+        if storage_settings.get("backend") == STORAGE_BACKEND_SQLITE:
+            messagebox.showerror(
+                "Already Using SQLite",
+                f"Sessions are already stored in {db_file}. Migrating {data_file} "
+                "would replace them with its older copy and delete every session "
+                "recorded since the switch.",
+            )
+            return
+        if not messagebox.askyesno(
+            "Migrate to SQLite",
+            f"This will replace the sessions stored in {db_file} with those in "
+            f"{data_file}.\n\nDo you want to continue?",
+        ):
+            return
+        # Queued session writes must land in data.json before it is copied
+        self.tracker.flush_writes()
+        try:
+            # Leave data.json complete on its own, without a journal that
+            # would be replayed over a later export of the database
+            self.tracker.fold_journal()
+            count = migrate_json_to_sqlite(data_file, db_file)
+        except Exception as error:
+            messagebox.showerror("Error", f"Migration failed: {error}")
+            return
+        finally:
+            self.tracker.session_store.invalidate()
+        messagebox.showinfo("Success", f"Migrated {count} sessions to {db_file}")
+
+    def export_sqlite_to_data_file(self):
+        """Write the SQLite database back out as data.json"""
+        data_file = self.tracker.data_file
+        db_file = sqlite_path_for(data_file)
+        if not os.path.exists(db_file):
+            messagebox.showinfo("No Data", "No SQLite database to export.")
+            return
+        if not messagebox.askyesno(
+            "Export to data.json",
+            f"This will overwrite {data_file} with the sessions stored in "
+            f"{db_file}.\n\nDo you want to continue?",
+        ):
+            return
+        try:
+            count = export_sqlite_to_json(db_file, data_file)
+        except Exception as error:
+            messagebox.showerror("Error", f"Export failed: {error}")
+            return
+        messagebox.showinfo("Success", f"Exported {count} sessions to {data_file}")
+
     def create_csv_export_section(self, parent):
         """Create CSV export section"""
         export_frame = ttk.LabelFrame(parent, padding=10, text="Data Export")
@@ -1826,337 +2085,74 @@ class SettingsFrame(ttk.Frame):
             self.update_scrollregion()
 
     def save_all_data_to_csv(self):
-        """Export all tracking data to CSV file"""
+        """Export all tracking data to CSV file.
+
+        Rows are streamed from the session data (see iter_all_data_rows()) with
+        a progress dialog that can cancel the export.
+        """
         try:
-            # Load data from data.json
-            data_file = self.tracker.data_file
+            load_data = getattr(self.tracker, "load_data", None)
+            period_model = None
+            if callable(load_data):
+                # Includes session changes not yet compacted into data.json
+                data = load_data(read_only=True)
+                if isinstance(getattr(self.tracker, "period_model", None), PeriodModel):
+                    period_model = self.tracker.get_period_model()
+            else:
+                data_file = self.tracker.data_file
 
-            if not os.path.exists(data_file):
-                messagebox.showerror("Error", "Data file not found")
-                return
+                if not os.path.exists(data_file):
+                    messagebox.showerror("Error", "Data file not found")
+                    return
 
-            with open(data_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+                with open(data_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            if period_model is None:
+                # Export the current names of renamed spheres/projects/actions
+                period_model = PeriodModel(NameTable(self.tracker.settings))
 
             if not data:
                 messagebox.showwarning("No Data", "No tracking data to export")
                 return
 
             # Ask user where to save the CSV
+            first_date = next(iter(data.values()), {}).get("date", "export")
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".csv",
                 filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
                 title="Save Data as CSV",
-                initialfile=f"time_aligned_data_{data.get(list(data.keys())[0], {}).get('date', 'export') if data else 'export'}.csv",
+                initialfile=f"time_aligned_data_{first_date}.csv",
             )
 
             if not file_path:
                 return  # User cancelled
 
-            # Convert data to CSV format
-            csv_rows = []
-
-            for session_id, session_data in data.items():
-                # Get session-level data
-                sphere = session_data.get("sphere", "")
-                date = session_data.get("date", "")
-                start_time = session_data.get("start_time", "")
-                end_time = session_data.get("end_time", "")
-                total_duration = session_data.get("total_duration", 0)
-                active_duration = session_data.get("active_duration", 0)
-                break_duration = session_data.get("break_duration", 0)
-
-                # Get session comments
-                session_comments = session_data.get("session_comments", {})
-                active_notes = session_comments.get("active_notes", "")
-                break_notes = session_comments.get("break_notes", "")
-                idle_notes = session_comments.get("idle_notes", "")
-                session_notes = session_comments.get("session_notes", "")
-
-                # Process active periods
-                active_periods = session_data.get("active", [])
-                breaks = session_data.get("breaks", [])
-                idle_periods = session_data.get("idle_periods", [])
-
-                # If there are active periods, create a row for each
-                if active_periods:
-                    for active in active_periods:
-                        # Extract primary and secondary project information
-                        primary_project = ""
-                        primary_comment = ""
-                        primary_percentage = 100
-                        primary_period_duration = active.get("duration", 0)
-                        secondary_project = ""
-                        secondary_comment = ""
-                        secondary_percentage = ""
-                        secondary_period_duration = ""
-
-                        if active.get("project"):
-                            # Single project case
-                            primary_project = active.get("project", "")
-                            primary_comment = active.get("comment", "")
-                        else:
-                            # Multiple projects case
-                            for project_item in active.get("projects", []):
-                                if project_item.get("project_primary", True):
-                                    primary_project = project_item.get("name", "")
-                                    primary_comment = project_item.get("comment", "")
-                                    primary_percentage = project_item.get(
-                                        "percentage", 100
-                                    )
-                                    primary_period_duration = project_item.get(
-                                        "duration", 0
-                                    )
-                                else:
-                                    secondary_project = project_item.get("name", "")
-                                    secondary_comment = project_item.get("comment", "")
-                                    secondary_percentage = project_item.get(
-                                        "percentage", ""
-                                    )
-                                    secondary_period_duration = project_item.get(
-                                        "duration", 0
-                                    )
-
-                        row = {
-                            "session_id": session_id,
-                            "date": date,
-                            "sphere": sphere,
-                            "session_start_time": start_time,
-                            "session_end_time": end_time,
-                            "session_total_duration": total_duration,
-                            "session_active_duration": active_duration,
-                            "session_break_duration": break_duration,
-                            "type": "active",
-                            "primary_action": primary_project,
-                            "primary_percentage": primary_percentage,
-                            "primary_duration": primary_period_duration,
-                            "primary_comment": primary_comment,
-                            "secondary_action": secondary_project,
-                            "secondary_percentage": secondary_percentage,
-                            "secondary_duration": secondary_period_duration,
-                            "secondary_comment": secondary_comment,
-                            "activity_start": active.get("start", ""),
-                            "activity_end": active.get("end", ""),
-                            "active_notes": active_notes,
-                            "break_notes": break_notes,
-                            "idle_notes": idle_notes,
-                            "session_notes": session_notes,
-                        }
-                        csv_rows.append(row)
-
-                # Process breaks
-                if breaks:
-                    for brk in breaks:
-                        # Extract primary and secondary action information
-                        primary_action = ""
-                        primary_comment = ""
-                        primary_percentage = 100
-                        primary_period_duration = brk.get("duration", 0)
-                        secondary_action = ""
-                        secondary_comment = ""
-                        secondary_percentage = ""
-                        secondary_period_duration = ""
-
-                        if brk.get("action"):
-                            # Single action case
-                            primary_action = brk.get("action", "")
-                            primary_comment = brk.get("comment", "")
-                        else:
-                            # Multiple actions case
-                            for action_item in brk.get("actions", []):
-                                if action_item.get("break_primary", True):
-                                    primary_action = action_item.get("name", "")
-                                    primary_comment = action_item.get("comment", "")
-                                    primary_percentage = action_item.get(
-                                        "percentage", 100
-                                    )
-                                    primary_period_duration = action_item.get(
-                                        "duration", 0
-                                    )
-                                else:
-                                    secondary_action = action_item.get("name", "")
-                                    secondary_comment = action_item.get("comment", "")
-                                    secondary_percentage = action_item.get(
-                                        "percentage", ""
-                                    )
-                                    secondary_period_duration = action_item.get(
-                                        "duration", 0
-                                    )
-
-                        row = {
-                            "session_id": session_id,
-                            "date": date,
-                            "sphere": sphere,
-                            "session_start_time": start_time,
-                            "session_end_time": end_time,
-                            "session_total_duration": total_duration,
-                            "session_active_duration": active_duration,
-                            "session_break_duration": break_duration,
-                            "type": "break",
-                            "primary_action": primary_action,
-                            "primary_percentage": primary_percentage,
-                            "primary_duration": primary_period_duration,
-                            "primary_comment": primary_comment,
-                            "secondary_action": secondary_action,
-                            "secondary_percentage": secondary_percentage,
-                            "secondary_duration": secondary_period_duration,
-                            "secondary_comment": secondary_comment,
-                            "activity_start": brk.get("start", ""),
-                            "activity_end": "",
-                            "active_notes": active_notes,
-                            "break_notes": break_notes,
-                            "idle_notes": idle_notes,
-                            "session_notes": session_notes,
-                        }
-                        csv_rows.append(row)
-
-                # Process idle periods
-                if idle_periods:
-                    for idle in idle_periods:
-                        # Extract primary and secondary action information
-                        primary_action = ""
-                        primary_comment = ""
-                        primary_percentage = 100
-                        primary_period_duration = idle.get("duration", 0)
-                        secondary_action = ""
-                        secondary_comment = ""
-                        secondary_percentage = ""
-                        secondary_period_duration = ""
-
-                        if idle.get("action"):
-                            # Single action case
-                            primary_action = idle.get("action", "")
-                            primary_comment = idle.get("comment", "")
-                        else:
-                            # Multiple actions case
-                            for action_item in idle.get("actions", []):
-                                if action_item.get("idle_primary", True):
-                                    primary_action = action_item.get("name", "")
-                                    primary_comment = action_item.get("comment", "")
-                                    primary_percentage = action_item.get(
-                                        "percentage", 100
-                                    )
-                                    primary_period_duration = action_item.get(
-                                        "duration", 0
-                                    )
-                                else:
-                                    secondary_action = action_item.get("name", "")
-                                    secondary_comment = action_item.get("comment", "")
-                                    secondary_percentage = action_item.get(
-                                        "percentage", ""
-                                    )
-                                    secondary_period_duration = action_item.get(
-                                        "duration", 0
-                                    )
-
-                        row = {
-                            "session_id": session_id,
-                            "date": date,
-                            "sphere": sphere,
-                            "session_start_time": start_time,
-                            "session_end_time": end_time,
-                            "session_total_duration": total_duration,
-                            "session_active_duration": active_duration,
-                            "session_break_duration": break_duration,
-                            "type": "idle",
-                            "primary_action": primary_action,
-                            "primary_percentage": primary_percentage,
-                            "primary_duration": primary_period_duration,
-                            "primary_comment": primary_comment,
-                            "secondary_action": secondary_action,
-                            "secondary_percentage": secondary_percentage,
-                            "secondary_duration": secondary_period_duration,
-                            "secondary_comment": secondary_comment,
-                            "activity_start": idle.get("start", ""),
-                            "activity_end": idle.get("end", ""),
-                            "active_notes": active_notes,
-                            "break_notes": break_notes,
-                            "idle_notes": idle_notes,
-                            "session_notes": session_notes,
-                        }
-                        csv_rows.append(row)
-
-                # If no active periods, breaks, or idle, create summary row
-                if not active_periods and not breaks and not idle_periods:
-                    row = {
-                        "session_id": session_id,
-                        "date": date,
-                        "sphere": sphere,
-                        "session_start_time": start_time,
-                        "session_end_time": end_time,
-                        "session_total_duration": total_duration,
-                        "session_active_duration": active_duration,
-                        "session_break_duration": break_duration,
-                        "type": "session_summary",
-                        "primary_action": "",
-                        "primary_percentage": "",
-                        "primary_duration": "",
-                        "primary_comment": "",
-                        "secondary_action": "",
-                        "secondary_percentage": "",
-                        "secondary_duration": "",
-                        "secondary_comment": "",
-                        "activity_start": "",
-                        "activity_end": "",
-                        "active_notes": active_notes,
-                        "break_notes": break_notes,
-                        "idle_notes": idle_notes,
-                        "session_notes": session_notes,
-                    }
-                    csv_rows.append(row)
-
-            # Write to CSV file
-            if csv_rows:
-                with open(file_path, "w", newline="", encoding="utf-8") as f:
-                    fieldnames = [
-                        "session_id",
-                        "date",
-                        "sphere",
-                        "session_start_time",
-                        "session_end_time",
-                        "session_total_duration",
-                        "session_active_duration",
-                        "session_break_duration",
-                        "type",
-                        "primary_action",
-                        "primary_percentage",
-                        "primary_duration",
-                        "primary_comment",
-                        "secondary_action",
-                        "secondary_percentage",
-                        "secondary_duration",
-                        "secondary_comment",
-                        "activity_start",
-                        "activity_end",
-                        "active_notes",
-                        "break_notes",
-                        "idle_notes",
-                        "session_notes",
-                    ]
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    writer.writerows(csv_rows)
-
-                messagebox.showinfo(
-                    "Export Successful",
-                    f"Data exported successfully to:\n{file_path}\n\n{len(csv_rows)} rows exported",
-                )
+            row_count = export_csv_with_progress(
+                self.root,
+                file_path,
+                ALL_DATA_CSV_FIELDS,
+                iter_all_data_rows(data, period_model),
+            )
+            if row_count is None:
+                return  # Export cancelled - no file written
 
-                # Open file location
-                try:
-                    directory = os.path.dirname(file_path)
-                    if platform.system() == "Windows":
-                        os.startfile(directory)
-                    elif platform.system() == "Darwin":  # macOS
-                        subprocess.Popen(["open", directory])
-                    else:  # Linux
-                        subprocess.Popen(["xdg-open", directory])
-                except Exception as error:
-                    # Silently fail if can't open directory
-                    pass
+            messagebox.showinfo(
+                "Export Successful",
+                f"Data exported successfully to:\n{file_path}\n\n{row_count} rows exported",
+            )
 
-            else:
-                messagebox.showwarning("No Data", "No data rows to export")
+            # Open file location
+            try:
+                directory = os.path.dirname(file_path)
+                if platform.system() == "Windows":
+                    os.startfile(directory)
+                elif platform.system() == "Darwin":  # macOS
+                    subprocess.Popen(["open", directory])
+                else:  # Linux
+                    subprocess.Popen(["xdg-open", directory])
+            except Exception as error:
+                # Silently fail if can't open directory
+                pass
 
         except Exception as error:
             messagebox.showerror(
@@ -0,0 +1,391 @@
+"""
+SQLite Storage Module for Time Tracker
+Optional storage backend that keeps session data in indexed SQLite tables
+(sessions, periods, project allocations) instead of one large data.json file.
+Round-trips losslessly with the data.json format, so it sits behind
+TimeTracker.load_data()/save_data() and can be migrated to and exported from
+data.json at any time.
+"""
+
+import os
+import json
+import sqlite3
+import hashlib
+from contextlib import closing
+
+from src.atomic_writer import write_json_atomic
+from src.session_journal import SessionJournal, apply_journal_record
+
+# data.json list name -> period type stored in the periods table
+PERIOD_LISTS = {"active": "active", "breaks": "break", "idle_periods": "idle"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    date TEXT,
+    sphere TEXT,
+    start_timestamp REAL,
+    end_timestamp REAL,
+    checksum TEXT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS periods (
+    period_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL REFERENCES sessions(session_id) ON DELETE CASCADE,
+    list_name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    date TEXT,
+    sphere TEXT,
+    start_timestamp REAL,
+    end_timestamp REAL,
+    duration REAL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS allocations (
+    period_id INTEGER NOT NULL REFERENCES periods(period_id) ON DELETE CASCADE,
+    session_id TEXT NOT NULL,
+    date TEXT,
+    project TEXT,
+    percentage REAL,
+    duration REAL,
+    is_primary INTEGER,
+    comment TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_date ON sessions(date);
+CREATE INDEX IF NOT EXISTS idx_periods_session ON periods(session_id, list_name, position);
+CREATE INDEX IF NOT EXISTS idx_periods_date ON periods(date);
+CREATE INDEX IF NOT EXISTS idx_periods_type ON periods(type);
+CREATE INDEX IF NOT EXISTS idx_allocations_session ON allocations(session_id);
+-- Sphere/project columns hold the names sessions were saved with, which a
+-- rename doesn't change (see src.name_table), so they are not queried
+DROP INDEX IF EXISTS idx_sessions_sphere;
+DROP INDEX IF EXISTS idx_periods_sphere;
+DROP INDEX IF EXISTS idx_allocations_project;
+"""
+
+
+def sqlite_path_for(data_file):
+    """Return the database path that belongs to a data file (data.json -> data.db)"""
+    return os.path.splitext(data_file)[0] + ".db"
+
+
+def _session_checksum(session):
+    """Stable content hash used to skip rewriting unchanged sessions"""
+    payload = json.dumps(session, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def _period_allocations(period):
+    """Return (project, percentage, duration, is_primary, comment) rows for an active period.
+
+    Handles both the legacy single "project" field and the "projects" list.
+    """
+    projects = period.get("projects")
+    if isinstance(projects, list) and projects:
+        return [
+            (
+                project.get("name"),
+                project.get("percentage"),
+                project.get("duration"),
+                1 if project.get("project_primary", True) else 0,
+                project.get("comment", ""),
+            )
+            for project in projects
+            if isinstance(project, dict)
+        ]
+    if period.get("project"):
+        return [
+            (
+                period["project"],
+                100,
+                period.get("duration"),
+                1,
+                period.get("comment", ""),
+            )
+        ]
+    return []
+
+
+# Session names per "IN (...)" query, under SQLite's bound parameter limit
+_CHECKSUM_BATCH = 500
+
+
+def _stored_checksums(conn, session_ids):
+    """Return {session_id: checksum} for those of session_ids already stored"""
+    checksums = {}
+    for start in range(0, len(session_ids), _CHECKSUM_BATCH):
+        batch = session_ids[start : start + _CHECKSUM_BATCH]
+        checksums.update(
+            conn.execute(
+                "SELECT session_id, checksum FROM sessions WHERE session_id IN (%s)"
+                % ",".join("?" * len(batch)),
+                batch,
+            )
+        )
+    return checksums
+
+
+class SqliteSessionStore:
+    """Session data stored in an SQLite database with indexed lookups"""
+
+    def __init__(self, db_file):
+        self.db_file = db_file
+        self._schema_ready = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_file)
+        conn.execute("PRAGMA foreign_keys = ON")
+        if not self._schema_ready:
+            conn.executescript(SCHEMA)
+            self._schema_ready = True
+        return conn
+
+    def exists(self):
+        """Whether the database file has been created"""
+        return os.path.exists(self.db_file)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _write_session(self, conn, session_id, session, checksum):
+        """Insert or replace one session and its periods/allocations"""
+        if not isinstance(session, dict):
+            session = {"__raw__": session}
+
+        # Keep key order of the session; period lists are stored as placeholders
+        shell = {
+            key: ([] if key in PERIOD_LISTS and isinstance(value, list) else value)
+            for key, value in session.items()
+        }
+        date = session.get("date")
+        sphere = session.get("sphere")
+
+        conn.execute(
+            """
+            INSERT INTO sessions
+                (session_id, date, sphere, start_timestamp, end_timestamp, checksum, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(session_id) DO UPDATE SET
+                date = excluded.date,
+                sphere = excluded.sphere,
+                start_timestamp = excluded.start_timestamp,
+                end_timestamp = excluded.end_timestamp,
+                checksum = excluded.checksum,
+                data = excluded.data
+            """,
+            (
+                session_id,
+                date,
+                sphere,
+                session.get("start_timestamp"),
+                session.get("end_timestamp"),
+                checksum,
+                json.dumps(shell),
+            ),
+        )
+        conn.execute("DELETE FROM allocations WHERE session_id = ?", (session_id,))
+        conn.execute("DELETE FROM periods WHERE session_id = ?", (session_id,))
+
+        for list_name, period_type in PERIOD_LISTS.items():
+            periods = session.get(list_name)
+            if not isinstance(periods, list):
+                continue
+            for position, period in enumerate(periods):
+                if not isinstance(period, dict):
+                    period = {"__raw__": period}
+                cursor = conn.execute(
+                    """
+                    INSERT INTO periods
+                        (session_id, list_name, type, position, date, sphere,
+                         start_timestamp, end_timestamp, duration, data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        session_id,
+                        list_name,
+                        period_type,
+                        position,
+                        date,
+                        sphere,
+                        period.get("start_timestamp"),
+                        period.get("end_timestamp"),
+                        period.get("duration"),
+                        json.dumps(period),
+                    ),
+                )
+                if period_type != "active":
+                    continue
+                conn.executemany(
+                    """
+                    INSERT INTO allocations
+                        (period_id, session_id, date, project, percentage,
+                         duration, is_primary, comment)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    [
+                        (cursor.lastrowid, session_id, date) + allocation
+                        for allocation in _period_allocations(period)
+                    ],
+                )
+
+    def upsert_sessions(self, sessions):
+        """Insert or update the given sessions, leaving all others untouched.
+
+        Sessions whose content is unchanged are skipped; only the stored
+        checksums of the given sessions are read.
+
+        Args:
+            sessions: Dictionary mapping session names to session data
+        """
+        with closing(self._connect()) as conn, conn:
+            existing = _stored_checksums(conn, list(sessions))
+            for session_id, session in sessions.items():
+                checksum = _session_checksum(session)
+                if existing.get(session_id) == checksum:
+                    continue
+                self._write_session(conn, session_id, session, checksum)
+
+    def save_all(self, all_data):
+        """Replace the stored data with all_data (data.json semantics for merge=False)"""
+        with closing(self._connect()) as conn, conn:
+            existing = dict(conn.execute("SELECT session_id, checksum FROM sessions"))
+            for session_id in set(existing) - set(all_data):
+                conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            for session_id, session in all_data.items():
+                checksum = _session_checksum(session)
+                if existing.get(session_id) == checksum:
+                    continue
+                self._write_session(conn, session_id, session, checksum)
+
+    def delete_session(self, session_id):
+        """Remove one session with its periods and allocations"""
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+
+    def apply_record(self, record):
+        """Apply a session journal record (see src.session_journal) to one session.
+
+        Only the affected session is read and rewritten.
+        """
+        session_id = record.get("session")
+        if session_id is None:
+            return
+        data = self.load_sessions(session_ids=[session_id])
+        apply_journal_record(data, record)
+        if session_id in data:
+            self.upsert_sessions({session_id: data[session_id]})
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def load_all(self):
+        """Load every session in data.json format"""
+        return self.load_sessions()
+
+    def load_sessions(self, start_date=None, end_date=None, session_ids=None):
+        """Load sessions matching the filters using the table indexes.
+
+        Args:
+            start_date: Earliest session date (inclusive, "YYYY-MM-DD")
+            end_date: Latest session date (inclusive, "YYYY-MM-DD")
+            session_ids: Only these session names
+
+        Returns:
+            dict: Session name -> session data in data.json format, in the
+                order sessions were first saved
+        """
+        conditions = []
+        params = []
+        if start_date is not None:
+            conditions.append("s.date >= ?")
+            params.append(start_date)
+        if end_date is not None:
+            conditions.append("s.date <= ?")
+            params.append(end_date)
+        if session_ids is not None:
+            session_ids = list(session_ids)
+            if not session_ids:
+                return {}
+            conditions.append("s.session_id IN (%s)" % ",".join("?" * len(session_ids)))
+            params.extend(session_ids)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        result = {}
+        with closing(self._connect()) as conn:
+            for session_id, data in conn.execute(
+                f"SELECT s.session_id, s.data FROM sessions s {where} ORDER BY s.rowid",
+                params,
+            ):
+                session = json.loads(data)
+                result[session_id] = session.get("__raw__", session)
+
+            for session_id, list_name, data in conn.execute(
+                f"""
+                SELECT p.session_id, p.list_name, p.data
+                FROM periods p JOIN sessions s ON s.session_id = p.session_id
+                {where}
+                ORDER BY p.session_id, p.list_name, p.position
+                """,
+                params,
+            ):
+                period = json.loads(data)
+                result[session_id][list_name].append(period.get("__raw__", period))
+        return result
+
+    def session_dates(self):
+        """Dates that have sessions ("YYYY-MM-DD"), oldest first - read from
+        the date index without loading any session"""
+        with closing(self._connect()) as conn:
+            return [
+                date
+                for (date,) in conn.execute(
+                    "SELECT DISTINCT date FROM sessions WHERE date IS NOT NULL "
+                    "ORDER BY date"
+                )
+            ]
+
+    def session_count(self):
+        """Number of stored sessions"""
+        with closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+
+def migrate_json_to_sqlite(data_file, db_file):
+    """One-shot migration of data.json (plus any pending journal) into SQLite.
+
+    Args:
+        data_file: Path to data.json
+        db_file: Path to the SQLite database (created if missing)
+
+    Returns:
+        int: Number of sessions migrated
+    """
+    all_data = {}
+    if os.path.exists(data_file):
+        with open(data_file, "r") as f:
+            all_data = json.load(f)
+    if not isinstance(all_data, dict):
+        raise ValueError(f"{data_file} does not contain session data")
+    SessionJournal(data_file).replay(all_data)
+
+    SqliteSessionStore(db_file).save_all(all_data)
+    return len(all_data)
+
+
+def export_sqlite_to_json(db_file, data_file):
+    """Export the SQLite database back to data.json format.
+
+    Args:
+        db_file: Path to the SQLite database
+        data_file: Path of the data.json file to write
+
+    Returns:
+        int: Number of sessions exported
+    """
+    all_data = SqliteSessionStore(db_file).load_all()
+    write_json_atomic(data_file, all_data)
+    SessionJournal(data_file).clear()
+    return len(all_data)
@@ -0,0 +1,90 @@
+"""
+Timeline Cache Module for Time Tracker
+Keeps recently shown analysis timeline result sets so that clicking a column
+header, re-selecting a card or returning to a filter doesn't re-read and
+re-filter the session data. Each result set precomputes its sort keys once per
+column and remembers every ordering it has produced.
+"""
+
+from collections import OrderedDict
+
+from src.constants import TIMELINE_CACHE_SIZE
+
+# Sortable timeline columns -> sort key for a timeline row. Columns not listed
+# (e.g. "sphere") sort by date like the default.
+TIMELINE_SORT_KEYS = {
+    "date": lambda row: (row["date"], row["period_start"]),
+    "type": lambda row: row["type"],
+    "primary_project": lambda row: row["primary_project"],
+    "secondary_project": lambda row: row["secondary_project"],
+    "start": lambda row: row["period_start"],
+    "duration": lambda row: row["duration"],
+}
+
+
+class TimelineResultSet:
+    """Filtered timeline rows for one range/filter combination"""
+
+    def __init__(self, rows):
+        self.rows = rows  # In query order (date, start)
+        self._keys = {}  # column -> sort key per row
+        self._orders = {}  # (column, reverse) -> sorted rows
+
+    def sorted(self, column, reverse=False):
+        """Return the rows ordered by a column.
+
+        The result is shared between calls and must not be modified.
+
+        Args:
+            column: Column key (see TIMELINE_SORT_KEYS)
+            reverse: Descending order if True
+
+        Returns:
+            list: Rows in the requested order (stable for equal keys)
+        """
+        if column not in TIMELINE_SORT_KEYS:
+            column = "date"
+        order = self._orders.get((column, reverse))
+        if order is None:
+            keys = self._keys.get(column)
+            if keys is None:
+                key = TIMELINE_SORT_KEYS[column]
+                keys = [key(row) for row in self.rows]
+                self._keys[column] = keys
+            indices = sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
+            order = [self.rows[i] for i in indices]
+            self._orders[(column, reverse)] = order
+        return order
+
+
+class TimelineCache:
+    """Least-recently-used cache of TimelineResultSets.
+
+    Keys must include everything the rows depend on: date range, filters,
+    active flags and the session data version.
+    """
+
+    def __init__(self, max_entries=TIMELINE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Return the cached result set for key (marking it recently used), or None"""
+        result_set = self._entries.get(key)
+        if result_set is not None:
+            self._entries.move_to_end(key)
+        return result_set
+
+    def put(self, key, result_set):
+        """Cache a result set, evicting the least recently used beyond the limit"""
+        self._entries[key] = result_set
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached result set"""
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
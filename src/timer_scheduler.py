@@ -0,0 +1,81 @@
+"""
+Timer Scheduler Module for Time Tracker
+Named one-shot timers on top of Tk's root.after(). TimeTracker uses it instead
+of a fixed-rate polling loop: display refreshes are armed for the next
+whole-second boundary, idle/auto-break checks for the exact moment the next
+threshold can be crossed, and nothing is armed at all while no session runs.
+"""
+
+import math
+import time
+
+from src.constants import MILLISECONDS_PER_SECOND, TIMER_BOUNDARY_SLACK_MS
+
+
+def ms_until_next_second(elapsed):
+    """Milliseconds until a running counter reaches its next whole second.
+
+    Args:
+        elapsed: Current counter value in seconds (e.g. session elapsed time)
+
+    Returns:
+        int: Delay in milliseconds, including a small slack so the counter has
+        definitely ticked over when the timer fires
+    """
+    fraction = elapsed - math.floor(elapsed)
+    remaining = math.ceil((1 - fraction) * MILLISECONDS_PER_SECOND)
+    return max(1, remaining) + TIMER_BOUNDARY_SLACK_MS
+
+
+class TimerScheduler:
+    """Named one-shot timers.
+
+    Scheduling a name that is already pending replaces the earlier timer, so
+    each name has at most one wakeup queued. wakeups counts fired timers and
+    is used to compare scheduling strategies.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.wakeups = 0
+        self._after_ids = {}
+
+    def schedule(self, name, delay_ms, callback):
+        """Run callback once after delay_ms, replacing any pending timer of that name"""
+        self.cancel(name)
+
+        def fire():
+            self._after_ids.pop(name, None)
+            self.wakeups += 1
+            callback()
+
+        self._after_ids[name] = self.root.after(max(0, int(delay_ms)), fire)
+
+    def schedule_at(self, name, deadline, callback):
+        """Run callback once at a time.time() deadline"""
+        delay_ms = math.ceil((deadline - time.time()) * MILLISECONDS_PER_SECOND)
+        self.schedule(name, delay_ms, callback)
+
+    def cancel(self, name):
+        """Cancel a pending timer (no-op if none is pending)"""
+        after_id = self._after_ids.pop(name, None)
+        if after_id is None:
+            return
+        try:
+            self.root.after_cancel(after_id)
+        except Exception:
+            # Window already destroyed
+            pass
+
+    def cancel_all(self):
+        """Cancel every pending timer"""
+        for name in list(self._after_ids):
+            self.cancel(name)
+
+    def is_scheduled(self, name):
+        """Return True if a timer with this name is pending"""
+        return name in self._after_ids
+
+    def pending(self):
+        """Return the names of all pending timers"""
+        return sorted(self._after_ids)
@@ -0,0 +1,83 @@
+"""
+Tray Icons Module for Time Tracker
+Pre-rendered system tray icons. The four state icons are drawn once and
+reused; they are only re-rendered when the taskbar colour (light/dark theme)
+changes, so switching state is a dictionary lookup instead of a new PIL image
+and a registry read.
+"""
+
+from PIL import Image, ImageDraw
+
+from src.ui_helpers import get_taskbar_color
+from src.constants import (
+    COLOR_TRAY_IDLE,
+    COLOR_TRAY_ACTIVE,
+    COLOR_TRAY_BREAK,
+    COLOR_TRAY_SESSION_IDLE,
+    TRAY_ICON_SIZE,
+    TRAY_ICON_MARGIN,
+    TRAY_ICON_OUTLINE_WIDTH,
+    TRAY_ICON_BG_COLOR,
+)
+
+TRAY_STATE_COLORS = {
+    "idle": COLOR_TRAY_IDLE,
+    "active": COLOR_TRAY_ACTIVE,
+    "break": COLOR_TRAY_BREAK,
+    "session_idle": COLOR_TRAY_SESSION_IDLE,
+}
+
+
+def render_tray_icon(state, background):
+    """Draw a colored circle icon for a tray state.
+
+    Args:
+        state: "idle", "active", "session_idle" or "break" (unknown -> idle)
+        background: RGBA tuple matching the OS taskbar
+
+    Returns:
+        PIL Image (TRAY_ICON_SIZE x TRAY_ICON_SIZE, RGBA)
+    """
+    image = Image.new("RGBA", (TRAY_ICON_SIZE, TRAY_ICON_SIZE), background)
+    dc = ImageDraw.Draw(image)
+    dc.ellipse(
+        [
+            TRAY_ICON_MARGIN,
+            TRAY_ICON_MARGIN,
+            TRAY_ICON_SIZE - TRAY_ICON_MARGIN,
+            TRAY_ICON_SIZE - TRAY_ICON_MARGIN,
+        ],
+        fill=TRAY_STATE_COLORS.get(state, COLOR_TRAY_IDLE),
+        outline="black",
+        width=TRAY_ICON_OUTLINE_WIDTH,
+    )
+    return image
+
+
+class TrayIconCache:
+    """The four tray state icons, rendered once per taskbar theme"""
+
+    def __init__(self, color_source=get_taskbar_color):
+        self._color_source = color_source
+        self.background = None
+        self._images = {}
+        self.refresh_theme()
+
+    def refresh_theme(self):
+        """Re-read the taskbar colour and re-render if it changed.
+
+        Returns:
+            bool: True if the icons were re-rendered
+        """
+        background = self._color_source() or TRAY_ICON_BG_COLOR
+        if self._images and background == self.background:
+            return False
+        self.background = background
+        self._images = {
+            state: render_tray_icon(state, background) for state in TRAY_STATE_COLORS
+        }
+        return True
+
+    def get(self, state):
+        """Return the cached icon for a state (unknown states use idle)"""
+        return self._images.get(state, self._images["idle"])
@@ -0,0 +1,74 @@
+"""
+Memory benchmark for the period object model
+
+Builds 100k periods of generated session data and measures (with tracemalloc)
+the memory held by:
+- the Session/Period/Allocation objects of the PeriodModel vs the same
+  sessions as nested dicts (Session.to_dict())
+- an "All Time" analysis timeline of TimelineRow objects vs one dict per row
+
+Run from the repository root:
+    python tests/benchmark_period_model_memory.py [periods]
+"""
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analysis_query import ALL_PROJECTS, ALL_SPHERES, AnalysisQuery
+from src.period_model import PeriodModel
+from tests.test_helpers import TestDataGenerator
+
+ALL_TIME = (datetime(2000, 1, 1), datetime(2100, 1, 1))
+
+
+def traced(build):
+    """Return (result, bytes allocated by build() and still held)"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def report(label, objects, dicts):
+    print(
+        f"{label:<16} objects {objects / 1e6:7.1f} MB   "
+        f"dicts {dicts / 1e6:7.1f} MB   "
+        f"saved {100 * (1 - objects / dicts):5.1f}%"
+    )
+
+
+def main(periods=100_000):
+    print(f"Generating {periods:,} periods...")
+    data = TestDataGenerator.create_test_data_with_n_periods(periods)
+    started = time.perf_counter()
+
+    model = PeriodModel()
+    sessions, session_bytes = traced(
+        lambda: [model.session(name, session) for name, session in data.items()]
+    )
+    _, dict_bytes = traced(lambda: [session.to_dict() for session in sessions])
+    report("Sessions", session_bytes, dict_bytes)
+
+    def timeline():
+        query = AnalysisQuery(data, model)
+        result = query.run([ALL_TIME], ALL_SPHERES, ALL_PROJECTS, "all", {}, 0)
+        return result.timeline
+
+    rows, row_bytes = traced(timeline)
+    _, row_dict_bytes = traced(lambda: [row.to_dict() for row in rows])
+    report(f"Timeline ({len(rows):,})", row_bytes, row_dict_bytes)
+
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,121 @@
+"""
+Screenshot encoding benchmark for Time Aligned
+
+Encodes synthetic desktop-like frames (MockScreenshot-style: a grab() that
+returns an image, but with real pixels - windows, lines of text and a photo)
+with each screenshot_settings format/quality/max_dimension combination and
+reports the encode time and bytes per capture, plus the thumbnail cost.
+
+Run from the repository root:
+    python tests/benchmark_screenshot_encoding.py [runs] [WIDTHxHEIGHT ...]
+"""
+
+import os
+import random
+import statistics
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image, ImageDraw
+
+from src.screenshot_encoding import ScreenshotEncoding, available_formats
+
+# (label, screenshot_settings image options)
+CONFIGS = [
+    ("png (default)", {"image_format": "png"}),
+    ("jpeg q80", {"image_format": "jpeg", "image_quality": 80}),
+    ("webp q80", {"image_format": "webp", "image_quality": 80}),
+    ("webp q60", {"image_format": "webp", "image_quality": 60}),
+    ("png max 1920", {"image_format": "png", "max_dimension": 1920}),
+    ("jpeg q80 max 1920", {"image_format": "jpeg", "max_dimension": 1920}),
+    ("webp q80 max 1920", {"image_format": "webp", "max_dimension": 1920}),
+]
+
+
+class SyntheticScreen:
+    """Stand-in for ImageGrab that returns desktop-like frames"""
+
+    def __init__(self, width=1920, height=1080, seed=0):
+        self.width = width
+        self.height = height
+        self.random = random.Random(seed)
+
+    def grab(self, bbox=None):
+        rng = self.random
+        image = Image.new("RGB", (self.width, self.height), (32, 54, 82))
+        draw = ImageDraw.Draw(image)
+        # Taskbar
+        draw.rectangle([(0, self.height - 40), (self.width, self.height)], (20, 20, 20))
+        # A few overlapping windows with title bars and lines of "text"
+        for _ in range(4):
+            left = rng.randrange(0, self.width // 2)
+            top = rng.randrange(0, self.height // 2)
+            right = left + rng.randrange(self.width // 4, self.width // 2)
+            bottom = top + rng.randrange(self.height // 4, self.height // 2)
+            draw.rectangle([(left, top), (right, bottom)], (250, 250, 250))
+            draw.rectangle([(left, top), (right, top + 30)], (0, 120, 215))
+            for y in range(top + 45, bottom - 10, 18):
+                x = left + 10
+                while x < right - 40:
+                    word = rng.randrange(15, 60)
+                    draw.rectangle([(x, y), (x + word, y + 9)], (40, 40, 40))
+                    x += word + 7
+        # A photo-like region (noisy content compresses like a real image)
+        size = (self.width // 4, self.height // 4)
+        photo = Image.merge(
+            "RGB",
+            [
+                Image.effect_noise(size, 40 + 20 * band).convert("L")
+                for band in range(3)
+            ],
+        )
+        image.paste(photo, (self.width // 2, self.height // 2))
+        return image
+
+
+def measure(encoding, frames):
+    """Return (median encode seconds, median bytes, median thumbnail seconds)"""
+    encode_times, sizes, thumbnail_times = [], [], []
+    for frame in frames:
+        output = BytesIO()
+        started = time.perf_counter()
+        saved = encoding.save(frame, output)
+        encode_times.append(time.perf_counter() - started)
+        sizes.append(output.tell())
+        started = time.perf_counter()
+        encoding.save_thumbnail(saved, BytesIO())
+        thumbnail_times.append(time.perf_counter() - started)
+    return (
+        statistics.median(encode_times),
+        statistics.median(sizes),
+        statistics.median(thumbnail_times),
+    )
+
+
+def main(runs=5, resolutions=((1920, 1080), (3840, 2160))):
+    formats = available_formats()
+    for width, height in resolutions:
+        screen = SyntheticScreen(width, height)
+        frames = [screen.grab() for _ in range(runs)]
+        raw_mb = width * height * 3 / 1024 / 1024
+        print(f"\n{width}x{height} ({raw_mb:.1f} MB raw), median of {runs} frames")
+        print(f"  {'setting':<20} {'encode ms':>10} {'KB/capture':>11} {'thumb ms':>9}")
+        for label, options in CONFIGS:
+            if options["image_format"] not in formats:
+                print(f"  {label:<20} (not supported by this Pillow build)")
+                continue
+            encoding = ScreenshotEncoding(options)
+            seconds, size, thumbnail_seconds = measure(encoding, frames)
+            print(
+                f"  {label:<20} {seconds * 1000:10.1f} {size / 1024:11.1f}"
+                f" {thumbnail_seconds * 1000:9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    resolutions = [tuple(int(n) for n in arg.split("x")) for arg in sys.argv[2:]]
+    main(runs, resolutions or ((1920, 1080), (3840, 2160)))
@@ -0,0 +1,175 @@
+"""
+Startup benchmark for Time Aligned
+
+Measures, each in a fresh interpreter:
+- the import cost of `import time_tracker`, per module (python -X importtime),
+  and which heavy modules it pulls in
+- time to first window: from launching the process until the main window
+  has been painted, and until the tray icon and hotkeys have been started
+
+The app runs in a temporary directory, so the real data.json/settings.json
+are never touched. Pass a data file to measure startup with a real history.
+Time to first window needs a display.
+
+Run from the repository root:
+    python tests/benchmark_startup.py [runs] [data.json]
+"""
+
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules startup should not need before the first window
+HEAVY_MODULES = (
+    "PIL",
+    "pystray",
+    "pynput",
+    "google",
+    "googleapiclient",
+    "src.analysis_frame",
+    "src.completion_frame",
+    "src.settings_frame",
+    "src.screenshot_capture",
+)
+
+# Child process: start the app like main() and report when the first window
+# is painted and when the background services are up
+FIRST_WINDOW_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import tkinter as tk
+import time_tracker
+imported = time.perf_counter()
+
+marks = {}
+start_services = time_tracker.TimeTracker._start_background_services
+
+def timed_services(self):
+    self.root.update_idletasks()
+    marks["window"] = time.perf_counter()
+    start_services(self)
+    marks["services"] = time.perf_counter()
+    self.root.after(0, self.root.quit)
+
+time_tracker.TimeTracker._start_background_services = timed_services
+root = tk.Tk()
+app = time_tracker.TimeTracker(root)
+app.recover_session_checkpoint()
+app.migrate_name_ids()
+app.migrate_screenshot_manifests()
+root.mainloop()
+print(json.dumps({
+    "import": imported - started,
+    "window": marks["window"] - started,
+    "services": marks["services"] - started,
+}))
+sys.stdout.flush()
+import os
+os._exit(0)
+"""
+
+
+def _child_env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def import_costs():
+    """Return ([(module, self_us, cumulative_us)], heavy modules imported)"""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import sys, time_tracker; print(' '.join(sorted(sys.modules)))",
+        ],
+        cwd=ROOT,
+        env=_child_env(),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    costs = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        costs.append((module.strip(), int(self_us), int(cumulative_us)))
+    loaded = set(result.stdout.split())
+    heavy = [
+        name
+        for name in HEAVY_MODULES
+        if any(m == name or m.startswith(name + ".") for m in loaded)
+    ]
+    return costs, heavy
+
+
+def first_window(data_file=None):
+    """Launch the app once; return (wall seconds to first window, child marks)"""
+    directory = tempfile.mkdtemp()
+    try:
+        if data_file:
+            shutil.copy(data_file, os.path.join(directory, "data.json"))
+        launched = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-c", FIRST_WINDOW_SCRIPT],
+            cwd=directory,
+            env=_child_env(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        output, errors = process.communicate()
+        finished = time.perf_counter()
+        if process.returncode != 0 or not output.strip():
+            raise RuntimeError((errors.strip().splitlines() or ["no output"])[-1])
+        marks = json.loads(output.strip().splitlines()[-1])
+        # Interpreter startup is before the child's first timestamp
+        interpreter = (finished - launched) - marks["services"]
+        return interpreter + marks["window"], marks
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main(runs=5, data_file=None):
+    costs, heavy = import_costs()
+    total = next(c for m, _, c in costs if m == "time_tracker")
+    print(f"import time_tracker: {total / 1000:.1f} ms cumulative")
+    print("Slowest modules (self time):")
+    for module, self_us, cumulative_us in sorted(costs, key=lambda c: -c[1])[:15]:
+        print(f"  {module:<40} {self_us / 1000:7.1f} ms  ({cumulative_us / 1000:.1f})")
+    print("Heavy modules loaded at import:", ", ".join(heavy) or "none")
+
+    try:
+        samples = [first_window(data_file) for _ in range(runs)]
+    except RuntimeError as error:
+        print(f"Time to first window: skipped ({error})")
+        return
+    walls = [wall for wall, _ in samples]
+    marks = [mark for _, mark in samples]
+    print(f"Time to first window over {runs} runs (median):")
+    print(f"  process launch -> window  {statistics.median(walls) * 1000:7.1f} ms")
+    for key, label in (
+        ("import", "import time_tracker"),
+        ("window", "window painted"),
+        ("services", "tray + hotkeys started"),
+    ):
+        value = statistics.median(m[key] for m in marks)
+        print(f"  {label:<25} {value * 1000:7.1f} ms after interpreter start")
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 5,
+        sys.argv[2] if len(sys.argv) > 2 else None,
+    )
@@ -558,6 +558,7 @@ class TestAnalysisCardRangeCustomization(unittest.TestCase):
         # Modify card ranges
         analysis.card_ranges = ["Last 14 Days", "This Month", "All Time"]
         analysis.save_card_ranges()
+        tracker.flush_writes()
 
         # Read settings file and verify
         with open(self.test_settings_file, "r") as f:
@@ -602,10 +603,13 @@ class TestAnalysisCardRangeCustomization(unittest.TestCase):
         analysis = AnalysisFrame(self.content_frame(), tracker, self.root)
         analysis.card_ranges = ["Last 7 Days", "Last 14 Days", "All Time"]
 
-        # Mock the file write to raise an error
+        # Mock the file write to raise an error - reported once the
+        # coalesced write runs
         with patch("builtins.open", side_effect=IOError("Permission denied")):
             with patch("tkinter.messagebox.showerror") as mock_error:
                 analysis.save_card_ranges()
+                tracker.flush_writes()
+                self.root.update()
 
             mock_error.assert_called_once()
             self.assertIn("Failed to save settings", mock_error.call_args[0][1])
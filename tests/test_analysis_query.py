@@ -0,0 +1,261 @@
+"""
+Tests for the Analysis Query Engine
+
+Verifies period normalization, single-pass totals for several date ranges,
+timeline rows and CSV export rows, independent of the Tk analysis frame.
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+def _sample_data():
+    """Two Work sessions and one Personal session"""
+    return {
+        "2026-01-10_1": {
+            "date": "2026-01-10",
+            "sphere": "Work",
+            "active": [
+                {"start": "09:00:00", "duration": 600, "project": "Alpha"},
+                {
+                    "start": "10:00:00",
+                    "duration": 1000,
+                    "projects": [
+                        {
+                            "name": "Alpha",
+                            "percentage": 70,
+                            "duration": 700,
+                            "comment": "main",
+                            "project_primary": True,
+                        },
+                        {
+                            "name": "Beta",
+                            "percentage": 30,
+                            "duration": 300,
+                            "comment": "side",
+                            "project_primary": False,
+                        },
+                    ],
+                },
+            ],
+            "breaks": [{"start": "09:30:00", "duration": 120, "action": "Rest"}],
+            "idle_periods": [
+                {"start": "11:00:00", "duration": 60, "end_timestamp": 5.0},
+                {"start": "12:00:00"},  # Still open - never counted
+            ],
+            "session_comments": {"break_notes": "coffee", "session_notes": "notes"},
+        },
+        "2026-01-11_1": {
+            "date": "2026-01-11",
+            "sphere": "Work",
+            "active": [{"start": "08:00:00", "duration": 300, "project": "Beta"}],
+            "breaks": [{"start": "08:10:00", "duration": 30, "action": "Rest"}],
+        },
+        "2026-01-11_2": {
+            "date": "2026-01-11",
+            "sphere": "Personal",
+            "active": [{"start": "18:00:00", "duration": 900, "project": "Gym"}],
+        },
+    }
+
+
+def _settings():
+    return {
+        "spheres": {"Work": {"active": True}, "Personal": {"active": True}},
+        "projects": {
+            "Alpha": {"active": True},
+            "Beta": {"active": False},
+            "Gym": {"active": True},
+        },
+    }
+
+
+def _day(day):
+    return datetime(2026, 1, day), datetime(2026, 1, day + 1)
+
+
+ALL_TIME = (datetime(2000, 1, 1), datetime(2100, 1, 1))
+
+
+class TestAnalysisQueryImports(unittest.TestCase):
+    """Test that the analysis query module imports correctly"""
+
+    def test_import_module(self):
+        """Test that analysis_query can be imported"""
+        from src.analysis_query import AnalysisQuery, normalize_period
+
+        self.assertTrue(callable(AnalysisQuery))
+        self.assertTrue(callable(normalize_period))
+
+
+class TestNormalizePeriod(unittest.TestCase):
+    """Test flattening of single and multi-allocation periods"""
+
+    def test_single_project(self):
+        """Test legacy single-project periods"""
+        from src.analysis_query import normalize_period
+
+        row = normalize_period(
+            {"start": "09:00:00", "duration": 60, "project": "A", "comment": "c"},
+            "Active",
+            "project",
+            "projects",
+            "project_primary",
+        )
+        self.assertEqual(row.primary, "A")
+        self.assertEqual(row.primary_comment, "c")
+        self.assertEqual(row.primary_percentage, 100)
+        self.assertEqual(row.primary_duration, 60)
+        self.assertEqual(row.secondary, "")
+        self.assertEqual(row.status_name, "A")
+
+    def test_multiple_actions(self):
+        """Test primary/secondary split for break actions"""
+        from src.analysis_query import normalize_period
+
+        row = normalize_period(
+            {
+                "duration": 100,
+                "actions": [
+                    {"name": "Rest", "percentage": 60, "duration": 60},
+                    {
+                        "name": "Walk",
+                        "percentage": 40,
+                        "duration": 40,
+                        "break_primary": False,
+                    },
+                ],
+            },
+            "Break",
+            "action",
+            "actions",
+            "break_primary",
+        )
+        self.assertEqual((row.primary, row.primary_percentage), ("Rest", 60))
+        self.assertEqual((row.secondary, row.secondary_duration), ("Walk", 40))
+        self.assertEqual(
+            [(item.name, item.duration) for item in row.allocations],
+            [("Rest", 60), ("Walk", 40)],
+        )
+        self.assertIn("Walk", row.names)
+
+
+class TestAnalysisQueryRun(unittest.TestCase):
+    """Test totals and timeline rows from one pass"""
+
+    def setUp(self):
+        from src.analysis_query import AnalysisQuery
+
+        self.query = AnalysisQuery(_sample_data())
+
+    def _run(self, ranges, project="All Projects", status="all", timeline_index=None):
+        return self.query.run(
+            ranges,
+            "All Spheres",
+            project,
+            status,
+            _settings(),
+            timeline_index=timeline_index,
+        )
+
+    def test_totals_for_several_ranges(self):
+        """Test one pass answers every requested range"""
+        result = self._run([_day(10), _day(11), ALL_TIME])
+        self.assertEqual(result.totals[0], (1600, 180))
+        self.assertEqual(result.totals[1], (1200, 30))
+        self.assertEqual(result.totals[2], (2800, 210))
+
+    def test_project_filter_uses_allocated_duration(self):
+        """Test a multi-project period contributes only the filtered share"""
+        result = self._run([_day(10)], project="Beta")
+        self.assertEqual(result.totals[0], (300, 180))
+
+    def test_status_filter(self):
+        """Test archived projects are excluded from the active filter"""
+        result = self._run([_day(11)], status="active")
+        # Beta is archived; its session's break goes with it
+        self.assertEqual(result.totals[0], (900, 0))
+
+    def test_timeline_rows_sorted(self):
+        """Test timeline rows for the requested range, sorted by date and start"""
+        result = self._run([_day(10), ALL_TIME], timeline_index=1)
+        starts = [(row["date"], row["period_start"]) for row in result.timeline]
+        self.assertEqual(starts, sorted(starts))
+        self.assertEqual(len(result.timeline), 7)
+
+        multi = [row for row in result.timeline if row["period_start"] == "10:00:00"]
+        self.assertEqual(multi[0]["primary_project"], "Alpha")
+        self.assertEqual(multi[0]["secondary_project"], "Beta")
+        breaks = [row for row in result.timeline if row["type"] == "Break"]
+        self.assertEqual(breaks[0]["session_break_idle_comments"], "coffee")
+
+    def test_no_timeline_without_index(self):
+        """Test totals-only queries build no rows"""
+        self.assertEqual(self._run([ALL_TIME]).timeline, [])
+
+    def test_sessions_normalized_once(self):
+        """Test repeated queries reuse the normalized sessions"""
+        self._run([ALL_TIME])
+        prepared = dict(self.query._prepared)
+        self._run([ALL_TIME], project="Alpha", status="active")
+        for key, value in self.query._prepared.items():
+            self.assertIs(value, prepared[key])
+
+    def test_cancelled_query_stops(self):
+        """Test a query stops once its cancelled() callback returns True"""
+        from src.analysis_query import QueryCancelled
+
+        checks = []
+
+        def cancelled():
+            checks.append(True)
+            return len(checks) > 1
+
+        with self.assertRaises(QueryCancelled):
+            self.query.run(
+                [ALL_TIME],
+                "All Spheres",
+                "All Projects",
+                "all",
+                _settings(),
+                cancelled=cancelled,
+            )
+        self.assertEqual(len(checks), 2)
+
+
+class TestAnalysisQueryExport(unittest.TestCase):
+    """Test CSV export rows"""
+
+    def test_export_rows(self):
+        """Test export rows keep CSV column names and include open idle periods"""
+        from src.analysis_query import AnalysisQuery
+
+        rows = AnalysisQuery(_sample_data()).export_rows(
+            _day(10), "Work", "All Projects", "all", _settings(), str
+        )
+        self.assertEqual([row["Type"] for row in rows].count("Idle"), 2)
+        multi = rows[1]
+        self.assertEqual(multi["Primary Action"], "Alpha")
+        self.assertEqual(multi["Primary Percentage"], 70)
+        self.assertEqual(multi["Primary Duration"], "700")
+        self.assertEqual(multi["Secondary Duration"], "300")
+        self.assertEqual(rows[2]["Project Active"], "N/A")
+
+    def test_streamed_export_keeps_no_sessions(self):
+        """Test iter_export_rows() yields the same rows without caching sessions"""
+        from src.analysis_query import AnalysisQuery
+
+        query = AnalysisQuery(_sample_data())
+        args = (ALL_TIME, "All Spheres", "All Projects", "all", _settings(), str)
+        streamed = list(query.iter_export_rows(*args))
+        self.assertEqual(query._prepared, {})
+        self.assertEqual(streamed, AnalysisQuery(_sample_data()).export_rows(*args))
+
+
+if __name__ == "__main__":
+    unittest.main()
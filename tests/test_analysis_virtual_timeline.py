@@ -0,0 +1,197 @@
+"""
+Tests for the virtualized Analysis Frame timeline.
+
+The timeline keeps a fixed pool of row widgets and re-fills them with the
+periods scrolled into view, replacing the old "Load More" pagination.
+
+Design:
+- At most TIMELINE_VISIBLE_ROWS row frames exist, however many periods match
+- Scrolling (scrollbar or mousewheel) recycles the same row widgets
+- The scrollbar is only shown when the periods don't all fit
+- Mousewheel at either end of the timeline falls through to the page scroll
+"""
+
+import unittest
+import tkinter as tk
+from tkinter import ttk
+from unittest.mock import Mock
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from time_tracker import TimeTracker
+from src.analysis_frame import AnalysisFrame
+from tests.test_helpers import TestFileManager, TestDataGenerator, safe_teardown_tk_root
+
+
+class TestImport(unittest.TestCase):
+    """Smoke test - verify module imports"""
+
+    def test_import(self):
+        """Verify analysis_frame imports without errors"""
+        from src.analysis_frame import AnalysisFrame, TIMELINE_COLUMNS
+
+        assert AnalysisFrame is not None
+        self.assertEqual(len(TIMELINE_COLUMNS), 14)
+
+
+class TestVirtualTimeline(unittest.TestCase):
+    """Test the pooled, virtualized timeline rows"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.root = tk.Tk()
+        self.root.withdraw()
+
+        self.file_manager = TestFileManager()
+        self.addCleanup(self.file_manager.cleanup)
+
+    def tearDown(self):
+        """Clean up after tests"""
+        safe_teardown_tk_root(self.root)
+        self.file_manager.cleanup()
+
+    def _create_analysis_frame_with_data(self, num_periods):
+        """Helper to create analysis frame with test data and proper filters
+
+        Args:
+            num_periods: Number of periods to generate in test data
+
+        Returns:
+            tuple: (tracker, frame) ready for testing
+        """
+        test_data = TestDataGenerator.create_test_data_with_n_periods(num_periods)
+        settings = TestDataGenerator.create_settings_data()
+
+        test_data_file = self.file_manager.create_test_file("test_data.json", test_data)
+        test_settings_file = self.file_manager.create_test_file(
+            "test_settings.json", settings
+        )
+        self.file_manager.test_files.append(test_data_file + ".rollup")
+
+        tracker = TimeTracker(self.root)
+        tracker.data_file = test_data_file
+        tracker.settings_file = test_settings_file
+        tracker.settings = tracker.get_settings()
+
+        content_frame = ttk.Frame(self.root)
+        content_frame.grid(row=0, column=0, sticky="nsew")
+        self.root.grid_rowconfigure(0, weight=1)
+        self.root.grid_columnconfigure(0, weight=1)
+
+        frame = AnalysisFrame(content_frame, tracker, self.root)
+        self.root.update()
+
+        # Set filters to include all test data
+        frame.sphere_var.set("All Spheres")
+        frame.project_var.set("All Projects")
+        frame.status_filter.set("all")
+        frame.selected_card = 2  # "All Time"
+
+        frame.update_timeline()
+        self.root.update()
+        return tracker, frame
+
+    def _shown_dates(self, frame):
+        """Date column of every pooled row, top to bottom"""
+        return [row.cells[0].cget("text") for row in frame.timeline_rows]
+
+    def test_widget_count_is_constant(self):
+        """Test only a fixed pool of rows exists for thousands of periods"""
+        from src.constants import TIMELINE_VISIBLE_ROWS
+
+        tracker, frame = self._create_analysis_frame_with_data(2000)
+
+        self.assertEqual(len(frame.timeline_data_all), 2000)
+        rows = frame.timeline_frame.winfo_children()
+        self.assertEqual(len(rows), TIMELINE_VISIBLE_ROWS)
+        for row in rows:
+            self.assertIsInstance(row, tk.Frame)
+            self.assertEqual(len(row.winfo_children()), 14)
+
+        # No Load More button anywhere
+        buttons = [
+            child
+            for row in rows
+            for child in row.winfo_children()
+            if isinstance(child, (tk.Button, ttk.Button))
+        ]
+        self.assertEqual(buttons, [])
+
+    def test_scrolling_recycles_rows(self):
+        """Test scrolling re-fills the same widgets with later periods"""
+        tracker, frame = self._create_analysis_frame_with_data(300)
+        widgets_before = list(frame.timeline_frame.winfo_children())
+
+        self.assertTrue(frame.scroll_timeline_to(100))
+        self.root.update()
+
+        self.assertEqual(frame.timeline_first_row, 100)
+        self.assertEqual(list(frame.timeline_frame.winfo_children()), widgets_before)
+        expected = [
+            period["date"]
+            for period in frame.timeline_data_all[100 : 100 + len(frame.timeline_rows)]
+        ]
+        self.assertEqual(self._shown_dates(frame), expected)
+
+    def test_scroll_is_clamped(self):
+        """Test scrolling past either end stops at the first/last window"""
+        tracker, frame = self._create_analysis_frame_with_data(300)
+        last_first_row = 300 - len(frame.timeline_rows)
+
+        frame.scroll_timeline_to(10**6)
+        self.assertEqual(frame.timeline_first_row, last_first_row)
+        self.assertFalse(frame.scroll_timeline_to(10**6))
+
+        frame.scroll_timeline_to(-5)
+        self.assertEqual(frame.timeline_first_row, 0)
+
+    def test_scrollbar_moveto(self):
+        """Test dragging the scrollbar jumps to the matching period"""
+        tracker, frame = self._create_analysis_frame_with_data(400)
+
+        frame.on_timeline_scrollbar("moveto", "0.5")
+        self.assertEqual(frame.timeline_first_row, 200)
+
+        frame.on_timeline_scrollbar("scroll", "1", "pages")
+        self.assertEqual(frame.timeline_first_row, 200 + len(frame.timeline_rows))
+
+    def test_mousewheel_scrolls_timeline_then_page(self):
+        """Test wheel notches move 3 rows; at the top the page scrolls instead"""
+        from src.constants import TIMELINE_WHEEL_ROWS
+
+        tracker, frame = self._create_analysis_frame_with_data(300)
+
+        # Wheel up at the top: not handled, ScrollableFrame scrolls the page
+        self.assertIsNone(frame.on_timeline_mousewheel(Mock(delta=120)))
+
+        self.assertEqual(frame.on_timeline_mousewheel(Mock(delta=-120)), "break")
+        self.assertEqual(frame.timeline_first_row, TIMELINE_WHEEL_ROWS)
+
+    def test_few_periods_shrink_pool(self):
+        """Test a short timeline has one row per period and no scrollbar"""
+        tracker, frame = self._create_analysis_frame_with_data(200)
+
+        frame.timeline_data_all = frame.timeline_data_all[:5]
+        frame.timeline_first_row = 0
+        frame._render_timeline_window()
+        self.root.update()
+
+        self.assertEqual(len(frame.timeline_frame.winfo_children()), 5)
+        self.assertFalse(frame.timeline_scrollbar.winfo_ismapped())
+
+    def test_update_timeline_resets_to_top(self):
+        """Test a refresh shows the first periods again"""
+        tracker, frame = self._create_analysis_frame_with_data(300)
+        frame.scroll_timeline_to(150)
+
+        frame.update_timeline()
+        self.assertEqual(frame.timeline_first_row, 0)
+        self.assertEqual(
+            self._shown_dates(frame)[0], frame.timeline_data_all[0]["date"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Tests for the Analysis Worker
+
+Verifies that analysis jobs run off the calling thread, that a newer submit
+supersedes (and cancels) older jobs so only the latest result is delivered,
+and that job errors are handed back instead of being lost.
+"""
+
+import unittest
+import sys
+import os
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+class TestAnalysisWorkerImports(unittest.TestCase):
+    """Test that the analysis worker module imports correctly"""
+
+    def test_import_module(self):
+        """Test that analysis_worker can be imported"""
+        from src.analysis_worker import AnalysisWorker
+
+        self.assertTrue(callable(AnalysisWorker))
+
+
+class TestAnalysisWorker(unittest.TestCase):
+    """Test generations, cancellation and result hand-off"""
+
+    def setUp(self):
+        from src.analysis_worker import AnalysisWorker
+
+        self.worker = AnalysisWorker()
+        self.gate = threading.Event()
+        self.started = threading.Event()
+
+    def tearDown(self):
+        self.gate.set()
+        self.worker.stop(timeout=5)
+
+    def _blocking_job(self, cancelled):
+        """Run until released or cancelled, like a long query"""
+        from src.analysis_query import QueryCancelled
+
+        self.started.set()
+        while not self.gate.wait(0.01):
+            if cancelled():
+                raise QueryCancelled()
+        return "slow"
+
+    def test_result_from_worker_thread(self):
+        """Test a job runs on the worker and its result is polled"""
+        threads = []
+
+        def job(cancelled):
+            threads.append(threading.current_thread())
+            return 42
+
+        generation = self.worker.submit(job)
+        self.assertTrue(self.worker.wait(timeout=5))
+        self.assertEqual(self.worker.poll(), (generation, 42, None))
+        self.assertIsNone(self.worker.poll())
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_newer_submit_cancels_running_job(self):
+        """Test a superseded job stops and only the newest result is delivered"""
+        first = self.worker.submit(self._blocking_job)
+        self.assertTrue(self.started.wait(5))
+
+        second = self.worker.submit(lambda cancelled: "fast")
+        self.assertTrue(self.worker.is_cancelled(first))
+        self.assertTrue(self.worker.wait(timeout=5))
+        self.assertEqual(self.worker.poll(), (second, "fast", None))
+
+    def test_cancel_drops_result(self):
+        """Test cancel() stops the running job and nothing is delivered"""
+        self.worker.submit(self._blocking_job)
+        self.assertTrue(self.started.wait(5))
+        self.assertTrue(self.worker.busy())
+
+        self.worker.cancel()
+        self.assertTrue(self.worker.wait(timeout=5))
+        self.assertFalse(self.worker.busy())
+        self.assertIsNone(self.worker.poll())
+
+    def test_job_error_is_returned(self):
+        """Test an exception in a job is handed back to the poller"""
+
+        def job(cancelled):
+            raise ValueError("bad data")
+
+        self.worker.submit(job)
+        self.assertTrue(self.worker.wait(timeout=5))
+        _, value, error = self.worker.poll()
+        self.assertIsNone(value)
+        self.assertIsInstance(error, ValueError)
+
+
+class TestBackgroundRefreshErrors(unittest.TestCase):
+    """Test a failing background query is reported on the Tk thread"""
+
+    def setUp(self):
+        from unittest.mock import Mock
+        from src.analysis_worker import AnalysisWorker
+
+        self.frame = Mock()
+        self.frame.analysis_worker = AnalysisWorker()
+
+    def tearDown(self):
+        self.frame.analysis_worker.stop(timeout=5)
+
+    def test_query_error_shown(self):
+        """Test the worker's exception is shown instead of raised from after()"""
+        from unittest.mock import patch
+        from src.analysis_frame import AnalysisFrame
+
+        def job(cancelled):
+            raise ValueError("Malformed date 'soon'")
+
+        generation = self.frame.analysis_worker.submit(job)
+        self.assertTrue(self.frame.analysis_worker.wait(timeout=5))
+
+        with patch("src.analysis_frame.messagebox") as mock_messagebox:
+            AnalysisFrame._poll_background_refresh(self.frame, generation, {})
+
+        mock_messagebox.showerror.assert_called_once()
+        self.assertIn("Malformed date", mock_messagebox.showerror.call_args[0][1])
+        self.frame.apply_refresh.assert_not_called()
+        self.assertIsNone(self.frame._poll_after_id)
+
+
+class TestBackgroundRefreshModel(unittest.TestCase):
+    """Test the background query gets its own PeriodModel"""
+
+    def test_worker_gets_model_snapshot(self):
+        """Test the worker never reads or fills the Tk thread's shared model"""
+        from unittest.mock import Mock
+        from src.analysis_frame import AnalysisFrame
+        from src.period_model import PeriodModel
+
+        shared = PeriodModel()
+        request = {"data": {}, "period_model": shared}
+        frame = Mock()
+        frame.prepare_refresh.return_value = request
+
+        AnalysisFrame._start_background_refresh(frame)
+        [job], _ = frame.analysis_worker.submit.call_args
+        job(lambda: False)
+
+        [submitted, _], _ = frame.compute_refresh.call_args
+        self.assertIsInstance(submitted["period_model"], PeriodModel)
+        self.assertIsNot(submitted["period_model"], shared)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""
+Tests for the Atomic Writer
+
+Verifies that data.json/settings.json writes replace the file atomically, that
+bursts of writes to the same file are coalesced into one, and that flush()
+works as a barrier for queued writes.
+"""
+
+import unittest
+import sys
+import os
+import json
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_helpers import TestFileManager
+
+
+class TestAtomicWriterImports(unittest.TestCase):
+    """Test that the atomic writer module imports correctly"""
+
+    def test_import_module(self):
+        """Test that atomic_writer can be imported"""
+        from src.atomic_writer import (
+            AtomicJsonWriter,
+            write_json_atomic,
+            write_text_atomic,
+        )
+
+        self.assertTrue(callable(AtomicJsonWriter))
+        self.assertTrue(callable(write_json_atomic))
+        self.assertTrue(callable(write_text_atomic))
+
+
+class TestWriteJsonAtomic(unittest.TestCase):
+    """Test the atomic replace"""
+
+    def setUp(self):
+        self.file_manager = TestFileManager()
+        self.path = self.file_manager.create_test_file(
+            "test_atomic_data.json", {"old": 1}
+        )
+
+    def tearDown(self):
+        self.file_manager.cleanup()
+
+    def test_replaces_file(self):
+        """Test the file holds the new data and no temp file is left"""
+        from src.atomic_writer import write_json_atomic
+
+        write_json_atomic(self.path, {"new": 2})
+        with open(self.path, "r") as f:
+            self.assertEqual(json.load(f), {"new": 2})
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_failed_write_keeps_old_file(self):
+        """Test a crash before the rename leaves the previous file intact"""
+        from src.atomic_writer import write_json_atomic
+
+        self.file_manager.test_files.append(self.path + ".tmp")
+        with patch("src.atomic_writer.os.fsync", side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                write_json_atomic(self.path, {"new": 2})
+        with open(self.path, "r") as f:
+            self.assertEqual(json.load(f), {"old": 1})
+
+
+class TestAtomicJsonWriter(unittest.TestCase):
+    """Test coalescing and the flush barrier"""
+
+    def setUp(self):
+        from src.atomic_writer import AtomicJsonWriter
+        from src.persistence_worker import PersistenceWorker
+
+        self.file_manager = TestFileManager()
+        self.path = self.file_manager.create_test_file("test_atomic_settings.json", {})
+        self.worker = PersistenceWorker()
+        self.errors = []
+        # Long delay - only flush() or write_now() writes during the test
+        self.writer = AtomicJsonWriter(
+            self.worker,
+            delay=60,
+            on_error=lambda path, error: self.errors.append((path, error)),
+        )
+
+    def tearDown(self):
+        self.writer.flush(5)
+        self.worker.stop(5)
+        self.file_manager.cleanup()
+
+    def _read(self):
+        with open(self.path, "r") as f:
+            return json.load(f)
+
+    def test_burst_is_one_write(self):
+        """Test several writes within the window become one, with the newest data"""
+        from src.atomic_writer import write_text_atomic
+
+        settings = {"count": 0}
+        with patch(
+            "src.atomic_writer.write_text_atomic", side_effect=write_text_atomic
+        ) as mock_write:
+            for count in range(5):
+                settings["count"] = count
+                self.writer.write(self.path, settings)
+            self.assertEqual(self._read(), {})
+            self.assertEqual(self.writer.pending_paths(), [self.path])
+
+            self.assertTrue(self.writer.flush(5))
+
+        self.assertEqual(mock_write.call_count, 1)
+        self.assertEqual(self._read(), {"count": 4})
+        self.assertEqual(self.writer.pending_paths(), [])
+
+    def test_write_snapshots_data(self):
+        """Test changes made after write() are not part of the queued write"""
+        settings = {"name": "before"}
+        self.writer.write(self.path, settings)
+        settings["name"] = "after"
+        self.writer.flush(5)
+        self.assertEqual(self._read(), {"name": "before"})
+
+    def test_write_now_supersedes_queued_write(self):
+        """Test write_now() writes immediately and drops an older queued write"""
+        self.writer.write(self.path, {"queued": True})
+        self.writer.write_now(self.path, {"now": True})
+        self.writer.flush(5)
+        self.assertEqual(self._read(), {"now": True})
+
+    def test_error_reported(self):
+        """Test a failed queued write is passed to on_error"""
+        missing = os.path.join(self.file_manager.test_data_dir, "missing", "s.json")
+        self.writer.write(missing, {})
+        self.writer.flush(5)
+        self.assertEqual(len(self.errors), 1)
+        self.assertEqual(self.errors[0][0], missing)
+        self.assertIsInstance(self.errors[0][1], OSError)
+
+    def test_timer_writes_without_flush(self):
+        """Test a queued write lands after the coalescing delay on its own"""
+        import time
+
+        self.writer.delay = 0.01
+        self.writer.write(self.path, {"timer": True})
+        deadline = time.monotonic() + 5
+        while self.writer.pending_paths() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.worker.flush(5)
+        self.assertEqual(self._read(), {"timer": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+"""
+Tests for the Backup Store
+
+Verifies that backups store each distinct session once, that any kept backup
+can be restored, and that rotation by count, age and size removes the oldest
+backups together with sessions nothing refers to any more.
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_analysis_query import _sample_data
+
+DAY = 86400
+
+
+def _files(directory):
+    """All files below a directory"""
+    return [
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+    ]
+
+
+class TestBackupStoreImports(unittest.TestCase):
+    """Test that the backup store module imports correctly"""
+
+    def test_import_module(self):
+        """Test that backup_store can be imported"""
+        from src.backup_store import BackupStore, session_digest
+
+        self.assertTrue(callable(BackupStore))
+        self.assertEqual(session_digest({"b": 1, "a": 2})[1], '{"a":2,"b":1}')
+
+
+class TestBackupStore(unittest.TestCase):
+    """Test creating, listing and restoring backups"""
+
+    def setUp(self):
+        from src.backup_store import BackupStore
+
+        self.backup_dir = tempfile.mkdtemp()
+        self.store = BackupStore(self.backup_dir)
+        self.data = _sample_data()
+
+    def tearDown(self):
+        shutil.rmtree(self.backup_dir, ignore_errors=True)
+
+    def test_sessions_stored_once(self):
+        """Test a backup after deleting a session writes only its manifest"""
+        self.store.create(self.data, "first", created=1000)
+        objects = set(_files(self.store.object_dir))
+        self.assertEqual(len(objects), len(self.data))
+
+        del self.data["2026-01-10_1"]
+        self.store.create(self.data, "delete 2026-01-10_1", created=2000)
+        self.assertEqual(set(_files(self.store.object_dir)), objects)
+        self.assertEqual(
+            [(b["reason"], b["sessions"]) for b in self.store.list()],
+            [("first", 3), ("delete 2026-01-10_1", 2)],
+        )
+
+    def test_unchanged_data_reuses_backup(self):
+        """Test backing up the same data twice makes one backup"""
+        first = self.store.create(self.data, created=1000)
+        self.assertEqual(self.store.create(self.data, created=2000), first)
+        self.assertEqual(len(self.store.list()), 1)
+
+    def test_restore_any_backup(self):
+        """Test every backup restores the data it was made from, in order"""
+        original = _sample_data()
+        first = self.store.create(self.data, created=1000)
+        self.data["2026-01-11_2"]["sphere"] = "Changed"
+        del self.data["2026-01-10_1"]
+        second = self.store.create(self.data, created=2000)
+
+        restored = self.store.restore(first)
+        self.assertEqual(restored, original)
+        self.assertEqual(list(restored), list(original))
+        self.assertEqual(self.store.restore(second), self.data)
+
+    def test_backup_at(self):
+        """Test finding the backup for a point in time"""
+        first = self.store.create(self.data, created=1000)
+        del self.data["2026-01-10_1"]
+        second = self.store.create(self.data, created=2000)
+
+        self.assertIsNone(self.store.backup_at(999))
+        self.assertEqual(self.store.backup_at(1500), first)
+        self.assertEqual(self.store.backup_at(2000), second)
+
+    def test_corrupt_session_detected(self):
+        """Test restore refuses a stored session that doesn't match its hash"""
+        backup_id = self.store.create(self.data, created=1000)
+        with open(sorted(_files(self.store.object_dir))[0], "w") as f:
+            f.write("{}")
+        with self.assertRaises(ValueError):
+            self.store.restore(backup_id)
+
+
+class TestBackupRotation(unittest.TestCase):
+    """Test removing old backups"""
+
+    def setUp(self):
+        from src.backup_store import BackupStore
+
+        self.backup_dir = tempfile.mkdtemp()
+        self.store = BackupStore(self.backup_dir)
+        # Five backups a day apart, each with one more session
+        self.ids = []
+        data = {}
+        for day in range(5):
+            data[f"s{day}"] = {"date": f"2026-01-0{day + 1}", "n": day}
+            self.ids.append(self.store.create(dict(data), created=day * DAY))
+
+    def tearDown(self):
+        shutil.rmtree(self.backup_dir, ignore_errors=True)
+
+    def _kept(self):
+        return [backup["id"] for backup in self.store.list()]
+
+    def test_rotate_by_count(self):
+        """Test only the newest max_count backups are kept"""
+        removed = self.store.rotate(max_count=2, now=4 * DAY)
+        self.assertEqual(removed, self.ids[:3])
+        self.assertEqual(self._kept(), self.ids[3:])
+        # Sessions of removed backups that later ones still hold are kept
+        self.assertEqual(len(self.store.restore(self.ids[3])), 4)
+
+    def test_rotate_by_age(self):
+        """Test backups older than max_age_days are removed"""
+        self.store.rotate(max_age_days=2, now=4 * DAY + 1)
+        self.assertEqual(self._kept(), self.ids[3:])
+
+    def test_rotate_by_size_keeps_newest(self):
+        """Test the size limit removes old backups but never the newest"""
+        self.store.rotate(max_size_mb=0, now=4 * DAY)
+        self.assertEqual(self._kept(), self.ids[-1:])
+        self.assertEqual(len(self.store.restore(self.ids[-1])), 5)
+
+    def test_unreferenced_sessions_removed(self):
+        """Test sessions no kept backup refers to are deleted"""
+        data = {"only": {"date": "2026-02-01"}}
+        newest = self.store.create(data, created=5 * DAY)
+        self.store.rotate(max_count=1, now=5 * DAY)
+        self.assertEqual(self._kept(), [newest])
+        self.assertEqual(len(_files(self.store.object_dir)), 1)
+
+
+class TestRestoreCommand(unittest.TestCase):
+    """Test restore_backup.py"""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.backup_dir = os.path.join(self.directory, "backups")
+        self.data_file = os.path.join(self.directory, "data.json")
+        self.settings_file = os.path.join(self.directory, "settings.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _run(self, *args):
+        from restore_backup import main
+
+        output = StringIO()
+        with redirect_stdout(output):
+            code = main(
+                list(args)
+                + [
+                    "--data-file",
+                    self.data_file,
+                    "--settings-file",
+                    self.settings_file,
+                    "--backup-dir",
+                    self.backup_dir,
+                ]
+            )
+        return code, output.getvalue()
+
+    def test_restore_backs_up_current_data(self):
+        """Test restoring replaces data.json and keeps the replaced data"""
+        from src.backup_store import BackupStore
+
+        store = BackupStore(self.backup_dir)
+        backup_id = store.create(_sample_data(), "delete x", created=1000)
+        with open(self.data_file, "w") as f:
+            json.dump({"newer": {"date": "2026-02-01"}}, f)
+
+        code, output = self._run(backup_id)
+        self.assertEqual(code, 0)
+        self.assertIn("Restored 3 sessions", output)
+        with open(self.data_file, "r") as f:
+            self.assertEqual(json.load(f), _sample_data())
+
+        backups = store.list()
+        self.assertEqual(backups[-1]["reason"], f"before restore {backup_id}")
+        self.assertEqual(
+            store.restore(backups[-1]["id"]), {"newer": {"date": "2026-02-01"}}
+        )
+
+    def test_list_and_unknown_backup(self):
+        """Test listing backups and restoring a missing one"""
+        code, output = self._run()
+        self.assertEqual(code, 0)
+        self.assertIn("No backups", output)
+        code, output = self._run("19990101_000000_000000")
+        self.assertEqual(code, 1)
+        self.assertIn("ERROR", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -174,10 +174,10 @@ class TestButtonNavigation(unittest.TestCase):
         # Show completion frame
         self.tracker.show_completion_frame()
 
-        # Mock the messagebox to auto-confirm and shutil.copy2 to avoid creating backup files
+        # Mock the messagebox to auto-confirm and backup_data to avoid creating backup files
         with patch("tkinter.messagebox.askyesno", return_value=True):
             with patch("tkinter.messagebox.showinfo"):
-                with patch("shutil.copy2"):
+                with patch("time_tracker.TimeTracker.backup_data"):
                     # Call delete
                     self.tracker.completion_frame._delete_session()
                     self.root.update()  # Process pending events
@@ -223,9 +223,9 @@ class TestCompletionFrameSaveSkipDelete(unittest.TestCase):
 
     @patch("src.completion_frame.messagebox.showinfo")  # Suppress success message
     @patch("src.completion_frame.messagebox.askyesno", return_value=True)
-    @patch("shutil.copy2")  # Prevent backup file creation
+    @patch("time_tracker.TimeTracker.backup_data")  # Prevent backup file creation
     def test_delete_session_removes_from_data(
-        self, mock_copy, mock_askyesno, mock_showinfo
+        self, mock_backup, mock_askyesno, mock_showinfo
     ):
         """Test that deleting a session removes it from data file"""
         tracker = TimeTracker(self.root)
@@ -275,9 +275,9 @@ class TestCompletionFrameSaveSkipDelete(unittest.TestCase):
 
     @patch("src.completion_frame.messagebox.showinfo")
     @patch("src.completion_frame.messagebox.askyesno", return_value=True)
-    @patch("shutil.copy2")
+    @patch("time_tracker.TimeTracker.backup_data")
     def test_delete_last_session_removes_from_file(
-        self, mock_copy, mock_askyesno, mock_showinfo
+        self, mock_backup, mock_askyesno, mock_showinfo
     ):
         """Regression test: deleting the ONLY session must write empty dict to disk.
 
@@ -323,9 +323,9 @@ class TestCompletionFrameSaveSkipDelete(unittest.TestCase):
 
     @patch("src.completion_frame.messagebox.showinfo")
     @patch("src.completion_frame.messagebox.askyesno", return_value=True)
-    @patch("shutil.copy2")
+    @patch("time_tracker.TimeTracker.backup_data")
     def test_delete_session_from_session_view_navigates_home(
-        self, mock_copy, mock_askyesno, mock_showinfo
+        self, mock_backup, mock_askyesno, mock_showinfo
     ):
         """Regression test: delete from session view must navigate home, not reload.
 
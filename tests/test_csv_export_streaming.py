@@ -0,0 +1,188 @@
+"""
+Tests for the streaming CSV export
+
+Verifies that rows are written lazily in chunks with progress callbacks, that
+a cancelled or failed export leaves no file behind, and that the all-data
+export rows are built with the shared period normalization.
+"""
+
+import unittest
+import sys
+import os
+import csv
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_helpers import TestFileManager
+
+
+def _rows(count):
+    for i in range(count):
+        yield {"a": i, "b": f"row {i}"}
+
+
+class TestCSVExportImports(unittest.TestCase):
+    """Test that the csv_export module imports correctly"""
+
+    def test_import_module(self):
+        """Test that csv_export can be imported"""
+        from src.csv_export import (
+            ANALYSIS_CSV_FIELDS,
+            ALL_DATA_CSV_FIELDS,
+            write_csv,
+            iter_all_data_rows,
+        )
+
+        self.assertEqual(len(ANALYSIS_CSV_FIELDS), 18)
+        self.assertEqual(len(ALL_DATA_CSV_FIELDS), 23)
+        self.assertTrue(callable(write_csv))
+        self.assertTrue(callable(iter_all_data_rows))
+
+
+class TestWriteCSV(unittest.TestCase):
+    """Test streaming rows to disk"""
+
+    def setUp(self):
+        self.file_manager = TestFileManager()
+        self.csv_file = os.path.join(self.file_manager.test_data_dir, "test_stream.csv")
+        self.file_manager.test_files.extend([self.csv_file, self.csv_file + ".part"])
+
+    def tearDown(self):
+        self.file_manager.cleanup()
+
+    def test_writes_all_rows_with_progress(self):
+        """Test every row is written and progress is reported per chunk"""
+        from src.csv_export import write_csv
+
+        calls = []
+        count = write_csv(
+            self.csv_file,
+            ["a", "b"],
+            _rows(25),
+            progress=lambda written: calls.append(written),
+            chunk_rows=10,
+        )
+
+        self.assertEqual(count, 25)
+        self.assertEqual(calls, [10, 20, 25])
+        with open(self.csv_file, "r", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[24], {"a": "24", "b": "row 24"})
+        self.assertFalse(os.path.exists(self.csv_file + ".part"))
+
+    def test_rows_consumed_lazily(self):
+        """Test rows are pulled from the generator while writing"""
+        from src.csv_export import write_csv
+
+        produced = []
+
+        def rows():
+            for row in _rows(30):
+                produced.append(row)
+                yield row
+
+        seen = []
+        write_csv(
+            self.csv_file,
+            ["a", "b"],
+            rows(),
+            progress=lambda written: seen.append(len(produced)),
+            chunk_rows=10,
+        )
+        self.assertEqual(seen[0], 10)
+
+    def test_cancel_leaves_no_file(self):
+        """Test a cancelled export stops early and removes the partial file"""
+        from src.csv_export import write_csv
+
+        count = write_csv(
+            self.csv_file,
+            ["a", "b"],
+            _rows(100),
+            progress=lambda written: False,
+            chunk_rows=10,
+        )
+
+        self.assertIsNone(count)
+        self.assertFalse(os.path.exists(self.csv_file))
+        self.assertFalse(os.path.exists(self.csv_file + ".part"))
+
+    def test_error_leaves_no_file(self):
+        """Test a row missing a column aborts without leaving a file"""
+        from src.csv_export import write_csv
+
+        with self.assertRaises(KeyError):
+            write_csv(self.csv_file, ["a", "missing"], _rows(5))
+        self.assertFalse(os.path.exists(self.csv_file))
+        self.assertFalse(os.path.exists(self.csv_file + ".part"))
+
+
+class TestAllDataRows(unittest.TestCase):
+    """Test the "Save All Data to CSV" row builder"""
+
+    def test_rows_per_period_and_summary(self):
+        """Test one row per period and a summary row for empty sessions"""
+        from src.csv_export import iter_all_data_rows, ALL_DATA_CSV_FIELDS
+
+        data = {
+            "s1": {
+                "date": "2026-01-20",
+                "sphere": "Work",
+                "active": [
+                    {
+                        "start": "09:00:00",
+                        "end": "10:00:00",
+                        "duration": 3600,
+                        "projects": [
+                            {
+                                "name": "Alpha",
+                                "project_primary": True,
+                                "percentage": 75,
+                                "duration": 2700,
+                            },
+                            {
+                                "name": "Beta",
+                                "project_primary": False,
+                                "percentage": 25,
+                                "duration": 900,
+                                "comment": "side",
+                            },
+                        ],
+                    }
+                ],
+                "breaks": [
+                    {
+                        "start": "10:00:00",
+                        "end": "10:05:00",
+                        "duration": 300,
+                        "action": "Rest",
+                    }
+                ],
+                "session_comments": {"session_notes": "notes"},
+            },
+            "s2": {"date": "2026-01-21", "sphere": "Work"},
+        }
+
+        rows = list(iter_all_data_rows(data))
+        self.assertEqual(
+            [row["type"] for row in rows], ["active", "break", "session_summary"]
+        )
+        for row in rows:
+            self.assertEqual(list(row), ALL_DATA_CSV_FIELDS)
+
+        active, brk, summary = rows
+        self.assertEqual(active["primary_action"], "Alpha")
+        self.assertEqual(active["primary_duration"], 2700)
+        self.assertEqual(active["secondary_action"], "Beta")
+        self.assertEqual(active["secondary_comment"], "side")
+        self.assertEqual(active["activity_end"], "10:00:00")
+        self.assertEqual(active["session_notes"], "notes")
+        self.assertEqual(brk["primary_action"], "Rest")
+        self.assertEqual(brk["activity_end"], "")
+        self.assertEqual(summary["session_id"], "s2")
+
+
+if __name__ == "__main__":
+    unittest.main()
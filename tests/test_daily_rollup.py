@@ -0,0 +1,265 @@
+"""
+Tests for the Daily Rollup
+
+Verifies that card totals answered from the per-day rollup match the analysis
+query engine for every filter combination, that incremental session updates
+(edit, rename, delete) match a full rebuild, and that the persisted rollup is
+only reused while the data files are unchanged.
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_helpers import TestFileManager
+from tests.test_analysis_query import _sample_data, _settings, _day, ALL_TIME
+
+FILTERS = [
+    (sphere, project, status)
+    for sphere in ("All Spheres", "Work", "Personal")
+    for project in ("All Projects", "Alpha", "Beta", "Gym", "Missing")
+    for status in ("active", "all", "archived")
+]
+
+
+class TestDailyRollupImports(unittest.TestCase):
+    """Test that the daily rollup module imports correctly"""
+
+    def test_import_module(self):
+        """Test that daily_rollup can be imported"""
+        from src.daily_rollup import DailyRollup, rollup_path_for
+
+        self.assertTrue(callable(DailyRollup))
+        self.assertEqual(rollup_path_for("data.json"), "data.json.rollup")
+
+
+class TestDailyRollupTotals(unittest.TestCase):
+    """Test rollup totals against the analysis query engine"""
+
+    RANGES = [_day(10), _day(11), _day(12), ALL_TIME]
+
+    def _assert_matches_query(self, rollup, data, settings):
+        from src.analysis_query import AnalysisQuery
+
+        query = AnalysisQuery(data)
+        for sphere, project, status in FILTERS:
+            expected = query.run(self.RANGES, sphere, project, status, settings)
+            for date_range, totals in zip(self.RANGES, expected.totals):
+                self.assertEqual(
+                    rollup.totals(date_range, sphere, project, status, settings),
+                    totals,
+                    (date_range, sphere, project, status),
+                )
+
+    def _build(self, data):
+        from src.daily_rollup import DailyRollup
+
+        rollup = DailyRollup()
+        rollup.rebuild(data)
+        return rollup
+
+    def test_matches_query_for_all_filters(self):
+        """Test every sphere/project/status combination gives the query totals"""
+        data = _sample_data()
+        self._assert_matches_query(self._build(data), data, _settings())
+
+    def test_one_row_set_per_day(self):
+        """Test sessions on the same day are aggregated into one day"""
+        rollup = self._build(_sample_data())
+        self.assertEqual(rollup.dates, ["2026-01-10", "2026-01-11"])
+
+    def test_status_resolved_at_query_time(self):
+        """Test archiving a project needs no rebuild"""
+        data = _sample_data()
+        rollup = self._build(data)
+        settings = _settings()
+        settings["projects"]["Alpha"]["active"] = False
+        settings["spheres"]["Personal"]["active"] = False
+        self._assert_matches_query(rollup, data, settings)
+
+    def test_partial_day_bounds(self):
+        """Test ranges that don't start/end at midnight include the right days"""
+        rollup = self._build(_sample_data())
+        settings = _settings()
+        # Session dates are midnights: 10th excluded, 11th included
+        date_range = (datetime(2026, 1, 10, 12), datetime(2026, 1, 11, 0, 0, 1))
+        self.assertEqual(
+            rollup.totals(date_range, "All Spheres", "All Projects", "all", settings),
+            (1200, 30),
+        )
+
+    def test_incremental_updates_match_rebuild(self):
+        """Test edits, project renames and deletions applied incrementally"""
+        data = _sample_data()
+        rollup = self._build(data)
+
+        # Rename Alpha -> Gamma
+        for period in data["2026-01-10_1"]["active"]:
+            if period.get("project") == "Alpha":
+                period["project"] = "Gamma"
+            for item in period.get("projects", []):
+                if item["name"] == "Alpha":
+                    item["name"] = "Gamma"
+        # Delete a session, add one, move one to another day
+        del data["2026-01-11_2"]
+        data["2026-01-12_1"] = {
+            "date": "2026-01-12",
+            "sphere": "Work",
+            "active": [{"duration": 50, "project": "Gamma"}],
+            "breaks": [{"duration": 5, "action": "Rest"}],
+        }
+        data["2026-01-11_1"]["date"] = "2026-01-12"
+
+        rollup.update_sessions(
+            data, {"2026-01-10_1", "2026-01-11_2", "2026-01-12_1", "2026-01-11_1"}
+        )
+        self.assertEqual(rollup.dates, ["2026-01-10", "2026-01-12"])
+        self.assertEqual(rollup.days, self._build(data).days)
+        self._assert_matches_query(rollup, data, _settings())
+
+
+class TestDailyRollupPersistence(unittest.TestCase):
+    """Test saving and loading the rollup file"""
+
+    SOURCE = ("data.json", "data.json.journal")
+    SIGNATURE = ((1, 10, 5), None)
+
+    def setUp(self):
+        from src.daily_rollup import DailyRollup
+
+        self.file_manager = TestFileManager()
+        self.rollup_file = os.path.join(
+            self.file_manager.test_data_dir, "test_rollup.json.rollup"
+        )
+        self.file_manager.test_files.append(self.rollup_file)
+        self.rollup = DailyRollup(self.SOURCE)
+        self.rollup.rebuild(_sample_data())
+        self.rollup.save(self.rollup_file, self.SIGNATURE)
+
+    def tearDown(self):
+        self.file_manager.cleanup()
+
+    def test_round_trip(self):
+        """Test a loaded rollup has the same day rows"""
+        from src.daily_rollup import DailyRollup
+
+        loaded = DailyRollup.load(self.rollup_file, self.SOURCE, self.SIGNATURE)
+        self.assertIsNotNone(loaded)
+        self.assertEqual(loaded.days, self.rollup.days)
+        self.assertEqual(loaded.dates, self.rollup.dates)
+
+    def test_changed_data_is_not_reused(self):
+        """Test a different signature or source means a rebuild"""
+        from src.daily_rollup import DailyRollup
+
+        changed = ((2, 10, 5), None)
+        self.assertIsNone(DailyRollup.load(self.rollup_file, self.SOURCE, changed))
+        self.assertIsNone(
+            DailyRollup.load(self.rollup_file, ("data.db",), self.SIGNATURE)
+        )
+        self.assertIsNone(DailyRollup.load(self.rollup_file, self.SOURCE, None))
+
+    def test_missing_or_corrupt_file(self):
+        """Test unreadable rollup files are ignored"""
+        from src.daily_rollup import DailyRollup
+
+        with open(self.rollup_file, "w") as f:
+            f.write("{not json")
+        self.assertIsNone(
+            DailyRollup.load(self.rollup_file, self.SOURCE, self.SIGNATURE)
+        )
+        os.remove(self.rollup_file)
+        self.assertIsNone(
+            DailyRollup.load(self.rollup_file, self.SOURCE, self.SIGNATURE)
+        )
+
+
+class TestRollupPersistedOnWorker(unittest.TestCase):
+    """Test TimeTracker writes the rollup on the persistence worker"""
+
+    def setUp(self):
+        import threading
+        from unittest.mock import Mock
+        from src.daily_rollup import DailyRollup
+        from src.persistence_worker import PersistenceWorker
+        from src.session_store import SessionStore
+        from time_tracker import TimeTracker
+
+        self.file_manager = TestFileManager()
+        self.data = _sample_data()
+        data_file = self.file_manager.create_test_file(
+            "test_rollup_worker.json", self.data
+        )
+        self.rollup_file = data_file + ".rollup"
+        self.file_manager.test_files.append(self.rollup_file)
+        self.source = (data_file,)
+        self.store = SessionStore()
+        self.store.get(self.source, lambda: self.data)
+        self.worker = PersistenceWorker()
+        self.gate = threading.Event()
+
+        rollup = DailyRollup(self.source)
+        rollup.rebuild(self.data)
+        self.tracker = Mock()
+        self.tracker.session_store = self.store
+        self.tracker.persistence_worker = self.worker
+        self.tracker.daily_rollup = rollup
+        self.tracker.rollup_version = self.store.version
+        self.tracker.rollup_names.key = "names"
+        self.tracker._write_rollup = lambda *args: TimeTracker._write_rollup(
+            self.tracker, *args
+        )
+
+    def tearDown(self):
+        self.gate.set()
+        self.worker.stop(timeout=5)
+        self.file_manager.cleanup()
+
+    def _persist_while_worker_busy(self):
+        from time_tracker import TimeTracker
+
+        self.worker.submit("block", 0, lambda payloads: self.gate.wait(5))
+        TimeTracker._persist_rollup(self.tracker, self.rollup_file)
+        # Nothing is written on the calling thread
+        self.assertFalse(os.path.exists(self.rollup_file))
+
+    def test_written_with_data_signature(self):
+        """Test the queued rollup is saved with the signature of its data"""
+        from src.daily_rollup import DailyRollup
+
+        self._persist_while_worker_busy()
+        # Later updates don't change the queued copy
+        self.tracker.daily_rollup.update_sessions({}, list(self.data))
+        self.gate.set()
+        self.worker.flush(timeout=5)
+
+        signature = [self.store.data_signature(self.source), "names"]
+        loaded = DailyRollup.load(self.rollup_file, self.source, signature)
+        self.assertEqual(loaded.sessions, self._build_sessions())
+
+    def test_skipped_when_data_moved_on(self):
+        """Test a rollup queued before a newer transition is not saved"""
+        from src.session_journal import make_session_update
+
+        self._persist_while_worker_busy()
+        self.store.apply(make_session_update("new", {"sphere": "Work"}), self.source)
+        self.store.write_finished(self.source)
+        self.gate.set()
+        self.worker.flush(timeout=5)
+
+        self.assertFalse(os.path.exists(self.rollup_file))
+
+    def _build_sessions(self):
+        from src.daily_rollup import DailyRollup
+
+        rollup = DailyRollup(self.source)
+        rollup.rebuild(self.data)
+        return rollup.sessions
+
+
+if __name__ == "__main__":
+    unittest.main()
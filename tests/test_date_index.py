@@ -0,0 +1,140 @@
+"""
+Tests for the Date Index
+
+Verifies that sessions are grouped by day for bisect range lookups, that
+lookups keep session data order, that updates return a new index, and that
+analysis queries read only the sessions in range with the same results.
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_analysis_query import _sample_data, _settings, _day, ALL_TIME
+
+
+class TestDateIndexImports(unittest.TestCase):
+    """Test that the date index module imports correctly"""
+
+    def test_import_module(self):
+        """Test that date_index can be imported"""
+        from src.date_index import DateIndex, first_day, session_day
+
+        self.assertTrue(callable(DateIndex))
+        self.assertEqual(first_day(datetime(2026, 1, 10, 0, 0, 1)), "2026-01-11")
+        self.assertEqual(session_day({"date": "2026-1-5"}), "2026-01-05")
+
+
+class TestDateIndex(unittest.TestCase):
+    """Test building and querying the index"""
+
+    def test_groups_sessions_by_day(self):
+        """Test days are sorted and sessions keep data order"""
+        from src.date_index import DateIndex
+
+        index = DateIndex(_sample_data())
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.dates, ["2026-01-10", "2026-01-11"])
+        self.assertEqual(
+            index.sessions_on("2026-01-11"), ["2026-01-11_1", "2026-01-11_2"]
+        )
+        self.assertEqual(index.sessions_on("2026-01-12"), [])
+
+    def test_range_lookup(self):
+        """Test ranges are end-exclusive and several ranges are merged"""
+        from src.date_index import DateIndex
+
+        index = DateIndex(_sample_data())
+        self.assertEqual(index.sessions_in([_day(10)]), ["2026-01-10_1"])
+        self.assertEqual(index.sessions_in([_day(12)]), [])
+        self.assertEqual(
+            index.sessions_in([_day(11), _day(10)]),
+            ["2026-01-10_1", "2026-01-11_1", "2026-01-11_2"],
+        )
+        # A start after midnight excludes that day
+        late_start = (datetime(2026, 1, 10, 12), datetime(2026, 1, 12))
+        self.assertEqual(len(index.sessions_in([late_start])), 2)
+
+    def test_malformed_dates_always_included(self):
+        """Test sessions with a malformed date are returned by every lookup"""
+        from src.date_index import DateIndex
+
+        data = _sample_data()
+        data["bad"] = {"date": "10/01/2026"}
+        index = DateIndex(data)
+        self.assertEqual(index.undated, ["bad"])
+        self.assertEqual(index.sessions_in([_day(10)]), ["2026-01-10_1", "bad"])
+
+    def test_updated_returns_new_index(self):
+        """Test updates add, move and remove sessions without touching the original"""
+        from src.date_index import DateIndex
+
+        data = _sample_data()
+        index = DateIndex(data)
+
+        added = index.updated("2026-01-13_1", {"date": "2026-01-13"})
+        self.assertEqual(added.dates[-1], "2026-01-13")
+        self.assertEqual(index.dates, ["2026-01-10", "2026-01-11"])
+
+        moved = added.updated("2026-01-10_1", {"date": "2026-01-11"})
+        self.assertEqual(moved.dates, ["2026-01-11", "2026-01-13"])
+        # Still first in data order
+        self.assertEqual(moved.sessions_on("2026-01-11")[0], "2026-01-10_1")
+
+        removed = moved.updated("2026-01-13_1", None)
+        self.assertEqual(removed.dates, ["2026-01-11"])
+        self.assertEqual(len(removed), 3)
+        self.assertEqual(len(added), 4)
+
+    def test_updates_match_rebuild(self):
+        """Test an incrementally updated index answers like a fresh one"""
+        from src.date_index import DateIndex
+        from tests.test_helpers import TestDataGenerator
+
+        data = TestDataGenerator.create_test_data_with_n_periods(300)
+        index = DateIndex()
+        for session_name, session_data in data.items():
+            index = index.updated(session_name, session_data)
+        fresh = DateIndex(data)
+        self.assertEqual(index.dates, fresh.dates)
+        self.assertEqual(index.sessions, fresh.sessions)
+        self.assertEqual(index.sessions_in([ALL_TIME]), list(data))
+
+
+class TestAnalysisQueryWithIndex(unittest.TestCase):
+    """Test queries reading sessions through the date index"""
+
+    def test_same_results(self):
+        """Test totals and timeline match a query without the index"""
+        from src.analysis_query import AnalysisQuery
+        from src.date_index import DateIndex
+
+        data = _sample_data()
+        args = ([_day(10), _day(11), ALL_TIME], "All Spheres", "All Projects")
+        expected = AnalysisQuery(data).run(*args, "all", _settings(), 2)
+        result = AnalysisQuery(data, date_index=DateIndex(data)).run(
+            *args, "all", _settings(), 2
+        )
+        self.assertEqual(result.totals, expected.totals)
+        self.assertEqual(result.timeline, expected.timeline)
+
+    def test_reads_only_sessions_in_range(self):
+        """Test sessions outside the range are never normalized"""
+        from src.analysis_query import AnalysisQuery
+        from src.date_index import DateIndex
+        from src.period_model import PeriodModel
+
+        data = _sample_data()
+        model = PeriodModel()
+        AnalysisQuery(data, model, DateIndex(data)).run(
+            [_day(10)], "All Spheres", "All Projects", "all", _settings(), 0
+        )
+        self.assertEqual(len(model), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2668,6 +2668,65 @@ class TestGoogleSheetsDetailedFormat(unittest.TestCase):
         except ImportError:
             self.skipTest("Google Sheets dependencies not installed")
 
+    @patch("src.google_sheets_integration.build")
+    @patch("src.google_sheets_integration.os.path.exists")
+    def test_upload_uses_current_names(self, mock_exists, mock_build):
+        """Test that upload resolves renamed spheres/projects to their current names"""
+        try:
+            from src.google_sheets_integration import GoogleSheetsUploader
+            from src.name_table import migrate_name_ids, rename_entry
+
+            mock_service = MagicMock()
+            mock_build.return_value = mock_service
+            mock_exists.return_value = True
+
+            settings = TestDataGenerator.create_settings_data()
+            settings["spheres"] = {"Work": {"active": True}}
+            settings["projects"] = {"Alpha": {"sphere": "Work", "active": True}}
+            settings["google_sheets"] = {
+                "enabled": True,
+                "spreadsheet_id": "test_123",
+                "sheet_name": "Sessions",
+            }
+            session_data = {
+                "date": "2024-01-20",
+                "sphere": "Work",
+                "active": [
+                    {
+                        "start": "10:00:00",
+                        "end": "10:30:00",
+                        "duration": 1800,
+                        "project": "Alpha",
+                    }
+                ],
+                "breaks": [],
+                "idle_periods": [],
+            }
+            migrate_name_ids(settings, {"session_789": session_data})
+
+            # Rename in settings only - the stored session keeps the old names
+            rename_entry(settings, "spheres", "Work", "Job")
+            rename_entry(settings, "projects", "Alpha", "Apex")
+            test_file = self.file_manager.create_test_file(
+                "test_current_names.json", settings
+            )
+
+            uploader = GoogleSheetsUploader(test_file)
+            uploader.service = mock_service
+            uploader.credentials = MagicMock()
+
+            with patch.object(uploader, "_ensure_sheet_headers", return_value=True):
+                self.assertTrue(uploader.upload_session(session_data, "session_789"))
+
+            body = mock_service.spreadsheets().values().append.call_args[1]["body"]
+            row = body["values"][0]
+            self.assertEqual(row[2], "Job")  # sphere
+            self.assertEqual(row[9], "Apex")  # primary_action
+            self.assertEqual(session_data["sphere"], "Work")
+
+        except ImportError:
+            self.skipTest("Google Sheets dependencies not installed")
+
 
 @unittest.skipIf(
     not GOOGLE_SHEETS_AVAILABLE, "Google Sheets dependencies not installed"
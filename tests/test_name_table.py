@@ -0,0 +1,227 @@
+"""
+Tests for the Name Table
+
+Verifies that spheres, projects and break actions get stable IDs, that saved
+sessions reference them, and that a settings-only rename shows the new name
+everywhere sessions are read - without rewriting the sessions.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_analysis_query import _sample_data, _settings, ALL_TIME
+
+
+def _migrated():
+    """Sample settings and sessions after the ID migration"""
+    from src.name_table import migrate_name_ids
+
+    settings = dict(_settings(), break_actions={"Rest": {"active": True}})
+    data = _sample_data()
+    migrate_name_ids(settings, data)
+    return settings, data
+
+
+class TestNameTableImports(unittest.TestCase):
+    """Test that the name table module imports correctly"""
+
+    def test_import_module(self):
+        """Test that name_table can be imported"""
+        from src.name_table import (
+            NAME_KINDS,
+            NameTable,
+            assign_name_ids,
+            migrate_name_ids,
+            rename_entry,
+            stamp_session_ids,
+        )
+
+        self.assertEqual(NAME_KINDS, ("spheres", "projects", "break_actions"))
+        self.assertTrue(callable(NameTable))
+
+
+class TestAssignAndRename(unittest.TestCase):
+    """Test ID assignment and settings renames"""
+
+    def test_assign_name_ids(self):
+        """Test every entry gets a unique ID and existing IDs are kept"""
+        from src.name_table import assign_name_ids
+
+        settings = _settings()
+        settings["spheres"]["Work"]["id"] = "work-id"
+        self.assertTrue(assign_name_ids(settings))
+        self.assertFalse(assign_name_ids(settings))
+
+        ids = [
+            entry["id"]
+            for kind in ("spheres", "projects")
+            for entry in settings[kind].values()
+        ]
+        self.assertEqual(len(set(ids)), 5)
+        self.assertEqual(settings["spheres"]["Work"]["id"], "work-id")
+
+    def test_rename_keeps_id(self):
+        """Test a renamed sphere keeps its ID and its projects follow it"""
+        from src.name_table import assign_name_ids, rename_entry
+
+        settings = _settings()
+        settings["projects"]["Alpha"]["sphere"] = "Work"
+        assign_name_ids(settings)
+        sphere_id = settings["spheres"]["Work"]["id"]
+
+        rename_entry(settings, "spheres", "Work", "Job")
+        self.assertNotIn("Work", settings["spheres"])
+        self.assertEqual(settings["spheres"]["Job"]["id"], sphere_id)
+        self.assertEqual(settings["projects"]["Alpha"]["sphere"], "Job")
+
+    def test_rename_errors(self):
+        """Test renaming onto an existing name or a missing entry fails"""
+        from src.name_table import rename_entry
+
+        settings = _settings()
+        with self.assertRaises(ValueError):
+            rename_entry(settings, "projects", "Alpha", "Gym")
+        with self.assertRaises(KeyError):
+            rename_entry(settings, "projects", "Missing", "New")
+        self.assertIn("Alpha", settings["projects"])
+
+
+class TestStampSessionIds(unittest.TestCase):
+    """Test storing IDs in sessions"""
+
+    def test_migration_stamps_every_format(self):
+        """Test session, single-name and list references all get IDs"""
+        settings, data = _migrated()
+        session = data["2026-01-10_1"]
+        project_ids = {
+            name: entry["id"] for name, entry in settings["projects"].items()
+        }
+
+        self.assertEqual(session["sphere_id"], settings["spheres"]["Work"]["id"])
+        self.assertEqual(session["active"][0]["project_id"], project_ids["Alpha"])
+        self.assertEqual(
+            [item["id"] for item in session["active"][1]["projects"]],
+            [project_ids["Alpha"], project_ids["Beta"]],
+        )
+        self.assertEqual(
+            session["breaks"][0]["action_id"], settings["break_actions"]["Rest"]["id"]
+        )
+        # Names are kept, and periods without a name get no ID
+        self.assertEqual(session["active"][0]["project"], "Alpha")
+        self.assertNotIn("action_id", session["idle_periods"][0])
+
+    def test_migration_skips_unknown_names(self):
+        """Test names without a settings entry are left without an ID"""
+        from src.name_table import migrate_name_ids
+
+        data = {"s": {"sphere": "Deleted", "active": [{"project": "Gone"}]}}
+        self.assertEqual(migrate_name_ids(_settings(), data), [])
+        self.assertEqual(
+            data["s"], {"sphere": "Deleted", "active": [{"project": "Gone"}]}
+        )
+
+    def test_overwrite(self):
+        """Test re-stamping follows a changed name and drops stale IDs"""
+        from src.name_table import NameTable, stamp_session_ids
+
+        settings, data = _migrated()
+        table = NameTable(settings)
+        period = data["2026-01-10_1"]["active"][0]
+        old_id = period["project_id"]
+
+        period["project"] = "Gym"
+        self.assertFalse(stamp_session_ids(data["2026-01-10_1"], table, False))
+        self.assertEqual(period["project_id"], old_id)
+        self.assertTrue(stamp_session_ids(data["2026-01-10_1"], table))
+        self.assertEqual(period["project_id"], table.id_for("projects", "Gym"))
+
+        # Switched to the list format - the single-name ID goes too
+        del period["project"]
+        self.assertTrue(stamp_session_ids(data["2026-01-10_1"], table))
+        self.assertNotIn("project_id", period)
+
+
+class TestRenameResolution(unittest.TestCase):
+    """Test sessions read through a NameTable show the current names"""
+
+    def test_resolve_after_rename(self):
+        """Test a rename shows up in sessions without rewriting them"""
+        from src.name_table import NameTable, rename_entry
+        from src.period_model import normalize_session
+
+        settings, data = _migrated()
+        stored = _migrated()[1]["2026-01-10_1"]
+        rename_entry(settings, "spheres", "Work", "Job")
+        rename_entry(settings, "projects", "Alpha", "Apex")
+
+        session = normalize_session(data["2026-01-10_1"], NameTable(settings))
+        self.assertEqual(session.sphere, "Job")
+        self.assertEqual(session.active[0].single_name, "Apex")
+        self.assertEqual(session.active[1].primary, "Apex")
+        self.assertEqual(session.active[1].secondary, "Beta")
+        self.assertEqual(session.active[1].allocations[0].name, "Apex")
+        # The stored session is untouched; exports get the current names
+        self.assertEqual(data["2026-01-10_1"]["sphere"], stored["sphere"])
+        self.assertEqual(session.to_dict()["active"][0]["project"], "Apex")
+
+    def test_fallback_to_stored_name(self):
+        """Test references without an ID, or to deleted entries, keep their name"""
+        from src.name_table import NameTable
+        from src.period_model import normalize_session
+
+        settings, data = _migrated()
+        del settings["projects"]["Alpha"]
+        data["2026-01-11_2"].pop("sphere_id")
+
+        table = NameTable(settings)
+        self.assertEqual(
+            normalize_session(data["2026-01-10_1"], table).active[0].single_name,
+            "Alpha",
+        )
+        self.assertEqual(
+            normalize_session(data["2026-01-11_2"], table).sphere, "Personal"
+        )
+
+    def test_period_model_follows_renames(self):
+        """Test set_names() renormalizes only when the names change"""
+        from src.name_table import NameTable, rename_entry
+        from src.period_model import PeriodModel
+
+        settings, data = _migrated()
+        model = PeriodModel(NameTable(settings))
+        first = model.session("2026-01-11_2", data["2026-01-11_2"])
+
+        model.set_names(NameTable(settings))
+        self.assertIs(model.session("2026-01-11_2", data["2026-01-11_2"]), first)
+
+        rename_entry(settings, "projects", "Gym", "Running")
+        model.set_names(NameTable(settings))
+        renamed = model.session("2026-01-11_2", data["2026-01-11_2"])
+        self.assertEqual(renamed.active[0].single_name, "Running")
+
+    def test_analysis_filter_after_rename(self):
+        """Test the analysis project filter matches the new project name"""
+        from src.analysis_query import AnalysisQuery
+        from src.name_table import NameTable, rename_entry
+        from src.period_model import PeriodModel
+
+        settings, data = _migrated()
+        rename_entry(settings, "projects", "Alpha", "Apex")
+        model = PeriodModel(NameTable(settings))
+
+        query = AnalysisQuery(data, model)
+        result = query.run([ALL_TIME], "Work", "Apex", "all", settings, 0)
+        active = [row for row in result.timeline if row.period.type == "Active"]
+        self.assertEqual(len(active), 2)
+        self.assertEqual({row.period.primary for row in active}, {"Apex"})
+        self.assertEqual(
+            query.run([ALL_TIME], "Work", "Alpha", "all", settings, 0).timeline, []
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+"""
+Tests for the Period Model
+
+Verifies the canonical session/period records every consumer reads, the flat
+per-period rows shared by the all-data CSV export and the Google Sheets upload,
+and that PeriodModel normalizes each session only once until it changes.
+"""
+
+import unittest
+import sys
+import os
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_analysis_query import _sample_data, _settings, _day, ALL_TIME
+
+
+class TestPeriodModelImports(unittest.TestCase):
+    """Test that the period model module imports correctly"""
+
+    def test_import_module(self):
+        """Test that period_model can be imported"""
+        from src.period_model import (
+            PeriodModel,
+            SESSION_ROW_FIELDS,
+            iter_session_rows,
+            normalize_session,
+        )
+
+        self.assertTrue(callable(PeriodModel))
+        self.assertEqual(len(SESSION_ROW_FIELDS), 23)
+
+
+class TestNormalizeSession(unittest.TestCase):
+    """Test the canonical session record"""
+
+    def test_session_fields(self):
+        """Test session fields, notes and every period list are normalized"""
+        from src.period_model import normalize_session
+
+        session = normalize_session(_sample_data()["2026-01-10_1"])
+        self.assertEqual(session.date_value, datetime(2026, 1, 10))
+        self.assertEqual(session.sphere, "Work")
+        self.assertEqual(session.break_notes, "coffee")
+        self.assertEqual(session.active_notes, "")
+        self.assertEqual(len(session.active), 2)
+        self.assertEqual(session.active[1].primary, "Alpha")
+        self.assertEqual(session.active[1].secondary, "Beta")
+        self.assertEqual(session.breaks[0].type, "Break")
+        self.assertEqual([p.ended for p in session.idle_periods], [True, False])
+
+    def test_malformed_date(self):
+        """Test a malformed date leaves date_value unset instead of raising"""
+        from src.period_model import normalize_session
+
+        session = normalize_session({"date": "10/01/2026", "sphere": "Work"})
+        self.assertIsNone(session.date_value)
+        self.assertEqual(session.active, ())
+
+
+class TestObjectModel(unittest.TestCase):
+    """Test the __slots__ Session/Period/Allocation classes"""
+
+    def test_round_trip(self):
+        """Test to_dict() gives back exactly the stored session"""
+        from src.period_model import Session
+
+        data = _sample_data()
+        data["2026-01-11_1"]["odd_key"] = [1, 2]
+        data["2026-01-11_1"]["active"][0]["screenshots"] = ["a.png"]
+        data["2026-01-10_1"]["active"][0]["screenshot_manifest"] = "manifest.json"
+        data["2026-01-10_1"]["active"][1]["projects"][0]["extra"] = None
+        for session_data in data.values():
+            self.assertEqual(Session(session_data).to_dict(), session_data)
+
+    def test_no_instance_dicts(self):
+        """Test records are slotted rather than carrying a __dict__"""
+        from src.period_model import Session
+
+        session = Session(_sample_data()["2026-01-10_1"])
+        allocation = session.active[1].allocations[1]
+        for record in (session, session.active[0], allocation):
+            self.assertFalse(hasattr(record, "__dict__"))
+        self.assertEqual((allocation.name, allocation.primary), ("Beta", False))
+
+    def test_timeline_rows_read_like_dicts(self):
+        """Test TimelineRow fields are read with the old dict keys"""
+        from src.analysis_query import AnalysisQuery
+
+        result = AnalysisQuery(_sample_data()).run(
+            [ALL_TIME], "All Spheres", "All Projects", "all", _settings(), 0
+        )
+        row = result.timeline[0]
+        self.assertEqual(row["date"], "2026-01-10")
+        self.assertEqual(row.get("sphere"), "Work")
+        self.assertIsNone(row.get("missing"))
+        self.assertEqual(dict(row.to_dict()), row)
+        self.assertEqual(len(row.to_dict()), 15)
+
+
+class TestIterSessionRows(unittest.TestCase):
+    """Test the flat per-period rows"""
+
+    def test_one_row_per_period(self):
+        """Test each period becomes a row with every column"""
+        from src.period_model import SESSION_ROW_FIELDS, iter_session_rows
+
+        rows = list(iter_session_rows("2026-01-10_1", _sample_data()["2026-01-10_1"]))
+        self.assertEqual(len(rows), 5)
+        for row in rows:
+            self.assertEqual(list(row), SESSION_ROW_FIELDS)
+        self.assertEqual(
+            [row["type"] for row in rows], ["active", "active", "break", "idle", "idle"]
+        )
+        self.assertEqual(rows[1]["secondary_action"], "Beta")
+        self.assertEqual(rows[1]["secondary_duration"], 300)
+        self.assertEqual(rows[0]["secondary_percentage"], "")
+
+    def test_session_summary_row(self):
+        """Test a session without periods gets a single summary row"""
+        from src.period_model import iter_session_rows
+
+        rows = list(iter_session_rows("s", {"date": "2026-01-12", "sphere": "Work"}))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["type"], "session_summary")
+        self.assertEqual(rows[0]["primary_action"], "")
+
+
+class TestPeriodModel(unittest.TestCase):
+    """Test the per-session normalization cache"""
+
+    def test_reused_until_replaced(self):
+        """Test a session is renormalized only when its dict is replaced"""
+        from src.period_model import PeriodModel
+
+        model = PeriodModel()
+        data = _sample_data()
+        first = model.session("2026-01-11_1", data["2026-01-11_1"])
+        self.assertIs(model.session("2026-01-11_1", data["2026-01-11_1"]), first)
+
+        data["2026-01-11_1"] = dict(data["2026-01-11_1"], sphere="Personal")
+        second = model.session("2026-01-11_1", data["2026-01-11_1"])
+        self.assertIsNot(second, first)
+        self.assertEqual(second.sphere, "Personal")
+
+    def test_prune(self):
+        """Test deleted sessions are forgotten"""
+        from src.period_model import PeriodModel
+
+        model = PeriodModel()
+        data = _sample_data()
+        for name, session_data in data.items():
+            model.session(name, session_data)
+        del data["2026-01-11_2"]
+        model.prune(data)
+        self.assertEqual(len(model), 2)
+
+    def test_snapshot_is_independent(self):
+        """Test a snapshot keeps its names and cache while the original changes"""
+        from src.name_table import NameTable
+        from src.period_model import PeriodModel
+
+        names = NameTable({"spheres": {"Work": {"id": "w1"}}})
+        model = PeriodModel(names)
+        data = _sample_data()
+        cached = model.session("2026-01-11_1", data["2026-01-11_1"])
+
+        snapshot = model.snapshot()
+        model.set_names(NameTable({"spheres": {"Job": {"id": "w1"}}}))
+        model.prune({})
+
+        self.assertIs(snapshot.names, names)
+        self.assertIs(snapshot.session("2026-01-11_1", data["2026-01-11_1"]), cached)
+        snapshot.session("2026-01-11_2", data["2026-01-11_2"])
+        self.assertEqual((len(snapshot), len(model)), (2, 0))
+
+    def test_query_with_model_matches(self):
+        """Test analysis queries give the same results from a shared model"""
+        from src.analysis_query import AnalysisQuery
+        from src.period_model import PeriodModel
+
+        data = _sample_data()
+        model = PeriodModel()
+        ranges = [_day(10), _day(11), ALL_TIME]
+        args = (ranges, "All Spheres", "All Projects", "all", _settings())
+        expected = AnalysisQuery(data).run(*args, timeline_index=2)
+        for _ in range(2):
+            result = AnalysisQuery(data, model).run(*args, timeline_index=2)
+            self.assertEqual(result.totals, expected.totals)
+            self.assertEqual(result.timeline, expected.timeline)
+        self.assertEqual(len(model), 3)
+
+
+class TestPeriodModelMemory(unittest.TestCase):
+    """Smaller version of tests/benchmark_period_model_memory.py"""
+
+    def _traced(self, build):
+        import gc
+        import tracemalloc
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            return build(), tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    def test_objects_smaller_than_dicts(self):
+        """Test sessions and timeline rows take less memory than dicts"""
+        from src.analysis_query import AnalysisQuery
+        from src.period_model import PeriodModel
+        from tests.test_helpers import TestDataGenerator
+
+        data = TestDataGenerator.create_test_data_with_n_periods(3000)
+        model = PeriodModel()
+        sessions, session_bytes = self._traced(
+            lambda: [model.session(name, value) for name, value in data.items()]
+        )
+        _, dict_bytes = self._traced(lambda: [s.to_dict() for s in sessions])
+        self.assertLess(session_bytes, dict_bytes)
+
+        rows, row_bytes = self._traced(
+            lambda: AnalysisQuery(data, model)
+            .run([ALL_TIME], "All Spheres", "All Projects", "all", {}, 0)
+            .timeline
+        )
+        _, row_dict_bytes = self._traced(lambda: [row.to_dict() for row in rows])
+        self.assertEqual(len(rows), 3000)
+        self.assertLess(row_bytes * 2, row_dict_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
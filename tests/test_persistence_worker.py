@@ -0,0 +1,219 @@
+"""
+Tests for the Persistence Worker
+
+Verifies that queued writes are performed off the calling thread, coalesced
+per key without reordering, bounded, and fully flushed on demand.
+"""
+
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_helpers import TestFileManager
+
+
+class TestPersistenceWorkerImports(unittest.TestCase):
+    """Test that the persistence worker module imports correctly"""
+
+    def test_import_module(self):
+        """Test that persistence_worker can be imported"""
+        from src.persistence_worker import PersistenceWorker
+
+        self.assertTrue(callable(PersistenceWorker))
+
+
+class TestPersistenceWorker(unittest.TestCase):
+    """Test queueing, coalescing and flushing"""
+
+    def setUp(self):
+        from src.persistence_worker import PersistenceWorker
+
+        self.worker = PersistenceWorker()
+        self.batches = []
+        self.gate = threading.Event()
+        self.blocked = threading.Event()
+
+    def tearDown(self):
+        self.gate.set()
+        self.worker.stop(timeout=5)
+
+    def _write(self, payloads):
+        self.batches.append(list(payloads))
+
+    def _blocking_write(self, payloads):
+        self.blocked.set()
+        self.gate.wait(5)
+        self.batches.append(list(payloads))
+
+    def _block_worker(self):
+        """Occupy the worker so following submits queue up behind it"""
+        self.worker.submit("block", 0, self._blocking_write)
+        self.blocked.wait(5)
+
+    def test_submit_and_flush(self):
+        """Test flush() waits until submitted writes are done"""
+        self.worker.submit("k", 1, self._write)
+        self.assertTrue(self.worker.flush(timeout=5))
+        self.assertEqual(self.batches, [[1]])
+        self.assertEqual(self.worker.pending_count(), 0)
+
+    def test_writes_happen_on_worker_thread(self):
+        """Test the caller never performs the write itself"""
+        threads = []
+        self.worker.submit("k", 1, lambda p: threads.append(threading.current_thread()))
+        self.worker.flush(timeout=5)
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_append_jobs_are_coalesced(self):
+        """Test jobs queued behind a slow write share one batch"""
+        self._block_worker()
+        for value in (1, 2, 3):
+            self.worker.submit("k", value, self._write)
+        self.gate.set()
+        self.worker.flush(timeout=5)
+        self.assertEqual(self.batches, [[0], [1, 2, 3]])
+
+    def test_replace_jobs_keep_newest(self):
+        """Test replace jobs only write the newest payload"""
+        self._block_worker()
+        for value in ("a", "b", "c"):
+            self.worker.submit("snapshot", value, self._write, replace=True)
+        self.gate.set()
+        self.worker.flush(timeout=5)
+        self.assertEqual(self.batches, [[0], ["c"]])
+
+    def test_order_preserved_across_keys(self):
+        """Test jobs with different keys are not reordered"""
+        self._block_worker()
+        self.worker.submit("a", 1, self._write)
+        self.worker.submit("b", 2, self._write)
+        self.worker.submit("a", 3, self._write)
+        self.gate.set()
+        self.worker.flush(timeout=5)
+        self.assertEqual(self.batches, [[0], [1], [2], [3]])
+
+    def test_on_done_receives_error(self):
+        """Test write errors are reported to every coalesced job"""
+        errors = []
+
+        def failing_write(payloads):
+            raise OSError("disk full")
+
+        self.worker.submit("k", 1, failing_write, on_done=errors.append)
+        self.assertTrue(self.worker.flush(timeout=5))
+        self.assertEqual(len(errors), 1)
+        self.assertIsInstance(errors[0], OSError)
+
+    def test_flush_times_out_while_blocked(self):
+        """Test flush() returns False if writes don't finish in time"""
+        self._block_worker()
+        self.assertFalse(self.worker.flush(timeout=0.05))
+        self.gate.set()
+        self.assertTrue(self.worker.flush(timeout=5))
+
+    def test_queue_is_bounded(self):
+        """Test the queue never grows past its maximum size"""
+        from src.persistence_worker import PersistenceWorker
+
+        worker = PersistenceWorker(max_queue_size=2)
+        try:
+            worker.submit("block", 0, self._blocking_write)
+            self.blocked.wait(5)
+            worker.submit("k", 1, self._write)
+            worker.submit("k", 2, self._write)
+            self.assertTrue(worker._queue.full())
+        finally:
+            self.gate.set()
+            worker.stop(timeout=5)
+        self.assertEqual(self.batches, [[0], [1, 2]])
+
+    def test_stop_flushes_pending_writes(self):
+        """Test stop() writes everything queued before it"""
+        self._block_worker()
+        self.worker.submit("k", 1, self._write)
+        self.gate.set()
+        self.worker.stop(timeout=5)
+        self.assertEqual(self.batches, [[0], [1]])
+
+    def test_submit_after_stop_writes_synchronously(self):
+        """Test writes still happen once the worker thread has exited"""
+        self.worker.stop(timeout=5)
+        self.worker.submit("k", 1, self._write)
+        self.assertEqual(self.batches, [[1]])
+
+    def test_jobs_queued_behind_stop_are_written(self):
+        """Test jobs submitted after stop() timed out still get written"""
+        self._block_worker()
+        self.worker.stop(timeout=0.05)  # Leaves the stop sentinel queued
+        self.worker.submit("k", 1, self._write)
+        self.worker.submit("k", 2, self._write)
+        self.gate.set()
+
+        self.assertTrue(self.worker.flush(timeout=5))
+        self.assertEqual(self.batches, [[0], [1, 2]])
+        self.worker._thread.join(5)
+        self.assertFalse(self.worker._thread.is_alive())
+
+    def test_worker_stopping_during_submit(self):
+        """Test a job queued just as the worker exits is not left behind"""
+        real_put = self.worker._queue.put
+
+        def put_after_stop(job, *args, **kwargs):
+            if job is not None:  # Not stop()'s own sentinel
+                # This job already counts as submitted, so flush() times out
+                self.worker.stop(timeout=0.01)
+                self.worker._thread.join(5)
+            real_put(job, *args, **kwargs)
+
+        with patch.object(self.worker._queue, "put", side_effect=put_after_stop):
+            self.worker.submit("k", 1, self._write)
+
+        self.assertTrue(self.worker.flush(timeout=5))
+        self.assertEqual(self.batches, [[1]])
+
+
+class TestJournalThroughWorker(unittest.TestCase):
+    """Test journal appends through the worker match direct appends"""
+
+    def setUp(self):
+        from src.persistence_worker import PersistenceWorker
+
+        self.file_manager = TestFileManager()
+        self.data_file = self.file_manager.create_test_file("test_worker_data.json", {})
+        self.file_manager.test_files.append(self.data_file + ".journal")
+        self.worker = PersistenceWorker()
+
+    def tearDown(self):
+        self.worker.stop(timeout=5)
+        self.file_manager.cleanup()
+
+    def test_records_replay_in_order(self):
+        """Test coalesced journal batches replay to the same data"""
+        from src.session_journal import (
+            SessionJournal,
+            make_session_update,
+            make_period_append,
+        )
+
+        journal = SessionJournal(self.data_file)
+        records = [make_session_update("s1", {"sphere": "Work"})] + [
+            make_period_append("s1", "active", i, {"duration": i}) for i in range(20)
+        ]
+        for record in records:
+            self.worker.submit(
+                ("journal", journal.journal_file), record, journal.append_many
+            )
+        self.worker.flush(timeout=5)
+
+        self.assertEqual(journal.record_count(), len(records))
+        data = journal.replay({})
+        self.assertEqual([p["duration"] for p in data["s1"]["active"]], list(range(20)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for Screenshot Dedupe
+
+Verifies that the perceptual hash matches near-identical screenshots but not
+different ones, and that the deduper compares with the last saved capture of
+the period and counts near-duplicates per session.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from PIL import Image, ImageDraw
+
+
+def _screen(seed=0, size=(640, 360)):
+    """Desktop-like frame: a window with lines of text"""
+    image = Image.new("RGB", size, (30, 50, 80))
+    draw = ImageDraw.Draw(image)
+    left = 40 + seed * 150
+    draw.rectangle([(left, 30), (left + 300, 300)], (250, 250, 250))
+    for y in range(60, 290, 12):
+        draw.rectangle(
+            [(left + 10, y), (left + 10 + (y * 7 + seed * 31) % 250, y + 5)], 0
+        )
+    return image
+
+
+class TestScreenshotDedupeImports(unittest.TestCase):
+    """Test that the screenshot dedupe module imports correctly"""
+
+    def test_import_module(self):
+        """Test that screenshot_dedupe can be imported"""
+        from src.screenshot_dedupe import (
+            DEDUPE_MODES,
+            ScreenshotDeduper,
+            perceptual_hash,
+            similarity,
+        )
+
+        self.assertIn("off", DEDUPE_MODES)
+        self.assertTrue(callable(ScreenshotDeduper))
+        self.assertTrue(callable(perceptual_hash))
+        self.assertEqual(similarity(5, 5), 100)
+
+
+class TestPerceptualHash(unittest.TestCase):
+    """Test the fingerprint"""
+
+    def test_near_identical_match(self):
+        """Test a changed clock in the corner still matches"""
+        from src.screenshot_dedupe import perceptual_hash, similarity
+
+        original = _screen()
+        clock = original.copy()
+        ImageDraw.Draw(clock).rectangle([(590, 345), (635, 355)], (200, 200, 200))
+        self.assertGreaterEqual(
+            similarity(perceptual_hash(original), perceptual_hash(clock)), 97
+        )
+        self.assertLess(perceptual_hash(original), 1 << 256)
+
+    def test_different_screens_differ(self):
+        """Test a moved window is not a near-duplicate"""
+        from src.screenshot_dedupe import perceptual_hash, similarity
+
+        self.assertLess(
+            similarity(perceptual_hash(_screen(0)), perceptual_hash(_screen(1))), 90
+        )
+
+
+class TestScreenshotDeduper(unittest.TestCase):
+    """Test comparing captures and counting duplicates"""
+
+    def test_compares_with_last_saved(self):
+        """Test duplicates refer to the last saved capture until a reset"""
+        from src.screenshot_dedupe import ScreenshotDeduper
+
+        deduper = ScreenshotDeduper({})
+        first = {"timestamp": "1"}
+        self.assertIsNone(deduper.check("s", 0b1010))
+        deduper.remember(0b1010, first)
+        self.assertIs(deduper.check("s", 0b1010), first)
+        self.assertIs(deduper.check("s", 0b1011), first)  # 1 bit of 256 differs
+
+        deduper.reset()
+        self.assertIsNone(deduper.check("s", 0b1010))
+        self.assertEqual(
+            deduper.stats("s"), {"captures": 4, "duplicates": 2, "ratio": 0.5}
+        )
+        self.assertIsNone(deduper.stats("other"))
+
+    def test_forget_failed_capture(self):
+        """Test a capture that wasn't saved is no longer compared with"""
+        from src.screenshot_dedupe import ScreenshotDeduper
+
+        deduper = ScreenshotDeduper({})
+        info = {"timestamp": "1"}
+        deduper.remember(7, info)
+        deduper.forget({"timestamp": "1"})  # Equal but not the same capture
+        self.assertIsNotNone(deduper.check("s", 7))
+        deduper.forget(info)
+        self.assertIsNone(deduper.check("s", 7))
+
+    def test_settings(self):
+        """Test mode and similarity settings, with invalid values ignored"""
+        from src.constants import SCREENSHOT_DEDUPE_SIMILARITY
+        from src.screenshot_dedupe import ScreenshotDeduper
+
+        deduper = ScreenshotDeduper({"dedupe_mode": "skip", "dedupe_similarity": 90})
+        self.assertEqual((deduper.mode, deduper.min_similarity), ("skip", 90))
+        self.assertTrue(deduper.enabled)
+
+        deduper.configure({"dedupe_mode": "sometimes", "dedupe_similarity": "high"})
+        self.assertEqual(deduper.mode, "reference")
+        self.assertEqual(deduper.min_similarity, SCREENSHOT_DEDUPE_SIMILARITY)
+        self.assertFalse(ScreenshotDeduper({"dedupe_mode": "off"}).enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Tests for Screenshot Encoding
+
+Verifies that the screenshot_settings image options are read with safe
+defaults, that captures are scaled down to the maximum size and saved in the
+configured format, and where thumbnails go.
+"""
+
+import unittest
+import sys
+import os
+from io import BytesIO
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from PIL import Image
+
+
+class TestScreenshotEncodingImports(unittest.TestCase):
+    """Test that the screenshot encoding module imports correctly"""
+
+    def test_import_module(self):
+        """Test that screenshot_encoding can be imported"""
+        from src.screenshot_encoding import (
+            ScreenshotEncoding,
+            available_formats,
+            fit_within,
+            thumbnail_path_for,
+        )
+
+        self.assertTrue(callable(ScreenshotEncoding))
+        self.assertIn("png", available_formats())
+        self.assertTrue(callable(fit_within))
+        self.assertTrue(callable(thumbnail_path_for))
+
+
+class TestEncodingSettings(unittest.TestCase):
+    """Test reading the image options"""
+
+    def test_defaults_match_old_behavior(self):
+        """Test settings without image options save full-size PNGs"""
+        from src.screenshot_encoding import ScreenshotEncoding
+
+        encoding = ScreenshotEncoding({"enabled": True})
+        self.assertEqual(encoding.image_format, "png")
+        self.assertEqual(encoding.extension, ".png")
+        self.assertEqual(encoding.max_dimension, 0)
+
+    def test_invalid_values(self):
+        """Test unknown formats and bad numbers fall back or are clamped"""
+        from src.screenshot_encoding import ScreenshotEncoding
+
+        encoding = ScreenshotEncoding(
+            {
+                "image_format": "bmp",
+                "image_quality": 500,
+                "max_dimension": "big",
+                "thumbnail_size": -5,
+            }
+        )
+        self.assertEqual(encoding.image_format, "png")
+        self.assertEqual(encoding.quality, 100)
+        self.assertEqual(encoding.max_dimension, 0)
+        self.assertEqual(encoding.thumbnail_size, 0)
+        self.assertEqual(ScreenshotEncoding({"image_format": "JPG"}).extension, ".jpg")
+
+
+class TestEncodingOutput(unittest.TestCase):
+    """Test the saved images"""
+
+    def test_formats(self):
+        """Test every available format saves a readable image of that format"""
+        from src.screenshot_encoding import (
+            IMAGE_FORMATS,
+            ScreenshotEncoding,
+            available_formats,
+        )
+
+        image = Image.new("RGB", (64, 48), "white")
+        for image_format in available_formats():
+            output = BytesIO()
+            ScreenshotEncoding({"image_format": image_format}).save(image, output)
+            output.seek(0)
+            with Image.open(output) as saved:
+                self.assertEqual(saved.format, IMAGE_FORMATS[image_format][0])
+                self.assertEqual(saved.size, (64, 48))
+
+    def test_max_dimension_keeps_aspect(self):
+        """Test captures larger than max_dimension are scaled to fit"""
+        from src.screenshot_encoding import ScreenshotEncoding, fit_within
+
+        image = Image.new("RGB", (3840, 1080))
+        saved = ScreenshotEncoding({"max_dimension": 1920}).save(image, BytesIO())
+        self.assertEqual(saved.size, (1920, 540))
+        self.assertIs(fit_within(image, 0), image)
+        self.assertIs(fit_within(image, 4000), image)
+
+    def test_thumbnail(self):
+        """Test thumbnails are small JPEGs in the period's thumbnails folder"""
+        from src.screenshot_encoding import ScreenshotEncoding, thumbnail_path_for
+
+        output = BytesIO()
+        encoding = ScreenshotEncoding({"thumbnail_size": 100})
+        self.assertTrue(encoding.save_thumbnail(Image.new("RGB", (400, 300)), output))
+        output.seek(0)
+        with Image.open(output) as thumbnail:
+            self.assertEqual((thumbnail.format, thumbnail.size), ("JPEG", (100, 75)))
+
+        self.assertFalse(
+            ScreenshotEncoding({"thumbnail_size": 0}).save_thumbnail(
+                Image.new("RGB", (4, 4)), BytesIO()
+            )
+        )
+        self.assertEqual(
+            thumbnail_path_for(os.path.join("period_active_0", "shot.webp")),
+            os.path.join("period_active_0", "thumbnails", "shot.jpg"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+"""
+Tests for Screenshot Manifests
+
+Verifies that period screenshot lists are stored in and read back from the
+session manifest, that deleted screenshots are dropped from it, and that
+inline lists in existing data are migrated.
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+class TestScreenshotManifestImports(unittest.TestCase):
+    """Test that the screenshot manifest module imports correctly"""
+
+    def test_import_module(self):
+        """Test that screenshot_manifest can be imported"""
+        from src.screenshot_manifest import (
+            load_period_screenshots,
+            migrate_screenshot_manifests,
+            remove_screenshots,
+            write_period_screenshots,
+        )
+
+        self.assertTrue(callable(load_period_screenshots))
+        self.assertTrue(callable(migrate_screenshot_manifests))
+        self.assertTrue(callable(remove_screenshots))
+        self.assertTrue(callable(write_period_screenshots))
+
+
+class ManifestTestCase(unittest.TestCase):
+    """Temporary data folder with a session screenshot folder"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.data_dir = tempfile.mkdtemp()
+        self.session_folder = os.path.join(
+            self.data_dir, "screenshots", "2026-02-16", "session_143022"
+        )
+
+    def tearDown(self):
+        """Clean up test files"""
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def _info(self, period, name, **extra):
+        """Screenshot info as ScreenshotCapture lists it"""
+        filepath = os.path.join(self.session_folder, period, name)
+        return {
+            "filepath": filepath,
+            "relative_path": os.path.relpath(filepath, self.data_dir),
+            "timestamp": name[:15],
+            "window_title": "Doc",
+            "process_name": "editor.exe",
+            **extra,
+        }
+
+
+class TestManifestReadWrite(ManifestTestCase):
+    """Test storing and loading period lists"""
+
+    def test_periods_found_by_start_timestamp(self):
+        """Test each period reads back its own list, saving again replaces it"""
+        from src.screenshot_manifest import (
+            load_period_screenshots,
+            write_period_screenshots,
+        )
+
+        folder = os.path.join(self.session_folder, "period_active_0")
+        first = [self._info("period_active_0", "20260216_143100_a.png")]
+        second = [self._info("period_active_0", "20260216_150000_b.png")]
+        manifest_file = write_period_screenshots(folder, 100.5, first)
+        write_period_screenshots(folder, 200.25, [])
+        write_period_screenshots(folder, 200.25, second)
+
+        self.assertEqual(
+            manifest_file, os.path.join(self.session_folder, "manifest.json")
+        )
+        with open(manifest_file) as f:
+            self.assertEqual(len(json.load(f)["periods"]), 2)
+
+        reference = os.path.relpath(manifest_file, self.data_dir)
+        cache = {}
+        for start, expected in ((100.5, first), (200.25, second), (300, [])):
+            period = {"start_timestamp": start, "screenshot_manifest": reference}
+            self.assertEqual(
+                load_period_screenshots(period, self.data_dir, cache), expected
+            )
+        self.assertEqual(list(cache), [os.path.join(self.data_dir, reference)])
+
+    def test_inline_and_missing(self):
+        """Test unmigrated inline lists are returned and missing manifests are empty"""
+        from src.screenshot_manifest import load_period_screenshots
+
+        inline = [self._info("period_active_0", "20260216_143100_a.png")]
+        self.assertEqual(
+            load_period_screenshots({"screenshots": inline}, self.data_dir), inline
+        )
+        self.assertEqual(load_period_screenshots({}, self.data_dir), [])
+        self.assertEqual(
+            load_period_screenshots(
+                {"start_timestamp": 1, "screenshot_manifest": "gone.json"},
+                self.data_dir,
+            ),
+            [],
+        )
+
+
+class TestManifestRemove(ManifestTestCase):
+    """Test dropping deleted screenshots"""
+
+    def test_remove_with_duplicates(self):
+        """Test entries using a deleted file go, near-duplicates included"""
+        from src.screenshot_manifest import (
+            load_period_screenshots,
+            remove_screenshots,
+            write_period_screenshots,
+        )
+
+        folder = os.path.join(self.session_folder, "period_active_0")
+        first = self._info("period_active_0", "20260216_143100_a.png")
+        duplicate = {**first, "timestamp": "20260216_143110", "duplicate_of": "x"}
+        kept = self._info("period_active_0", "20260216_150000_b.png")
+        manifest_file = write_period_screenshots(folder, 1, [first, duplicate, kept])
+
+        self.assertEqual(remove_screenshots([first["filepath"]], self.data_dir), 2)
+        period = {
+            "start_timestamp": 1,
+            "screenshot_manifest": os.path.relpath(manifest_file, self.data_dir),
+        }
+        self.assertEqual(load_period_screenshots(period, self.data_dir), [kept])
+
+        # The last screenshot takes the manifest and emptied folders with it
+        self.assertEqual(remove_screenshots([kept["filepath"]], self.data_dir), 1)
+        self.assertFalse(os.path.exists(os.path.dirname(self.session_folder)))
+        self.assertTrue(os.path.isdir(os.path.join(self.data_dir, "screenshots")))
+
+
+class TestManifestMigration(ManifestTestCase):
+    """Test moving inline lists out of the session data"""
+
+    def test_migrate_inline_lists(self):
+        """Test inline lists move to manifests unless their folder is unknown"""
+        from src.screenshot_manifest import (
+            load_period_screenshots,
+            migrate_screenshot_manifests,
+        )
+
+        active = [self._info("period_active_0", "20260216_143100_a.png")]
+        breaks = [self._info("period_break_0", "20260216_150000_b.png")]
+        all_data = {
+            "2026-02-16_143022": {
+                "active": [
+                    {
+                        "start_timestamp": 10,
+                        "screenshot_folder": os.path.relpath(
+                            os.path.join(self.session_folder, "period_active_0"),
+                            self.data_dir,
+                        ),
+                        "screenshots": active,
+                    }
+                ],
+                # No screenshot_folder - found from the screenshot's path
+                "breaks": [{"start_timestamp": 20, "screenshots": breaks}],
+            },
+            "2026-02-15_090000": {"active": [{"screenshots": ["a.png"]}]},
+            "2026-02-14_090000": {"active": [{"start_timestamp": 5}]},
+        }
+
+        changed = migrate_screenshot_manifests(all_data, self.data_dir)
+
+        self.assertEqual(changed, ["2026-02-16_143022"])
+        session = all_data["2026-02-16_143022"]
+        for period, expected in (
+            (session["active"][0], active),
+            (session["breaks"][0], breaks),
+        ):
+            self.assertNotIn("screenshots", period)
+            self.assertEqual(
+                period["screenshot_manifest"],
+                os.path.join(
+                    "screenshots", "2026-02-16", "session_143022", "manifest.json"
+                ),
+            )
+            self.assertEqual(load_period_screenshots(period, self.data_dir), expected)
+        # A list that doesn't say where its files are stays inline
+        self.assertEqual(
+            all_data["2026-02-15_090000"]["active"][0]["screenshots"], ["a.png"]
+        )
+        self.assertEqual(migrate_screenshot_manifests(all_data, self.data_dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,225 @@
+"""
+Tests for Screenshot Retention
+
+Verifies that the screenshot index tracks sizes and references, survives a
+restart (scanning only newer date folders), and that the retention limits
+evict the right screenshots - never from the running session - and clean up
+their thumbnails and empty folders.
+"""
+
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+DAY = 24 * 60 * 60
+NOW = time.mktime((2026, 2, 16, 12, 0, 0, 0, 0, -1))
+
+
+class TestScreenshotRetentionImports(unittest.TestCase):
+    """Test that the screenshot retention module imports correctly"""
+
+    def test_import_module(self):
+        """Test that screenshot_retention can be imported"""
+        from src.screenshot_retention import ScreenshotIndex, ScreenshotRetention
+
+        self.assertTrue(callable(ScreenshotIndex))
+        self.assertTrue(callable(ScreenshotRetention))
+
+
+class RetentionTestCase(unittest.TestCase):
+    """Temporary screenshot folder with helpers to create screenshots"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        self.base = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """Clean up test files"""
+        shutil.rmtree(self.base, ignore_errors=True)
+
+    def _write(self, date, period, name, size=100, thumbnail=True):
+        """Create a screenshot (and thumbnail) file, returning its path"""
+        from src.screenshot_encoding import thumbnail_path_for
+
+        folder = os.path.join(self.base, date, "session_090000", period)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, name)
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+        if thumbnail:
+            os.makedirs(os.path.dirname(thumbnail_path_for(path)), exist_ok=True)
+            with open(thumbnail_path_for(path), "wb") as f:
+                f.write(b"t" * 10)
+        return path
+
+
+class TestScreenshotIndex(RetentionTestCase):
+    """Test the running index"""
+
+    def test_add_reference_and_remove(self):
+        """Test sizes add up and references are counted"""
+        from src.screenshot_retention import ScreenshotIndex
+
+        index = ScreenshotIndex(self.base)
+        first = self._write("2026-02-16", "period_active_0", "a.png")
+        index.add(first, 110, NOW)
+        # A near-duplicate listed before its file was saved still counts
+        index.add_reference(os.path.join(os.path.dirname(first), "b.png"))
+        index.add(os.path.join(os.path.dirname(first), "b.png"), 50, NOW)
+        index.add_reference(first)
+        index.add(os.path.join(self.base, os.pardir, "elsewhere.png"), 999, NOW)
+
+        self.assertEqual(index.total_bytes(), 160)
+        entries = {key: references for key, _, _, references in index.entries()}
+        self.assertEqual(
+            entries,
+            {
+                "2026-02-16/session_090000/period_active_0/a.png": 2,
+                "2026-02-16/session_090000/period_active_0/b.png": 2,
+            },
+        )
+        index.remove("2026-02-16/session_090000/period_active_0/a.png")
+        self.assertEqual(index.total_bytes(), 50)
+
+    def test_rebuilt_from_disk(self):
+        """Test a missing index is rebuilt, thumbnails counted with their capture"""
+        from src.screenshot_retention import ScreenshotIndex
+
+        self._write("2026-02-15", "period_active_0", "a.png", 100)
+        self._write("2026-02-16", "period_break_0", "b.jpg", 200, thumbnail=False)
+        # Session manifests are not screenshots
+        session_folder = os.path.join(self.base, "2026-02-16", "session_090000")
+        with open(os.path.join(session_folder, "manifest.json"), "w") as f:
+            f.write("{}")
+
+        index = ScreenshotIndex(self.base)
+        self.assertEqual(index.total_bytes(), 310)
+        self.assertEqual(len(index.entries()), 2)
+
+    def test_saved_index_scans_only_newer_days(self):
+        """Test after a restart only date folders since the save are scanned"""
+        from src.constants import SCREENSHOT_INDEX_FILE
+        from src.screenshot_retention import ScreenshotIndex
+
+        index = ScreenshotIndex(self.base)
+        index.add(self._write("2026-02-15", "period_active_0", "a.png"), 110, NOW)
+        index.save()
+        with open(os.path.join(self.base, SCREENSHOT_INDEX_FILE)) as f:
+            data = json.load(f)
+        data["saved_at"] = NOW  # Pretend it was saved on 2026-02-16
+        with open(os.path.join(self.base, SCREENSHOT_INDEX_FILE), "w") as f:
+            json.dump(data, f)
+        # Saved while the app was not running to update the index
+        self._write("2026-02-15", "period_active_1", "old.png")
+        self._write("2026-02-17", "period_active_0", "new.png")
+
+        keys = [key for key, _, _, _ in ScreenshotIndex(self.base).entries()]
+        self.assertEqual(
+            sorted(keys),
+            [
+                "2026-02-15/session_090000/period_active_0/a.png",
+                "2026-02-17/session_090000/period_active_0/new.png",
+            ],
+        )
+
+
+class TestScreenshotRetention(RetentionTestCase):
+    """Test choosing and deleting screenshots beyond the limits"""
+
+    def _retention(self, index, **limits):
+        from src.screenshot_retention import ScreenshotRetention
+
+        return ScreenshotRetention(index, {"screenshot_settings": limits})
+
+    def test_settings(self):
+        """Test missing and invalid limits mean no limit"""
+        from src.screenshot_retention import ScreenshotIndex
+
+        index = ScreenshotIndex(self.base)
+        self.assertFalse(self._retention(index).enabled)
+        retention = self._retention(index, max_age_days="soon", keep_per_period=-3)
+        self.assertEqual((retention.max_age_days, retention.keep_per_period), (0, 0))
+        self.assertFalse(retention.enabled)
+        self.assertTrue(self._retention(index, max_total_size_mb=100).enabled)
+
+    def test_age_and_keep_per_period(self):
+        """Test old screenshots go, and only the most referenced are kept"""
+        from src.screenshot_retention import ScreenshotIndex
+
+        index = ScreenshotIndex(self.base)
+        old = self._write("2026-01-01", "period_active_0", "old.png")
+        index.add(old, 110, NOW - 40 * DAY)
+        period = []
+        for second, references in enumerate((3, 1, 1)):
+            path = self._write("2026-02-16", "period_active_0", f"{second}.png")
+            index.add(path, 110, NOW - 60 + second)
+            for _ in range(references - 1):
+                index.add_reference(path)
+            period.append(index.key_for(path))
+
+        retention = self._retention(index, max_age_days=30, keep_per_period=2)
+        # The most referenced and then the newest capture are kept
+        self.assertEqual(
+            retention.select_evictions(NOW), [index.key_for(old), period[1]]
+        )
+
+    def test_size_evicts_oldest_day_first(self):
+        """Test the quota thins out the oldest day, least referenced first"""
+        from src.screenshot_retention import ScreenshotIndex
+
+        index = ScreenshotIndex(self.base)
+        megabyte = 1024 * 1024
+        day_one = [
+            self._write("2026-02-14", "period_active_0", f"{n}.png", thumbnail=False)
+            for n in range(3)
+        ]
+        for n, path in enumerate(day_one):
+            index.add(path, megabyte, NOW - 2 * DAY + n)
+        index.add_reference(day_one[0])
+        newer = self._write("2026-02-15", "period_active_0", "n.png", thumbnail=False)
+        index.add(newer, megabyte, NOW - DAY)
+
+        retention = self._retention(index, max_total_size_mb=2)
+        self.assertEqual(
+            retention.select_evictions(NOW),
+            [index.key_for(day_one[1]), index.key_for(day_one[2])],
+        )
+
+    def test_run_once_deletes_and_protects_session(self):
+        """Test evicted files, thumbnails and empty folders are removed"""
+        from src.screenshot_encoding import thumbnail_path_for
+        from src.screenshot_retention import ScreenshotIndex, ScreenshotRetention
+
+        index = ScreenshotIndex(self.base)
+        old = self._write("2026-01-01", "period_active_0", "old.png")
+        index.add(old, 110, NOW - 40 * DAY)
+        running = self._write("2026-01-02", "period_active_0", "running.png")
+        index.add(running, 110, NOW - 39 * DAY)
+
+        evicted = []
+        retention = ScreenshotRetention(
+            index,
+            {"screenshot_settings": {"max_age_days": 30}},
+            on_evicted=evicted.append,
+            protected_folder=lambda: os.path.dirname(os.path.dirname(running)),
+        )
+        self.assertEqual(retention.run_once(NOW), [old])
+
+        self.assertEqual(evicted, [[old]])
+        self.assertFalse(os.path.exists(thumbnail_path_for(old)))
+        self.assertFalse(os.path.exists(os.path.join(self.base, "2026-01-01")))
+        self.assertTrue(os.path.exists(running))
+        self.assertEqual(index.total_bytes(), 110)
+        # The index was saved with the eviction
+        self.assertEqual(len(ScreenshotIndex(self.base).entries()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests for the Screenshot Writer
+
+Verifies that captures are saved off the submitting thread, that the queue is
+bounded by memory with the oldest captures dropped first, and that flush()
+waits for queued captures.
+"""
+
+import unittest
+import sys
+import os
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from PIL import Image
+
+
+class TestScreenshotWriterImports(unittest.TestCase):
+    """Test that the screenshot writer module imports correctly"""
+
+    def test_import_module(self):
+        """Test that screenshot_writer can be imported"""
+        from src.screenshot_writer import (
+            ScreenshotDropped,
+            ScreenshotWriter,
+            image_size_bytes,
+        )
+
+        self.assertTrue(callable(ScreenshotWriter))
+        self.assertTrue(issubclass(ScreenshotDropped, Exception))
+        self.assertEqual(image_size_bytes(Image.new("RGB", (10, 20))), 600)
+
+
+class TestScreenshotWriter(unittest.TestCase):
+    """Test the worker pool and its bounded queue"""
+
+    def setUp(self):
+        from src.screenshot_writer import ScreenshotWriter
+
+        self.writer = ScreenshotWriter(workers=1, max_queued_bytes=1000)
+        self.results = []
+
+    def tearDown(self):
+        self.writer.stop(5)
+
+    def _done(self, name):
+        return lambda error: self.results.append((name, error))
+
+    def test_writes_on_worker_thread(self):
+        """Test write runs on a writer thread and on_done reports success"""
+        threads = []
+        image = Image.new("RGB", (10, 10))
+        self.writer.submit(
+            image, lambda img: threads.append(threading.current_thread().name)
+        )
+        self.writer.submit(image, lambda img: None, self._done("second"))
+        self.assertTrue(self.writer.flush(5))
+        self.assertEqual(threads, ["ScreenshotWriter-0"])
+        self.assertEqual(self.results, [("second", None)])
+        self.assertEqual(self.writer.pending_count(), 0)
+
+    def test_drops_oldest_when_full(self):
+        """Test captures that don't fit in memory push out the oldest ones"""
+        from src.screenshot_writer import ScreenshotDropped
+
+        # Hold the only worker so the next captures stay queued
+        release = threading.Event()
+        started = threading.Event()
+
+        def blocked(img):
+            started.set()
+            release.wait(5)
+
+        image = Image.new("RGB", (10, 10))  # 300 bytes
+        self.writer.submit(image, blocked, self._done("busy"))
+        self.assertTrue(started.wait(5))
+        for name in ("a", "b", "c", "d"):
+            self.writer.submit(image, lambda img: None, self._done(name))
+
+        # Only three 300-byte captures fit in 1000 bytes - "a" was dropped
+        self.assertEqual(self.writer.dropped, 1)
+        self.assertEqual(self.results[0][0], "a")
+        self.assertIsInstance(self.results[0][1], ScreenshotDropped)
+        self.assertEqual(self.writer.pending_count(), 4)
+
+        release.set()
+        self.assertTrue(self.writer.flush(5))
+        self.assertEqual(
+            self.results[1:],
+            [("busy", None), ("b", None), ("c", None), ("d", None)],
+        )
+
+    def test_write_error_reported(self):
+        """Test an exception from write is passed to on_done"""
+
+        def fail(img):
+            raise OSError("disk full")
+
+        self.writer.submit(Image.new("RGB", (1, 1)), fail, self._done("x"))
+        self.writer.flush(5)
+        self.assertIsInstance(self.results[0][1], OSError)
+
+    def test_oversized_capture_still_written(self):
+        """Test a capture larger than the limit is kept when it is alone"""
+        self.writer.submit(
+            Image.new("RGB", (100, 100)), lambda img: None, self._done("big")
+        )
+        self.writer.flush(5)
+        self.assertEqual(self.results, [("big", None)])
+        self.assertEqual(self.writer.dropped, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
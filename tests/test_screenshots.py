@@ -9,6 +9,7 @@ import json
 import os
 import sys
 import time
+from datetime import datetime
 from unittest.mock import Mock, patch, MagicMock
 
 # Add parent directory to path
@@ -424,5 +425,252 @@ class TestScreenshotSettingsUpdate(unittest.TestCase):
         self.assertFalse(capture.monitoring)
 
 
+class TestScreenshotPipeline(unittest.TestCase):
+    """Test that capturing only grabs and saving happens on the writer"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        import tempfile
+
+        self.file_manager = TestFileManager()
+        self.screenshot_dir = tempfile.mkdtemp()
+        self.settings = TestDataGenerator.create_settings_data()
+        self.settings["screenshot_settings"]["enabled"] = True
+        self.settings["screenshot_settings"]["screenshot_path"] = self.screenshot_dir
+        self.test_data_file = self.file_manager.create_test_file("test_data.json", {})
+
+    def tearDown(self):
+        """Clean up test files"""
+        import shutil
+
+        shutil.rmtree(self.screenshot_dir, ignore_errors=True)
+        self.file_manager.cleanup()
+
+    def _capture(self):
+        from PIL import Image
+
+        capture = ScreenshotCapture(self.settings, self.test_data_file)
+        capture.set_current_session("2026-02-16_143022", "active", 0)
+        capture._get_active_window_info = Mock(return_value=("Doc", "editor.exe"))
+        return capture, Image.new("RGB", (320, 200), "white")
+
+    def test_capture_is_listed_before_saved(self):
+        """Test a queued capture is listed at once and saved by the writer"""
+        capture, image = self._capture()
+        saved = []
+        capture._save_screenshot = lambda img, path, at, enc: saved.append(path)
+
+        with patch("src.screenshot_capture.ImageGrab.grab", return_value=image):
+            with patch.object(capture.writer, "_start_workers"):
+                info = capture.capture_screenshot()
+                # Nothing saved yet, but the capture already counts
+                self.assertEqual(saved, [])
+                self.assertEqual(capture.get_current_period_screenshots(), [info])
+                self.assertEqual(capture.pending_count(), 1)
+
+        capture.writer._start_workers()
+        self.assertTrue(capture.flush(5))
+        self.assertEqual(saved, [info["filepath"]])
+        self.assertEqual(capture.get_current_period_screenshots(), [info])
+
+    def test_saved_file_has_overlay(self):
+        """Test the writer saves a PNG with the timestamp overlay"""
+        from PIL import Image
+
+        capture, image = self._capture()
+        with patch("src.screenshot_capture.ImageGrab.grab", return_value=image):
+            info = capture.capture_screenshot()
+        capture.flush(5)
+
+        with Image.open(info["filepath"]) as saved:
+            self.assertEqual(saved.format, "PNG")
+            self.assertEqual(saved.size, (320, 200))
+            # Dark box behind the timestamp in the bottom left corner
+            self.assertEqual(saved.convert("RGB").getpixel((2, 198)), (0, 0, 0))
+            self.assertEqual(saved.convert("RGB").getpixel((300, 10)), (255, 255, 255))
+
+        # Thumbnails are on by default
+        from src.screenshot_encoding import thumbnail_path_for
+
+        with Image.open(thumbnail_path_for(info["filepath"])) as thumbnail:
+            self.assertEqual(thumbnail.format, "JPEG")
+
+    def test_format_and_max_dimension(self):
+        """Test screenshots are saved in the configured format and size"""
+        from PIL import Image
+        from src.screenshot_encoding import thumbnail_path_for
+
+        self.settings["screenshot_settings"].update(
+            {"image_format": "jpeg", "max_dimension": 160, "thumbnail_size": 0}
+        )
+        capture, image = self._capture()
+        with patch("src.screenshot_capture.ImageGrab.grab", return_value=image):
+            info = capture.capture_screenshot()
+        capture.flush(5)
+
+        self.assertTrue(info["filepath"].endswith(".jpg"))
+        with Image.open(info["filepath"]) as saved:
+            self.assertEqual(saved.format, "JPEG")
+            self.assertEqual(saved.size, (160, 100))
+        self.assertFalse(os.path.exists(thumbnail_path_for(info["filepath"])))
+
+    def test_failed_save_removed_from_period(self):
+        """Test a capture that could not be saved is not listed"""
+        capture, image = self._capture()
+        capture._save_screenshot = Mock(side_effect=OSError("disk full"))
+
+        with patch("src.screenshot_capture.ImageGrab.grab", return_value=image):
+            capture.capture_screenshot()
+        capture.flush(5)
+
+        self.assertEqual(capture.get_current_period_screenshots(), [])
+        self.assertEqual(capture.failed_captures, 1)
+
+    def test_failed_save_removed_from_written_manifest(self):
+        """Test a capture failing after its period was written leaves the manifest"""
+        from src.screenshot_manifest import load_period_screenshots
+
+        capture, image = self._capture()
+        capture._save_screenshot = Mock(side_effect=OSError("disk full"))
+
+        with patch("src.screenshot_capture.ImageGrab.grab", return_value=image):
+            with patch.object(capture.writer, "_start_workers"):
+                info = capture.capture_screenshot()
+                # The period ends while the capture is still queued
+                manifest_file = capture.write_period_manifest(100.0)
+        period = {
+            "start_timestamp": 100.0,
+            "screenshot_manifest": manifest_file,
+        }
+        self.assertEqual(load_period_screenshots(period, ""), [info])
+
+        capture.writer._start_workers()
+        capture.flush(5)
+        self.assertEqual(load_period_screenshots(period, ""), [])
+
+    def test_dropped_capture_removed_from_written_manifest(self):
+        """Test a capture dropped from a full queue leaves the written manifest"""
+        from src.screenshot_manifest import load_period_screenshots
+
+        self.settings["screenshot_settings"]["dedupe_mode"] = "off"
+        capture, image = self._capture()
+        capture._save_screenshot = Mock()
+        # Room for one queued capture only
+        capture.writer.max_queued_bytes = 320 * 200 * 3
+
+        infos = []
+        with patch("src.screenshot_capture.ImageGrab.grab", return_value=image):
+            with patch.object(capture.writer, "_start_workers"):
+                for second in range(2):
+                    with patch("src.screenshot_capture.datetime") as mock_datetime:
+                        mock_datetime.now.return_value = datetime(
+                            2026, 2, 16, 14, 31, second
+                        )
+                        infos.append(capture.capture_screenshot())
+                    if second == 0:
+                        manifest_file = capture.write_period_manifest(100.0)
+        period = {"start_timestamp": 100.0, "screenshot_manifest": manifest_file}
+
+        # The second capture pushed the first, already written, out of the queue
+        self.assertEqual(capture.writer.dropped, 1)
+        self.assertEqual(capture.failed_captures, 1)
+        self.assertEqual(capture.get_current_period_screenshots(), [infos[1]])
+        self.assertEqual(load_period_screenshots(period, ""), [])
+
+        capture.writer._start_workers()
+        capture.flush(5)
+        self.assertEqual(capture._save_screenshot.call_count, 1)
+
+
+class TestScreenshotDedupe(unittest.TestCase):
+    """Test that near-duplicate captures are not saved again"""
+
+    def setUp(self):
+        """Set up test fixtures"""
+        import tempfile
+
+        self.file_manager = TestFileManager()
+        self.screenshot_dir = tempfile.mkdtemp()
+        self.settings = TestDataGenerator.create_settings_data()
+        self.settings["screenshot_settings"]["enabled"] = True
+        self.settings["screenshot_settings"]["screenshot_path"] = self.screenshot_dir
+        self.test_data_file = self.file_manager.create_test_file("test_data.json", {})
+
+    def tearDown(self):
+        """Clean up test files"""
+        import shutil
+
+        shutil.rmtree(self.screenshot_dir, ignore_errors=True)
+        self.file_manager.cleanup()
+
+    def _capture_same_screen(self, times, dedupe_mode="reference", index=None):
+        from PIL import Image
+
+        self.settings["screenshot_settings"]["dedupe_mode"] = dedupe_mode
+        capture = ScreenshotCapture(self.settings, self.test_data_file, index=index)
+        capture.set_current_session("2026-02-16_143022", "active", 0)
+        capture._get_active_window_info = Mock(return_value=("Doc", "editor.exe"))
+        screen = Image.new("RGB", (320, 200), "white")
+        infos = []
+        with patch("src.screenshot_capture.ImageGrab.grab", return_value=screen):
+            for second in range(times):
+                with patch("src.screenshot_capture.datetime") as mock_datetime:
+                    mock_datetime.now.return_value = datetime(
+                        2026, 2, 16, 14, 31, second
+                    )
+                    infos.append(capture.capture_screenshot())
+        capture.flush(5)
+        return capture, infos
+
+    def test_duplicates_reference_first_file(self):
+        """Test repeated captures of one screen are saved once"""
+        capture, infos = self._capture_same_screen(3)
+
+        listed = capture.get_current_period_screenshots()
+        self.assertEqual(len(listed), 3)
+        self.assertEqual({info["filepath"] for info in listed}, {infos[0]["filepath"]})
+        self.assertNotIn("duplicate_of", listed[0])
+        self.assertEqual(listed[2]["duplicate_of"], infos[0]["timestamp"])
+        self.assertEqual(
+            capture.dedupe_stats("2026-02-16_143022"),
+            {"captures": 3, "duplicates": 2, "ratio": 0.667},
+        )
+        period_folder = capture.get_screenshot_folder_path()
+        self.assertEqual(
+            [name for name in os.listdir(period_folder) if name.endswith(".png")],
+            [os.path.basename(infos[0]["filepath"])],
+        )
+
+    def test_index_counts_references(self):
+        """Test the saved file is indexed with every period entry using it"""
+        from src.screenshot_encoding import thumbnail_path_for
+        from src.screenshot_retention import ScreenshotIndex
+
+        index = ScreenshotIndex(self.screenshot_dir)
+        capture, infos = self._capture_same_screen(3, index=index)
+
+        [(key, size, created, references)] = index.entries()
+        self.assertEqual(index.path_for(key), os.path.abspath(infos[0]["filepath"]))
+        self.assertEqual(
+            size,
+            os.path.getsize(infos[0]["filepath"])
+            + os.path.getsize(thumbnail_path_for(infos[0]["filepath"])),
+        )
+        self.assertEqual(created, datetime(2026, 2, 16, 14, 31, 0).timestamp())
+        self.assertEqual(references, 3)
+
+    def test_skip_mode(self):
+        """Test skip mode leaves near-duplicates out of the period"""
+        capture, infos = self._capture_same_screen(3, "skip")
+        self.assertEqual(infos[1:], [None, None])
+        self.assertEqual(capture.get_current_period_screenshots(), [infos[0]])
+
+    def test_off_mode(self):
+        """Test every capture is saved with dedupe off"""
+        capture, infos = self._capture_same_screen(2, "off")
+        self.assertEqual(len({info["filepath"] for info in infos}), 2)
+        self.assertIsNone(capture.dedupe_stats("2026-02-16_143022"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,112 @@
+"""
+Tests for the Session Checkpoint
+
+Verifies that the running session's progress is checkpointed to a small
+sidecar file with an atomic replace, and that a checkpoint is only recovered
+when it is newer than the saved session.
+"""
+
+import unittest
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_helpers import TestFileManager
+
+FIELDS = {
+    "end_time": "10:05:00",
+    "end_timestamp": 2000.0,
+    "total_duration": 1000.0,
+    "active_duration": 900.0,
+    "break_duration": 100.0,
+}
+
+
+class TestSessionCheckpointImports(unittest.TestCase):
+    """Test that the session checkpoint module imports correctly"""
+
+    def test_import_module(self):
+        """Test that session_checkpoint can be imported"""
+        from src.session_checkpoint import CHECKPOINT_FIELDS, SessionCheckpoint
+
+        self.assertTrue(callable(SessionCheckpoint))
+        self.assertEqual(set(CHECKPOINT_FIELDS), set(FIELDS))
+
+
+class TestSessionCheckpointFile(unittest.TestCase):
+    """Test the checkpoint file on disk"""
+
+    def setUp(self):
+        from src.session_checkpoint import SessionCheckpoint
+
+        self.file_manager = TestFileManager()
+        self.data_file = self.file_manager.create_test_file(
+            "test_checkpoint_data.json", {}
+        )
+        self.checkpoint_file = self.data_file + ".checkpoint"
+        self.file_manager.test_files.append(self.checkpoint_file)
+        self.checkpoint = SessionCheckpoint(self.data_file)
+        self.all_data = {
+            "s1": {"start_timestamp": 1000.0, "active": [{"duration": 10}]}
+        }
+
+    def tearDown(self):
+        self.file_manager.cleanup()
+
+    def test_write_and_read(self):
+        """Test a checkpoint is a small file next to the data file"""
+        self.checkpoint.write("s1", FIELDS)
+
+        self.assertEqual(self.checkpoint.checkpoint_file, self.checkpoint_file)
+        self.assertEqual(self.checkpoint.read(), ("s1", FIELDS))
+        self.assertLess(os.path.getsize(self.checkpoint_file), 300)
+        self.assertFalse(os.path.exists(self.checkpoint_file + ".tmp"))
+
+    def test_write_latest_keeps_newest(self):
+        """Test coalesced checkpoints write only the newest one"""
+        newer = dict(FIELDS, end_timestamp=3000.0)
+        self.checkpoint.write_latest([("s1", FIELDS), ("s1", newer)])
+        self.assertEqual(self.checkpoint.read(), ("s1", newer))
+
+    def test_unreadable_checkpoint_ignored(self):
+        """Test a missing or corrupt checkpoint reads as None"""
+        self.assertIsNone(self.checkpoint.read())
+        with open(self.checkpoint_file, "w") as f:
+            f.write('{"session": "s1", "fie')
+        self.assertIsNone(self.checkpoint.read())
+        self.assertIsNone(self.checkpoint.pending_update(self.all_data))
+
+    def test_unknown_fields_dropped(self):
+        """Test a checkpoint can only update the progress fields"""
+        with open(self.checkpoint_file, "w") as f:
+            json.dump({"session": "s1", "fields": dict(FIELDS, active=[])}, f)
+        self.assertEqual(self.checkpoint.read(), ("s1", FIELDS))
+
+    def test_pending_update_after_crash(self):
+        """Test a checkpoint newer than the saved session is recovered"""
+        self.checkpoint.write("s1", FIELDS)
+        self.assertEqual(self.checkpoint.pending_update(self.all_data), ("s1", FIELDS))
+
+    def test_pending_update_ignores_stale_checkpoint(self):
+        """Test a checkpoint older than the session's final end time is ignored"""
+        self.checkpoint.write("s1", FIELDS)
+        self.all_data["s1"]["end_timestamp"] = 2500.0
+        self.assertIsNone(self.checkpoint.pending_update(self.all_data))
+        self.assertIsNone(self.checkpoint.pending_update({}))
+
+    def test_clear(self):
+        """Test clear() removes the checkpoint and any leftover temp file"""
+        self.checkpoint.write("s1", FIELDS)
+        with open(self.checkpoint_file + ".tmp", "w") as f:
+            f.write("{")
+        self.checkpoint.clear()
+        self.checkpoint.clear()
+        self.assertFalse(os.path.exists(self.checkpoint_file))
+        self.assertFalse(os.path.exists(self.checkpoint_file + ".tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
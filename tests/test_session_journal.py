@@ -0,0 +1,351 @@
+"""
+Tests for the Session Journal
+
+Verifies that session transitions are appended as small journal records and
+that replaying the journal on top of a data.json snapshot reproduces the data
+a full rewrite would have produced.
+"""
+
+import unittest
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_helpers import TestFileManager
+
+
+class TestSessionJournalImports(unittest.TestCase):
+    """Test that the session journal module imports correctly"""
+
+    def test_import_module(self):
+        """Test that session_journal can be imported"""
+        from src.session_journal import SessionJournal, apply_journal_record
+
+        self.assertTrue(callable(apply_journal_record))
+        self.assertTrue(callable(SessionJournal))
+
+
+class TestApplyJournalRecord(unittest.TestCase):
+    """Test applying individual journal records to session data"""
+
+    def test_update_session_creates_session(self):
+        """Test that update_session creates a missing session"""
+        from src.session_journal import apply_journal_record, make_session_update
+
+        all_data = {}
+        apply_journal_record(
+            all_data, make_session_update("s1", {"sphere": "Work", "breaks": []})
+        )
+        self.assertEqual(all_data["s1"], {"sphere": "Work", "breaks": []})
+
+    def test_update_session_merges_fields(self):
+        """Test that update_session keeps existing fields"""
+        from src.session_journal import apply_journal_record, make_session_update
+
+        all_data = {"s1": {"sphere": "Work", "active": [{"duration": 5}]}}
+        apply_journal_record(all_data, make_session_update("s1", {"end_time": "10:00"}))
+        self.assertEqual(all_data["s1"]["sphere"], "Work")
+        self.assertEqual(all_data["s1"]["end_time"], "10:00")
+        self.assertEqual(len(all_data["s1"]["active"]), 1)
+
+    def test_append_period(self):
+        """Test that append_period adds to the named list"""
+        from src.session_journal import apply_journal_record, make_period_append
+
+        all_data = {"s1": {"breaks": []}}
+        apply_journal_record(
+            all_data, make_period_append("s1", "active", 0, {"duration": 10})
+        )
+        apply_journal_record(
+            all_data, make_period_append("s1", "breaks", 0, {"duration": 3})
+        )
+        self.assertEqual(all_data["s1"]["active"], [{"duration": 10}])
+        self.assertEqual(all_data["s1"]["breaks"], [{"duration": 3}])
+
+    def test_append_period_is_idempotent(self):
+        """Test that replaying an append already in the snapshot doesn't duplicate"""
+        from src.session_journal import apply_journal_record, make_period_append
+
+        record = make_period_append("s1", "active", 0, {"duration": 10})
+        all_data = {}
+        apply_journal_record(all_data, record)
+        apply_journal_record(all_data, record)
+        self.assertEqual(len(all_data["s1"]["active"]), 1)
+
+    def test_update_period_closes_idle(self):
+        """Test that update_period merges fields into an existing period"""
+        from src.session_journal import apply_journal_record, make_period_update
+
+        all_data = {"s1": {"idle_periods": [{"start_timestamp": 100}]}}
+        apply_journal_record(
+            all_data,
+            make_period_update(
+                "s1", "idle_periods", 0, {"end_timestamp": 130, "duration": 30}
+            ),
+        )
+        idle = all_data["s1"]["idle_periods"][0]
+        self.assertEqual(idle["end_timestamp"], 130)
+        self.assertEqual(idle["duration"], 30)
+
+    def test_update_period_out_of_range_ignored(self):
+        """Test that updating a missing period does nothing"""
+        from src.session_journal import apply_journal_record, make_period_update
+
+        all_data = {"s1": {"idle_periods": []}}
+        apply_journal_record(
+            all_data, make_period_update("s1", "idle_periods", 0, {"duration": 1})
+        )
+        self.assertEqual(all_data["s1"]["idle_periods"], [])
+
+    def test_unknown_op_ignored(self):
+        """Test that unknown operations are skipped"""
+        from src.session_journal import apply_journal_record
+
+        all_data = {"s1": {"sphere": "Work"}}
+        apply_journal_record(all_data, {"op": "future_op", "session": "s1"})
+        self.assertEqual(all_data, {"s1": {"sphere": "Work"}})
+
+
+class TestSessionJournalFile(unittest.TestCase):
+    """Test journal persistence on disk"""
+
+    def setUp(self):
+        self.file_manager = TestFileManager()
+        self.data_file = self.file_manager.create_test_file(
+            "test_journal_data.json", {"old": {"sphere": "General"}}
+        )
+        self.journal_file = self.data_file + ".journal"
+        self.file_manager.test_files.append(self.journal_file)
+
+    def tearDown(self):
+        self.file_manager.cleanup()
+
+    def test_journal_path(self):
+        """Test journal is stored next to the data file"""
+        from src.session_journal import SessionJournal
+
+        journal = SessionJournal(self.data_file)
+        self.assertEqual(journal.journal_file, self.journal_file)
+
+    def test_append_writes_one_line_per_record(self):
+        """Test each transition appends exactly one line"""
+        from src.session_journal import (
+            SessionJournal,
+            make_session_update,
+            make_period_append,
+        )
+
+        journal = SessionJournal(self.data_file)
+        journal.append(make_session_update("s1", {"sphere": "Work"}))
+        journal.append(make_period_append("s1", "active", 0, {"duration": 5}))
+
+        with open(self.journal_file, "r") as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[0])["op"], "update_session")
+        self.assertEqual(journal.record_count(), 2)
+
+    def test_append_does_not_touch_data_file(self):
+        """Test transitions don't rewrite data.json"""
+        from src.session_journal import SessionJournal, make_session_update
+
+        before = os.path.getmtime(self.data_file)
+        with open(self.data_file, "r") as f:
+            content_before = f.read()
+
+        journal = SessionJournal(self.data_file)
+        journal.append(make_session_update("s1", {"sphere": "Work"}))
+
+        with open(self.data_file, "r") as f:
+            self.assertEqual(f.read(), content_before)
+        self.assertEqual(os.path.getmtime(self.data_file), before)
+
+    def test_replay_merges_with_snapshot(self):
+        """Test replay applies journal records on top of data.json"""
+        from src.session_journal import (
+            SessionJournal,
+            make_session_update,
+            make_period_append,
+        )
+
+        journal = SessionJournal(self.data_file)
+        journal.append(make_session_update("s1", {"sphere": "Work", "breaks": []}))
+        journal.append(make_period_append("s1", "breaks", 0, {"duration": 60}))
+
+        with open(self.data_file, "r") as f:
+            snapshot = json.load(f)
+        all_data = journal.replay(snapshot)
+
+        self.assertIn("old", all_data)
+        self.assertEqual(all_data["s1"]["sphere"], "Work")
+        self.assertEqual(all_data["s1"]["breaks"], [{"duration": 60}])
+
+    def test_torn_last_line_skipped(self):
+        """Test a partially written final record is ignored"""
+        from src.session_journal import SessionJournal, make_session_update
+
+        journal = SessionJournal(self.data_file)
+        journal.append(make_session_update("s1", {"sphere": "Work"}))
+        with open(self.journal_file, "a") as f:
+            f.write('{"op": "update_session", "sess')
+
+        records = SessionJournal(self.data_file).read_records()
+        self.assertEqual(len(records), 1)
+
+    def test_clear_removes_journal(self):
+        """Test clear removes the journal file after compaction"""
+        from src.session_journal import SessionJournal, make_session_update
+
+        journal = SessionJournal(self.data_file)
+        journal.append(make_session_update("s1", {"sphere": "Work"}))
+        journal.clear()
+
+        self.assertFalse(os.path.exists(self.journal_file))
+        self.assertEqual(journal.record_count(), 0)
+        self.assertEqual(journal.replay({}), {})
+
+    def test_missing_journal_replays_nothing(self):
+        """Test replay without a journal returns the snapshot unchanged"""
+        from src.session_journal import SessionJournal
+
+        journal = SessionJournal(self.data_file)
+        self.assertEqual(journal.read_records(), [])
+        self.assertEqual(journal.replay({"a": {}}), {"a": {}})
+
+
+class TestJournalCompaction(unittest.TestCase):
+    """Test when record_transition compacts the journal"""
+
+    def setUp(self):
+        from unittest.mock import Mock
+        from src.session_journal import SessionJournal
+
+        self.file_manager = TestFileManager()
+        self.data_file = self.file_manager.create_test_file(
+            "test_compaction_data.json", {}
+        )
+        self.file_manager.test_files.append(self.data_file + ".journal")
+        self.journal = SessionJournal(self.data_file)
+
+        # The worker never gets to write - compaction must not depend on it
+        self.tracker = Mock()
+        self.tracker.uses_sqlite_storage.return_value = False
+        self.tracker.journal_records_submitted = None
+        self.tracker._get_journal.return_value = self.journal
+
+    def tearDown(self):
+        self.file_manager.cleanup()
+
+    def _record(self, count):
+        from unittest.mock import patch
+        from src.session_journal import make_period_append
+        from time_tracker import TimeTracker
+
+        with patch("time_tracker.JOURNAL_COMPACTION_THRESHOLD", 3):
+            for index in range(count):
+                TimeTracker.record_transition(
+                    self.tracker,
+                    make_period_append("s1", "active", index, {"duration": 1}),
+                )
+
+    def test_counts_submitted_records(self):
+        """Test records still queued on the worker count towards compaction"""
+        self._record(2)
+        self.tracker.compact_journal.assert_not_called()
+        self._record(1)
+        self.tracker.compact_journal.assert_called_once()
+        self.assertEqual(self.tracker.persistence_worker.submit.call_count, 3)
+
+    def test_counts_records_left_by_earlier_runs(self):
+        """Test a journal that was not compacted on exit is counted once"""
+        from src.session_journal import make_session_update
+
+        self.journal.append(make_session_update("s0", {"sphere": "Work"}))
+        self.journal.append(make_session_update("s0", {"sphere": "Home"}))
+        self._record(1)
+        self.tracker.compact_journal.assert_called_once()
+        self.assertEqual(self.tracker.journal_records_submitted, 3)
+
+
+class TestJournalCompactionOnWorker(unittest.TestCase):
+    """Test compact_journal writes data.json on the persistence worker"""
+
+    def setUp(self):
+        import threading
+        from unittest.mock import Mock
+        from src.persistence_worker import PersistenceWorker
+        from src.session_journal import SessionJournal, make_session_update
+        from src.session_store import SessionStore
+        from time_tracker import TimeTracker
+
+        self.file_manager = TestFileManager()
+        self.data_file = self.file_manager.create_test_file(
+            "test_compact_worker_data.json", {"old": {"sphere": "General"}}
+        )
+        self.file_manager.test_files.append(self.data_file + ".journal")
+        self.journal = SessionJournal(self.data_file)
+        self.journal.append(make_session_update("s1", {"sphere": "Work"}))
+        self.source = (self.data_file, self.journal.journal_file)
+        self.store = SessionStore()
+        self.worker = PersistenceWorker()
+        self.gate = threading.Event()
+        self.loads = 0
+
+        self.tracker = Mock()
+        self.tracker.uses_sqlite_storage.return_value = False
+        self.tracker.data_file = self.data_file
+        self.tracker.session_store = self.store
+        self.tracker.persistence_worker = self.worker
+        self.tracker._storage_source.return_value = self.source
+        self.tracker._get_journal.return_value = self.journal
+        self.tracker.load_data = lambda read_only=False: self.store.get(
+            self.source, self._loader
+        )
+        self.tracker._write_compacted = lambda *args: TimeTracker._write_compacted(
+            self.tracker, *args
+        )
+        self.tracker._on_transition_written = (
+            lambda error, source, path: self.store.write_finished(source)
+        )
+
+    def tearDown(self):
+        self.gate.set()
+        self.worker.stop(timeout=5)
+        self.file_manager.cleanup()
+
+    def _loader(self):
+        self.loads += 1
+        with open(self.data_file, "r") as f:
+            return self.journal.replay(json.load(f))
+
+    def test_compaction_runs_on_worker(self):
+        """Test the full rewrite happens on the worker, not the calling thread"""
+        from time_tracker import TimeTracker
+
+        self.worker.submit("block", 0, lambda payloads: self.gate.wait(5))
+        TimeTracker.compact_journal(self.tracker)
+
+        # Nothing written yet - the caller only queued the compaction
+        with open(self.data_file, "r") as f:
+            self.assertEqual(json.load(f), {"old": {"sphere": "General"}})
+        self.assertTrue(os.path.exists(self.journal.journal_file))
+        self.assertEqual(self.tracker.journal_records_submitted, 0)
+
+        self.gate.set()
+        self.assertTrue(self.worker.flush(timeout=5))
+        with open(self.data_file, "r") as f:
+            self.assertEqual(
+                json.load(f),
+                {"old": {"sphere": "General"}, "s1": {"sphere": "Work"}},
+            )
+        self.assertFalse(os.path.exists(self.journal.journal_file))
+        # The compacted files are adopted, not re-read
+        self.tracker.load_data(read_only=True)
+        self.assertEqual(self.loads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,233 @@
+"""
+Tests for the Session Store
+
+Verifies that session data is parsed once, handed out as a shared view,
+re-read only when the data file changes on disk, and that every mutation
+bumps the data version.
+"""
+
+import unittest
+import sys
+import os
+import json
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_helpers import TestFileManager
+
+
+class TestSessionStoreImports(unittest.TestCase):
+    """Test that the session store module imports correctly"""
+
+    def test_import_module(self):
+        """Test that session_store can be imported"""
+        from src.session_store import SessionStore, copy_session_data, file_signature
+
+        self.assertTrue(callable(SessionStore))
+        self.assertTrue(callable(copy_session_data))
+        self.assertTrue(callable(file_signature))
+
+
+class TestSessionStore(unittest.TestCase):
+    """Test caching, invalidation and versioning"""
+
+    def setUp(self):
+        from src.session_store import SessionStore
+
+        self.file_manager = TestFileManager()
+        self.data_file = self.file_manager.create_test_file(
+            "test_store_data.json", {"s1": {"sphere": "Work", "active": []}}
+        )
+        self.source = (self.data_file,)
+        self.store = SessionStore()
+        self.load_count = 0
+
+    def tearDown(self):
+        self.file_manager.cleanup()
+
+    def _loader(self):
+        self.load_count += 1
+        with open(self.data_file, "r") as f:
+            return json.load(f)
+
+    def _rewrite(self, data):
+        with open(self.data_file, "w") as f:
+            json.dump(data, f)
+
+    def test_parses_once(self):
+        """Test repeated reads share one parse"""
+        first = self.store.get(self.source, self._loader)
+        second = self.store.get(self.source, self._loader)
+        self.assertIs(first, second)
+        self.assertEqual(self.load_count, 1)
+
+    def test_reloads_when_file_changes(self):
+        """Test a changed file (size differs) is re-read"""
+        self.store.get(self.source, self._loader)
+        version = self.store.version
+        self._rewrite({"s1": {"sphere": "Work"}, "s2": {"sphere": "Personal"}})
+
+        data = self.store.get(self.source, self._loader)
+        self.assertIn("s2", data)
+        self.assertEqual(self.load_count, 2)
+        self.assertGreater(self.store.version, version)
+
+    def test_reloads_when_source_changes(self):
+        """Test switching to another data file reloads"""
+        other_file = self.file_manager.create_test_file(
+            "test_store_other.json", {"other": {}}
+        )
+        self.store.get(self.source, self._loader)
+
+        def other_loader():
+            with open(other_file, "r") as f:
+                return json.load(f)
+
+        self.assertEqual(self.store.get((other_file,), other_loader), {"other": {}})
+
+    def test_missing_file_is_cached(self):
+        """Test a missing file is cached until it appears"""
+        os.remove(self.data_file)
+        self.store.get(self.source, lambda: {})
+        self.assertEqual(self.store.get(self.source, self._loader), {})
+        self._rewrite({"s3": {}})
+        self.assertIn("s3", self.store.get(self.source, self._loader))
+
+    def test_apply_updates_view_and_version(self):
+        """Test apply() keeps the cached view current without reloading"""
+        from src.session_journal import make_period_append
+
+        self.store.get(self.source, self._loader)
+        version = self.store.version
+        self.store.apply(
+            make_period_append("s1", "active", 0, {"duration": 5}), self.source
+        )
+
+        data = self.store.get(self.source, self._loader)
+        self.assertEqual(data["s1"]["active"], [{"duration": 5}])
+        self.assertEqual(self.load_count, 1)
+        self.assertEqual(self.store.version, version + 1)
+
+    def test_apply_leaves_earlier_views_untouched(self):
+        """Test apply() replaces the view so readers of the old one see no change"""
+        from src.session_journal import make_period_append
+
+        before = self.store.get(self.source, self._loader)
+        self.store.apply(
+            make_period_append("s1", "active", 0, {"duration": 5}), self.source
+        )
+
+        after = self.store.get(self.source, self._loader)
+        self.assertIsNot(after, before)
+        self.assertEqual(before["s1"]["active"], [])
+        self.assertEqual(after["s1"]["active"], [{"duration": 5}])
+
+    def test_apply_updates_date_index(self):
+        """Test apply() updates the date index instead of rebuilding it"""
+        from src.session_journal import make_session_update
+
+        self._rewrite({"s1": {"date": "2026-01-10"}})
+        before = self.store.date_index(self.source, self._loader)
+        self.store.apply(make_session_update("s2", {"date": "2026-01-12"}), self.source)
+
+        after = self.store.date_index(self.source, self._loader)
+        self.assertIsNot(after, before)
+        self.assertEqual(before.dates, ["2026-01-10"])
+        self.assertEqual(after.dates, ["2026-01-10", "2026-01-12"])
+        self.assertEqual(after.sessions_on("2026-01-12"), ["s2"])
+        self.assertIs(self.store.date_index(self.source, self._loader), after)
+        self.assertEqual(self.load_count, 1)
+
+    def test_invalidate_forces_reload(self):
+        """Test invalidate() bumps the version and reloads on next read"""
+        self.store.get(self.source, self._loader)
+        version = self.store.version
+        self.store.invalidate()
+        self.store.get(self.source, self._loader)
+        self.assertEqual(self.load_count, 2)
+        self.assertGreater(self.store.version, version)
+
+    def test_check_detects_disk_change(self):
+        """Test check() bumps the version when the file changed"""
+        self.store.get(self.source, self._loader)
+        version = self.store.check(self.source)
+        self.assertEqual(self.store.check(self.source), version)
+
+        self._rewrite({"changed": {"sphere": "Work", "extra": "x"}})
+        self.assertGreater(self.store.check(self.source), version)
+
+    def test_version_is_monotonic(self):
+        """Test versions never go backwards"""
+        versions = [self.store.version]
+        self.store.get(self.source, self._loader)
+        self.store.invalidate()
+        versions.append(self.store.version)
+        self.store.get(self.source, self._loader)
+        self.store.invalidate()
+        versions.append(self.store.version)
+        self.assertEqual(versions, sorted(versions))
+        self.assertEqual(len(set(versions)), len(versions))
+
+
+class TestCopySessionData(unittest.TestCase):
+    """Test private copies of the shared view"""
+
+    def test_copy_is_independent(self):
+        """Test modifying a copy doesn't touch the original"""
+        from src.session_store import copy_session_data
+
+        original = {"s1": {"active": [{"projects": [{"name": "A"}]}]}}
+        copy = copy_session_data(original)
+        copy["s1"]["active"][0]["projects"][0]["name"] = "B"
+        self.assertEqual(original["s1"]["active"][0]["projects"][0]["name"], "A")
+        self.assertEqual(copy_session_data(original), original)
+
+    def test_copy_non_dict(self):
+        """Test non-dict JSON content is copied as-is"""
+        from src.session_store import copy_session_data
+
+        self.assertEqual(copy_session_data([1, 2, 3]), [1, 2, 3])
+
+
+class TestSessionStorePendingWrites(unittest.TestCase):
+    """Test the session store trusts its cache while writes are in flight"""
+
+    def setUp(self):
+        from src.session_store import SessionStore
+
+        self.file_manager = TestFileManager()
+        self.data_file = self.file_manager.create_test_file(
+            "test_pending_data.json", {"s1": {"active": []}}
+        )
+        self.source = (self.data_file,)
+        self.store = SessionStore()
+        self.loads = 0
+
+    def tearDown(self):
+        self.file_manager.cleanup()
+
+    def _loader(self):
+        self.loads += 1
+        return {"s1": {"active": []}}
+
+    def test_pending_write_not_reloaded(self):
+        """Test a disk change during a pending write doesn't drop applied records"""
+        from src.session_journal import make_period_append
+
+        self.store.get(self.source, self._loader)
+        self.store.apply(make_period_append("s1", "active", 0, {"d": 1}), self.source)
+        with open(self.data_file, "a") as f:
+            f.write(" ")
+        data = self.store.get(self.source, self._loader)
+        self.assertEqual(data["s1"]["active"], [{"d": 1}])
+        self.assertEqual(self.loads, 1)
+
+        # Once written, our own file change is adopted rather than reloaded
+        self.store.write_finished(self.source)
+        self.store.get(self.source, self._loader)
+        self.assertEqual(self.loads, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -62,6 +62,15 @@ class MockTracker:
                 return name
         return None
 
+    def save_settings(self):
+        """Write settings to file (the real tracker coalesces these writes)"""
+        with open(self.settings_file, "w") as f:
+            json.dump(self.settings, f, indent=2)
+
+    def flush_writes(self, timeout=None):
+        """Mock flush - save_settings() already wrote the file"""
+        return True
+
     def load_data(self):
         """Mock load data - returns empty dict by default"""
         return {}
@@ -1185,7 +1194,11 @@ class TestSettingsFrameDataAccuracy(unittest.TestCase):
 
 
 class TestSphereRenameSessionUpdate(unittest.TestCase):
-    """Test that renaming a sphere updates saved sessions in data.json"""
+    """Test that renaming a sphere shows the new name for saved sessions
+
+    Sessions reference the sphere by ID (see src.name_table), so the rename
+    only changes settings.
+    """
 
     def setUp(self):
         """Set up test fixtures"""
@@ -1236,54 +1249,73 @@ class TestSphereRenameSessionUpdate(unittest.TestCase):
 
         mock_confirm.assert_called_once()
 
-    def test_rename_sphere_updates_sessions_with_old_name(self):
-        """Test that renaming a sphere updates sphere field in all matching sessions"""
-        sessions = {
-            "session_2026_01_01": {"sphere": "OldSphere", "date": "2026-01-01"},
-            "session_2026_01_02": {"sphere": "OldSphere", "date": "2026-01-02"},
+    def _stamped_sessions(self):
+        """Sessions referencing both spheres by ID"""
+        from src.name_table import assign_name_ids
+
+        assign_name_ids(self.tracker.settings)
+        spheres = self.tracker.settings["spheres"]
+        return {
+            "session_a": {
+                "sphere": "OldSphere",
+                "sphere_id": spheres["OldSphere"]["id"],
+                "date": "2026-01-01",
+            },
+            "session_b": {
+                "sphere": "OtherSphere",
+                "sphere_id": spheres["OtherSphere"]["id"],
+                "date": "2026-01-02",
+            },
         }
-        saved_data = {}
 
-        def capture_save(data, merge=True):
-            saved_data.update(data)
+    def test_rename_sphere_shows_new_name_without_rewriting_sessions(self):
+        """Test that renamed sphere sessions resolve to the new name, unsaved"""
+        from src.name_table import NameTable
+        from src.period_model import normalize_session
+
+        sessions = self._stamped_sessions()
+        sphere_id = self.tracker.settings["spheres"]["OldSphere"]["id"]
+        mock_save = Mock()
 
         with patch("tkinter.simpledialog.askstring") as mock_ask, patch(
             "tkinter.messagebox.askyesno"
         ) as mock_confirm, patch.object(
             self.tracker, "load_data", return_value=sessions
         ), patch.object(
-            self.tracker, "save_data", side_effect=capture_save
+            self.tracker, "save_data", mock_save
         ):
             mock_ask.return_value = "NewSphere"
             mock_confirm.return_value = True
             self.frame.edit_sphere_name("OldSphere")
 
-        self.assertEqual(saved_data["session_2026_01_01"]["sphere"], "NewSphere")
-        self.assertEqual(saved_data["session_2026_01_02"]["sphere"], "NewSphere")
+        mock_save.assert_not_called()
+        self.assertEqual(self.tracker.settings["spheres"]["NewSphere"]["id"], sphere_id)
+        self.assertEqual(
+            self.tracker.settings["projects"]["ProjectA"]["sphere"], "NewSphere"
+        )
+        names = NameTable(self.tracker.settings)
+        self.assertEqual(
+            normalize_session(sessions["session_a"], names).sphere, "NewSphere"
+        )
 
     def test_rename_sphere_does_not_affect_other_sphere_sessions(self):
         """Test that renaming a sphere leaves sessions from other spheres unchanged"""
-        sessions = {
-            "session_a": {"sphere": "OldSphere", "date": "2026-01-01"},
-            "session_b": {"sphere": "OtherSphere", "date": "2026-01-02"},
-        }
-        saved_data = {}
+        from src.name_table import NameTable
+        from src.period_model import normalize_session
 
-        def capture_save(data, merge=True):
-            saved_data.update(data)
+        sessions = self._stamped_sessions()
 
         with patch("tkinter.simpledialog.askstring") as mock_ask, patch(
             "tkinter.messagebox.askyesno"
-        ) as mock_confirm, patch.object(
-            self.tracker, "load_data", return_value=sessions
-        ), patch.object(
-            self.tracker, "save_data", side_effect=capture_save
-        ):
+        ) as mock_confirm:
             mock_ask.return_value = "NewSphere"
             mock_confirm.return_value = True
             self.frame.edit_sphere_name("OldSphere")
 
-        self.assertEqual(saved_data["session_b"]["sphere"], "OtherSphere")
+        names = NameTable(self.tracker.settings)
+        self.assertEqual(
+            normalize_session(sessions["session_b"], names).sphere, "OtherSphere"
+        )
 
     def test_rename_sphere_cancel_confirmation_aborts_all_changes(self):
         """Test that cancelling the confirmation popup leaves sphere and sessions unchanged"""
@@ -2996,10 +3028,17 @@ class TestGoogleSheetsSettingsUI(unittest.TestCase):
 
 
 class TestProjectRenameSessionUpdate(unittest.TestCase):
-    """Test that renaming a project updates saved sessions in data.json"""
+    """Test that renaming a project shows the new name for saved sessions
+
+    Sessions reference projects by ID in both the legacy "project" and the
+    "projects" list format (see src.name_table), so the rename only changes
+    settings.
+    """
 
     def setUp(self):
         """Set up test fixtures"""
+        from src.name_table import assign_name_ids
+
         self.file_manager = TestFileManager()
 
         settings = {
@@ -3014,6 +3053,13 @@ class TestProjectRenameSessionUpdate(unittest.TestCase):
                     "note": "",
                     "goal": "",
                 },
+                "Other Project": {
+                    "sphere": "Sphere1",
+                    "is_default": False,
+                    "active": True,
+                    "note": "",
+                    "goal": "",
+                },
             },
             "break_actions": {
                 "Resting": {"is_default": True, "active": True, "notes": ""}
@@ -3021,6 +3067,9 @@ class TestProjectRenameSessionUpdate(unittest.TestCase):
             "idle_settings": {"idle_threshold": 60, "idle_break_threshold": 300},
             "screenshot_settings": {"enabled": False},
         }
+        assign_name_ids(settings)
+        self.project_a_id = settings["projects"]["Project A"]["id"]
+        self.other_id = settings["projects"]["Other Project"]["id"]
         self.test_settings_file = self.file_manager.create_test_file(
             "test_project_rename_sessions.json", settings
         )
@@ -3035,185 +3084,163 @@ class TestProjectRenameSessionUpdate(unittest.TestCase):
         safe_teardown_tk_root(self.root)
         self.file_manager.cleanup()
 
-    def test_rename_project_updates_active_period_project_names(self):
-        """Test that renaming a project updates project name in all active periods"""
-        sessions = {
-            "session_01": {
-                "sphere": "Sphere1",
-                "active": [
-                    {"projects": [{"name": "Project A", "project_primary": True}]}
-                ],
-            },
-            "session_02": {
-                "sphere": "Sphere1",
-                "active": [
-                    {"projects": [{"name": "Project A", "project_primary": True}]}
-                ],
-            },
-        }
-        saved_data = {}
-
-        def capture_save(data, merge=True):
-            saved_data.update(data)
-
-        with patch.object(
-            self.tracker, "load_data", return_value=sessions
-        ), patch.object(self.tracker, "save_data", side_effect=capture_save):
-            self.frame._rename_project_in_sessions("Project A", "Project B")
-
-        self.assertEqual(
-            saved_data["session_01"]["active"][0]["projects"][0]["name"], "Project B"
-        )
-        self.assertEqual(
-            saved_data["session_02"]["active"][0]["projects"][0]["name"], "Project B"
-        )
-
-    def test_rename_project_does_not_affect_other_projects_in_same_period(self):
-        """Test that renaming does not change other project names in the same active period"""
-        sessions = {
-            "session_01": {
-                "active": [
-                    {
-                        "projects": [
-                            {"name": "Project A", "project_primary": True},
-                            {"name": "Other Project", "project_primary": False},
-                        ]
-                    }
-                ]
-            }
-        }
-        saved_data = {}
-
-        def capture_save(data, merge=True):
-            saved_data.update(data)
+    def _resolve(self, session_data):
+        from src.name_table import NameTable
+        from src.period_model import normalize_session
 
-        with patch.object(
-            self.tracker, "load_data", return_value=sessions
-        ), patch.object(self.tracker, "save_data", side_effect=capture_save):
-            self.frame._rename_project_in_sessions("Project A", "Project B")
+        return normalize_session(session_data, NameTable(self.tracker.settings))
 
-        projects = saved_data["session_01"]["active"][0]["projects"]
-        self.assertEqual(projects[0]["name"], "Project B")
-        self.assertEqual(projects[1]["name"], "Other Project")
+    def test_rename_project_keeps_id_in_settings(self):
+        """Test that the renamed project keeps its ID and settings"""
+        self.frame._rename_project("Project A", "Project B")
 
-    def test_rename_project_updates_all_active_periods_in_session(self):
-        """Test that all active periods within a session are updated"""
-        sessions = {
-            "session_01": {
-                "active": [
-                    {"projects": [{"name": "Project A", "project_primary": True}]},
-                    {"projects": [{"name": "Project A", "project_primary": True}]},
-                ]
-            }
-        }
-        saved_data = {}
-
-        def capture_save(data, merge=True):
-            saved_data.update(data)
+        projects = self.tracker.settings["projects"]
+        self.assertNotIn("Project A", projects)
+        self.assertEqual(projects["Project B"]["id"], self.project_a_id)
+        self.assertTrue(projects["Project B"]["is_default"])
 
-        with patch.object(
-            self.tracker, "load_data", return_value=sessions
-        ), patch.object(self.tracker, "save_data", side_effect=capture_save):
-            self.frame._rename_project_in_sessions("Project A", "Project B")
-
-        for active_period in saved_data["session_01"]["active"]:
-            self.assertEqual(active_period["projects"][0]["name"], "Project B")
-
-    def test_rename_project_no_matching_sessions_does_not_call_save_data(self):
-        """Test that save_data is not called when no sessions reference the old project"""
+    def test_rename_project_does_not_rewrite_sessions(self):
+        """Test that renaming a project doesn't load or save session data"""
+        mock_load = Mock(return_value={})
         mock_save = Mock()
 
-        with patch.object(self.tracker, "load_data", return_value={}), patch.object(
+        with patch.object(self.tracker, "load_data", mock_load), patch.object(
             self.tracker, "save_data", mock_save
         ):
-            self.frame._rename_project_in_sessions("Project A", "Project B")
+            self.frame._rename_project("Project A", "Project B")
 
+        mock_load.assert_not_called()
         mock_save.assert_not_called()
 
-    def test_rename_project_sessions_with_different_project_unchanged(self):
-        """Test that sessions referencing a different project are not saved"""
-        sessions = {
-            "session_other": {
-                "active": [
-                    {
-                        "projects": [
-                            {"name": "Different Project", "project_primary": True}
-                        ]
-                    }
-                ]
-            }
+    def test_rename_project_shows_new_name_in_project_lists(self):
+        """Test that "projects" list entries resolve to the new name"""
+        session = {
+            "sphere": "Sphere1",
+            "active": [
+                {
+                    "projects": [
+                        {
+                            "name": "Project A",
+                            "id": self.project_a_id,
+                            "project_primary": True,
+                        },
+                        {
+                            "name": "Other Project",
+                            "id": self.other_id,
+                            "project_primary": False,
+                        },
+                    ]
+                }
+            ],
         }
-        mock_save = Mock()
-
-        with patch.object(
-            self.tracker, "load_data", return_value=sessions
-        ), patch.object(self.tracker, "save_data", mock_save):
-            self.frame._rename_project_in_sessions("Project A", "Project B")
-
-        mock_save.assert_not_called()
-
-    def test_rename_project_empty_active_list_does_not_crash(self):
-        """Test that sessions with empty active list are handled gracefully"""
-        sessions = {"session_empty": {"active": []}}
-        mock_save = Mock()
-
-        with patch.object(
-            self.tracker, "load_data", return_value=sessions
-        ), patch.object(self.tracker, "save_data", mock_save):
-            # Should not raise
-            self.frame._rename_project_in_sessions("Project A", "Project B")
-
-        mock_save.assert_not_called()
-
-    def test_rename_project_legacy_string_field_updated(self):
-        """Test that legacy 'project' string field (not 'projects' array) is also updated.
-
-        Real sessions saved without multi-project support use:
-            active_period["project"] = "Project A"   (string)
-        rather than:
-            active_period["projects"] = [{"name": "Project A", ...}]  (array)
-        Both formats must be handled.
-        """
-        sessions = {
-            "session_legacy_01": {
-                "active": [{"project": "Project A", "duration": 5.0}]
-            },
-            "session_legacy_02": {
-                "active": [{"project": "Project A", "duration": 3.0}]
-            },
+        self.frame._rename_project("Project A", "Project B")
+
+        period = self._resolve(session).active[0]
+        self.assertEqual(period.primary, "Project B")
+        self.assertEqual(period.secondary, "Other Project")
+        # The stored session keeps the name it was saved with
+        self.assertEqual(session["active"][0]["projects"][0]["name"], "Project A")
+
+    def test_rename_project_legacy_string_field_resolved(self):
+        """Test that the legacy "project" string field resolves to the new name"""
+        session = {
+            "active": [
+                {"project": "Project A", "project_id": self.project_a_id},
+                {"project": "Other Project", "project_id": self.other_id},
+            ]
         }
-        saved_data = {}
+        self.frame._rename_project("Project A", "Project B")
 
-        def capture_save(data, merge=True):
-            saved_data.update(data)
+        active = self._resolve(session).active
+        self.assertEqual(active[0].single_name, "Project B")
+        self.assertEqual(active[1].single_name, "Other Project")
 
-        with patch.object(
-            self.tracker, "load_data", return_value=sessions
-        ), patch.object(self.tracker, "save_data", side_effect=capture_save):
-            self.frame._rename_project_in_sessions("Project A", "Project B")
-
-        self.assertEqual(
-            saved_data["session_legacy_01"]["active"][0]["project"], "Project B"
-        )
-        self.assertEqual(
-            saved_data["session_legacy_02"]["active"][0]["project"], "Project B"
-        )
+    def test_rename_project_to_existing_name_rejected(self):
+        """Test that a rename onto an existing project name is refused"""
+        with self.assertRaises(ValueError):
+            self.frame._rename_project("Project A", "Other Project")
+        self.assertIn("Project A", self.tracker.settings["projects"])
 
-    def test_rename_project_legacy_other_project_unchanged(self):
-        """Test that legacy 'project' string for a different project is not changed"""
-        sessions = {
-            "session_other": {
-                "active": [{"project": "Unrelated Project", "duration": 2.0}]
-            }
-        }
-        mock_save = Mock()
 
-        with patch.object(
-            self.tracker, "load_data", return_value=sessions
-        ), patch.object(self.tracker, "save_data", mock_save):
-            self.frame._rename_project_in_sessions("Project A", "Project B")
+class TestSettingsFrameSqliteMigration(unittest.TestCase):
+    """Test the "Migrate data.json to SQLite" button"""
 
-        mock_save.assert_not_called()
+    def setUp(self):
+        """Set up a settings frame stand-in with a tracker"""
+        self.frame = Mock()
+        self.frame.tracker.data_file = "data.json"
+        self.frame.tracker.settings = {"storage_settings": {"backend": "json"}}
+
+    @patch("src.settings_frame.messagebox")
+    @patch("src.settings_frame.migrate_json_to_sqlite", return_value=3)
+    def test_migration_confirmed_flushes_and_invalidates(self, mock_migrate, mock_box):
+        """Test queued writes land first and the session store is re-read after"""
+        tracker = self.frame.tracker
+        calls = []
+        tracker.flush_writes.side_effect = lambda *args: calls.append("flush")
+        tracker.fold_journal.side_effect = lambda: calls.append("fold")
+        mock_migrate.side_effect = lambda *args: calls.append("migrate") or 3
+        mock_box.askyesno.return_value = True
+
+        SettingsFrame.migrate_data_to_sqlite(self.frame)
+
+        self.assertEqual(calls, ["flush", "fold", "migrate"])
+        tracker.session_store.invalidate.assert_called_once_with()
+        mock_box.showinfo.assert_called_once()
+
+    @patch("src.settings_frame.messagebox")
+    @patch("src.settings_frame.migrate_json_to_sqlite")
+    def test_migration_needs_confirmation(self, mock_migrate, mock_box):
+        """Test nothing is migrated when the user says no"""
+        mock_box.askyesno.return_value = False
+        SettingsFrame.migrate_data_to_sqlite(self.frame)
+        mock_migrate.assert_not_called()
+
+    @patch("src.settings_frame.messagebox")
+    @patch("src.settings_frame.migrate_json_to_sqlite")
+    def test_migration_refused_on_sqlite_backend(self, mock_migrate, mock_box):
+        """Test the stale data.json can't overwrite the active database"""
+        self.frame.tracker.settings["storage_settings"]["backend"] = "sqlite"
+        SettingsFrame.migrate_data_to_sqlite(self.frame)
+        mock_migrate.assert_not_called()
+        mock_box.askyesno.assert_not_called()
+        mock_box.showerror.assert_called_once()
+
+    @patch("src.settings_frame.messagebox")
+    def test_migration_folds_journal_into_data_file(self, mock_box):
+        """Test the journal is folded into data.json and removed, then migrated"""
+        from src.persistence_worker import PersistenceWorker
+        from src.session_journal import SessionJournal, make_session_update
+        from src.sqlite_store import SqliteSessionStore, sqlite_path_for
+        from time_tracker import TimeTracker
+
+        file_manager = TestFileManager()
+        self.addCleanup(file_manager.cleanup)
+        data_file = file_manager.create_test_file(
+            "test_migrate_journal_data.json", {"old": {"sphere": "General"}}
+        )
+        db_file = sqlite_path_for(data_file)
+        journal = SessionJournal(data_file)
+        file_manager.test_files.extend([journal.journal_file, db_file])
+        journal.append(make_session_update("s1", {"sphere": "Work"}))
+
+        worker = PersistenceWorker()
+        self.addCleanup(worker.stop, 5)
+        tracker = self.frame.tracker
+        tracker.data_file = data_file
+        tracker.persistence_worker = worker
+        tracker._get_journal.return_value = journal
+        tracker.fold_journal = lambda: TimeTracker.fold_journal(tracker)
+        mock_box.askyesno.return_value = True
+
+        SettingsFrame.migrate_data_to_sqlite(self.frame)
+
+        mock_box.showerror.assert_not_called()
+        expected = {"old": {"sphere": "General"}, "s1": {"sphere": "Work"}}
+        with open(data_file, "r") as f:
+            self.assertEqual(json.load(f), expected)
+        self.assertFalse(os.path.exists(journal.journal_file))
+        self.assertEqual(set(SqliteSessionStore(db_file).load_all()), {"old", "s1"})
 
 
 if __name__ == "__main__":
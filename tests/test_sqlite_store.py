@@ -0,0 +1,428 @@
+"""
+Tests for the SQLite Storage Backend
+
+Verifies that sessions round-trip losslessly between data.json format and the
+SQLite tables, and that date-range loads use the date index.
+"""
+
+import unittest
+import sys
+import os
+import json
+import sqlite3
+from unittest.mock import Mock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from tests.test_helpers import TestFileManager, TestDataGenerator
+
+
+def _sample_data():
+    """Sessions covering legacy and multi-project formats"""
+    return {
+        "2026-01-10_1000": {
+            "sphere": "Work",
+            "date": "2026-01-10",
+            "start_time": "09:00:00",
+            "start_timestamp": 1000.0,
+            "end_timestamp": 4600.0,
+            "total_duration": 3600.0,
+            "active": [
+                {
+                    "start": "09:00:00",
+                    "start_timestamp": 1000.0,
+                    "end": "09:30:00",
+                    "end_timestamp": 2800.0,
+                    "duration": 1800.0,
+                    "project": "Alpha",
+                    "comment": "legacy",
+                },
+                {
+                    "start": "09:30:00",
+                    "start_timestamp": 2800.0,
+                    "duration": 1800.0,
+                    "projects": [
+                        {
+                            "name": "Alpha",
+                            "percentage": 60,
+                            "duration": 1080.0,
+                            "comment": "",
+                            "project_primary": True,
+                        },
+                        {
+                            "name": "Beta",
+                            "percentage": 40,
+                            "duration": 720.0,
+                            "comment": "review",
+                            "project_primary": False,
+                        },
+                    ],
+                },
+            ],
+            "breaks": [{"start_timestamp": 5000.0, "duration": 60, "action": "Rest"}],
+            "idle_periods": [],
+            "session_comments": {"session_notes": "notes"},
+        },
+        "2026-01-12_9000": {
+            "sphere": "Personal",
+            "date": "2026-01-12",
+            "start_timestamp": 9000.0,
+            "active": [{"duration": 100, "project": "Gamma"}],
+            "breaks": [],
+            "idle_periods": [{"start_timestamp": 9100.0}],
+        },
+    }
+
+
+class TestSqliteStoreImports(unittest.TestCase):
+    """Test that the SQLite store module imports correctly"""
+
+    def test_import_module(self):
+        """Test that sqlite_store can be imported"""
+        from src.sqlite_store import (
+            SqliteSessionStore,
+            migrate_json_to_sqlite,
+            export_sqlite_to_json,
+        )
+
+        self.assertTrue(callable(SqliteSessionStore))
+        self.assertTrue(callable(migrate_json_to_sqlite))
+        self.assertTrue(callable(export_sqlite_to_json))
+
+
+class TestSqliteSessionStore(unittest.TestCase):
+    """Test storing and querying sessions"""
+
+    def setUp(self):
+        from src.sqlite_store import SqliteSessionStore
+
+        self.file_manager = TestFileManager()
+        self.db_file = os.path.join(self.file_manager.test_data_dir, "test_store.db")
+        self.file_manager.test_files.append(self.db_file)
+        self.store = SqliteSessionStore(self.db_file)
+
+    def tearDown(self):
+        self.file_manager.cleanup()
+
+    def test_round_trip_is_lossless(self):
+        """Test save_all then load_all returns identical data"""
+        data = _sample_data()
+        self.store.save_all(data)
+        self.assertEqual(self.store.load_all(), data)
+
+    def test_round_trip_preserves_session_order(self):
+        """Test sessions come back in the order they were saved"""
+        data = _sample_data()
+        self.store.save_all(data)
+        self.assertEqual(list(self.store.load_all()), list(data))
+
+    def test_round_trip_generated_sessions(self):
+        """Test round trip of helper-generated sessions"""
+        data = TestDataGenerator.create_test_data_with_n_periods(20)
+        self.store.save_all(data)
+        self.assertEqual(self.store.load_all(), data)
+
+    def test_indexes_created(self):
+        """Test the date and period indexes exist, name indexes are dropped"""
+        conn = sqlite3.connect(self.db_file)
+        try:
+            # A database created before the name indexes were dropped
+            conn.execute("CREATE TABLE sessions (session_id TEXT, sphere TEXT)")
+            conn.execute("CREATE INDEX idx_sessions_sphere ON sessions(sphere)")
+            conn.commit()
+        finally:
+            conn.close()
+        os.remove(self.db_file)
+        self.store.save_all(_sample_data())
+        conn = sqlite3.connect(self.db_file)
+        try:
+            indexes = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index'"
+                )
+            }
+        finally:
+            conn.close()
+        for expected in ("idx_sessions_date", "idx_periods_type"):
+            self.assertIn(expected, indexes)
+        for dropped in ("idx_sessions_sphere", "idx_allocations_project"):
+            self.assertNotIn(dropped, indexes)
+
+    def test_load_sessions_by_date_range(self):
+        """Test date-range filter is inclusive"""
+        self.store.save_all(_sample_data())
+        result = self.store.load_sessions(
+            start_date="2026-01-11", end_date="2026-01-12"
+        )
+        self.assertEqual(list(result), ["2026-01-12_9000"])
+
+    def test_date_range_uses_date_index(self):
+        """Test a date-range load is an index lookup, not a table scan"""
+        self.store.save_all(_sample_data())
+        conn = sqlite3.connect(self.db_file)
+        try:
+            plan = " ".join(
+                row[-1]
+                for row in conn.execute(
+                    "EXPLAIN QUERY PLAN SELECT session_id FROM sessions "
+                    "WHERE date >= ? AND date <= ?",
+                    ("2026-01-11", "2026-01-12"),
+                )
+            )
+        finally:
+            conn.close()
+        self.assertIn("idx_sessions_date", plan)
+
+    def test_session_dates(self):
+        """Test the dates with sessions are listed once each, oldest first"""
+        data = _sample_data()
+        data["2026-01-10_2000"] = {"date": "2026-01-10", "active": []}
+        self.store.save_all(data)
+        self.assertEqual(self.store.session_dates(), ["2026-01-10", "2026-01-12"])
+
+    def test_upsert_leaves_other_sessions(self):
+        """Test upsert_sessions only touches the given sessions"""
+        data = _sample_data()
+        self.store.save_all(data)
+        self.store.upsert_sessions({"2026-01-12_9000": {"sphere": "Changed"}})
+
+        loaded = self.store.load_all()
+        self.assertEqual(loaded["2026-01-12_9000"], {"sphere": "Changed"})
+        self.assertEqual(loaded["2026-01-10_1000"], data["2026-01-10_1000"])
+
+    def test_save_all_removes_missing_sessions(self):
+        """Test save_all has replace semantics"""
+        data = _sample_data()
+        self.store.save_all(data)
+        del data["2026-01-10_1000"]
+        self.store.save_all(data)
+        self.assertEqual(list(self.store.load_all()), ["2026-01-12_9000"])
+
+    def test_delete_session_removes_periods(self):
+        """Test deleting a session cascades to periods and allocations"""
+        self.store.save_all(_sample_data())
+        self.store.delete_session("2026-01-10_1000")
+
+        conn = sqlite3.connect(self.db_file)
+        try:
+            periods = conn.execute(
+                "SELECT COUNT(*) FROM periods WHERE session_id = '2026-01-10_1000'"
+            ).fetchone()[0]
+            allocations = conn.execute(
+                "SELECT COUNT(*) FROM allocations WHERE session_id = '2026-01-10_1000'"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        self.assertEqual(periods, 0)
+        self.assertEqual(allocations, 0)
+        self.assertEqual(self.store.session_count(), 1)
+
+    def test_apply_journal_record(self):
+        """Test journal records update one session in place"""
+        from src.session_journal import make_period_append, make_session_update
+
+        self.store.save_all(_sample_data())
+        self.store.apply_record(
+            make_period_append("2026-01-12_9000", "breaks", 0, {"duration": 30})
+        )
+        self.store.apply_record(make_session_update("new_session", {"sphere": "Work"}))
+
+        loaded = self.store.load_all()
+        self.assertEqual(loaded["2026-01-12_9000"]["breaks"], [{"duration": 30}])
+        self.assertEqual(loaded["new_session"], {"sphere": "Work"})
+
+    def test_apply_record_reads_only_its_session(self):
+        """Test a transition doesn't scan the checksums of every session"""
+        from src.session_journal import make_session_update
+
+        self.store.save_all(_sample_data())
+        statements = []
+        connect = self.store._connect
+
+        def traced_connect():
+            conn = connect()
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        with patch.object(self.store, "_connect", traced_connect):
+            self.store.apply_record(
+                make_session_update("2026-01-12_9000", {"sphere": "Changed"})
+            )
+
+        checksum_reads = [sql for sql in statements if "checksum FROM sessions" in sql]
+        self.assertEqual(len(checksum_reads), 1)
+        self.assertIn("WHERE session_id IN ('2026-01-12_9000')", checksum_reads[0])
+        self.assertEqual(self.store.load_all()["2026-01-12_9000"]["sphere"], "Changed")
+
+    def test_upsert_many_sessions(self):
+        """Test upserts beyond one checksum query batch skip unchanged sessions"""
+        data = {f"2026-01-01_{n:04d}": {"sphere": "Work"} for n in range(1200)}
+        self.store.upsert_sessions(data)
+        data["2026-01-01_1100"] = {"sphere": "Changed"}
+        self.store.upsert_sessions(data)
+        loaded = self.store.load_all()
+        self.assertEqual(len(loaded), 1200)
+        self.assertEqual(loaded["2026-01-01_1100"], {"sphere": "Changed"})
+
+
+class TestMigrationAndExport(unittest.TestCase):
+    """Test moving data between data.json and SQLite"""
+
+    def setUp(self):
+        self.file_manager = TestFileManager()
+        self.data_file = self.file_manager.create_test_file(
+            "test_migrate_data.json", _sample_data()
+        )
+        self.db_file = os.path.join(
+            self.file_manager.test_data_dir, "test_migrate_data.db"
+        )
+        self.export_file = os.path.join(
+            self.file_manager.test_data_dir, "test_migrate_export.json"
+        )
+        self.file_manager.test_files.extend(
+            [self.db_file, self.export_file, self.data_file + ".journal"]
+        )
+
+    def tearDown(self):
+        self.file_manager.cleanup()
+
+    def test_sqlite_path_for(self):
+        """Test database lives next to the data file"""
+        from src.sqlite_store import sqlite_path_for
+
+        self.assertEqual(sqlite_path_for(self.data_file), self.db_file)
+
+    def test_migrate_then_export_round_trip(self):
+        """Test data.json -> SQLite -> data.json gives the original data"""
+        from src.sqlite_store import migrate_json_to_sqlite, export_sqlite_to_json
+
+        self.assertEqual(migrate_json_to_sqlite(self.data_file, self.db_file), 2)
+        self.assertEqual(export_sqlite_to_json(self.db_file, self.export_file), 2)
+
+        with open(self.export_file, "r") as f:
+            self.assertEqual(json.load(f), _sample_data())
+
+    def test_migrate_includes_pending_journal(self):
+        """Test migration replays the session journal first"""
+        from src.session_journal import SessionJournal, make_session_update
+        from src.sqlite_store import migrate_json_to_sqlite, SqliteSessionStore
+
+        SessionJournal(self.data_file).append(
+            make_session_update("2026-01-13_1", {"sphere": "Work"})
+        )
+        self.assertEqual(migrate_json_to_sqlite(self.data_file, self.db_file), 3)
+        self.assertIn("2026-01-13_1", SqliteSessionStore(self.db_file).load_all())
+
+    def test_migrate_missing_data_file(self):
+        """Test migrating with no data.json creates an empty database"""
+        from src.sqlite_store import migrate_json_to_sqlite
+
+        missing = os.path.join(self.file_manager.test_data_dir, "does_not_exist.json")
+        self.assertEqual(migrate_json_to_sqlite(missing, self.db_file), 0)
+        self.assertTrue(os.path.exists(self.db_file))
+
+
+class TestTrackerRangeReads(unittest.TestCase):
+    """Test date-range reads go to the database with the SQLite backend"""
+
+    def setUp(self):
+        from src.session_store import SessionStore
+        from src.sqlite_store import SqliteSessionStore
+
+        self.file_manager = TestFileManager()
+        self.db_file = os.path.join(self.file_manager.test_data_dir, "test_range.db")
+        self.file_manager.test_files.append(self.db_file)
+        self.store = SqliteSessionStore(self.db_file)
+        self.store.save_all(_sample_data())
+
+        self.tracker = Mock()
+        self.tracker.uses_sqlite_storage.return_value = True
+        self.tracker.session_store = SessionStore()
+        self.tracker._storage_source.return_value = (self.db_file,)
+        self.tracker._get_sqlite_store.return_value = self.store
+        self.tracker.load_data.return_value = {"cached": {"date": "2026-01-12"}}
+        self.tracker._reads_from_sqlite = lambda: self._tracker_method(
+            "_reads_from_sqlite"
+        )
+        self.tracker.load_sessions_between = lambda *args: self._tracker_method(
+            "load_sessions_between", *args
+        )
+
+    def tearDown(self):
+        self.file_manager.cleanup()
+
+    def _tracker_method(self, name, *args):
+        from time_tracker import TimeTracker
+
+        return getattr(TimeTracker, name)(self.tracker, *args)
+
+    def test_reads_only_the_range(self):
+        """Test only sessions dated within the range are loaded from SQLite"""
+        with patch.object(
+            self.store, "load_all", side_effect=AssertionError("full load")
+        ):
+            self.assertEqual(
+                list(
+                    self._tracker_method(
+                        "load_sessions_between", "2026-01-11", "2026-01-31"
+                    )
+                ),
+                ["2026-01-12_9000"],
+            )
+            self.assertEqual(
+                self._tracker_method("session_dates"), ["2026-01-10", "2026-01-12"]
+            )
+            self.assertEqual(
+                self._tracker_method("sessions_on", "2026-01-10"), ["2026-01-10_1000"]
+            )
+        self.tracker.load_data.assert_not_called()
+
+    def test_pending_writes_read_the_cached_view(self):
+        """Test the cached view is used while the database lags behind it"""
+        from src.session_journal import make_session_update
+
+        source = (self.db_file,)
+        self.tracker.session_store.get(source, self.store.load_all)
+        self.tracker.session_store.apply(
+            make_session_update("2026-01-12_9999", {"date": "2026-01-12"}), source
+        )
+        self.assertEqual(
+            list(
+                self._tracker_method(
+                    "load_sessions_between", "2026-01-12", "2026-01-12"
+                )
+            ),
+            ["cached"],
+        )
+
+    def test_analysis_queries_only_the_card_ranges(self):
+        """Test analysis reads the span of its date ranges from SQLite"""
+        from datetime import datetime
+        from src.analysis_frame import AnalysisFrame
+        from src.name_table import NameTable
+        from src.period_model import PeriodModel
+
+        frame = Mock()
+        frame.tracker = self.tracker
+        frame.uses_sqlite_storage = lambda: AnalysisFrame.uses_sqlite_storage(frame)
+        shared = PeriodModel(NameTable({}))
+        frame.get_period_model.return_value = shared
+
+        data, model, date_index = AnalysisFrame.query_inputs(
+            frame,
+            [
+                (datetime(2026, 1, 11), datetime(2026, 1, 12)),
+                (datetime(2026, 1, 12), datetime(2026, 1, 13)),
+            ],
+        )
+
+        self.assertEqual(list(data), ["2026-01-12_9000"])
+        self.assertIsNot(model, shared)
+        self.assertIs(model.names, shared.names)
+        self.assertIsNone(date_index)
+
+
+if __name__ == "__main__":
+    unittest.main()
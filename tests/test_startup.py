@@ -0,0 +1,60 @@
+"""
+Tests for startup cost
+
+Verifies that importing time_tracker doesn't pull in the views, screenshot
+capture, tray or input-monitoring libraries; they are imported when first used
+so the main window appears sooner (see tests/benchmark_startup.py).
+"""
+
+import unittest
+import sys
+import os
+import subprocess
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED_MODULES = (
+    "PIL",
+    "pystray",
+    "pynput",
+    "src.analysis_frame",
+    "src.completion_frame",
+    "src.settings_frame",
+    "src.screenshot_capture",
+    "src.tray_icons",
+)
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test what importing time_tracker loads"""
+
+    def test_deferred_modules_not_imported(self):
+        """Test heavy modules are not loaded until they are needed"""
+        env = dict(os.environ)
+        env["PYTHONPATH"] = ROOT + os.pathsep + env.get("PYTHONPATH", "")
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys, time_tracker; print(' '.join(sys.modules))",
+            ],
+            cwd=ROOT,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            self.skipTest(f"time_tracker not importable: {result.stderr.strip()}")
+        loaded = result.stdout.split()
+        for name in DEFERRED_MODULES:
+            self.assertFalse(
+                any(m == name or m.startswith(name + ".") for m in loaded),
+                f"{name} imported at startup",
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
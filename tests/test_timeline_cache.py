@@ -0,0 +1,119 @@
+"""
+Tests for the Timeline Cache
+
+Verifies that cached result sets re-sort exactly like the old in-place
+list.sort() (including stable ordering of ties in both directions), that sort
+keys are computed once per column, and that the cache evicts the least
+recently used result set.
+"""
+
+import unittest
+import sys
+import os
+import random
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+def _rows(count, seed=7):
+    """Timeline-like rows with many duplicate keys"""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": i,
+            "date": f"2026-01-{rng.randint(1, 3):02d}",
+            "period_start": f"{rng.randint(8, 9):02d}:00:00",
+            "type": rng.choice(["Active", "Break", "Idle"]),
+            "primary_project": rng.choice(["Alpha", "Beta", ""]),
+            "secondary_project": rng.choice(["Alpha", ""]),
+            "duration": rng.choice(["5m", "10m", "1h 0m"]),
+        }
+        for i in range(count)
+    ]
+
+
+class TestTimelineCacheImports(unittest.TestCase):
+    """Test that the timeline cache module imports correctly"""
+
+    def test_import_module(self):
+        """Test that timeline_cache can be imported"""
+        from src.timeline_cache import TimelineCache, TimelineResultSet
+
+        self.assertTrue(callable(TimelineCache))
+        self.assertTrue(callable(TimelineResultSet))
+
+
+class TestTimelineResultSet(unittest.TestCase):
+    """Test sorting cached timeline rows"""
+
+    def test_matches_list_sort(self):
+        """Test every column/direction matches a stable list.sort()"""
+        from src.timeline_cache import TimelineResultSet, TIMELINE_SORT_KEYS
+
+        rows = _rows(200)
+        result_set = TimelineResultSet(rows)
+        for column, key in TIMELINE_SORT_KEYS.items():
+            for reverse in (False, True):
+                expected = list(rows)
+                expected.sort(key=key, reverse=reverse)
+                actual = result_set.sorted(column, reverse)
+                self.assertEqual(
+                    [row["id"] for row in actual],
+                    [row["id"] for row in expected],
+                    (column, reverse),
+                )
+
+    def test_rows_not_mutated(self):
+        """Test sorting leaves the query order untouched"""
+        from src.timeline_cache import TimelineResultSet
+
+        rows = _rows(50)
+        ids = [row["id"] for row in rows]
+        TimelineResultSet(rows).sorted("duration", True)
+        self.assertEqual([row["id"] for row in rows], ids)
+
+    def test_keys_computed_once(self):
+        """Test toggling direction reuses the column's sort keys"""
+        from src.timeline_cache import TimelineResultSet
+
+        result_set = TimelineResultSet(_rows(30))
+        first = result_set.sorted("type")
+        keys = result_set._keys["type"]
+        result_set.sorted("type", True)
+        self.assertIs(result_set._keys["type"], keys)
+        self.assertIs(result_set.sorted("type"), first)
+
+    def test_unknown_column_sorts_by_date(self):
+        """Test columns without a sort key fall back to date order"""
+        from src.timeline_cache import TimelineResultSet
+
+        result_set = TimelineResultSet(_rows(30))
+        self.assertEqual(result_set.sorted("sphere"), result_set.sorted("date"))
+
+
+class TestTimelineCacheEviction(unittest.TestCase):
+    """Test the LRU behaviour of the cache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test a lookup keeps an entry alive past newer insertions"""
+        from src.timeline_cache import TimelineCache, TimelineResultSet
+
+        cache = TimelineCache(max_entries=2)
+        first, second, third = (TimelineResultSet([]) for _ in range(3))
+        cache.put("a", first)
+        cache.put("b", second)
+        self.assertIs(cache.get("a"), first)
+        cache.put("c", third)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertIs(cache.get("a"), first)
+        self.assertIs(cache.get("c"), third)
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
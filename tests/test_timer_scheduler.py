@@ -0,0 +1,192 @@
+"""
+Tests for the Timer Scheduler
+
+Verifies named one-shot timers replace each other, cancel cleanly, align
+display refreshes to whole seconds, and that event-driven scheduling needs far
+fewer wakeups than the old fixed 100 ms poll.
+"""
+
+import unittest
+import sys
+import os
+import heapq
+import itertools
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+class FakeRoot:
+    """Stand-in for tk.Tk's after/after_cancel with a virtual clock (ms)"""
+
+    def __init__(self):
+        self.now_ms = 0
+        self._queue = []
+        self._ids = itertools.count(1)
+        self._cancelled = set()
+
+    def after(self, delay_ms, callback):
+        after_id = f"after#{next(self._ids)}"
+        heapq.heappush(self._queue, (self.now_ms + delay_ms, after_id, callback))
+        return after_id
+
+    def after_cancel(self, after_id):
+        self._cancelled.add(after_id)
+
+    def run_until(self, end_ms):
+        """Fire due callbacks in order until end_ms; returns callbacks fired"""
+        fired = 0
+        while self._queue and self._queue[0][0] <= end_ms:
+            due_ms, after_id, callback = heapq.heappop(self._queue)
+            if after_id in self._cancelled:
+                continue
+            self.now_ms = due_ms
+            callback()
+            fired += 1
+        self.now_ms = end_ms
+        return fired
+
+
+class TestTimerSchedulerImports(unittest.TestCase):
+    """Test that the timer scheduler module imports correctly"""
+
+    def test_import_module(self):
+        """Test that timer_scheduler can be imported"""
+        from src.timer_scheduler import TimerScheduler, ms_until_next_second
+
+        self.assertTrue(callable(TimerScheduler))
+        self.assertTrue(callable(ms_until_next_second))
+
+
+class TestMsUntilNextSecond(unittest.TestCase):
+    """Test whole-second alignment"""
+
+    def test_alignment(self):
+        """Test delays land just after the next whole second"""
+        from src.timer_scheduler import ms_until_next_second
+        from src.constants import TIMER_BOUNDARY_SLACK_MS
+
+        self.assertEqual(ms_until_next_second(10.25), 750 + TIMER_BOUNDARY_SLACK_MS)
+        self.assertEqual(ms_until_next_second(3.0), 1000 + TIMER_BOUNDARY_SLACK_MS)
+        self.assertEqual(ms_until_next_second(0.9999), 1 + TIMER_BOUNDARY_SLACK_MS)
+
+    def test_counter_ticks_over(self):
+        """Test the counter has reached a new whole second when the timer fires"""
+        from src.timer_scheduler import ms_until_next_second
+
+        for elapsed in (0.0, 0.5, 12.001, 59.999, 3599.42):
+            fired_at = elapsed + ms_until_next_second(elapsed) / 1000
+            self.assertEqual(int(fired_at), int(elapsed) + 1)
+
+
+class TestTimerScheduler(unittest.TestCase):
+    """Test one-shot scheduling semantics"""
+
+    def setUp(self):
+        from src.timer_scheduler import TimerScheduler
+
+        self.root = FakeRoot()
+        self.timers = TimerScheduler(self.root)
+        self.calls = []
+
+    def test_fires_once(self):
+        """Test a timer fires once and is then no longer pending"""
+        self.timers.schedule("tick", 100, lambda: self.calls.append("tick"))
+        self.assertTrue(self.timers.is_scheduled("tick"))
+        self.root.run_until(10_000)
+        self.assertEqual(self.calls, ["tick"])
+        self.assertFalse(self.timers.is_scheduled("tick"))
+        self.assertEqual(self.timers.wakeups, 1)
+
+    def test_reschedule_replaces(self):
+        """Test scheduling a pending name replaces the earlier timer"""
+        self.timers.schedule("idle", 100, lambda: self.calls.append("first"))
+        self.timers.schedule("idle", 200, lambda: self.calls.append("second"))
+        self.root.run_until(1000)
+        self.assertEqual(self.calls, ["second"])
+
+    def test_cancel_all(self):
+        """Test cancel_all leaves nothing pending"""
+        self.timers.schedule("tick", 100, lambda: self.calls.append("tick"))
+        self.timers.schedule("idle", 100, lambda: self.calls.append("idle"))
+        self.assertEqual(self.timers.pending(), ["idle", "tick"])
+        self.timers.cancel_all()
+        self.assertEqual(self.timers.pending(), [])
+        self.root.run_until(1000)
+        self.assertEqual(self.calls, [])
+
+    def test_cancel_unknown_name(self):
+        """Test cancelling a name that isn't pending is a no-op"""
+        self.timers.cancel("missing")
+        self.assertEqual(self.timers.pending(), [])
+
+
+class TestWakeupReduction(unittest.TestCase):
+    """Compare wakeups of the old 100 ms poll with event-driven timers"""
+
+    HOUR_MS = 3600 * 1000
+
+    def _simulate_poll(self):
+        """Old behaviour: update_timers re-armed every 100 ms, session or not"""
+        root = FakeRoot()
+
+        def poll():
+            root.after(100, poll)
+
+        poll()
+        return root.run_until(self.HOUR_MS)
+
+    def _simulate_event_driven(self, session_active):
+        """New behaviour: whole-second ticks, idle deadline and checkpoints"""
+        from src.timer_scheduler import TimerScheduler, ms_until_next_second
+        from src.constants import (
+            SESSION_CHECKPOINT_INTERVAL_MS,
+            DEFAULT_IDLE_THRESHOLD_SECONDS,
+        )
+
+        root = FakeRoot()
+        timers = TimerScheduler(root)
+        start_ms = 250  # Session starts mid-second
+
+        def tick():
+            if session_active:
+                elapsed = (root.now_ms - start_ms) / 1000
+                timers.schedule("tick", ms_until_next_second(elapsed), tick)
+
+        def checkpoint():
+            timers.schedule("checkpoint", SESSION_CHECKPOINT_INTERVAL_MS, checkpoint)
+
+        def idle_deadline():
+            # User keeps working: input 10 s ago, re-arm from it
+            last_input_ms = root.now_ms - 10_000
+            timers.schedule(
+                "idle",
+                last_input_ms + DEFAULT_IDLE_THRESHOLD_SECONDS * 1000 - root.now_ms,
+                idle_deadline,
+            )
+
+        root.now_ms = start_ms
+        tick()
+        if session_active:
+            checkpoint()
+            idle_deadline()
+        root.run_until(self.HOUR_MS)
+        return timers.wakeups
+
+    def test_no_session_is_quiescent(self):
+        """Test no timers fire at all without a session"""
+        self.assertEqual(self._simulate_event_driven(session_active=False), 0)
+
+    def test_active_session_wakeups(self):
+        """Test an active session needs ~1 wakeup/s instead of 10/s"""
+        polled = self._simulate_poll()
+        event_driven = self._simulate_event_driven(session_active=True)
+
+        self.assertEqual(polled, 36_000)
+        # 3600 display ticks + 240 checkpoints + one idle re-arm per 50 s of work
+        self.assertLess(event_driven, 3600 + 240 + 80)
+        self.assertLess(event_driven * 9, polled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for the Tray Icon Cache
+
+Verifies state icons are rendered once, shared between lookups, and only
+re-rendered when the taskbar colour changes.
+"""
+
+import unittest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+
+class TestTrayIconsImports(unittest.TestCase):
+    """Test that the tray icons module imports correctly"""
+
+    def test_import_module(self):
+        """Test that tray_icons can be imported"""
+        from src.tray_icons import TrayIconCache, render_tray_icon
+
+        self.assertTrue(callable(TrayIconCache))
+        self.assertTrue(callable(render_tray_icon))
+
+
+class TestTrayIconCache(unittest.TestCase):
+    """Test rendering and theme refresh"""
+
+    def setUp(self):
+        self.color_reads = 0
+        self.color = (32, 32, 32, 255)
+
+    def _color_source(self):
+        self.color_reads += 1
+        return self.color
+
+    def test_renders_all_states(self):
+        """Test every state has an icon with the state colour in the centre"""
+        from src.tray_icons import TrayIconCache, TRAY_STATE_COLORS
+        from src.constants import TRAY_ICON_SIZE
+        from PIL import ImageColor
+
+        cache = TrayIconCache(self._color_source)
+        centre = (TRAY_ICON_SIZE // 2, TRAY_ICON_SIZE // 2)
+        for state, color in TRAY_STATE_COLORS.items():
+            image = cache.get(state)
+            self.assertEqual(image.size, (TRAY_ICON_SIZE, TRAY_ICON_SIZE))
+            self.assertEqual(image.getpixel(centre)[:3], ImageColor.getrgb(color))
+            self.assertEqual(image.getpixel((0, 0)), self.color)
+
+    def test_lookups_share_images(self):
+        """Test repeated lookups return the same image without re-reading theme"""
+        from src.tray_icons import TrayIconCache
+
+        cache = TrayIconCache(self._color_source)
+        first = cache.get("active")
+        for _ in range(100):
+            self.assertIs(cache.get("active"), first)
+        self.assertEqual(self.color_reads, 1)
+
+    def test_unknown_state_uses_idle(self):
+        """Test unrecognised states fall back to the idle icon"""
+        from src.tray_icons import TrayIconCache
+
+        cache = TrayIconCache(self._color_source)
+        self.assertIs(cache.get("unknown"), cache.get("idle"))
+
+    def test_refresh_theme_only_rerenders_on_change(self):
+        """Test icons are re-rendered only when the taskbar colour changes"""
+        from src.tray_icons import TrayIconCache
+
+        cache = TrayIconCache(self._color_source)
+        original = cache.get("break")
+        self.assertFalse(cache.refresh_theme())
+        self.assertIs(cache.get("break"), original)
+
+        self.color = (242, 242, 242, 255)
+        self.assertTrue(cache.refresh_theme())
+        self.assertIsNot(cache.get("break"), original)
+        self.assertEqual(cache.get("break").getpixel((0, 0)), self.color)
+
+    def test_missing_colour_uses_transparent_background(self):
+        """Test a falsy taskbar colour falls back to TRAY_ICON_BG_COLOR"""
+        from src.tray_icons import TrayIconCache
+        from src.constants import TRAY_ICON_BG_COLOR
+
+        cache = TrayIconCache(lambda: None)
+        self.assertEqual(cache.background, TRAY_ICON_BG_COLOR)
+
+
+if __name__ == "__main__":
+    unittest.main()
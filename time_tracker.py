@@ -6,38 +6,63 @@ import json
 from datetime import datetime
 import sys
 import threading
-from PIL import Image, ImageDraw
-import pystray
-from pynput import mouse, keyboard
-
-from src.ui_helpers import ScrollableFrame, get_frame_background, get_taskbar_color
-from src.completion_frame import CompletionFrame
-from src.settings_frame import SettingsFrame
-from src.analysis_frame import AnalysisFrame
-from src.screenshot_capture import ScreenshotCapture
+import queue
+
+# The views (completion, settings, analysis), screenshot capture, the tray
+# icon (pystray, PIL) and the input hooks (pynput) are imported where they are
+# first used, so launching at login only pays for the main window.
+from src.ui_helpers import ScrollableFrame, get_frame_background
+from src.session_journal import (
+    SessionJournal,
+    make_session_update,
+    make_period_append,
+    make_period_update,
+)
+from src.session_checkpoint import SessionCheckpoint
+from src.session_store import SessionStore, copy_session_data
+from src.persistence_worker import PersistenceWorker
+from src.atomic_writer import AtomicJsonWriter, write_json_atomic
+from src.backup_store import BackupStore
+from src.timer_scheduler import TimerScheduler, ms_until_next_second
+from src.sqlite_store import SqliteSessionStore, sqlite_path_for
+from src.date_index import session_day
+from src.daily_rollup import DailyRollup, rollup_path_for
+from src.screenshot_manifest import (
+    SCREENSHOT_MANIFESTS_MIGRATED_KEY,
+    migrate_screenshot_manifests,
+    remove_screenshots,
+)
+from src.period_model import PeriodModel
+from src.name_table import (
+    NAME_IDS_MIGRATED_KEY,
+    NameTable,
+    migrate_name_ids,
+    stamp_session_ids,
+)
 from src.constants import (
-    UPDATE_TIMER_INTERVAL_MS,
-    ONE_MINUTE_MS,
+    SESSION_CHECKPOINT_INTERVAL_MS,
     DEFAULT_IDLE_THRESHOLD_SECONDS,
     DEFAULT_IDLE_BREAK_THRESHOLD_SECONDS,
     SECONDS_PER_HOUR,
     SECONDS_PER_MINUTE,
     DEFAULT_SETTINGS_FILE,
     DEFAULT_DATA_FILE,
+    DEFAULT_BACKUP_FOLDER,
     DEFAULT_SCREENSHOT_FOLDER,
+    SCREENSHOT_DEFAULT_FORMAT,
+    SCREENSHOT_DEFAULT_QUALITY,
+    SCREENSHOT_DEFAULT_THUMBNAIL_SIZE,
+    SCREENSHOT_DEDUPE_SIMILARITY,
+    JOURNAL_COMPACTION_THRESHOLD,
+    PERSISTENCE_FLUSH_TIMEOUT_SECONDS,
+    STORAGE_BACKEND_JSON,
+    STORAGE_BACKEND_SQLITE,
     COLOR_LINK_BLUE,
     COLOR_GRAY_TEXT,
     COLOR_ACTIVE_GREEN,
     get_resource_path,
     COLOR_BREAK_ORANGE,
-    COLOR_TRAY_IDLE,
-    COLOR_TRAY_ACTIVE,
-    COLOR_TRAY_BREAK,
-    COLOR_TRAY_SESSION_IDLE,
-    TRAY_ICON_SIZE,
-    TRAY_ICON_MARGIN,
-    TRAY_ICON_OUTLINE_WIDTH,
-    TRAY_ICON_BG_COLOR,
+    TRAY_TOOLTIP_MIN_INTERVAL_SECONDS,
     FONT_LINK,
     FONT_SMALL,
     FONT_NORMAL,
@@ -81,20 +106,48 @@ class TimeTracker:
         self.idle_start_time = None
         self.last_user_input = time.time()
 
-        self.backup_loop_count = 0  # auto back up save end time if crash
-        self.update_timer_interval = UPDATE_TIMER_INTERVAL_MS
-        self.one_minute_ms = ONE_MINUTE_MS
-        self.backup_frequency = (
-            self.one_minute_ms // self.update_timer_interval
-        )  # save every minute
+        # One-shot timers for display refresh, idle deadline and backup -
+        # nothing is armed while no session is active
+        self.timers = TimerScheduler(root)
 
         # File paths
         self.settings_file = DEFAULT_SETTINGS_FILE
         self.data_file = DEFAULT_DATA_FILE
+        self.backup_folder = DEFAULT_BACKUP_FOLDER
+
+        # Background writer - transitions never block on disk I/O
+        self.persistence_worker = PersistenceWorker()
+        # Atomic data.json/settings.json writes; settings bursts are coalesced
+        self.json_writer = AtomicJsonWriter(
+            self.persistence_worker, on_error=self._on_json_write_failed
+        )
 
         # Load settings
         self.settings = self.get_settings()
 
+        # Process-wide session data cache (see load_data)
+        self.session_store = SessionStore()
+
+        # Append-only journal for session transitions (see record_transition)
+        self.journal = None
+        # Records submitted to the journal since it was last compacted - counted
+        # here because the persistence worker may still be appending them
+        self.journal_records_submitted = None
+        # Running session's end time/durations (see _checkpoint_session_progress)
+        self.checkpoint = None
+
+        self.sqlite_store = None  # Used when storage_settings backend is "sqlite"
+
+        # Per-day analysis totals (see get_daily_rollup)
+        self.daily_rollup = None
+        self.rollup_version = None  # Data version the rollup is current for
+        self.rollup_dirty = set()  # Sessions changed since, applied on next read
+        self.rollup_names = None  # NameTable the rollup's names were resolved with
+
+        # Normalized sessions shared by analysis, exports and uploads
+        self.period_model = PeriodModel()
+        self.period_model_version = None  # Data version last pruned for
+
         # Input monitoring
         self.input_listener_running = False
         self.mouse_listener = None
@@ -102,9 +155,15 @@ class TimeTracker:
         self.input_monitoring_error_shown = (
             False  # Track if error notification already displayed
         )
+        # Timestamped activity events from the input hook threads, handled on
+        # the Tk thread by process_input_events()
+        self.input_events = queue.SimpleQueue()
+        self.input_events_scheduled = False
 
-        # Screenshot capture
-        self.screenshot_capture = ScreenshotCapture(self.settings, self.data_file)
+        # Screenshot capture, created when the first session starts
+        self.screenshot_capture = None
+        # Screenshot index and retention limits, created on first use
+        self.screenshot_retention = None
 
         # Frame references
         self.completion_frame = None
@@ -114,6 +173,9 @@ class TimeTracker:
         self.tray_icon = None
         self.tray_thread = None
         self.window_visible = True
+        self.tray_icons = None  # Pre-rendered state icons (TrayIconCache)
+        self.tray_icon_state = None  # State of the icon currently shown
+        self.tray_title_updated_at = 0.0  # monotonic time of last tooltip change
 
         # Global hotkeys
         self.hotkey_listener = None
@@ -121,17 +183,35 @@ class TimeTracker:
         # Create GUI
         self.create_widgets()
 
-        # Setup system tray
-        self.setup_tray_icon()
+        # System tray and global hotkeys start once the window is painted
+        self.root.after_idle(self._start_background_services)
 
-        # Setup global hotkeys
-        self.setup_global_hotkeys()
+        # Resume display refreshes when the window is restored
+        self.root.bind("<Map>", self._on_window_mapped, add="+")
+        # Re-render tray icons for a new light/dark taskbar
+        self.root.bind("<<ThemeChanged>>", self._on_theme_changed, add="+")
 
-        # Start update loop
+        # Initial display (no session yet, so no timers are armed)
         self.update_timers()
 
+    def _start_background_services(self):
+        """Start the system tray icon and global hotkeys.
+
+        Runs from the first idle callback after __init__, so the window is
+        shown without waiting for pystray and pynput to load and start their
+        threads. Pending redraws are flushed first - Tk schedules them as
+        idle callbacks too. Screenshot retention starts here too if a limit is
+        set.
+        """
+        self.root.update_idletasks()
+        self.setup_tray_icon()
+        self.setup_global_hotkeys()
+        self._start_screenshot_retention()
+
     def get_settings(self):
         """Load or create settings file"""
+        # A coalesced save may still be queued - re-read what was saved last
+        self.json_writer.flush()
         default_settings = {
             "idle_settings": {
                 "idle_tracking_enabled": True,  # enable/disable idle tracking
@@ -143,6 +223,15 @@ class TimeTracker:
                 "capture_on_focus_change": True,  # capture on window focus change
                 "min_seconds_between_captures": 10,  # minimum seconds between captures
                 "screenshot_path": DEFAULT_SCREENSHOT_FOLDER,  # base path for screenshots
+                "image_format": SCREENSHOT_DEFAULT_FORMAT,  # "png", "jpeg" or "webp"
+                "image_quality": SCREENSHOT_DEFAULT_QUALITY,  # JPEG/WebP quality
+                "max_dimension": 0,  # longest side in px, 0 = full resolution
+                "thumbnail_size": SCREENSHOT_DEFAULT_THUMBNAIL_SIZE,  # 0 = none
+                "dedupe_mode": "reference",  # near-duplicates: reference/skip/off
+                "dedupe_similarity": SCREENSHOT_DEDUPE_SIMILARITY,  # % hash match
+                "max_total_size_mb": 0,  # screenshot folder quota, 0 = no limit
+                "max_age_days": 0,  # delete older screenshots, 0 = keep all
+                "keep_per_period": 0,  # screenshots kept per period, 0 = all
             },
             "spheres": {
                 "General": {"is_default": True, "active": True},
@@ -153,11 +242,13 @@ class TimeTracker:
                 "Personal": {"sphere": "General", "is_default": False, "active": True},
             },
             "break_actions": {"Resting": {"is_default": True, "active": True}},
+            "storage_settings": {
+                "backend": STORAGE_BACKEND_JSON,  # "json" or "sqlite"
+            },
         }
 
         if not os.path.exists(self.settings_file):
-            with open(self.settings_file, "w") as f:
-                json.dump(default_settings, f, indent=2)
+            write_json_atomic(self.settings_file, default_settings)
             return default_settings
 
         try:
@@ -166,6 +257,74 @@ class TimeTracker:
         except Exception:
             return default_settings
 
+    def save_settings(self):
+        """Queue self.settings to be written to the settings file.
+
+        Returns immediately; saves within JSON_WRITE_COALESCE_SECONDS of each
+        other are written once, atomically, on the persistence worker. Write
+        errors are reported by _on_json_write_failed(). Use flush_writes() to
+        wait for the file.
+
+        Raises:
+            TypeError: If the settings are not JSON serializable
+        """
+        self.json_writer.write(self.settings_file, self.settings)
+
+    def flush_writes(self, timeout=None):
+        """Write all queued settings and session data now and wait for them.
+
+        Args:
+            timeout: Seconds to wait, or None to wait indefinitely
+
+        Returns:
+            bool: True if everything was written, False on timeout
+        """
+        return self.json_writer.flush(timeout)
+
+    def _on_json_write_failed(self, path, error):
+        """Writer callback for a failed queued write (runs on the worker thread)"""
+
+        def show_error():
+            messagebox.showerror("Error", f"Failed to save settings: {error}")
+
+        try:
+            self.root.after(0, show_error)
+        except Exception:
+            pass
+
+    def migrate_name_ids(self):
+        """Give spheres, projects and break actions stable IDs, once.
+
+        Existing sessions get the IDs of the names they were saved with (see
+        src.name_table), so later renames only have to change settings. The
+        settings file records that the migration ran.
+        """
+        if self.settings.get(NAME_IDS_MIGRATED_KEY):
+            return
+        all_data = self.load_data()
+        if isinstance(all_data, dict) and migrate_name_ids(self.settings, all_data):
+            self.save_data(all_data, merge=False)
+        self.settings[NAME_IDS_MIGRATED_KEY] = True
+        self.save_settings()
+
+    def migrate_screenshot_manifests(self):
+        """Move screenshot lists saved inside periods to session manifests, once.
+
+        See src.screenshot_manifest. The settings file records that the
+        migration ran.
+        """
+        if self.settings.get(SCREENSHOT_MANIFESTS_MIGRATED_KEY):
+            return
+        all_data = self.load_data()
+        if isinstance(all_data, dict):
+            changed = migrate_screenshot_manifests(
+                all_data, os.path.dirname(self.data_file)
+            )
+            if changed:
+                self.save_data({name: all_data[name] for name in changed})
+        self.settings[SCREENSHOT_MANIFESTS_MIGRATED_KEY] = True
+        self.save_settings()
+
     def _get_default_sphere(self):
         """Get the default sphere from settings"""
         for sphere, data in self.settings["spheres"].items():
@@ -245,39 +404,110 @@ class TimeTracker:
 
         return break_actions, default_action
 
-    def load_data(self):
+    def load_data(self, read_only=False):
         """Load existing session data from the data file.
 
-        Reads the data.json file containing all saved session information.
+        Session data comes from the process-wide session store, which parses
+        data.json (plus any session journal records) once and only re-reads it
+        when the file changes on disk.
         Returns an empty dictionary if the file doesn't exist or cannot be read.
 
+        Args:
+            read_only: If True, return the store's shared read view instead of a
+                private copy. Much faster for display code, but the result must
+                not be modified.
+
         Returns:
             dict: Dictionary mapping session names to session data, or empty dict if:
-                - data.json file doesn't exist
+                - data.json file doesn't exist and there is no journal
                 - File cannot be read due to permissions/corruption
                 - JSON parsing fails
 
         Note:
             This method silently handles errors by returning {} rather than raising
             exceptions, allowing the app to continue with empty/new data.
+            With the SQLite backend selected, sessions are read from the database.
         """
+        data = self.session_store.get(self._storage_source(), self._read_data_file)
+        if read_only:
+            return data
+        return copy_session_data(data)
+
+    def get_date_index(self):
+        """Get the date index of the current session data (see src.date_index).
+
+        Kept current by the session store as transitions are applied, so date
+        range lookups never scan the whole history.
+
+        Returns:
+            DateIndex
+        """
+        return self.session_store.date_index(
+            self._storage_source(), self._read_data_file
+        )
+
+    @property
+    def data_version(self):
+        """Monotonic version of the session data, bumped on every change.
+
+        Also detects changes made to the data file by other writers.
+        """
+        return self.session_store.check(self._storage_source())
+
+    def _storage_source(self):
+        """Files whose contents make up the session data for the current backend"""
+        if self.uses_sqlite_storage():
+            return (sqlite_path_for(self.data_file),)
+        return (self.data_file, self._get_journal().journal_file)
+
+    def _read_data_file(self):
+        """Parse session data from disk (snapshot + journal, or SQLite).
+
+        Used by the session store when its cached copy is missing or stale.
+        """
+        if self.uses_sqlite_storage():
+            try:
+                return self._get_sqlite_store().load_all()
+            except Exception:
+                return {}
+
+        journal = self._get_journal()
+
         if not os.path.exists(self.data_file):
-            return {}
+            return journal.replay({})
 
         try:
             with open(self.data_file, "r") as f:
-                return json.load(f)
+                all_data = json.load(f)
         except Exception:
             return {}
 
+        if isinstance(all_data, dict):
+            journal.replay(all_data)
+        return all_data
+
     def save_data(self, session_data, merge=True):
         """Save session data to file
 
+        Writes a full snapshot of data.json. Because the snapshot is built from
+        load_data() (journal included), the journal is compacted afterwards.
+        With the SQLite backend only the changed sessions are rewritten.
+        Pending background writes are flushed first, and the session store is
+        invalidated afterwards, bumping the data version.
+
         Args:
             session_data: Data to save
             merge: If True, merge with existing data. If False, replace entirely.
         """
+        # Queued transitions must land before the snapshot replaces the journal
+        self.persistence_worker.flush()
+        version_before = self.session_store.version
+        changed_sessions = self._changed_sessions(session_data, merge)
         try:
+            if self.uses_sqlite_storage():
+                self._save_data_sqlite(session_data, merge)
+                return
+
             if merge:
                 all_data = self.load_data()
                 all_data.update(session_data)
@@ -287,8 +517,10 @@ class TimeTracker:
                     return
                 all_data = session_data
 
-            with open(self.data_file, "w") as f:
-                json.dump(all_data, f, indent=2)
+            self.json_writer.write_now(self.data_file, all_data)
+
+            self._get_journal().clear()
+            self.journal_records_submitted = 0
         except Exception as error:
             messagebox.showerror(
                 "Save Error",
@@ -296,6 +528,581 @@ class TimeTracker:
                 f"Error: {error}\n\n"
                 "Your session data may not be saved. Please check file permissions.",
             )
+        finally:
+            self.session_store.invalidate()
+            self._track_rollup_change(changed_sessions, version_before)
+
+    def delete_session(self, session_name):
+        """Remove a saved session.
+
+        Unlike save_data(merge=False), an empty result is written too, so the
+        last remaining session can be deleted.
+
+        Args:
+            session_name: Session key in data.json
+
+        Raises:
+            Exception: If the session data could not be written
+        """
+        # Queued transitions must land before the snapshot replaces the journal
+        self.persistence_worker.flush()
+        version_before = self.session_store.version
+        try:
+            if self.uses_sqlite_storage():
+                self._get_sqlite_store().delete_session(session_name)
+                return
+            all_data = self.load_data()
+            all_data.pop(session_name, None)
+            self.json_writer.write_now(self.data_file, all_data)
+            self._get_journal().clear()
+            self.journal_records_submitted = 0
+        finally:
+            self.session_store.invalidate()
+            self._track_rollup_change({session_name}, version_before)
+
+    def backup_data(self, reason):
+        """Back up the session data before a destructive change.
+
+        Backups go to backup_folder (see src.backup_store): only sessions not
+        stored by an earlier backup are written, and old backups are rotated
+        out. restore_backup.py lists and restores them.
+
+        Args:
+            reason: Note listed with the backup (e.g. "delete <session>")
+
+        Returns:
+            str: Backup ID
+
+        Raises:
+            Exception: If the backup could not be written
+        """
+        store = BackupStore(self.backup_folder)
+        backup_id = store.create(self.load_data(read_only=True), reason)
+        try:
+            store.rotate()
+        except OSError:
+            pass  # Retried after the next backup
+        return backup_id
+
+    def _save_data_sqlite(self, session_data, merge):
+        """SQLite version of save_data() - merge upserts, replace rewrites all"""
+        store = self._get_sqlite_store()
+        if merge:
+            store.upsert_sessions(session_data)
+        else:
+            # Safety check: Don't save if replacement data is empty
+            if not session_data:
+                return
+            store.save_all(session_data)
+
+    def uses_sqlite_storage(self):
+        """Whether session data is stored in SQLite instead of data.json"""
+        storage_settings = self.settings.get("storage_settings", {})
+        return storage_settings.get("backend") == STORAGE_BACKEND_SQLITE
+
+    def _get_sqlite_store(self):
+        """Get the SQLite store for the current data file (data.json -> data.db)"""
+        db_file = sqlite_path_for(self.data_file)
+        if self.sqlite_store is None or self.sqlite_store.db_file != db_file:
+            self.sqlite_store = SqliteSessionStore(db_file)
+        return self.sqlite_store
+
+    def _reads_from_sqlite(self):
+        """Whether reads can go to the SQLite database directly: it is the
+        backend and no transitions are still being written to it (until then
+        the session store's cached view is ahead of the database)"""
+        return self.uses_sqlite_storage() and not self.session_store.has_pending_writes(
+            self._storage_source()
+        )
+
+    def load_sessions_between(self, start_date, end_date):
+        """Load only the sessions dated within a range.
+
+        With the SQLite backend the range is an indexed lookup, so sessions
+        outside it are never read; otherwise the cached data is filtered.
+
+        Args:
+            start_date: Earliest session date, inclusive ("YYYY-MM-DD")
+            end_date: Latest session date, inclusive ("YYYY-MM-DD")
+
+        Returns:
+            dict: Matching sessions in data.json format, in data order. Must not
+            be modified (it may share sessions with the cached read view).
+        """
+        if self._reads_from_sqlite():
+            try:
+                return self._get_sqlite_store().load_sessions(
+                    start_date=start_date, end_date=end_date
+                )
+            except Exception:
+                return {}
+        return {
+            session_name: session
+            for session_name, session in self.load_data(read_only=True).items()
+            if start_date <= (session_day(session) or "") <= end_date
+        }
+
+    def session_dates(self):
+        """Dates that have sessions ("YYYY-MM-DD"), oldest first.
+
+        Read from the sessions table's date index with the SQLite backend,
+        from the date index of the cached data otherwise.
+        """
+        if self._reads_from_sqlite():
+            try:
+                return self._get_sqlite_store().session_dates()
+            except Exception:
+                return []
+        return list(self.get_date_index().dates)
+
+    def sessions_on(self, day):
+        """Names of the sessions dated day ("YYYY-MM-DD"), in data order"""
+        if self._reads_from_sqlite():
+            return list(self.load_sessions_between(day, day))
+        return self.get_date_index().sessions_on(day)
+
+    def _get_journal(self):
+        """Get the journal for the current data file.
+
+        Tests and callers may reassign data_file after construction, so the
+        journal is re-created whenever the path changes.
+        """
+        if self.journal is None or self.journal.data_file != self.data_file:
+            self.journal = SessionJournal(self.data_file)
+            self.journal_records_submitted = None
+        return self.journal
+
+    def _get_checkpoint(self):
+        """Get the crash checkpoint for the current data file.
+
+        Re-created whenever data_file changes, like the journal.
+        """
+        if self.checkpoint is None or self.checkpoint.data_file != self.data_file:
+            self.checkpoint = SessionCheckpoint(self.data_file)
+        return self.checkpoint
+
+    def recover_session_checkpoint(self):
+        """Fold a checkpoint left behind by a crash into the session data.
+
+        A session that was running when the app stopped keeps the end time and
+        durations of its last checkpoint. Called once at startup.
+        """
+        checkpoint = self._get_checkpoint()
+        if not os.path.exists(checkpoint.checkpoint_file):
+            return  # Clean shutdown - no need to load the session data
+        update = checkpoint.pending_update(self.load_data(read_only=True))
+        if update is not None:
+            self.record_transition(make_session_update(*update))
+            # The checkpoint may only go once its values are on disk
+            if not self.persistence_worker.flush(PERSISTENCE_FLUSH_TIMEOUT_SECONDS):
+                return
+        checkpoint.clear()
+
+    def _get_live_session(self):
+        """Get the running session from the session store's read view.
+
+        The store keeps the view current as transitions are recorded, so this
+        never re-reads data.json. The result must not be modified directly - use
+        record_transition().
+
+        Returns:
+            dict or None: Session data, or None if the session isn't saved yet
+        """
+        all_data = self.load_data(read_only=True)
+        if not isinstance(all_data, dict):
+            return None
+        return all_data.get(self.session_name)
+
+    def record_transition(self, record):
+        """Record a session transition without blocking on disk I/O.
+
+        Applies the record to the session store's cached view immediately (so
+        load_data() sees it) and queues it on the persistence worker, which
+        appends it to data.json.journal - a small append instead of a full
+        data.json rewrite. Once the journal grows past
+        JOURNAL_COMPACTION_THRESHOLD records it is compacted into data.json,
+        also on the worker.
+
+        Must be called on the Tk thread.
+
+        Args:
+            record: Record built with make_session_update / make_period_append /
+                make_period_update from src.session_journal
+        """
+        source = self._storage_source()
+        # Make sure the cached view is loaded and current - it stays
+        # authoritative until the worker has written the record
+        self.load_data(read_only=True)
+        version_before = self.session_store.version
+        self.session_store.apply(record, source)
+        self._track_rollup_change({record["session"]}, version_before)
+
+        if self.uses_sqlite_storage():
+            # SQLite commits are already small and atomic - no journal needed
+            store = self._get_sqlite_store()
+            self.persistence_worker.submit(
+                ("sqlite", store.db_file),
+                record,
+                lambda records: [store.apply_record(r) for r in records],
+                on_done=lambda error: self._on_transition_written(
+                    error, source, store.db_file
+                ),
+            )
+            return
+
+        journal = self._get_journal()
+        if self.journal_records_submitted is None:
+            # First transition for this journal - count what earlier runs left
+            self.journal_records_submitted = journal.record_count()
+        self.persistence_worker.submit(
+            ("journal", journal.journal_file),
+            record,
+            journal.append_many,
+            on_done=lambda error: self._on_transition_written(
+                error, source, journal.journal_file
+            ),
+        )
+
+        self.journal_records_submitted += 1
+        if self.journal_records_submitted >= JOURNAL_COMPACTION_THRESHOLD:
+            self.compact_journal()
+
+    def _on_transition_written(self, error, source, path):
+        """Persistence worker callback after a transition was written.
+
+        Runs on the worker thread; errors are reported on the Tk thread.
+        """
+        self.session_store.write_finished(source)
+        if error is None:
+            return
+
+        def show_error():
+            messagebox.showerror(
+                "Save Error",
+                f"Failed to save session data to {path}\n\n"
+                f"Error: {error}\n\n"
+                "Your session data may not be saved. Please check file permissions.",
+            )
+
+        try:
+            self.root.after(0, show_error)
+        except Exception:
+            pass
+
+    def compact_journal(self):
+        """Fold the journal into data.json and remove it, on the persistence
+        worker.
+
+        Called from record_transition() once JOURNAL_COMPACTION_THRESHOLD
+        records were submitted. The job runs after the appends queued before
+        it and writes the session store's read view, which already includes
+        them; records submitted later go to the new, empty journal. Queued
+        compactions are coalesced.
+        """
+        if self.uses_sqlite_storage():
+            return
+        all_data = self.load_data(read_only=True)
+        if not all_data:
+            return
+        source = self._storage_source()
+        data_file = self.data_file
+        journal = self._get_journal()
+        # The files lag behind the cached view until the job has run
+        self.session_store.write_started(source)
+        self.journal_records_submitted = 0
+        self.persistence_worker.submit(
+            ("compact", data_file),
+            all_data,
+            lambda snapshots: self._write_compacted(data_file, journal, snapshots[-1]),
+            replace=True,
+            on_done=lambda error: self._on_transition_written(error, source, data_file),
+        )
+
+    def _write_compacted(self, data_file, journal, all_data):
+        """Write a compacted data.json, then remove the journal it includes
+        (runs on the persistence worker)"""
+        write_json_atomic(data_file, all_data)
+        journal.clear()
+
+    def fold_journal(self):
+        """Fold the journal into data.json now and remove it.
+
+        Unlike compact_journal() this waits for the queued transitions and
+        writes on the calling thread, so afterwards data.json alone holds every
+        session - used before it is copied to another storage backend.
+
+        Raises:
+            Exception: If data.json could not be read or written
+        """
+        self.persistence_worker.flush()
+        journal = self._get_journal()
+        if not journal.record_count():
+            return
+        all_data = {}
+        if os.path.exists(self.data_file):
+            with open(self.data_file, "r") as f:
+                all_data = json.load(f)
+        if not isinstance(all_data, dict):
+            raise ValueError(f"{self.data_file} does not contain session data")
+        write_json_atomic(self.data_file, journal.replay(all_data))
+        journal.clear()
+        self.journal_records_submitted = 0
+
+    def _rollup_in_sync(self):
+        """Whether the daily rollup reflects the session store's current data"""
+        return (
+            self.daily_rollup is not None
+            and self.daily_rollup.source == self._storage_source()
+            and self.rollup_version == self.session_store.version
+        )
+
+    def _changed_sessions(self, session_data, merge):
+        """Names of sessions a save_data() call adds, changes or removes.
+
+        Only computed while the daily rollup is in sync - otherwise it is
+        rebuilt on its next read anyway.
+
+        Returns:
+            set: Session names, or None if not tracked
+        """
+        if not self._rollup_in_sync() or not isinstance(session_data, dict):
+            return None
+        current = self.load_data(read_only=True)
+        if not isinstance(current, dict):
+            return None
+        if merge:
+            names = session_data.keys()
+        elif not session_data:
+            return set()  # Nothing is written
+        else:
+            names = current.keys() | session_data.keys()
+        return {
+            name
+            for name in names
+            if current.get(name) != session_data.get(name)
+            or (name in current) != (name in session_data)
+        }
+
+    def _track_rollup_change(self, session_names, version_before):
+        """Queue changed sessions for an incremental daily rollup update.
+
+        If the rollup was already stale (or the change wasn't tracked) it is
+        left stale and rebuilt from scratch on the next get_daily_rollup().
+
+        Args:
+            session_names: Names of changed sessions, or None if unknown
+            version_before: Session store version before the change
+        """
+        if session_names is None or self.daily_rollup is None:
+            return
+        if self.rollup_version != version_before:
+            return
+        self.rollup_dirty.update(session_names)
+        self.rollup_version = self.session_store.version
+
+    def get_daily_rollup(self):
+        """Get the per-day analysis totals, brought up to date.
+
+        On first use the rollup persisted next to the data file is loaded if it
+        was built from the data files as they are now; otherwise it is rebuilt.
+        Sessions changed since the last call (saved, renamed, or updated by a
+        transition) are applied incrementally, and the result is queued to be
+        persisted on the persistence worker.
+
+        Returns:
+            DailyRollup, or None if the session data isn't a dictionary
+        """
+        source = self._storage_source()
+        rollup_file = rollup_path_for(self.data_file)
+        period_model = self.get_period_model()
+
+        if self.daily_rollup is None or self.daily_rollup.source != source:
+            # Queued transitions must be on disk before comparing signatures
+            self.persistence_worker.flush()
+            self.load_data(read_only=True)
+            self.daily_rollup = DailyRollup.load(
+                rollup_file, source, self._rollup_signature(source)
+            )
+            self.rollup_version = self.session_store.version
+            self.rollup_names = period_model.names
+            self.rollup_dirty = set()
+
+        all_data = self.load_data(read_only=True)
+        if not isinstance(all_data, dict):
+            return None
+
+        if (
+            self.daily_rollup is None
+            or self.rollup_version != self.session_store.version
+            or self.rollup_names != period_model.names
+        ):
+            self.daily_rollup = DailyRollup(source)
+            self.daily_rollup.rebuild(all_data, period_model)
+        elif self.rollup_dirty:
+            self.daily_rollup.update_sessions(all_data, self.rollup_dirty, period_model)
+        else:
+            return self.daily_rollup
+
+        self.rollup_version = self.session_store.version
+        self.rollup_names = period_model.names
+        self.rollup_dirty = set()
+        self._persist_rollup(rollup_file)
+        return self.daily_rollup
+
+    def get_period_model(self):
+        """Get the normalized-session cache for the current session data.
+
+        Sessions are normalized on first use and again only after they change
+        or a sphere/project/break action is renamed; deleted sessions are
+        dropped whenever the data version moves on.
+
+        Returns:
+            PeriodModel
+        """
+        self.period_model.set_names(NameTable(self.settings))
+        version = self.data_version
+        if self.period_model_version != version:
+            all_data = self.load_data(read_only=True)
+            if isinstance(all_data, dict):
+                self.period_model.prune(all_data)
+            else:
+                self.period_model.clear()
+            self.period_model_version = version
+        return self.period_model
+
+    def _rollup_signature(self, source):
+        """Signature a persisted rollup must match: data files and name table.
+
+        Returns:
+            list, or None if the data files can't be read
+        """
+        signature = self.session_store.data_signature(source)
+        if signature is None:
+            return None
+        return [signature, self.period_model.names.key]
+
+    def _persist_rollup(self, rollup_file):
+        """Queue the daily rollup to be written on the persistence worker.
+
+        Queued rollup writes are coalesced, and each runs after the transitions
+        submitted before it, so the data files' signature is taken there. If
+        the data changed again in the meantime the write is skipped; the next
+        get_daily_rollup() queues a newer copy.
+        """
+        snapshot = (
+            self.daily_rollup.snapshot(),
+            self.rollup_version,
+            self.rollup_names.key,
+        )
+        self.persistence_worker.submit(
+            ("rollup", rollup_file),
+            snapshot,
+            lambda snapshots: self._write_rollup(rollup_file, snapshots[-1]),
+            replace=True,
+        )
+
+    def _write_rollup(self, rollup_file, snapshot):
+        """Save a rollup snapshot with the signature of the data it reflects
+        (runs on the persistence worker)"""
+        rollup, version, names_key = snapshot
+        signature = self.session_store.data_signature(rollup.source, version)
+        if signature is None:
+            return
+        try:
+            rollup.save(rollup_file, [signature, names_key])
+        except Exception:
+            # Only a cache - it is rebuilt on the next start if missing
+            pass
+
+    def _get_screenshot_capture(self):
+        """Get the screenshot capture, creating it on first use.
+
+        Created lazily so PIL and the window/process modules it uses are only
+        imported once a session starts.
+        """
+        if self.screenshot_capture is None:
+            from src.screenshot_capture import ScreenshotCapture
+
+            self.screenshot_capture = ScreenshotCapture(
+                self.settings,
+                self.data_file,
+                index=self._get_screenshot_retention().index,
+            )
+        return self.screenshot_capture
+
+    def _get_screenshot_retention(self):
+        """Get the screenshot index and retention limits, creating them on
+        first use"""
+        if self.screenshot_retention is None:
+            from src.screenshot_retention import ScreenshotIndex, ScreenshotRetention
+
+            screenshot_path = self.settings.get("screenshot_settings", {}).get(
+                "screenshot_path", DEFAULT_SCREENSHOT_FOLDER
+            )
+            self.screenshot_retention = ScreenshotRetention(
+                ScreenshotIndex(screenshot_path),
+                self.settings,
+                on_evicted=self._on_screenshots_evicted,
+                protected_folder=self._current_screenshot_session_folder,
+            )
+        return self.screenshot_retention
+
+    def _start_screenshot_retention(self):
+        """Apply the retention settings, starting the background pass if any
+        limit is set"""
+        screenshot_settings = self.settings.get("screenshot_settings", {})
+        if self.screenshot_retention is None and not any(
+            screenshot_settings.get(key)
+            for key in ("max_total_size_mb", "max_age_days", "keep_per_period")
+        ):
+            return  # Nothing to enforce - don't load the index yet
+        retention = self._get_screenshot_retention()
+        retention.configure(self.settings)
+        if retention.enabled:
+            retention.start()
+
+    def _current_screenshot_session_folder(self):
+        """Screenshot folder of the running session, which retention leaves
+        alone (retention thread)"""
+        screenshot_capture = self.screenshot_capture
+        if screenshot_capture is None or not self.session_active:
+            return None
+        period_folder = screenshot_capture.get_screenshot_folder_path()
+        return os.path.dirname(period_folder) if period_folder else None
+
+    def _on_screenshots_evicted(self, paths):
+        """Retention callback: drop the evicted screenshots from their session
+        manifests (retention thread)"""
+        remove_screenshots(paths, os.path.dirname(self.data_file))
+
+    def _add_screenshot_info(self, period):
+        """Add the current capture period's screenshot folder and manifest to a
+        period.
+
+        The screenshot list goes to the session's manifest (see
+        src.screenshot_manifest); it is only kept in the period if the manifest
+        can't be written.
+        """
+        screenshot_capture = self._get_screenshot_capture()
+        current_screenshots = screenshot_capture.get_current_period_screenshots()
+        if screenshot_capture.enabled and current_screenshots:
+            screenshot_folder = screenshot_capture.get_screenshot_folder_path()
+            if screenshot_folder:
+                data_dir = os.path.dirname(self.data_file)
+                period["screenshot_folder"] = os.path.relpath(
+                    screenshot_folder, data_dir
+                )
+                try:
+                    manifest_file = screenshot_capture.write_period_manifest(
+                        period["start_timestamp"]
+                    )
+                    if manifest_file:
+                        period["screenshot_manifest"] = os.path.relpath(
+                            manifest_file, data_dir
+                        )
+                except OSError:
+                    period["screenshots"] = current_screenshots
+        return period
 
     def create_widgets(self):
         """Create the main GUI elements for the time tracker interface.
@@ -471,12 +1278,11 @@ class TimeTracker:
         """Start monitoring keyboard and mouse input for idle detection.
 
         Sets up pynput listeners to track user activity (mouse movement, clicks,
-        scrolling, and keyboard presses). When activity is detected after an idle
-        period, this method handles the complex transition back to active state:
-        - Saves the completed idle period with duration
-        - Saves the pre-idle active period (from last active start to idle start)
-        - Starts a new active period from when activity resumed
-        - Manages screenshot capture transitions between periods
+        scrolling, and keyboard presses). The listener callbacks run on pynput's
+        hook threads, so they do as little as possible: record the timestamp
+        and, when the session is idle, enqueue the activity event for the Tk
+        thread. The idle -> active transition itself happens in
+        process_input_events() / _resume_from_idle().
 
         The on_activity callback is triggered on ANY input event and updates
         last_user_input timestamp used by check_idle() for threshold detection.
@@ -485,113 +1291,31 @@ class TimeTracker:
             - Sets input_listener_running flag to True
             - Creates and starts mouse_listener (pynput.mouse.Listener)
             - Creates and starts keyboard_listener (pynput.keyboard.Listener)
-            - When resuming from idle:
-                - Updates session_idle flag to False
-                - Saves idle period end time to data.json
-                - Saves pre-idle active period with screenshot info
-                - Starts new active period with fresh screenshot capture
-                - Updates active_period_start_time to current time
 
-
-
-        CRITICAL: This method implements complex state transitions when resuming
-        from idle. It must save the active period that ended when idle started,
-        then start a fresh active period from when idle ended. This preserves
-        accurate time tracking boundaries.
+        CRITICAL: Never touch Tk widgets, session data or files from on_activity.
+        A slow hook callback delays the user's own mouse and keyboard input
+        system-wide, and Tk is not thread-safe.
         """
         if self.input_listener_running:
             return
+        from pynput import mouse, keyboard
 
         self.input_listener_running = True
         self.last_user_input = time.time()
 
         def on_activity(*args):
-            try:
-                self.last_user_input = time.time()
-                if self.session_idle:
-                    self.session_idle = False
-                    self.status_label.config(text="Active")
-                    # Save idle period end
-                    all_data = self.load_data()
-                    if self.session_name in all_data:
-                        idle_periods = all_data[self.session_name]["idle_periods"]
-                        # Check if there are any idle periods and the last one doesn't have an end time
-                        if idle_periods and "end" not in idle_periods[-1]:
-                            last_idle = idle_periods[-1]
-                            last_idle["end"] = datetime.now().strftime("%H:%M:%S")
-                            last_idle["end_timestamp"] = self.last_user_input
-                            last_idle["duration"] = (
-                                last_idle["end_timestamp"]
-                                - last_idle["start_timestamp"]
-                            )
-
-                            # Save the active period that ended when idle started,
-                            # then start a new active period from when idle ended
-                            all_data[self.session_name]["active"] = all_data[
-                                self.session_name
-                            ].get("active", [])
-
-                            # Build active period from last active_period_start_time to idle start
-                            idle_start_time = last_idle["start_timestamp"]
-                            pre_idle_active_period = {
-                                "start": datetime.fromtimestamp(
-                                    self.active_period_start_time
-                                ).strftime("%H:%M:%S"),
-                                "start_timestamp": self.active_period_start_time,
-                                "end": datetime.fromtimestamp(idle_start_time).strftime(
-                                    "%H:%M:%S"
-                                ),
-                                "end_timestamp": idle_start_time,
-                                "duration": idle_start_time
-                                - self.active_period_start_time,
-                            }
-
-                            # Add screenshot info if any were captured
-                            current_screenshots = (
-                                self.screenshot_capture.get_current_period_screenshots()
-                            )
-                            if self.screenshot_capture.enabled and current_screenshots:
-                                screenshot_folder = (
-                                    self.screenshot_capture.get_screenshot_folder_path()
-                                )
-                                if screenshot_folder:
-                                    pre_idle_active_period["screenshot_folder"] = (
-                                        os.path.relpath(
-                                            screenshot_folder,
-                                            os.path.dirname(self.data_file),
-                                        )
-                                    )
-                                    pre_idle_active_period["screenshots"] = (
-                                        current_screenshots
-                                    )
-
-                            all_data[self.session_name]["active"].append(
-                                pre_idle_active_period
-                            )
-
-                            # Start new active period from when idle ended (NOW)
-                            self.active_period_start_time = self.last_user_input
-
-                            # Start fresh screenshot capture for new active period
-                            active_period_count = len(
-                                all_data[self.session_name]["active"]
-                            )
-                            self.screenshot_capture.set_current_session(
-                                self.session_name, "active", active_period_count
-                            )
-
-                            self.save_data(all_data)
-            except Exception as error:
-                # Show error notification once for user-actionable issues (disk full, permissions)
-                # After first notification, fail silently to avoid spamming on every input event
-                if not self.input_monitoring_error_shown:
-                    self.input_monitoring_error_shown = True
-                    messagebox.showerror(
-                        "Input Monitoring Error",
-                        f"Error saving idle/active period data:\n\n{error}\n\n"
-                        "This could be due to disk space or file permissions.\n"
-                        "Input monitoring will continue, but some data may not be saved.",
-                    )
+            now = time.time()
+            self.last_user_input = now
+            if self.session_idle and not self.input_events_scheduled:
+                # Only the first event after going idle matters - later ones
+                # are covered by last_user_input
+                self.input_events_scheduled = True
+                self.input_events.put(now)
+                try:
+                    self.root.after(0, self.process_input_events)
+                except Exception:
+                    # Tk is shutting down
+                    pass
 
         # Start mouse listener with error suppression
         self.mouse_listener = mouse.Listener(
@@ -606,6 +1330,118 @@ class TimeTracker:
         self.keyboard_listener = keyboard.Listener(on_press=on_activity)
         self.keyboard_listener.start()
 
+    def process_input_events(self):
+        """Handle activity events queued by the input hook threads (Tk thread).
+
+        Drains the input event queue and, if the session is still idle, resumes
+        it as of the first queued activity timestamp.
+        """
+        resume_time = None
+        while True:
+            try:
+                timestamp = self.input_events.get_nowait()
+            except queue.Empty:
+                break
+            if resume_time is None:
+                resume_time = timestamp
+        self.input_events_scheduled = False
+
+        if resume_time is None or not self.session_idle:
+            return
+
+        try:
+            self._resume_from_idle(resume_time)
+        except Exception as error:
+            # Show error notification once for user-actionable issues (disk full, permissions)
+            # After first notification, fail silently to avoid spamming on every input event
+            if not self.input_monitoring_error_shown:
+                self.input_monitoring_error_shown = True
+                messagebox.showerror(
+                    "Input Monitoring Error",
+                    f"Error saving idle/active period data:\n\n{error}\n\n"
+                    "This could be due to disk space or file permissions.\n"
+                    "Input monitoring will continue, but some data may not be saved.",
+                )
+
+    def _resume_from_idle(self, resume_time):
+        """Transition an idle session back to active.
+
+        Handles the complex transition back to active state:
+        - Saves the completed idle period with duration
+        - Saves the pre-idle active period (from last active start to idle start)
+        - Starts a new active period from when activity resumed
+        - Manages screenshot capture transitions between periods
+
+        Args:
+            resume_time: Unix timestamp of the first input after going idle
+
+        CRITICAL: It must save the active period that ended when idle started,
+        then start a fresh active period from when idle ended. This preserves
+        accurate time tracking boundaries.
+        """
+        self.session_idle = False
+        self.status_label.config(text="Active")
+        self.update_tray_icon()
+        self._arm_idle_deadline()
+        # Save idle period end
+        session = self._get_live_session()
+        if session is None:
+            return
+        idle_periods = session.get("idle_periods", [])
+        # Check if there are any idle periods and the last one doesn't have an end time
+        if not idle_periods or "end" in idle_periods[-1]:
+            return
+
+        last_idle = idle_periods[-1]
+        idle_end = {
+            "end": datetime.fromtimestamp(resume_time).strftime("%H:%M:%S"),
+            "end_timestamp": resume_time,
+            "duration": resume_time - last_idle["start_timestamp"],
+        }
+        self.record_transition(
+            make_period_update(
+                self.session_name,
+                "idle_periods",
+                len(idle_periods) - 1,
+                idle_end,
+            )
+        )
+
+        # Save the active period that ended when idle started,
+        # then start a new active period from when idle ended
+        # Build active period from last active_period_start_time to idle start
+        idle_start_time = last_idle["start_timestamp"]
+        pre_idle_active_period = {
+            "start": datetime.fromtimestamp(self.active_period_start_time).strftime(
+                "%H:%M:%S"
+            ),
+            "start_timestamp": self.active_period_start_time,
+            "end": datetime.fromtimestamp(idle_start_time).strftime("%H:%M:%S"),
+            "end_timestamp": idle_start_time,
+            "duration": idle_start_time - self.active_period_start_time,
+        }
+
+        # Add screenshot info if any were captured
+        self._add_screenshot_info(pre_idle_active_period)
+
+        active_period_count = len(session.get("active", []))
+        self.record_transition(
+            make_period_append(
+                self.session_name,
+                "active",
+                active_period_count,
+                pre_idle_active_period,
+            )
+        )
+
+        # Start new active period from when idle ended
+        self.active_period_start_time = resume_time
+
+        # Start fresh screenshot capture for new active period
+        self._get_screenshot_capture().set_current_session(
+            self.session_name, "active", active_period_count + 1
+        )
+
     def stop_input_monitoring(self):
         """Stop monitoring input"""
         self.input_listener_running = False
@@ -629,7 +1465,7 @@ class TimeTracker:
         The session name format is: YYYY-MM-DD_<unix_timestamp>
 
         Side effects:
-            - Creates new session entry in data.json
+            - Records new session entry in the session journal
             - Enables End Session and Start Break buttons
             - Starts input monitoring for idle detection
             - Starts screenshot capture for the first active period
@@ -654,18 +1490,17 @@ class TimeTracker:
 
         # Create session data
         session_data = {
-            self.session_name: {
-                "sphere": (self._get_default_sphere() if settings else "General"),
-                "date": current_date,
-                "start_time": current_time,
-                "start_timestamp": self.session_start_time,
-                "breaks": [],
-                "idle_periods": [],
-            }
+            "sphere": (self._get_default_sphere() if settings else "General"),
+            "date": current_date,
+            "start_time": current_time,
+            "start_timestamp": self.session_start_time,
+            "breaks": [],
+            "idle_periods": [],
         }
+        stamp_session_ids(session_data, NameTable(self.settings))
 
         # Save initial session
-        self.save_data(session_data)
+        self.record_transition(make_session_update(self.session_name, session_data))
 
         # Update UI
         self.start_button.config(state=tk.DISABLED)
@@ -685,8 +1520,18 @@ class TimeTracker:
         self.start_input_monitoring()
 
         # Start screenshot capture for first active period
-        self.screenshot_capture.set_current_session(self.session_name, "active", 0)
-        self.screenshot_capture.start_monitoring()
+        screenshot_capture = self._get_screenshot_capture()
+        screenshot_capture.set_current_session(self.session_name, "active", 0)
+        screenshot_capture.start_monitoring()
+
+        # Arm display refresh, idle deadline and crash checkpoint
+        self.update_timers()
+        self._arm_idle_deadline()
+        self.timers.schedule(
+            "checkpoint",
+            SESSION_CHECKPOINT_INTERVAL_MS,
+            self._checkpoint_session_progress,
+        )
 
     def end_session(self):
         """End the current tracking session.
@@ -699,7 +1544,8 @@ class TimeTracker:
         first. Input monitoring and screenshot capture are stopped.
 
         Side effects:
-            - Saves final active period to data.json with screenshot info
+            - Records final active period with screenshot info
+            - Compacts the session journal into data.json
             - Stops input monitoring (mouse/keyboard listeners)
             - Stops screenshot capture
             - Calculates and saves final time statistics
@@ -724,12 +1570,8 @@ class TimeTracker:
 
         # Save the final active period (if not on break)
         if not end_on_break:
-
-            all_data = self.load_data()
-            if self.session_name in all_data:
-                all_data[self.session_name]["active"] = all_data[self.session_name].get(
-                    "active", []
-                )
+            session = self._get_live_session()
+            if session is not None:
                 # Build final active period with screenshot data
                 final_period = {
                     "start": datetime.fromtimestamp(
@@ -741,26 +1583,22 @@ class TimeTracker:
                     "duration": duration,
                 }
                 # Add screenshot info if any were captured
-                current_screenshots = (
-                    self.screenshot_capture.get_current_period_screenshots()
-                )
-                if self.screenshot_capture.enabled and current_screenshots:
-                    screenshot_folder = (
-                        self.screenshot_capture.get_screenshot_folder_path()
+                self._add_screenshot_info(final_period)
+                self.record_transition(
+                    make_period_append(
+                        self.session_name,
+                        "active",
+                        len(session.get("active", [])),
+                        final_period,
                     )
-                    if screenshot_folder:
-                        final_period["screenshot_folder"] = os.path.relpath(
-                            screenshot_folder, os.path.dirname(self.data_file)
-                        )
-                        final_period["screenshots"] = current_screenshots
-                all_data[self.session_name]["active"].append(final_period)
-                self.save_data(all_data)
+                )
 
         # Stop input monitoring
         self.stop_input_monitoring()
 
         # Stop screenshot capture
-        self.screenshot_capture.stop_monitoring()
+        if self.screenshot_capture is not None:
+            self.screenshot_capture.stop_monitoring()
 
         # Calculate final time using original session start time
         end_time = time.time()
@@ -782,6 +1620,10 @@ class TimeTracker:
             all_data[self.session_name]["total_duration"] = total_elapsed
             all_data[self.session_name]["active_duration"] = active_time
             all_data[self.session_name]["break_duration"] = break_time
+            if self.screenshot_capture is not None:
+                dedupe_stats = self.screenshot_capture.dedupe_stats(self.session_name)
+                if dedupe_stats:
+                    all_data[self.session_name]["screenshot_dedupe"] = dedupe_stats
 
             # Apply defaults to any unassigned periods so data is complete for analysis
             session = all_data[self.session_name]
@@ -822,14 +1664,25 @@ class TimeTracker:
                 has_action = idle_period.get("action") or idle_period.get("actions")
                 if not has_action:
                     idle_period["action"] = default_break_action
+            stamp_session_ids(session, NameTable(self.settings))
 
+            # Full save also compacts the session journal into data.json
             self.save_data(all_data)
 
+        # The final end time and durations supersede the crash checkpoint -
+        # drain a queued checkpoint write first so it can't recreate the file
+        self.persistence_worker.flush()
+        self._get_checkpoint().clear()
+
         # Reset state (but keep session_name for completion frame)
         self.session_active = False
         self.session_start_time = None
         self.session_elapsed = 0
 
+        # Go quiescent - no timers run without a session
+        self.timers.cancel_all()
+        self.update_tray_icon()
+
         # Update UI
         self.start_button.config(state=tk.NORMAL)
         self.end_button.config(state=tk.DISABLED)
@@ -856,13 +1709,13 @@ class TimeTracker:
 
         Side effects:
             Starting a break:
-                - Saves current active period to data.json
+                - Records current active period in the session journal
                 - Switches screenshot capture to break period
                 - Updates status label to "On break"
                 - Changes button text to "End Break"
 
             Ending a break:
-                - Saves break period to data.json
+                - Records break period in the session journal
                 - Increments total_break_time counter
                 - Switches screenshot capture back to active period
                 - Updates status label to "Session active"
@@ -883,11 +1736,8 @@ class TimeTracker:
             self.break_button.config(text="End Break")
             self.status_label.config(text="On break")
             # Save the end of the active period before break
-            all_data = self.load_data()
-            if self.session_name in all_data:
-                all_data[self.session_name]["active"] = all_data[self.session_name].get(
-                    "active", []
-                )
+            session = self._get_live_session()
+            if session is not None:
                 # Add screenshot folder to the active period
                 active_period = {
                     "start": datetime.fromtimestamp(
@@ -901,33 +1751,33 @@ class TimeTracker:
                     "duration": self.break_start_time - self.active_period_start_time,
                 }
                 # Add screenshot info if any were captured
-                current_screenshots = (
-                    self.screenshot_capture.get_current_period_screenshots()
-                )
-                if self.screenshot_capture.enabled and current_screenshots:
-                    screenshot_folder = (
-                        self.screenshot_capture.get_screenshot_folder_path()
+                self._add_screenshot_info(active_period)
+                self.record_transition(
+                    make_period_append(
+                        self.session_name,
+                        "active",
+                        len(session.get("active", [])),
+                        active_period,
                     )
-                    if screenshot_folder:
-                        active_period["screenshot_folder"] = os.path.relpath(
-                            screenshot_folder, os.path.dirname(self.data_file)
-                        )
-                        active_period["screenshots"] = current_screenshots
-                all_data[self.session_name]["active"].append(active_period)
-                self.save_data(all_data)
+                )
 
             # Switch screenshot capture to break period
-            break_period_count = len(all_data[self.session_name].get("breaks", []))
-            self.screenshot_capture.set_current_session(
+            session = self._get_live_session() or {}
+            break_period_count = len(session.get("breaks", []))
+            self._get_screenshot_capture().set_current_session(
                 self.session_name, "break", break_period_count
             )
+
+            # No idle tracking during breaks; break timer counts from its start
+            self.timers.cancel("idle")
+            self.update_timers()
         else:
             # End break
             break_duration = time.time() - self.break_start_time
 
             # Save break data
-            all_data = self.load_data()
-            if self.session_name in all_data:
+            session = self._get_live_session()
+            if session is not None:
                 break_period = {
                     "start": datetime.fromtimestamp(self.break_start_time).strftime(
                         "%H:%M:%S"
@@ -938,20 +1788,15 @@ class TimeTracker:
                     "duration": break_duration,
                 }
                 # Add screenshot info if any were captured
-                current_screenshots = (
-                    self.screenshot_capture.get_current_period_screenshots()
-                )
-                if self.screenshot_capture.enabled and current_screenshots:
-                    screenshot_folder = (
-                        self.screenshot_capture.get_screenshot_folder_path()
+                self._add_screenshot_info(break_period)
+                self.record_transition(
+                    make_period_append(
+                        self.session_name,
+                        "breaks",
+                        len(session.get("breaks", [])),
+                        break_period,
                     )
-                    if screenshot_folder:
-                        break_period["screenshot_folder"] = os.path.relpath(
-                            screenshot_folder, os.path.dirname(self.data_file)
-                        )
-                        break_period["screenshots"] = current_screenshots
-                all_data[self.session_name]["breaks"].append(break_period)
-                self.save_data(all_data)
+                )
 
             # Track cumulative break time
             self.total_break_time += break_duration
@@ -967,11 +1812,15 @@ class TimeTracker:
             self.active_period_start_time = time.time()
 
             # Switch screenshot capture back to active period
-            active_period_count = len(all_data[self.session_name].get("active", []))
-            self.screenshot_capture.set_current_session(
+            session = self._get_live_session() or {}
+            active_period_count = len(session.get("active", []))
+            self._get_screenshot_capture().set_current_session(
                 self.session_name, "active", active_period_count
             )
 
+            self.update_timers()
+            self._arm_idle_deadline()
+
     def show_completion_frame(self):
         """Display session completion UI for labeling and saving session data.
 
@@ -1006,6 +1855,8 @@ class TimeTracker:
 
         # Get content frame and create completion frame with session name
         completion_parent = self.completion_container.get_content_frame()
+        from src.completion_frame import CompletionFrame
+
         self.completion_frame = CompletionFrame(
             completion_parent, self, self.session_name
         )
@@ -1099,12 +1950,16 @@ class TimeTracker:
             When newly idle:
                 - Sets session_idle flag to True
                 - Records idle_start_time as current time
-                - Saves idle period start to data.json
+                - Records idle period start in the session journal
                 - Updates status label to "Idle detected"
 
             When idle exceeds break threshold:
                 - Auto-starts a break using toggle_break()
                 - Sets auto_break_start_time_from_idle for accurate break timing
+
+        Note:
+            Runs from the one-shot idle deadline armed by _arm_idle_deadline(),
+            not from a polling loop.
         """
         if not self.session_active or self.break_active:
             return
@@ -1127,23 +1982,29 @@ class TimeTracker:
             # The threshold period counts as active time
             self.idle_start_time = time.time()
             self.status_label.config(text="Idle detected")
+            self.update_tray_icon()
 
             # Save idle period start
-            all_data = self.load_data()
-            if self.session_name in all_data:
-                all_data[self.session_name]["idle_periods"].append(
-                    {
-                        "start": datetime.fromtimestamp(self.idle_start_time).strftime(
-                            "%H:%M:%S"
-                        ),
-                        "start_timestamp": self.idle_start_time,
-                    }
+            session = self._get_live_session()
+            if session is not None:
+                self.record_transition(
+                    make_period_append(
+                        self.session_name,
+                        "idle_periods",
+                        len(session.get("idle_periods", [])),
+                        {
+                            "start": datetime.fromtimestamp(
+                                self.idle_start_time
+                            ).strftime("%H:%M:%S"),
+                            "start_timestamp": self.idle_start_time,
+                        },
+                    )
                 )
-                self.save_data(all_data)
 
-        # Check if idle long enough for auto-break
+        # Check if idle long enough for auto-break (-1 means "Never")
         elif (
             self.session_idle
+            and self.settings["idle_settings"]["idle_break_threshold"] >= 0
             and idle_time >= self.settings["idle_settings"]["idle_break_threshold"]
         ):
             if not self.break_active:
@@ -1152,52 +2013,66 @@ class TimeTracker:
                 self.toggle_break()
 
     def update_timers(self):
-        """Update timer displays and perform periodic background tasks.
+        """Update timer displays and arm the next refresh.
+
+        Refreshes are event driven rather than polled: each call arms a single
+        one-shot timer for the next whole-second boundary of the running
+        counter, so the displayed HH:MM:SS changes exactly once per second.
+        Labels are only touched while the window is visible; the tray tooltip
+        keeps ticking while the tray icon exists. With no active session
+        nothing is re-armed and the app is fully quiescent until the next
+        start_session().
 
-        Called every 100ms (UPDATE_TIMER_INTERVAL_MS) by the Tkinter event loop.
-        Updates session timer, break timer, total active time, and total break time
-        labels. Also performs periodic tasks like idle checking and auto-backup.
+        Called from:
+        - __init__ (initial display)
+        - Session transitions (start, break, resume from idle)
+        - Its own one-shot "tick" timer
+        - toggle_window() / <Map> when the window becomes visible again
 
         Side effects:
             - Updates system tray icon with current session status
-            - Updates session_timer_label with current active time
+            - Updates session_timer_label / total_active_label with active time
             - Updates break_timer_label with current break duration
-            - Updates total_active_label with cumulative active time
             - Updates total_break_label with cumulative break time
-            - Calls check_idle() to monitor for idle periods
-            - Auto-saves session data every minute to prevent data loss
-            - Triggers screenshot capture (if enabled)
-
-        Note:
-            This method implements a backup loop counter that triggers auto-save
-            every minute (60000ms / 100ms = 600 iterations) to protect against
-            unexpected program termination.
+            - Re-arms the "tick" timer while a session is active
         """
-        # Update tray icon periodically
-        self.update_tray_icon()
+        now = time.time()
 
         if self.session_active and not self.break_active:
             # Calculate active time by subtracting breaks from total elapsed
-            total_elapsed = time.time() - self.session_start_time
+            total_elapsed = now - self.session_start_time
             self.session_elapsed = total_elapsed - self.total_break_time
-            self.session_timer_label.config(text=self.format_time(self.session_elapsed))
+        if self.break_active:
+            self.break_elapsed = now - self.break_start_time
+
+        if self._displays_visible():
+            self._refresh_timer_labels()
+
+        self.update_tray_icon()
 
+        if not self.session_active:
+            self.timers.cancel("tick")
+            return
+        if not self._displays_visible() and self.tray_icon is None:
+            # Nothing on screen shows the timer - wait for <Map> / toggle_window
+            self.timers.cancel("tick")
+            return
+
+        # Next whole second of whichever counter is running
+        counter = self.break_elapsed if self.break_active else self.session_elapsed
+        self.timers.schedule("tick", ms_until_next_second(counter), self.update_timers)
+
+    def _refresh_timer_labels(self):
+        """Write the current counters into the timer labels"""
+        if self.session_active and not self.break_active:
+            self.session_timer_label.config(text=self.format_time(self.session_elapsed))
             # Update total active time
             self.total_active_label.config(text=self.format_time(self.session_elapsed))
 
-            # Check for idle
-            self.check_idle()
-
         if self.break_active:
-            # Get current time once for all calculations
-            current_time = time.time()
-            self.break_elapsed = current_time - self.break_start_time
-
             # Update break timer (current break)
-            self.break_timer_label.config(text=self.format_time(self.break_elapsed))
-
             # Total break stays at previous cumulative value (updates only when break ends)
-            # No need to update total_break_label here
+            self.break_timer_label.config(text=self.format_time(self.break_elapsed))
         else:
             self.break_timer_label.config(text="00:00:00")
 
@@ -1210,37 +2085,96 @@ class TimeTracker:
                 # Reset total break when no session is active
                 self.total_break_label.config(text="00:00:00")
 
-        # save in case computer crashes or runtime stops unexpectedly
-        if self.backup_loop_count == self.backup_frequency:
-            # Update session data
-            if self.session_active:
-                all_data = self.load_data()
-                if self.session_name in all_data:
-                    all_data[self.session_name]["end_time"] = datetime.now().strftime(
-                        "%H:%M:%S"
-                    )
-                    all_data[self.session_name]["end_timestamp"] = time.time()
-                    all_data[self.session_name]["total_duration"] = (
-                        time.time() - all_data[self.session_name]["start_timestamp"]
-                    )
-                    all_data[self.session_name]["active_duration"] = (
-                        all_data[self.session_name]["total_duration"]
-                        - self.total_break_time
-                    )
-                    all_data[self.session_name][
-                        "break_duration"
-                    ] = self.total_break_time
-                    self.save_data(all_data)
+    def _displays_visible(self):
+        """Return True if the main window is shown (not hidden to tray or minimized)"""
+        if not self.window_visible:
+            return False
+        try:
+            return self.root.state() != "iconic"
+        except Exception:
+            return False
+
+    def _on_window_mapped(self, event=None):
+        """Refresh displays immediately when the main window is shown again"""
+        if event is not None and event.widget is not self.root:
+            return
+        self.update_timers()
+
+    def _arm_idle_deadline(self):
+        """Arm a one-shot timer for the next idle or auto-break threshold.
+
+        The deadline is measured from last_user_input. Input arriving in the
+        meantime only moves last_user_input, so the timer may fire early; in
+        that case check_idle() does nothing and the deadline is re-armed from
+        the newer input time. This costs at most one wakeup per threshold
+        period instead of polling.
+        """
+        self.timers.cancel("idle")
+        if not self.session_active or self.break_active:
+            return
+
+        idle_settings = self.settings.get("idle_settings", {})
+        if not idle_settings.get("idle_tracking_enabled", True):
+            return
+
+        if self.session_idle:
+            threshold = idle_settings.get(
+                "idle_break_threshold", DEFAULT_IDLE_BREAK_THRESHOLD_SECONDS
+            )
+            if threshold < 0:
+                # Auto-break set to "Never" - wait for input to resume
+                return
+        else:
+            threshold = idle_settings.get(
+                "idle_threshold", DEFAULT_IDLE_THRESHOLD_SECONDS
+            )
+
+        self.timers.schedule_at(
+            "idle", self.last_user_input + threshold, self._on_idle_deadline
+        )
+
+    def _on_idle_deadline(self):
+        """Idle deadline reached: check thresholds and arm the next deadline"""
+        self.check_idle()
+        self._arm_idle_deadline()
+
+    def _checkpoint_session_progress(self):
+        """Checkpoint session end time/durations so a crash loses little time.
 
-                # Collect screenshot if capture is enabled (monitor thread handles actual capture)
-                # Just check if new screenshots were captured and add to tracking list
-                # This is handled automatically by the ScreenshotCapture monitor thread
+        Runs from the one-shot "checkpoint" timer every
+        SESSION_CHECKPOINT_INTERVAL_MS while a session is active. Only the
+        small checkpoint file is rewritten (on the persistence worker); the
+        session data itself is written when the session ends.
+        """
+        if not self.session_active:
+            return
 
-            self.backup_loop_count = 0
-        self.backup_loop_count += 1
+        session = self._get_live_session()
+        if session is not None:
+            now = time.time()
+            total_duration = now - session["start_timestamp"]
+            checkpoint = self._get_checkpoint()
+            self.persistence_worker.submit(
+                ("checkpoint", checkpoint.checkpoint_file),
+                (
+                    self.session_name,
+                    {
+                        "end_time": datetime.now().strftime("%H:%M:%S"),
+                        "end_timestamp": now,
+                        "total_duration": total_duration,
+                        "active_duration": total_duration - self.total_break_time,
+                        "break_duration": self.total_break_time,
+                    },
+                ),
+                checkpoint.write_latest,
+                replace=True,
+            )
 
-        # Schedule next update
-        self.root.after(self.update_timer_interval, self.update_timers)
+        self.timers.schedule(
+            "checkpoint",
+            SESSION_CHECKPOINT_INTERVAL_MS,
+            self._checkpoint_session_progress,
+        )
 
     def open_settings(self):
         """Open the settings window"""
@@ -1260,6 +2194,8 @@ class TimeTracker:
         self.main_frame_container.grid_forget()
 
         # Create settings frame in main window
+        from src.settings_frame import SettingsFrame
+
         self.settings_frame = SettingsFrame(self.root, self, self.root)
         self.settings_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
@@ -1276,8 +2212,10 @@ class TimeTracker:
             # Reload settings in case they changed
             self.settings = self.get_settings()
 
-            # Update screenshot capture settings
-            self.screenshot_capture.update_settings(self.settings)
+            # Update screenshot capture and retention settings
+            if self.screenshot_capture is not None:
+                self.screenshot_capture.update_settings(self.settings)
+            self._start_screenshot_retention()
 
             # Show main frame again
             self.main_frame_container._is_alive = True  # Re-enable scrolling
@@ -1386,6 +2324,8 @@ class TimeTracker:
             self.session_view_from_analysis = False
 
         # Create analysis frame in main window
+        from src.analysis_frame import AnalysisFrame
+
         self.analysis_frame = AnalysisFrame(self.root, self, self.root)
         self.analysis_frame.grid(row=0, column=0, sticky=(tk.W, tk.E, tk.N, tk.S))
 
@@ -1529,6 +2469,8 @@ class TimeTracker:
 
         # Get content frame and create completion frame (session view)
         session_view_parent = self.session_view_container.get_content_frame()
+        from src.completion_frame import CompletionFrame
+
         self.session_view_frame = CompletionFrame(session_view_parent, self, None)
         self.session_view_frame.pack(fill="both", expand=True)
 
@@ -1570,11 +2512,10 @@ class TimeTracker:
                 self.root.title("Time Aligned - Time Tracker")
 
     def create_tray_icon_image(self, state="idle"):
-        """Generate colored circle icon for system tray based on application state.
+        """Return the colored circle icon for the system tray state.
 
-        Creates 64x64 PIL Image with colored circle indicating current app state.
-        Called by setup_tray_icon() for initial icon and update_tray_icon() for
-        state changes.
+        Icons are pre-rendered by TrayIconCache (src/tray_icons.py) and only
+        re-rendered when the taskbar theme changes, so this is a lookup.
 
         State color mapping:
         - "idle": Blue-gray (#607D8B) - No active session
@@ -1588,43 +2529,9 @@ class TimeTracker:
 
         Returns:
             PIL Image object (64x64 RGBA) with colored circle on transparent/
-            taskbar-matched background.
-
-        Note:
-            Circle drawn with 8px margin, 2px black outline for visibility.
-            RGBA mode lets the OS taskbar colour show through so no white
-            square appears behind the icon.
-            Image format compatible with pystray.Icon.
+            taskbar-matched background. Shared - do not modify.
         """
-        # Use RGBA with the detected OS taskbar colour so the icon
-        # blends in rather than showing a white square.
-        bg = get_taskbar_color() or TRAY_ICON_BG_COLOR
-        image = Image.new("RGBA", (TRAY_ICON_SIZE, TRAY_ICON_SIZE), bg)
-        dc = ImageDraw.Draw(image)
-
-        colors = {
-            "idle": COLOR_TRAY_IDLE,
-            "active": COLOR_TRAY_ACTIVE,
-            "break": COLOR_TRAY_BREAK,
-            "session_idle": COLOR_TRAY_SESSION_IDLE,
-        }
-
-        color = colors.get(state, COLOR_TRAY_IDLE)
-
-        # Draw circle
-        dc.ellipse(
-            [
-                TRAY_ICON_MARGIN,
-                TRAY_ICON_MARGIN,
-                TRAY_ICON_SIZE - TRAY_ICON_MARGIN,
-                TRAY_ICON_SIZE - TRAY_ICON_MARGIN,
-            ],
-            fill=color,
-            outline="black",
-            width=TRAY_ICON_OUTLINE_WIDTH,
-        )
-
-        return image
+        return self.tray_icons.get(state)
 
     def setup_tray_icon(self):
         """Initialize system tray icon with menu in separate daemon thread.
@@ -1662,6 +2569,12 @@ class TimeTracker:
         """
 
         def run_tray():
+            # Imported and rendered here, off the Tk thread
+            import pystray
+            from src.tray_icons import TrayIconCache
+
+            self.tray_icons = TrayIconCache()
+
             # Create menu
             menu = pystray.Menu(
                 pystray.MenuItem("Show/Hide Window", self.toggle_window, default=True),
@@ -1711,8 +2624,8 @@ class TimeTracker:
     def update_tray_icon(self):
         """Update tray icon appearance and tooltip based on current session state.
 
-        Called every 100ms by update_timers() to reflect real-time state changes.
-        Updates both icon color and tooltip text.
+        Called by update_timers() once per second while a session is active and
+        on every state change. Updates both icon color and tooltip text.
 
         State transitions:
         - No session: "idle" state, blue-gray icon, "Time Aligned - Ready"
@@ -1727,13 +2640,15 @@ class TimeTracker:
         - Idle: Shows "Ready" (no timer)
 
         Side effects:
-            - Updates tray_icon.icon via create_tray_icon_image()
-            - Updates tray_icon.title (tooltip text)
+            - Updates tray_icon.icon via create_tray_icon_image(), only when the
+              state changed (icon assignment re-uploads the bitmap to the shell)
+            - Updates tray_icon.title (tooltip text) when it changed, at most
+              once per TRAY_TOOLTIP_MIN_INTERVAL_SECONDS except on state changes
             - No-op if tray_icon is None (not initialized)
 
         Note:
             Uses format_time() to convert elapsed seconds to HH:MM:SS string.
-            Called very frequently (10 times per second) so must be efficient.
+            Called once per second during a session so must be efficient.
         """
         if self.tray_icon is None:
             return
@@ -1752,8 +2667,26 @@ class TimeTracker:
             state = "idle"
             title = "Time Aligned - Ready"
 
-        self.tray_icon.icon = self.create_tray_icon_image(state)
-        self.tray_icon.title = title
+        # Assigning icon makes pystray re-upload the bitmap - only on transitions
+        state_changed = state != self.tray_icon_state
+        if state_changed:
+            self.tray_icon.icon = self.create_tray_icon_image(state)
+            self.tray_icon_state = state
+
+        now = time.monotonic()
+        if title != self.tray_icon.title and (
+            state_changed
+            or now - self.tray_title_updated_at >= TRAY_TOOLTIP_MIN_INTERVAL_SECONDS
+        ):
+            self.tray_icon.title = title
+            self.tray_title_updated_at = now
+
+    def _on_theme_changed(self, event=None):
+        """Re-render tray icons if the taskbar colour changed"""
+        if self.tray_icons is None or not self.tray_icons.refresh_theme():
+            return
+        if self.tray_icon is not None and self.tray_icon_state is not None:
+            self.tray_icon.icon = self.create_tray_icon_image(self.tray_icon_state)
 
     def setup_global_hotkeys(self):
         """Register global keyboard shortcuts using pynput library.
@@ -1782,6 +2715,8 @@ class TimeTracker:
             Hotkeys are optional - app continues if registration fails.
         """
         try:
+            from pynput import keyboard
+
             # Define hotkey handlers using proper key format
             hotkeys = {
                 "<ctrl>+<shift>+s": self._hotkey_start_session,
@@ -1847,6 +2782,8 @@ class TimeTracker:
             self.root.lift()
             self.root.focus_force()
             self.window_visible = True
+            # Displays were not refreshed while hidden
+            self.update_timers()
 
     def tray_start_session(self, icon=None, item=None):
         """Tray menu handler: Start new session via root.after for thread safety."""
@@ -1900,6 +2837,8 @@ class TimeTracker:
            - Stop input monitoring (pynput mouse/keyboard listeners)
            - Stop hotkey listener (global keyboard shortcuts)
            - Stop tray icon (system tray menu)
+           - Wait for queued screenshots to be saved
+           - Flush queued settings/session writes and stop the persistence worker
 
         4. Exit tkinter:
            - Call root.quit() to exit mainloop
@@ -1915,6 +2854,7 @@ class TimeTracker:
             - Stops input_monitoring via stop_input_monitoring()
             - Stops hotkey_listener via hotkey_listener.stop()
             - Stops tray_icon via tray_icon.stop()
+            - Waits up to PERSISTENCE_FLUSH_TIMEOUT_SECONDS for queued writes
             - Calls root.quit() and root.destroy()
 
         Note:
@@ -1940,6 +2880,12 @@ class TimeTracker:
                     self.hotkey_listener.stop()
                 if self.tray_icon:
                     self.tray_icon.stop()
+                if self.screenshot_capture is not None:
+                    self.screenshot_capture.flush(PERSISTENCE_FLUSH_TIMEOUT_SECONDS)
+                if self.screenshot_retention is not None:
+                    self.screenshot_retention.stop(PERSISTENCE_FLUSH_TIMEOUT_SECONDS)
+                self.flush_writes(PERSISTENCE_FLUSH_TIMEOUT_SECONDS)
+                self.persistence_worker.stop(PERSISTENCE_FLUSH_TIMEOUT_SECONDS)
                 self.root.quit()
                 self.root.destroy()
         else:
@@ -1948,6 +2894,12 @@ class TimeTracker:
                 self.hotkey_listener.stop()
             if self.tray_icon:
                 self.tray_icon.stop()
+            if self.screenshot_capture is not None:
+                self.screenshot_capture.flush(PERSISTENCE_FLUSH_TIMEOUT_SECONDS)
+            if self.screenshot_retention is not None:
+                self.screenshot_retention.stop(PERSISTENCE_FLUSH_TIMEOUT_SECONDS)
+            self.flush_writes(PERSISTENCE_FLUSH_TIMEOUT_SECONDS)
+            self.persistence_worker.stop(PERSISTENCE_FLUSH_TIMEOUT_SECONDS)
             self.root.quit()
             self.root.destroy()
 
@@ -1955,6 +2907,9 @@ class TimeTracker:
 def main():
     root = tk.Tk()
     app = TimeTracker(root)
+    app.recover_session_checkpoint()
+    app.migrate_name_ids()
+    app.migrate_screenshot_manifests()
     root.protocol("WM_DELETE_WINDOW", app.on_closing)
     root.mainloop()
 